@@ -19,26 +19,63 @@ class Settings(BaseSettings):
     
     # === Banco de Dados ===
     DATABASE_URL: str = "sqlite:///./leme.db"
+    MIGRAR_NO_STARTUP: bool = False            # aplica migrações no boot (dev local); em produção use scripts.migrar
+
+    # === Análise em lote (POST /api/v1/analise/lote) ===
+    ANALISE_LOTE_MAX_ITENS: int = 100          # empresas por requisição
     
     # === IA (Anthropic) ===
     ANTHROPIC_API_KEY: Optional[str] = None
+    ANTHROPIC_BASE_URL: Optional[str] = None   # sobrescreve a URL da API (ex: servidor fake local)
+    IA_MAX_CONCORRENCIA: int = 4               # chamadas simultâneas à Claude por worker
+    IA_MAX_CONEXOES: int = 20                  # tamanho do pool HTTP do cliente Anthropic
+    IA_TIMEOUT_SEGUNDOS: float = 30.0          # timeout total de cada chamada
+    IA_MAX_TENTATIVAS: int = 3                 # tentativas em erros transitórios (429, 5xx, rede)
+
+    # === Fila de IA (jobs_ia) ===
+    IA_JOBS_WORKERS: int = 2                   # workers assíncronos por processo
+    IA_JOBS_INTERVALO_SEGUNDOS: float = 5.0    # polling da fila quando vazia
+    IA_JOBS_MAX_TENTATIVAS: int = 3            # tentativas por job antes de marcar 'falhou'
+
+    # === Cache de textos de IA (cache_ia) ===
+    IA_CACHE_ATIVO: bool = True                # desliga o cache sem mexer no código
+    IA_CACHE_MAX_ITENS: int = 2000             # entradas na camada em memória (por worker)
+
+    # === Cache do plano de ação do dashboard ===
+    PLANO_ACAO_CACHE_MAX_ITENS: int = 5000     # planos em memória (por worker)
     
     # === Stripe ===
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
     
+    # === Respostas HTTP ===
+    GZIP_MINIMO_BYTES: int = 1000              # corpos menores saem sem compressão
+    LISTAGEM_LIMITE_PADRAO: int = 50           # itens por página nas listagens (services/paginacao.py)
+    LISTAGEM_LIMITE_MAXIMO: int = 200
+
     # === URLs ===
     FRONTEND_URL: str = "https://leme.app.br"
     
     # === E-mail (Brevo) ===
     BREVO_API_KEY: Optional[str] = None
+    EMAIL_LOTE_TAMANHO: int = 100              # destinatários por chamada no envio em lote dos crons
+    EMAIL_MAX_CONCORRENCIA: int = 4            # lotes enviados ao mesmo tempo
+    EMAIL_REQUISICOES_POR_SEGUNDO: float = 5.0 # rate limit de chamadas ao Brevo
 
     # === Cron ===
     CRON_SECRET: Optional[str] = None
     
+    # === Métricas (/metrics) ===
+    METRICS_TOKEN: Optional[str] = None        # exigido em Authorization: Bearer <token>; sem ele, /metrics só abre com DEBUG
+
     # === Admin ===
     ADMIN_EMAIL: str = "bavstecnologia@gmail.com"
     
+    # === Logs ===
+    LOG_NIVEL: str = "INFO"
+    LOG_NIVEIS: str = ""                       # por subsistema: "services.email_service=WARNING,sqlalchemy.engine=INFO"
+    LOG_FORMATO: str = "json"                  # "json" (produção) ou "texto" (dev local)
+
     # === Debug ===
     DEBUG: bool = False
     
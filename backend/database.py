@@ -3,9 +3,11 @@ Configuração do banco de dados
 Suporta SQLite (local) e PostgreSQL (produção)
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import get_settings
+from services.contador_queries import instrumentar_engine, instrumentar_pool
 
 settings = get_settings()
 
@@ -41,6 +43,33 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+# ── Engine assíncrono (endpoints async def) ───────────────────────────────────
+# Mesmo banco, driver assíncrono: psycopg (async) no PostgreSQL e aiosqlite
+# localmente. Query com await não bloqueia o event loop do uvicorn.
+
+if database_url.startswith("sqlite"):
+    async_database_url = database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    async_engine = create_async_engine(async_database_url, echo=settings.DEBUG)
+else:
+    # postgresql+psycopg serve para os dois modos — o SQLAlchemy escolhe o async
+    async_engine = create_async_engine(database_url, pool_pre_ping=True, echo=settings.DEBUG)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    # Sem expirar no commit: ler atributo depois do commit não dispara I/O implícito
+    expire_on_commit=False,
+)
+
+# Contagem de queries/tempo de banco por requisição (middleware do main.py)
+# e métricas do pool de conexões (/metrics)
+instrumentar_engine(engine)
+instrumentar_engine(async_engine.sync_engine)
+instrumentar_pool(engine, "sync")
+instrumentar_pool(async_engine.sync_engine, "async")
+
+
 def get_db():
     """Dependency do FastAPI para injetar sessão do banco."""
     db = SessionLocal()
@@ -50,52 +79,7 @@ def get_db():
         db.close()
 
 
-def run_migrations():
-    """
-    Executa migrações simples no startup.
-    Adiciona colunas/tabelas que podem estar faltando no banco de produção.
-    """
-
-    # ── Migrações de colunas simples ──────────────────────────────────────────
-    colunas = [
-        # Fase 1 — Stripe/paywall
-        ("analises", "stripe_session_id", "VARCHAR(200)"),
-        ("analises", "pago",              "BOOLEAN DEFAULT FALSE"),
-        ("analises", "pago_em",           "TIMESTAMP"),
-
-        # Fase 2 — vínculo análise → usuário
-        ("analises", "usuario_id",        "VARCHAR(36)"),
-    ]
-
-    with engine.connect() as conn:
-        for table, column, col_type in colunas:
-            try:
-                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
-                conn.commit()
-                print(f"[Migration] ✅ Coluna {column} adicionada em {table}")
-            except Exception as e:
-                conn.rollback()
-                if "already exists" in str(e).lower() or "duplicate column" in str(e).lower():
-                    print(f"[Migration] ⏭️  Coluna {column} já existe em {table}")
-                else:
-                    print(f"[Migration] ⚠️  Erro ao adicionar {column}: {e}")
-
-        # ── Fase 2 — criar tabela plano_acao_progresso se não existir ─────────
-        try:
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS plano_acao_progresso (
-                    id          VARCHAR(36) PRIMARY KEY,
-                    analise_id  VARCHAR(36) NOT NULL REFERENCES analises(id) ON DELETE CASCADE,
-                    usuario_id  VARCHAR(36) NOT NULL REFERENCES usuarios(id) ON DELETE CASCADE,
-                    periodo     VARCHAR(2)  NOT NULL,
-                    indice_acao INTEGER     NOT NULL,
-                    marcado     BOOLEAN     NOT NULL DEFAULT TRUE,
-                    updated_at  TIMESTAMP   DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE (analise_id, usuario_id, periodo, indice_acao)
-                )
-            """))
-            conn.commit()
-            print("[Migration] ✅ Tabela plano_acao_progresso verificada/criada")
-        except Exception as e:
-            conn.rollback()
-            print(f"[Migration] ⚠️  Erro ao criar plano_acao_progresso: {e}")
\ No newline at end of file
+async def get_async_db():
+    """Dependency do FastAPI para injetar sessão assíncrona do banco."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,133 @@
+"""
+Configuração de logs da aplicação
+
+- Uma linha JSON por evento (LOG_FORMATO=json) ou texto legível (LOG_FORMATO=texto, dev local)
+- Quem loga só enfileira o registro (QueueHandler); a escrita no stdout
+  acontece numa thread de fundo (QueueListener) — o request não espera I/O
+- Cada linha leva o request_id da requisição corrente (middleware do main.py,
+  header X-Request-ID), inclusive em endpoints síncronos e tarefas filhas
+- Nível geral em LOG_NIVEL e por subsistema em LOG_NIVEIS, ex:
+  LOG_NIVEIS="services.email_service=WARNING,sqlalchemy.engine=INFO"
+
+Nos módulos, como já era no ia_service/ia_client:
+    logger = logging.getLogger(__name__)
+    logger.info("Lote de %d e-mails enviado", n)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import get_settings
+
+# Preenchido pelo middleware a cada requisição ("-" fora de requisição)
+request_id_atual: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Atributos padrão do LogRecord — o resto veio de extra={...} e vai pro JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class FiltroRequestId(logging.Filter):
+    """Carimba o request_id no registro — roda na thread de quem loga, antes da fila."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_atual.get()
+        return True
+
+
+class _Enfileirador(logging.handlers.QueueHandler):
+    """
+    QueueHandler que resolve mensagem e traceback antes de enfileirar
+    (args e exc_info podem não ser serializáveis/estáveis na outra thread)
+    sem perder o traceback em campo próprio.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith("_"):
+                dados[chave] = valor
+        if record.exc_text:
+            dados["exc"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+def _niveis_por_logger(texto: str) -> dict[str, str]:
+    """'a.b=WARNING,c=DEBUG' → {'a.b': 'WARNING', 'c': 'DEBUG'} (entradas inválidas são ignoradas)."""
+    niveis = {}
+    for item in texto.split(","):
+        nome, _, nivel = item.partition("=")
+        if nome.strip() and nivel.strip():
+            niveis[nome.strip()] = nivel.strip().upper()
+    return niveis
+
+
+def configurar_logs() -> None:
+    """Instala o pipeline no logger raiz. Idempotente (reload do uvicorn, scripts)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    settings = get_settings()
+
+    saida = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMATO == "texto":
+        saida.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s"
+        ))
+    else:
+        saida.setFormatter(FormatadorJSON())
+
+    fila: queue.SimpleQueue = queue.SimpleQueue()
+    enfileirador = _Enfileirador(fila)
+    enfileirador.addFilter(FiltroRequestId())
+
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(enfileirador)
+    raiz.setLevel(settings.LOG_NIVEL.upper())
+
+    for nome, nivel in _niveis_por_logger(settings.LOG_NIVEIS).items():
+        logging.getLogger(nome).setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(fila, saida, respect_handler_level=True)
+    _listener.start()
+    # Garante que o que está na fila saia antes do processo terminar
+    atexit.register(encerrar_logs)
+
+
+def encerrar_logs() -> None:
+    """Esvazia a fila e para a thread de escrita (shutdown do lifespan)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
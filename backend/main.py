@@ -3,15 +3,26 @@
 """
 
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI
+import logging
+import secrets
+import time
+import uuid
+
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 
 from config import get_settings
-from database import engine, Base, run_migrations
+from logs import configurar_logs, encerrar_logs, request_id_atual
+from respostas import RespostaJSON
+from database import async_engine
+from migracoes import aplicar_migracoes, migracoes_pendentes
 from routers.analise import router as analise_router
 from routers.dashboard import router as dashboard_router
 from routers.report import router as report_router
@@ -23,20 +34,68 @@ from routers.auth import router as auth_router
 from routers.stripe_pro import router as stripe_pro_router
 from routers.historico import router as historico_router   # NOVO — Fase 2
 from routers.progresso import router as progresso_router   # NOVO — Fase 2
+from routers.painel_pro import router as painel_pro_router
 from routers.chat import router as chat_router             # NOVO — Fase 5
 from routers.cron import router as cron_router             # NOVO — Fase 6
+from services.ia_client import fechar_cliente as fechar_cliente_ia
+from services.ia_jobs import iniciar_workers as iniciar_workers_ia, parar_workers as parar_workers_ia
+from services.email_service import fechar_http_client as fechar_cliente_email
+from services.contador_queries import contar_queries, resumir_sql
+from services.paginacao import HEADER_PROXIMO_CURSOR
+from services.metricas import (
+    HISTOGRAMA_QUERIES,
+    HISTOGRAMA_TEMPO_DB,
+    HISTOGRAMA_LATENCIA_HTTP,
+    MEDIDOR_EM_ANDAMENTO,
+    exportar_prometheus,
+)
 
 settings = get_settings()
 
-Base.metadata.create_all(bind=engine)
-run_migrations()
+# Antes de qualquer log: JSON, fila com thread de escrita, request_id
+configurar_logs()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup/shutdown do worker:
+    - confere o schema (só leitura: as migrações rodam no deploy, via
+      python -m scripts.migrar — ou aqui, se MIGRAR_NO_STARTUP=true);
+      com migração pendente o worker NÃO sobe: queries e workers da fila
+      contra um schema velho falhariam em cada requisição
+    - sobe os workers da fila de IA (jobs_ia)
+    - ao desligar, para os workers e fecha os pools HTTP compartilhados
+      e o pool do engine assíncrono; esvazia a fila de logs
+    """
+    if settings.MIGRAR_NO_STARTUP:
+        aplicar_migracoes()
+    else:
+        pendentes = migracoes_pendentes()
+        if pendentes:
+            versoes = ", ".join(f"{m.versao:03d}" for m in pendentes)
+            logger.error("Migrações pendentes (%s) — rode: python -m scripts.migrar", versoes)
+            raise RuntimeError(f"Migrações pendentes ({versoes}): rode python -m scripts.migrar antes de subir a API")
+
+    iniciar_workers_ia()
+    yield
+    await parar_workers_ia()
+    await fechar_cliente_ia()
+    await fechar_cliente_email()
+    await async_engine.dispose()
+    encerrar_logs()
+
 
 app = FastAPI(
     title=settings.API_TITLE,
     version=settings.API_VERSION,
     description=settings.API_DESCRIPTION,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # orjson em todas as respostas JSON (respostas.py)
+    default_response_class=RespostaJSON,
 )
 
 app.add_middleware(
@@ -50,8 +109,85 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lido pelo frontend nas listagens paginadas (services/paginacao.py)
+    expose_headers=[HEADER_PROXIMO_CURSOR],
 )
 
+# Streams SSE nunca passam pelo GZip: Starlette anterior à exclusão de
+# text/event-stream comprime o stream e segura os eventos no buffer do zlib
+ROTAS_SEM_GZIP = {"/api/v1/chat/consultor/stream"}
+
+
+class GZipExcetoStreams(GZipMiddleware):
+    """GZipMiddleware que deixa passar sem compressão as rotas de ROTAS_SEM_GZIP."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in ROTAS_SEM_GZIP:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Corpos a partir de GZIP_MINIMO_BYTES saem comprimidos (dashboard, histórico)
+app.add_middleware(GZipExcetoStreams, minimum_size=settings.GZIP_MINIMO_BYTES)
+
+
+@app.middleware("http")
+async def medir_requisicao(request: Request, call_next):
+    """
+    Métricas por requisição (services/metricas.py, expostas em /metrics):
+    - latência por template de rota e requisições em andamento
+    - queries e tempo de banco (services/contador_queries.py); avisa no log
+      quando o mesmo SQL se repete demais (suspeita de N+1)
+    - com DEBUG=true, devolve X-DB-Queries / X-DB-Tempo-Ms na resposta
+    """
+    inicio = time.perf_counter()
+    MEDIDOR_EM_ANDAMENTO.somar(1)
+    status = "500"
+    try:
+        with contar_queries() as estatisticas:
+            response = await call_next(request)
+        status = str(response.status_code)
+    finally:
+        MEDIDOR_EM_ANDAMENTO.somar(-1)
+        # Template da rota (/api/v1/dashboard/{analise_id}), não o path com IDs
+        rota = getattr(request.scope.get("route"), "path", "desconhecida")
+        HISTOGRAMA_LATENCIA_HTTP.observar(
+            time.perf_counter() - inicio, metodo=request.method, rota=rota, status=status
+        )
+
+    HISTOGRAMA_QUERIES.observar(estatisticas.queries, metodo=request.method, rota=rota)
+    HISTOGRAMA_TEMPO_DB.observar(estatisticas.tempo_segundos, metodo=request.method, rota=rota)
+
+    for sql, repeticoes in estatisticas.suspeitas_n_mais_1():
+        logger.warning(
+            "Possível N+1 em %s %s: %dx %s", request.method, rota, repeticoes, resumir_sql(sql),
+            extra={"rota": rota, "repeticoes": repeticoes},
+        )
+
+    if settings.DEBUG:
+        response.headers["X-DB-Queries"] = str(estatisticas.queries)
+        response.headers["X-DB-Tempo-Ms"] = f"{estatisticas.tempo_segundos * 1000:.1f}"
+    return response
+
+
+@app.middleware("http")
+async def correlacionar_requisicao(request: Request, call_next):
+    """
+    request_id da requisição (X-Request-ID do proxy ou gerado aqui) em todos
+    os logs feitos durante ela (logs.py) e devolvido no header da resposta.
+    Registrado por último = middleware mais externo: cobre também os outros.
+    """
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_atual.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_atual.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
 # Routers Free (não alterados)
 app.include_router(analise_router)
 app.include_router(dashboard_router)
@@ -68,6 +204,7 @@ app.include_router(stripe_pro_router)
 # Fase 2 Pro
 app.include_router(historico_router)
 app.include_router(progresso_router)
+app.include_router(painel_pro_router)
 
 # Fase 5 Pro
 app.include_router(chat_router)
@@ -88,4 +225,21 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(authorization: str = Header(None)):
+    """
+    Métricas no formato texto do Prometheus (deste worker).
+    Com METRICS_TOKEN configurado, exige Authorization: Bearer <token>.
+    Sem token, só responde com DEBUG=true (dev local); em produção é 404.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            raise HTTPException(status_code=404, detail="Not Found")
+    elif not secrets.compare_digest(
+        (authorization or "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+    ):
+        raise HTTPException(status_code=401, detail="Não autorizado")
+    return PlainTextResponse(exportar_prometheus(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
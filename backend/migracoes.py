@@ -0,0 +1,248 @@
+"""
+Migrações versionadas do banco
+
+Antes, cada worker rodava create_all + a lista inteira de ALTER TABLE no
+import do main.py (capturando "already exists"), o que atrasava o boot e
+pegava lock em analises a cada deploy. Agora:
+
+- cada migração tem um número; as aplicadas ficam na tabela schema_versao
+- só as pendentes rodam, uma vez, cada uma na sua transação
+- no PostgreSQL um advisory lock impede dois processos migrando ao mesmo tempo
+- quem roda é o deploy, explicitamente:
+
+    cd backend && python -m scripts.migrar
+
+O startup dos workers não faz DDL (ver main.py / MIGRAR_NO_STARTUP).
+Para alterar o schema: acrescentar uma função no fim de MIGRACOES, nunca
+editar uma já aplicada.
+"""
+
+import logging
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database import engine, Base
+
+logger = logging.getLogger(__name__)
+
+# Chave arbitrária (bigint) do pg_advisory_lock — única por aplicação
+CHAVE_ADVISORY_LOCK = 7_140_221_001
+
+# Fora do Base: create_all das migrações não deve mexer nela
+schema_versao = Table(
+    "schema_versao",
+    MetaData(),
+    Column("versao", Integer, primary_key=True),
+    Column("descricao", String(200), nullable=False),
+    Column("aplicada_em", DateTime, nullable=False),
+)
+
+
+class Migracao(NamedTuple):
+    versao: int
+    descricao: str
+    aplicar: Callable[[Connection], None]
+    # False para DDL que não roda dentro de transação (CREATE INDEX CONCURRENTLY)
+    transacional: bool = True
+
+
+# ========== MIGRAÇÕES ==========
+
+def _m001_tabelas(conn: Connection) -> None:
+    """Tabelas de todos os models (create_all só cria as que faltam)."""
+    import models  # noqa: F401 — registra todas as tabelas no Base
+    Base.metadata.create_all(bind=conn)
+
+
+def _m002_colunas_analises(conn: Connection) -> None:
+    """Colunas acrescentadas em analises depois da criação da tabela em produção."""
+    colunas = [
+        # Fase 1 — Stripe/paywall
+        ("analises", "stripe_session_id", "VARCHAR(200)"),
+        ("analises", "pago",              "BOOLEAN DEFAULT FALSE"),
+        ("analises", "pago_em",           "TIMESTAMP"),
+
+        # Fase 2 — vínculo análise → usuário
+        ("analises", "usuario_id",        "VARCHAR(36)"),
+    ]
+
+    inspetor = inspect(conn)
+    existentes = {}
+    for table, column, col_type in colunas:
+        if table not in existentes:
+            existentes[table] = {c["name"] for c in inspetor.get_columns(table)}
+        if column in existentes[table]:
+            continue
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
+        logger.info("Coluna %s adicionada em %s", column, table)
+
+
+# Nome → definição (coluna(s) + WHERE opcional). SQL válido em PostgreSQL e SQLite.
+INDICES_ANALISES = [
+    ("idx_analise_email_created",             "analises (email, created_at DESC)"),
+    ("idx_analise_usuario_created",           "analises (usuario_id, created_at DESC)"),
+    ("idx_analise_usuario_arquivada_created", "analises (usuario_id, arquivada, created_at DESC)"),
+    ("idx_analise_30d_pendente",              "analises (created_at) WHERE email_30d_enviado_em IS NULL"),
+]
+
+
+def _m003_indices_analises(conn: Connection) -> None:
+    """
+    Índices compostos dos caminhos quentes (os mesmos do __table_args__ de
+    Analise, que o create_all só cria em tabela nova). No PostgreSQL usa
+    CONCURRENTLY para não travar escrita em analises durante o build.
+    """
+    concorrente = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    for nome, definicao in INDICES_ANALISES:
+        conn.execute(text(f"CREATE INDEX {concorrente}IF NOT EXISTS {nome} ON {definicao}"))
+        logger.info("Índice %s verificado/criado", nome)
+
+
+def _m004_resumos_analises(conn: Connection) -> None:
+    """Preenche resumo_analises_usuario/email a partir das análises existentes."""
+    from services.resumo_analises import reconstruir_resumos
+
+    # A sessão entra na transação da conexão: o commit é o do runner
+    with Session(bind=conn) as db:
+        totais = reconstruir_resumos(db)
+        db.flush()
+    logger.info("Resumos: %d usuários, %d e-mails", totais["usuarios"], totais["emails"])
+
+
+def _m005_versao_motor(conn: Connection) -> None:
+    """
+    Versão do motor de cálculo em cada análise. As existentes ficam NULL
+    (versão desconhecida) e são recalculadas na leitura ou pelo backfill.
+    """
+    if "versao_motor" in {c["name"] for c in inspect(conn).get_columns("analises")}:
+        return
+    conn.execute(text("ALTER TABLE analises ADD COLUMN versao_motor INTEGER"))
+    logger.info("Coluna versao_motor adicionada em analises")
+
+
+# Keyset (created_at, id) das listagens (services/paginacao.py): com o id no
+# índice, cada página começa direto no ponto do cursor
+INDICES_KEYSET = [
+    ("idx_analise_email_created_id",             "analises (email, created_at DESC, id DESC)"),
+    ("idx_analise_usuario_arquivada_created_id", "analises (usuario_id, arquivada, created_at DESC, id DESC)"),
+    ("idx_pre_abertura_email_created_id",        "analises_pre_abertura (email, created_at DESC, id DESC)"),
+]
+
+# Prefixos dos de cima: deixam de ser usados e só custariam escrita
+INDICES_SUBSTITUIDOS = ["idx_analise_email_created", "idx_analise_usuario_arquivada_created"]
+
+
+def _m006_indices_keyset(conn: Connection) -> None:
+    """Índices da paginação por cursor; remove os que ficaram redundantes."""
+    concorrente = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    for nome, definicao in INDICES_KEYSET:
+        conn.execute(text(f"CREATE INDEX {concorrente}IF NOT EXISTS {nome} ON {definicao}"))
+        logger.info("Índice %s verificado/criado", nome)
+    for nome in INDICES_SUBSTITUIDOS:
+        conn.execute(text(f"DROP INDEX {concorrente}IF EXISTS {nome}"))
+        logger.info("Índice %s removido", nome)
+
+
+# Listagens por cursor (created_at, id): linha antiga com created_at NULL
+# não entra no keyset (tuple < cursor nunca é verdadeiro) nem gera cursor
+TABELAS_KEYSET = ["analises", "analises_pre_abertura"]
+
+
+def _m007_created_at_nulo(conn: Connection) -> None:
+    """Preenche created_at NULL com updated_at (ou agora) nas tabelas paginadas por cursor."""
+    for tabela in TABELAS_KEYSET:
+        resultado = conn.execute(
+            text(f"UPDATE {tabela} SET created_at = COALESCE(updated_at, :agora) WHERE created_at IS NULL"),
+            {"agora": datetime.utcnow()},
+        )
+        if resultado.rowcount:
+            logger.info("created_at preenchido em %d linha(s) de %s", resultado.rowcount, tabela)
+
+
+def _m008_indice_cache_ia(conn: Connection) -> None:
+    """Índice de expira_em: limpeza das entradas vencidas do cache_ia sem varrer a tabela."""
+    concorrente = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    conn.execute(text(f"CREATE INDEX {concorrente}IF NOT EXISTS idx_cache_ia_expira_em ON cache_ia (expira_em)"))
+    logger.info("Índice idx_cache_ia_expira_em verificado/criado")
+
+
+MIGRACOES = [
+    Migracao(1, "tabelas dos models", _m001_tabelas),
+    Migracao(2, "colunas de analises (Stripe, vínculo Pro)", _m002_colunas_analises),
+    Migracao(3, "índices compostos de analises", _m003_indices_analises, transacional=False),
+    Migracao(4, "preenche tabelas de resumo de análises", _m004_resumos_analises),
+    Migracao(5, "versão do motor de cálculo em analises", _m005_versao_motor),
+    Migracao(6, "índices da paginação por cursor", _m006_indices_keyset, transacional=False),
+    Migracao(7, "created_at NULL nas tabelas paginadas por cursor", _m007_created_at_nulo),
+    Migracao(8, "índice de expiração do cache_ia", _m008_indice_cache_ia, transacional=False),
+]
+
+
+# ========== RUNNER ==========
+
+def versoes_aplicadas(conn: Connection) -> set[int]:
+    if not inspect(conn).has_table(schema_versao.name):
+        return set()
+    return set(conn.execute(select(schema_versao.c.versao)).scalars())
+
+
+def migracoes_pendentes() -> list[Migracao]:
+    """Consulta (sem DDL) quais migrações ainda não foram aplicadas."""
+    with engine.connect() as conn:
+        aplicadas = versoes_aplicadas(conn)
+    return [m for m in MIGRACOES if m.versao not in aplicadas]
+
+
+def _aplicar(migracao: Migracao) -> None:
+    registro = schema_versao.insert().values(
+        versao=migracao.versao,
+        descricao=migracao.descricao,
+        aplicada_em=datetime.utcnow(),
+    )
+    if migracao.transacional:
+        # DDL + registro da versão no mesmo commit
+        with engine.begin() as conn:
+            migracao.aplicar(conn)
+            conn.execute(registro)
+    else:
+        # Precisa ser idempotente: se cair antes do registro, roda de novo
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            migracao.aplicar(conn)
+            conn.execute(registro)
+
+
+def aplicar_migracoes() -> list[int]:
+    """
+    Aplica as migrações pendentes em ordem e devolve as versões aplicadas.
+    No PostgreSQL, segura um advisory lock durante toda a execução — um
+    segundo processo espera o primeiro terminar e depois não encontra
+    nada pendente.
+    """
+    aplicadas_agora = []
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as trava:
+        postgres = trava.dialect.name == "postgresql"
+        if postgres:
+            trava.execute(text("SELECT pg_advisory_lock(:chave)"), {"chave": CHAVE_ADVISORY_LOCK})
+        try:
+            schema_versao.create(trava, checkfirst=True)
+            # Relido depois do lock: outro processo pode ter acabado de migrar
+            aplicadas = versoes_aplicadas(trava)
+
+            for migracao in MIGRACOES:
+                if migracao.versao in aplicadas:
+                    continue
+                logger.info("Aplicando migração %03d — %s", migracao.versao, migracao.descricao)
+                _aplicar(migracao)
+                aplicadas_agora.append(migracao.versao)
+        finally:
+            if postgres:
+                trava.execute(text("SELECT pg_advisory_unlock(:chave)"), {"chave": CHAVE_ADVISORY_LOCK})
+
+    if not aplicadas_agora:
+        logger.info("Banco já está na versão mais recente")
+    return aplicadas_agora
@@ -7,5 +7,8 @@ from models.pre_abertura import AnalisePreAbertura
 from models.sessao import SessaoAnalise
 from models.usuario import Usuario
 from models.plano_acao_progresso import PlanoAcaoProgresso  # NOVO — Fase 2
+from models.job_ia import JobIA
+from models.cache_ia import CacheIA
+from models.resumo_analises import ResumoAnalisesUsuario, ResumoAnalisesEmail
 
-__all__ = ["Analise", "AnalisePreAbertura", "SessaoAnalise", "Usuario", "PlanoAcaoProgresso"]
\ No newline at end of file
+__all__ = ["Analise", "AnalisePreAbertura", "SessaoAnalise", "Usuario", "PlanoAcaoProgresso", "JobIA", "CacheIA", "ResumoAnalisesUsuario", "ResumoAnalisesEmail"]
\ No newline at end of file
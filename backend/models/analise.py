@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Integer, Numeric, Boolean,
-    DateTime, JSON, ForeignKey, TypeDecorator, CHAR, Text
+    DateTime, JSON, ForeignKey, TypeDecorator, CHAR, Text, Index, text
 )
 from sqlalchemy.orm import relationship
 from database import Base
@@ -119,6 +119,7 @@ class Analise(Base):
 
     # ========== SCORE E DIAGNÓSTICO ==========
     score_saude = Column(Numeric(5, 2), nullable=True)
+    versao_motor = Column(Integer, nullable=True)  # VERSAO_MOTOR que calculou; NULL = antes do versionamento
     pontos_fortes = Column(JSON, default=list)
     pontos_atencao = Column(JSON, default=list)
     plano_30_dias = Column(JSON, default=list)
@@ -150,5 +151,27 @@ class Analise(Base):
     # ========== RELACIONAMENTOS ==========
     progresso_plano = relationship("PlanoAcaoProgresso", back_populates="analise", cascade="all, delete-orphan")
 
+    # ========== ÍNDICES COMPOSTOS (caminhos quentes) ==========
+    # Filtro + ORDER BY created_at DESC resolvidos só pelo índice, sem sort.
+    # Bancos já existentes recebem os mesmos índices em migracoes.py (migrações 003 e 006).
+    __table_args__ = (
+        # get_dashboard / histórico do dashboard / listar_por_email (por e-mail;
+        # o id desempata o cursor da paginação — migração 006)
+        Index('idx_analise_email_created_id', 'email', text('created_at DESC'), text('id DESC')),
+        # buscar_comparativo, score anterior, recálculo do resumo (por usuário)
+        Index('idx_analise_usuario_created', 'usuario_id', text('created_at DESC')),
+        # listar_historico (usuário + não arquivadas, paginado por cursor)
+        Index(
+            'idx_analise_usuario_arquivada_created_id',
+            'usuario_id', 'arquivada', text('created_at DESC'), text('id DESC'),
+        ),
+        # processar_reengajamento_30_dias: só as que ainda não receberam o e-mail
+        Index(
+            'idx_analise_30d_pendente', 'created_at',
+            postgresql_where=text('email_30d_enviado_em IS NULL'),
+            sqlite_where=text('email_30d_enviado_em IS NULL'),
+        ),
+    )
+
     def __repr__(self):
         return f"<Analise {self.nome_empresa} - {self.mes_referencia}/{self.ano_referencia}>"
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Modelo da tabela 'cache_ia' - camada persistente do cache de textos de IA
+Fase 5 — evita chamar a Claude de novo para prompts idênticos
+
+A chave é o SHA-256 da forma canônica do prompt (modelo, system,
+mensagens, max_tokens). Sobrevive a restart e é compartilhada entre
+os workers — a camada em memória fica na frente (services/ia_cache.py).
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from database import Base
+
+
+class CacheIA(Base):
+    """
+    Texto gerado pela IA, endereçado pelo conteúdo do prompt.
+    """
+
+    __tablename__ = "cache_ia"
+
+    # ========== IDENTIFICAÇÃO ==========
+    chave = Column(String(64), primary_key=True)  # sha256 hex do prompt canônico
+    funcao = Column(String(50), nullable=False)   # resumo_executivo, comparativo_setorial...
+
+    # ========== CONTEÚDO ==========
+    texto = Column(Text, nullable=False)
+
+    # ========== CONTROLE ==========
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expira_em = Column(DateTime, nullable=False)
+
+    # Limpeza das expiradas a cada gravação (ia_cache._gravar_no_banco) — migração 008
+    __table_args__ = (
+        Index('idx_cache_ia_expira_em', 'expira_em'),
+    )
+
+    def __repr__(self):
+        return f"<CacheIA {self.funcao} {self.chave[:12]}>"
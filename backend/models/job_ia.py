@@ -0,0 +1,56 @@
+"""
+Modelo da tabela 'jobs_ia' - fila persistente de geração de conteúdo via IA
+Fase 5 — resumo_executivo e comparativo_setorial saem do request de criação
+
+Cada análise Pro gera UM job (analise_id é único = deduplicação).
+O worker em background (services/ia_jobs.py) consome os jobs pendentes.
+
+Status possíveis:
+- pendente: aguardando worker (ou aguardando nova tentativa)
+- processando: reservado por um worker
+- concluido: textos gerados e salvos na análise
+- falhou: esgotou as tentativas — dashboard usa o fallback do frontend
+"""
+
+import uuid
+from datetime import datetime
+from sqlalchemy import (
+    Column, String, Integer, DateTime, Text, ForeignKey, Index
+)
+from database import Base
+from models.analise import GUID
+
+
+class JobIA(Base):
+    """
+    Fila de geração de IA por análise.
+    Sobrevive a restart do servidor — o worker retoma os pendentes.
+    """
+
+    __tablename__ = "jobs_ia"
+
+    # ========== IDENTIFICAÇÃO ==========
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+
+    # unique=True — uma análise nunca tem dois jobs (deduplicação)
+    analise_id = Column(GUID(), ForeignKey("analises.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    # ========== CONTROLE DA FILA ==========
+    status = Column(String(20), nullable=False, default="pendente")
+    tentativas = Column(Integer, nullable=False, default=0)
+    max_tentativas = Column(Integer, nullable=False, default=3)
+    proxima_tentativa_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    erro = Column(Text, nullable=True)
+
+    # ========== METADADOS ==========
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    concluido_em = Column(DateTime, nullable=True)
+
+    # Índice composto para o worker buscar o próximo job pronto
+    __table_args__ = (
+        Index('idx_job_ia_status_proxima', 'status', 'proxima_tentativa_em'),
+    )
+
+    def __repr__(self):
+        return f"<JobIA analise={self.analise_id} status={self.status} tentativas={self.tentativas}>"
@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy import (
     Column, String, Integer, Numeric, Boolean,
-    DateTime, JSON, TypeDecorator, CHAR
+    DateTime, JSON, TypeDecorator, CHAR, Index, text
 )
 from database import Base
 
@@ -122,5 +122,10 @@ class AnalisePreAbertura(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # listar_por_email paginado por cursor (created_at, id) — migração 006
+    __table_args__ = (
+        Index('idx_pre_abertura_email_created_id', 'email', text('created_at DESC'), text('id DESC')),
+    )
+    
     def __repr__(self):
         return f"<AnalisePreAbertura {self.setor} - {self.mes_abertura}/{self.ano_abertura}>"
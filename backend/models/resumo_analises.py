@@ -0,0 +1,63 @@
+"""
+Modelos das tabelas de resumo de análises (uma linha por usuário / por e-mail)
+
+Guardam o que várias telas e crons recalculavam com ORDER BY created_at:
+primeira análise, última, penúltima (score anterior) e contagens.
+Mantidas pelo services/resumo_analises.py na mesma transação que altera
+a análise — leitura vira busca por chave primária.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, Numeric
+
+from database import Base
+from models.analise import GUID
+
+
+class _ResumoAnalisesMixin:
+    """Colunas comuns aos resumos por usuário e por e-mail."""
+
+    # ========== PRIMEIRA ANÁLISE (aniversário mensal) ==========
+    primeira_analise_id = Column(GUID(), nullable=True)
+    primeira_analise_em = Column(DateTime, nullable=True)
+
+    # ========== ÚLTIMA ANÁLISE ==========
+    ultima_analise_id = Column(GUID(), nullable=True)
+    ultima_analise_em = Column(DateTime, nullable=True)
+    ultimo_score = Column(Numeric(5, 2), nullable=True)
+    ultimo_folego_caixa = Column(Integer, nullable=True)
+    ultimo_mes_referencia = Column(Integer, nullable=True)
+    ultimo_ano_referencia = Column(Integer, nullable=True)
+
+    # ========== PENÚLTIMA ANÁLISE (score anterior / comparativo) ==========
+    penultima_analise_id = Column(GUID(), nullable=True)
+    penultimo_score = Column(Numeric(5, 2), nullable=True)
+
+    # ========== CONTAGENS ==========
+    total_analises = Column(Integer, nullable=False, default=0)
+    total_arquivadas = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ResumoAnalisesUsuario(_ResumoAnalisesMixin, Base):
+    """Resumo das análises vinculadas a um usuário Pro."""
+
+    __tablename__ = "resumo_analises_usuario"
+
+    # Mesmo formato de analises.usuario_id (String(36))
+    usuario_id = Column(String(36), primary_key=True)
+
+    def __repr__(self):
+        return f"<ResumoAnalisesUsuario {self.usuario_id} ({self.total_analises})>"
+
+
+class ResumoAnalisesEmail(_ResumoAnalisesMixin, Base):
+    """Resumo das análises feitas com um e-mail (Free e Pro)."""
+
+    __tablename__ = "resumo_analises_email"
+
+    email = Column(String(100), primary_key=True)
+
+    def __repr__(self):
+        return f"<ResumoAnalisesEmail {self.email} ({self.total_analises})>"
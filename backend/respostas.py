@@ -0,0 +1,58 @@
+"""
+Serialização JSON rápida (orjson) das respostas da API
+
+RespostaJSON é a default_response_class do app (main.py): tudo que sai como
+JSON é escrito pelo orjson, não pelo json da stdlib.
+
+Rotas sem response_model (dashboard, histórico) ainda passariam pelo
+jsonable_encoder do FastAPI, que percorre o payload inteiro recursivamente
+antes de serializar. Para os payloads grandes, devolver direto:
+
+    return resposta_json(montar_payload_dashboard(...), response)
+
+e o dict vai do endpoint ao orjson sem a passada extra. Os tipos que saem
+dos models (Decimal das colunas Numeric, UUID do GUID, datetime) são
+convertidos como o jsonable_encoder fazia — o JSON gerado é o mesmo.
+"""
+
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPCOES = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _converter(valor: Any) -> Any:
+    """Tipos que o orjson não conhece (chamado só para eles)."""
+    if isinstance(valor, Decimal):
+        # Mesma regra do decimal_encoder do FastAPI: inteiro se não tem casas
+        return int(valor) if valor.as_tuple().exponent >= 0 else float(valor)
+    if isinstance(valor, BaseModel):
+        return valor.model_dump(mode="json")
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+
+class RespostaJSON(JSONResponse):
+    """JSONResponse escrita pelo orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_converter, option=_OPCOES)
+
+
+def resposta_json(conteudo: Any, response: Optional[Response] = None, status_code: int = 200) -> RespostaJSON:
+    """
+    Resposta pronta (pula o jsonable_encoder). `response` é o parâmetro
+    Response injetado no endpoint: os headers que já foram colocados nele
+    (ETag, Cache-Control...) vêm junto — o FastAPI só os copia quando é ele
+    quem monta a resposta.
+    """
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return RespostaJSON(conteudo, status_code=status_code, headers=headers)
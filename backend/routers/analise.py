@@ -2,24 +2,45 @@
 Endpoints da API de Análise Financeira
 """
 
+import logging
+from datetime import datetime, timezone
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from config import get_settings
+from database import get_db, get_async_db
 from models.analise import Analise
+from models.usuario import Usuario
 from schemas.analise import (
     DadosAnaliseInput,
+    AnaliseLoteInput,
+    AnaliseLoteResponse,
     AnaliseResponse,
     AnaliseResumo,
     IndicadoresCalculados,
     DiagnosticoPlano,
+    ItemLoteResultado,
     ValidacaoResponse
 )
-from services.indicadores import calcular_indicadores
+from services.indicadores import VERSAO_MOTOR, calcular_indicadores
+from services.indicadores_lote import LoteIndicadores, calcular_indicadores_lote
+from services.cache_http import CACHE_REVALIDAR, gerar_etag, responder_condicional
 from services.diagnostico import gerar_diagnostico
-from services.email_service import enviar_email_pos_conclusao, enviar_email_pos_analise_pro
-from services.ia_service import gerar_resumo_executivo, gerar_comparativo_setorial
+from services.paginacao import Pagina, aplicar_keyset, cortar_pagina, parametros_paginacao
+from services.email_service import (
+    enviar_email_pos_conclusao,
+    enviar_emails_em_lote,
+    montar_email_pos_conclusao,
+)
+from services.ia_jobs import enfileirar_geracao_ia, enfileirar_geracao_ia_lote, notificar_novo_job, buscar_status_job
+from services.resumo_analises import registrar_nova_analise, registrar_novas_analises
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter(
     prefix="/api/v1/analise",
@@ -27,35 +48,16 @@ router = APIRouter(
 )
 
 
-@router.post("/nova", response_model=AnaliseResponse, status_code=status.HTTP_201_CREATED)
-async def criar_analise(
-    dados: DadosAnaliseInput,
-    request: Request,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """
-    Cria uma nova análise financeira.
-    Se o usuário estiver logado como Pro, vincula automaticamente
-    e dispara geração de conteúdo via IA (resumo executivo).
-    """
-
-    # 1. Calcular indicadores
-    indicadores = calcular_indicadores(dados)
+# ========== HELPERS ==========
 
-    # 2. Gerar diagnóstico e plano de ação
-    diagnostico = gerar_diagnostico(dados, indicadores)
-
-    # 3. Detectar usuario_id (Pro logado) — lido do body, validado no banco
-    usuario_id = dados.usuario_id or None
-    if usuario_id:
-        from models.usuario import Usuario
-        usuario_obj = db.query(Usuario).filter(Usuario.id == usuario_id).first()
-        if not usuario_obj or not usuario_obj.pro_ativo:
-            usuario_id = None
-
-    # 4. Criar registro no banco
-    analise = Analise(
+def _nova_analise(
+    dados: DadosAnaliseInput,
+    indicadores: IndicadoresCalculados,
+    diagnostico: dict,
+    usuario_id: str | None,
+) -> Analise:
+    """Registro de Analise a partir do formulário + cálculos (sem adicionar na sessão)."""
+    return Analise(
         # Identificação
         nome_empresa=dados.nome_empresa,
         email=dados.email,
@@ -116,6 +118,7 @@ async def criar_analise(
 
         # Score
         score_saude=indicadores.score_saude,
+        versao_motor=VERSAO_MOTOR,
 
         # Diagnóstico e Plano de Ação
         pontos_fortes=diagnostico["pontos_fortes"],
@@ -131,103 +134,8 @@ async def criar_analise(
         ref_parceiro=dados.ref_parceiro,
     )
 
-    db.add(analise)
-    db.commit()
-    db.refresh(analise)
-
-    # 5. Gerar conteúdo via IA — apenas para usuários Pro
-    # Free não dispara nenhuma chamada à Claude API
-    if usuario_id:
-        # Montar dict de indicadores para os prompts
-        indicadores_dict = {
-            "margem_bruta": float(indicadores.margem_bruta) if indicadores.margem_bruta is not None else None,
-            "resultado_mes": float(indicadores.resultado_mes) if indicadores.resultado_mes is not None else None,
-            "folego_caixa": indicadores.folego_caixa,
-            "ciclo_financeiro": indicadores.ciclo_financeiro,
-            "peso_divida": float(indicadores.peso_divida) if indicadores.peso_divida is not None else None,
-            "receita_funcionario": float(indicadores.receita_funcionario) if indicadores.receita_funcionario is not None else None,
-        }
-
-        # Prioridade do mês = primeiro item do plano de 30 dias
-        plano_prioridade = ""
-        if diagnostico["plano_30_dias"]:
-            primeiro = diagnostico["plano_30_dias"][0]
-            if isinstance(primeiro, dict):
-                plano_prioridade = primeiro.get("titulo", "") or primeiro.get("acao", "")
-            else:
-                plano_prioridade = str(primeiro)
-
-        # 5a. Resumo executivo — buscar score anterior se houver análises passadas
-        try:
-            from sqlalchemy import desc
-
-            score_anterior = None
-            analise_anterior = (
-                db.query(Analise)
-                .filter(
-                    Analise.usuario_id == usuario_id,
-                    Analise.id != analise.id
-                )
-                .order_by(desc(Analise.created_at))
-                .first()
-            )
-            if analise_anterior and analise_anterior.score_saude is not None:
-                score_anterior = int(analise_anterior.score_saude)
-
-            resumo = await gerar_resumo_executivo(
-                score=int(indicadores.score_saude),
-                indicadores=indicadores_dict,
-                pontos_atencao=[
-                    p.get("titulo", "") if isinstance(p, dict) else str(p)
-                    for p in diagnostico["pontos_atencao"]
-                ],
-                plano_prioridade=plano_prioridade,
-                setor=dados.setor.value,
-                score_anterior=score_anterior,
-            )
-            analise.resumo_executivo = resumo
-
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).error("Erro ao gerar resumo executivo: %s", e)
-
-        # Salvar resumo_executivo no banco
-        db.commit()
-        db.refresh(analise)
-
-        # Atualizar ultima_analise_em no usuário
-        from models.usuario import Usuario as UsuarioModel
-        usuario_obj = db.query(UsuarioModel).filter(UsuarioModel.id == usuario_id).first()
-        if usuario_obj:
-            from datetime import datetime, timezone
-            usuario_obj.ultima_analise_em = datetime.now(timezone.utc)
-            db.commit()
-
-        # 5b. Disparar e-mail pós-análise Pro em background
-        if analise.resumo_executivo:
-            from models.usuario import Usuario as UsuarioModel
-            usuario_obj = db.query(UsuarioModel).filter(UsuarioModel.id == usuario_id).first()
-            if usuario_obj:
-                background_tasks.add_task(
-                    enviar_email_pos_analise_pro,
-                    nome_empresa=analise.nome_empresa,
-                    email=analise.email,
-                    score=int(analise.score_saude),
-                    mes_referencia=analise.mes_referencia,
-                    ano_referencia=analise.ano_referencia,
-                    resumo_executivo=analise.resumo_executivo,
-                    analise_id=str(analise.id),
-                )
-
-    # 6. Disparar e-mail pós-conclusão em background
-    background_tasks.add_task(
-        enviar_email_pos_conclusao,
-        nome_empresa=analise.nome_empresa,
-        email=analise.email,
-        analise_id=str(analise.id)
-    )
 
-    # 7. Montar resposta
+def _montar_resposta(analise: Analise, indicadores: IndicadoresCalculados) -> AnaliseResponse:
     return AnaliseResponse(
         id=analise.id,
         nome_empresa=analise.nome_empresa,
@@ -250,12 +158,212 @@ async def criar_analise(
     )
 
 
+@router.post("/nova", response_model=AnaliseResponse, status_code=status.HTTP_201_CREATED)
+async def criar_analise(
+    dados: DadosAnaliseInput,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cria uma nova análise financeira.
+    Se o usuário estiver logado como Pro, vincula automaticamente
+    e enfileira a geração de conteúdo via IA (resumo executivo e
+    comparativo setorial) — acompanhar por GET /{analise_id}/ia-status.
+    """
+
+    # 1. Calcular indicadores
+    indicadores = calcular_indicadores(dados)
+
+    # 2. Gerar diagnóstico e plano de ação
+    diagnostico = gerar_diagnostico(dados, indicadores)
+
+    # 3. Detectar usuario_id (Pro logado) — lido do body, validado no banco
+    usuario_id = dados.usuario_id or None
+    usuario_obj = None
+    if usuario_id:
+        usuario_obj = (await db.execute(
+            select(Usuario).where(Usuario.id == usuario_id)
+        )).scalars().first()
+        if not usuario_obj or not usuario_obj.pro_ativo:
+            usuario_id = None
+            usuario_obj = None
+
+    # 4. Criar registro no banco
+    analise = _nova_analise(dados, indicadores, diagnostico, usuario_id)
+
+    db.add(analise)
+    await db.flush()  # garante analise.id e created_at para o resumo e o job
+
+    def _registrar(sessao: Session) -> None:
+        # Resumo por usuário/e-mail (primeira, última, penúltima) — mesmo commit
+        registrar_nova_analise(sessao, analise)
+
+        # 5. Conteúdo via IA — apenas para usuários Pro
+        # Free não dispara nenhuma chamada à Claude API.
+        # A geração NÃO acontece aqui: entra na fila (jobs_ia) no mesmo commit
+        # da análise e um worker gera resumo + comparativo depois do 201.
+        if usuario_id:
+            enfileirar_geracao_ia(sessao, analise.id)
+
+    # Os helpers de resumo/fila são síncronos (usados também pelos jobs):
+    # run_sync roda na mesma transação, sem bloquear o event loop no I/O
+    await db.run_sync(_registrar)
+
+    if usuario_id:
+        # Atualizar ultima_analise_em no usuário
+        usuario_obj.ultima_analise_em = datetime.now(timezone.utc)
+
+    # Sem refresh: a sessão assíncrona não expira no commit e todas as
+    # colunas (inclusive id/created_at/defaults) já foram preenchidas no flush
+    await db.commit()
+
+    if usuario_id:
+        notificar_novo_job()
+
+    # 6. Disparar e-mail pós-conclusão em background
+    background_tasks.add_task(
+        enviar_email_pos_conclusao,
+        nome_empresa=analise.nome_empresa,
+        email=analise.email,
+        analise_id=str(analise.id)
+    )
+
+    # 7. Montar resposta
+    return _montar_resposta(analise, indicadores)
+
+
+def _erros_validacao(erro: ValidationError) -> list[str]:
+    """Erros do pydantic como 'campo.subcampo: mensagem'."""
+    return [
+        f"{'.'.join(str(parte) for parte in detalhe['loc']) or 'item'}: {detalhe['msg']}"
+        for detalhe in erro.errors()
+    ]
+
+
+def _normalizar_usuario_id(usuario_id: str | None) -> str | None:
+    """UUID canônico, ou None se ausente/inválido (tratado como Free, igual ao /nova)."""
+    if not usuario_id:
+        return None
+    try:
+        return str(UUID(usuario_id))
+    except ValueError:
+        return None
+
+
+@router.post("/lote", response_model=AnaliseLoteResponse)
+async def criar_analises_lote(
+    lote: AnaliseLoteInput,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cria várias análises de uma vez (contador enviando a carteira de clientes).
+
+    Mesmo resultado de chamar /nova para cada item, mas:
+    - indicadores de todos os itens num passo só (motor em lote)
+    - usuários Pro conferidos numa única query
+    - todas as análises inseridas e commitadas numa transação, com cada
+      resumo (por e-mail e por usuário) atualizado uma vez só
+    - e-mails pós-conclusão enviados em lote pelo Brevo, em background;
+      IA dos itens Pro vai para a fila (jobs_ia) no mesmo commit
+
+    Itens inválidos voltam com sucesso=False e a lista de erros, sem
+    impedir os demais. Limite de itens em ANALISE_LOTE_MAX_ITENS.
+    """
+    if len(lote.itens) > settings.ANALISE_LOTE_MAX_ITENS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {settings.ANALISE_LOTE_MAX_ITENS} empresas por lote"
+        )
+
+    resultados = [ItemLoteResultado(indice=i, sucesso=False) for i in range(len(lote.itens))]
+
+    # 1. Validar cada item separadamente
+    validos: list[tuple[int, DadosAnaliseInput]] = []
+    for i, item in enumerate(lote.itens):
+        try:
+            validos.append((i, DadosAnaliseInput.model_validate(item)))
+        except ValidationError as e:
+            resultados[i].erros = _erros_validacao(e)
+
+    # 2. Indicadores de todos os itens válidos de uma vez
+    lista_indicadores: list[IndicadoresCalculados] = []
+    if validos:
+        lote_indicadores = LoteIndicadores.de_dados([dados for _, dados in validos])
+        lista_indicadores = calcular_indicadores_lote(lote_indicadores).linhas()
+
+    # 3. Usuários Pro citados no lote — uma query só
+    ids_usuarios = {_normalizar_usuario_id(dados.usuario_id) for _, dados in validos} - {None}
+    usuarios_pro: dict[str, Usuario] = {}
+    if ids_usuarios:
+        encontrados = (await db.execute(
+            select(Usuario).where(Usuario.id.in_(ids_usuarios))
+        )).scalars()
+        usuarios_pro = {str(u.id): u for u in encontrados if u.pro_ativo}
+
+    # 4. Diagnóstico e registro de cada item
+    criadas: list[tuple[int, Analise, IndicadoresCalculados]] = []
+    for (i, dados), indicadores in zip(validos, lista_indicadores):
+        try:
+            diagnostico = gerar_diagnostico(dados, indicadores)
+        except Exception:
+            logger.exception("Erro no diagnóstico do item %d do lote", i)
+            resultados[i].erros = ["Erro interno ao gerar o diagnóstico"]
+            continue
+
+        usuario_id = dados.usuario_id if _normalizar_usuario_id(dados.usuario_id) in usuarios_pro else None
+        criadas.append((i, _nova_analise(dados, indicadores, diagnostico, usuario_id), indicadores))
+
+    if criadas:
+        db.add_all([analise for _, analise, _ in criadas])
+        await db.flush()  # um INSERT em lote; preenche id e created_at
+
+        def _registrar(sessao: Session) -> None:
+            # Cada resumo (e-mail/usuário) atualizado uma vez; jobs num add_all só
+            registrar_novas_analises(sessao, [analise for _, analise, _ in criadas])
+            enfileirar_geracao_ia_lote(sessao, [analise.id for _, analise, _ in criadas if analise.usuario_id])
+
+        await db.run_sync(_registrar)
+
+        agora = datetime.now(timezone.utc)
+        for _, analise, _ in criadas:
+            if analise.usuario_id:
+                usuarios_pro[_normalizar_usuario_id(analise.usuario_id)].ultima_analise_em = agora
+
+        await db.commit()
+
+        if any(analise.usuario_id for _, analise, _ in criadas):
+            notificar_novo_job()
+
+        # E-mails pós-conclusão: uma chamada ao Brevo por MAX_VERSOES_POR_LOTE
+        background_tasks.add_task(enviar_emails_em_lote, [
+            montar_email_pos_conclusao(analise.nome_empresa, analise.email, str(analise.id))
+            for _, analise, _ in criadas
+        ])
+
+    for i, analise, indicadores in criadas:
+        resultados[i].sucesso = True
+        resultados[i].analise = _montar_resposta(analise, indicadores)
+
+    logger.info("Lote de análises: %d criadas de %d itens", len(criadas), len(lote.itens))
+
+    return AnaliseLoteResponse(
+        total=len(lote.itens),
+        criadas=len(criadas),
+        com_erro=len(lote.itens) - len(criadas),
+        resultados=resultados,
+    )
+
+
 @router.get("/{analise_id}", response_model=AnaliseResponse)
 def buscar_analise(
     analise_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """Busca uma análise pelo ID."""
+    """Busca uma análise pelo ID. Responde 304 se o cliente já tem a versão atual."""
     analise = db.query(Analise).filter(Analise.id == analise_id).first()
 
     if not analise:
@@ -264,6 +372,15 @@ def buscar_analise(
             detail="Análise não encontrada"
         )
 
+    nao_modificado = responder_condicional(
+        request, response,
+        etag=gerar_etag(analise.id, analise.updated_at),
+        ultima_modificacao=analise.updated_at,
+        cache_control=CACHE_REVALIDAR,
+    )
+    if nao_modificado:
+        return nao_modificado
+
     indicadores = IndicadoresCalculados(
         margem_bruta=float(analise.margem_bruta) if analise.margem_bruta else None,
         resultado_mes=float(analise.resultado_mes) if analise.resultado_mes else None,
@@ -281,39 +398,62 @@ def buscar_analise(
         score_saude=float(analise.score_saude) if analise.score_saude else None
     )
 
-    return AnaliseResponse(
-        id=analise.id,
-        nome_empresa=analise.nome_empresa,
-        email=analise.email,
-        setor=analise.setor,
-        estado=analise.estado,
-        mes_referencia=analise.mes_referencia,
-        ano_referencia=analise.ano_referencia,
-        indicadores=indicadores,
-        diagnostico=DiagnosticoPlano(
-            pontos_fortes=analise.pontos_fortes or [],
-            pontos_atencao=analise.pontos_atencao or [],
-            plano_30_dias=analise.plano_30_dias or [],
-            plano_60_dias=analise.plano_60_dias or [],
-            plano_90_dias=analise.plano_90_dias or []
-        ),
-        alertas_coerencia=analise.alertas_coerencia or [],
-        metodo_entrada=analise.metodo_entrada,
-        created_at=analise.created_at
-    )
+    return _montar_resposta(analise, indicadores)
+
+
+@router.get("/{analise_id}/ia-status")
+def status_ia(
+    analise_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Status da geração de IA de uma análise Pro.
+    O dashboard consulta até sair de 'pendente'/'processando'.
+
+    status: pendente | processando | concluido | falhou | indisponivel (Free/antigas)
+    """
+    analise = db.query(Analise).filter(Analise.id == analise_id).first()
+
+    if not analise:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Análise não encontrada"
+        )
+
+    job = buscar_status_job(db, analise_id)
+
+    return {
+        "analise_id": str(analise.id),
+        "status": job.status if job else "indisponivel",
+        "tentativas": job.tentativas if job else 0,
+        "resumo_executivo": analise.resumo_executivo,
+        "comparativo_setorial": analise.comparativo_setorial,
+    }
 
 
 @router.get("/email/{email}", response_model=list[AnaliseResumo])
 def listar_por_email(
     email: str,
+    response: Response,
+    pagina: Pagina = Depends(parametros_paginacao),
     db: Session = Depends(get_db)
 ):
-    """Lista todas as análises de um email."""
-    analises = db.query(Analise).filter(
-        Analise.email == email
-    ).order_by(
-        Analise.created_at.desc()
-    ).all()
+    """
+    Lista as análises de um email, da mais recente para a mais antiga,
+    paginadas por cursor (header X-Proximo-Cursor) quando vem ?limite=;
+    sem limite nem cursor, todas — como antes. Só as colunas do resumo.
+    """
+    consulta = select(
+        Analise.id,
+        Analise.nome_empresa,
+        Analise.setor,
+        Analise.mes_referencia,
+        Analise.ano_referencia,
+        Analise.score_saude,
+        Analise.tendencia_status,
+        Analise.created_at,
+    ).where(Analise.email == email)
+    linhas = db.execute(aplicar_keyset(consulta, Analise.created_at, Analise.id, pagina)).all()
 
     return [
         AnaliseResumo(
@@ -326,7 +466,7 @@ def listar_por_email(
             tendencia_status=a.tendencia_status,
             created_at=a.created_at
         )
-        for a in analises
+        for a in cortar_pagina(linhas, pagina, response)
     ]
 
 
@@ -1,24 +1,30 @@
 """
 Endpoint do ChatConsultor — Fase 5
 POST /api/v1/chat/consultor
+POST /api/v1/chat/consultor/stream  (mesma lógica, resposta via Server-Sent Events)
 
 Requer autenticação Pro.
 O histórico completo da conversa é enviado pelo frontend a cada mensagem
 — o backend não armazena histórico de chat.
 """
 
+import json
 import logging
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from database import get_db
+from database import get_db, get_async_db
 from models.analise import Analise
 from services.ia_service import (
     montar_system_prompt_chat,
     gerar_mensagem_abertura_chat,
 )
-import anthropic
+from services.ia_client import gerar_texto, transmitir_texto
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +33,6 @@ router = APIRouter(
     tags=["Chat Consultor"]
 )
 
-_client = anthropic.Anthropic()
-MODELO_IA = "claude-sonnet-4-5"
-
 
 # ========== SCHEMAS ==========
 
@@ -62,20 +65,18 @@ def get_usuario_pro(
     return get_usuario_atual
 
 
-# ========== ENDPOINT ==========
+# ========== HELPERS ==========
 
-@router.post("/consultor", response_model=ChatConsultorResponse)
-async def chat_consultor(
-    body: ChatConsultorRequest,
-    db: Session = Depends(get_db),
-):
-    """
-    Endpoint do ChatConsultor Pro.
+# Sem buffer em proxies (nginx/Railway) para o primeiro byte sair na hora
+HEADERS_SSE = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-    - Busca a análise no banco para montar o contexto real
-    - Se historico vazio: gera mensagem de abertura contextualizada
-    - Se historico preenchido: responde à última mensagem do usuário
-    - Requer que a análise pertença a um usuário Pro
+MENSAGEM_INDISPONIVEL = "Serviço de chat temporariamente indisponível. Tente novamente em instantes."
+
+
+async def _carregar_contexto_analise(body: ChatConsultorRequest, db: AsyncSession) -> dict:
+    """
+    Busca a análise no banco, valida que pertence a um usuário Pro
+    e monta o dict usado no system prompt.
     """
 
     # 1. Buscar análise no banco
@@ -88,7 +89,9 @@ async def chat_consultor(
             detail="analise_id inválido"
         )
 
-    analise = db.query(Analise).filter(Analise.id == analise_uuid).first()
+    analise = (await db.execute(
+        select(Analise).where(Analise.id == analise_uuid)
+    )).scalars().first()
 
     if not analise:
         raise HTTPException(
@@ -105,7 +108,7 @@ async def chat_consultor(
         )
 
     # 3. Montar dict da análise para o system prompt
-    analise_dict = {
+    return {
         "score_saude": float(analise.score_saude) if analise.score_saude else 0,
         "setor": analise.setor,
         "folego_caixa": analise.folego_caixa or 0,
@@ -114,22 +117,19 @@ async def chat_consultor(
         "plano_30_dias": analise.plano_30_dias or [],
     }
 
-    # 4. Histórico vazio = primeira abertura → gerar mensagem de abertura
-    if not body.historico:
-        try:
-            abertura = await gerar_mensagem_abertura_chat(analise_dict)
-            return ChatConsultorResponse(resposta=abertura)
-        except Exception as e:
-            logger.error("Erro ao gerar abertura do chat: %s", e)
-            score = int(analise_dict["score_saude"])
-            return ChatConsultorResponse(
-                resposta=f"Olá! Estou aqui para ajudar com a análise financeira da sua empresa (score {score}/100). O que você quer explorar?"
-            )
 
-    # 5. Histórico preenchido → responder à mensagem do usuário
-    system_prompt = montar_system_prompt_chat(analise_dict)
+async def _gerar_abertura(analise_dict: dict) -> str:
+    """Mensagem de abertura do chat, com fallback estático se a IA falhar."""
+    try:
+        return await gerar_mensagem_abertura_chat(analise_dict)
+    except Exception as e:
+        logger.error("Erro ao gerar abertura do chat: %s", e)
+        score = int(analise_dict["score_saude"])
+        return f"Olá! Estou aqui para ajudar com a análise financeira da sua empresa (score {score}/100). O que você quer explorar?"
+
 
-    # Converter histórico para formato da Claude API
+def _montar_mensagens_api(body: ChatConsultorRequest) -> list[dict]:
+    """Converte o histórico + mensagem atual para o formato da Claude API."""
     mensagens_api = [
         {"role": msg.role, "content": msg.content}
         for msg in body.historico
@@ -137,20 +137,134 @@ async def chat_consultor(
 
     # Adicionar a mensagem atual do usuário
     mensagens_api.append({"role": "user", "content": body.mensagem})
+    return mensagens_api
+
+
+def _evento_sse(dados: dict, evento: Optional[str] = None) -> str:
+    """Formata um evento Server-Sent Events. O payload vai em JSON (preserva quebras de linha)."""
+    linha_evento = f"event: {evento}\n" if evento else ""
+    return f"{linha_evento}data: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
+
+class _RespostaStreamClaude(StreamingResponse):
+    """
+    StreamingResponse que sempre fecha o stream da Claude ao terminar.
+
+    O finally de eventos() só roda se o corpo começou a ser iterado: se o
+    cliente cai antes do primeiro envio (ClientDisconnect, cancelamento), o
+    stream ficaria aberto segurando a conexão e o slot do semáforo até o GC.
+    BackgroundTask não resolve — o Starlette pula o background na desconexão.
+    """
+
+    def __init__(self, conteudo, gerador, **kwargs):
+        super().__init__(conteudo, **kwargs)
+        self._gerador = gerador
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Já fechado pelo finally de eventos() → no-op
+            await self._gerador.aclose()
+
+
+# ========== ENDPOINTS ==========
+
+@router.post("/consultor", response_model=ChatConsultorResponse)
+async def chat_consultor(
+    body: ChatConsultorRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Endpoint do ChatConsultor Pro.
+
+    - Busca a análise no banco para montar o contexto real
+    - Se historico vazio: gera mensagem de abertura contextualizada
+    - Se historico preenchido: responde à última mensagem do usuário
+    - Requer que a análise pertença a um usuário Pro
+    """
+    analise_dict = await _carregar_contexto_analise(body, db)
+
+    # Histórico vazio = primeira abertura → gerar mensagem de abertura
+    if not body.historico:
+        return ChatConsultorResponse(resposta=await _gerar_abertura(analise_dict))
+
+    # Histórico preenchido → responder à mensagem do usuário
+    system_prompt = montar_system_prompt_chat(analise_dict)
 
     try:
-        resposta = _client.messages.create(
-            model=MODELO_IA,
+        texto = await gerar_texto(
             max_tokens=600,
             system=system_prompt,
-            messages=mensagens_api,
+            messages=_montar_mensagens_api(body),
         )
-        texto = resposta.content[0].text.strip()
         return ChatConsultorResponse(resposta=texto)
 
     except Exception as e:
         logger.error("Erro na chamada ao ChatConsultor: %s", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Serviço de chat temporariamente indisponível. Tente novamente em instantes."
+            detail=MENSAGEM_INDISPONIVEL
         )
+
+
+@router.post("/consultor/stream")
+async def chat_consultor_stream(
+    body: ChatConsultorRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Versão em streaming (Server-Sent Events) do ChatConsultor.
+
+    Mesmas regras do POST /consultor. A resposta chega em eventos:
+    - data: {"texto": "..."}              → pedaço da resposta (concatenar no frontend)
+    - event: fim   / data: {}             → resposta completa
+    - event: erro  / data: {"detail": ..} → falha no meio do streaming
+
+    Se a Claude falhar antes do primeiro pedaço, responde 503 (igual ao /consultor).
+    """
+    analise_dict = await _carregar_contexto_analise(body, db)
+
+    # Abertura: texto curto (150 tokens) — vai num único evento
+    if not body.historico:
+        abertura = await _gerar_abertura(analise_dict)
+
+        async def eventos_abertura():
+            yield _evento_sse({"texto": abertura})
+            yield _evento_sse({}, evento="fim")
+
+        return StreamingResponse(eventos_abertura(), media_type="text/event-stream", headers=HEADERS_SSE)
+
+    gerador = transmitir_texto(
+        max_tokens=600,
+        system=montar_system_prompt_chat(analise_dict),
+        messages=_montar_mensagens_api(body),
+    )
+
+    # Espera o primeiro pedaço ANTES de abrir a resposta: se a Claude estiver
+    # fora do ar, o frontend recebe o mesmo 503 da versão sem streaming.
+    try:
+        primeiro = await gerador.__anext__()
+    except StopAsyncIteration:
+        primeiro = ""
+    except Exception as e:
+        logger.error("Erro na chamada ao ChatConsultor (stream): %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=MENSAGEM_INDISPONIVEL
+        )
+
+    async def eventos():
+        try:
+            if primeiro:
+                yield _evento_sse({"texto": primeiro})
+            async for pedaco in gerador:
+                yield _evento_sse({"texto": pedaco})
+            yield _evento_sse({}, evento="fim")
+        except Exception as e:
+            logger.error("Erro no meio do streaming do ChatConsultor: %s", e)
+            yield _evento_sse({"detail": MENSAGEM_INDISPONIVEL}, evento="erro")
+        finally:
+            await gerador.aclose()
+
+    return _RespostaStreamClaude(eventos(), gerador, media_type="text/event-stream", headers=HEADERS_SSE)
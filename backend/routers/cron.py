@@ -10,14 +10,18 @@ Configurar no cron-job.org: diariamente às 09:00 horário de Brasília.
 """
 
 import calendar
+import time
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func, extract, cast, String
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from database import get_async_db
 from models.usuario import Usuario
-from models.analise import Analise
-from services.email_service import enviar_email_lembrete_mensal
+from models.resumo_analises import ResumoAnalisesUsuario
+from services.email_service import montar_email_lembrete_mensal
+from services.email_dispatcher import despachar_emails
+from services.metricas import HISTOGRAMA_CRON
 from config import get_settings
 
 settings = get_settings()
@@ -42,9 +46,9 @@ def _verificar_cron_secret(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Não autorizado")
 
 
-def _calcular_dia_alvo(dia_aniversario: int, ano: int, mes: int) -> int:
+def _filtro_dia_aniversario(coluna_primeira_analise, hoje: datetime):
     """
-    Retorna o dia em que o lembrete deve disparar no mês/ano informados.
+    Condição SQL: hoje é o dia-alvo do lembrete para a 1ª análise em `coluna`.
 
     Se a 1ª análise foi no dia 31 e o mês atual só tem 28 dias (ex: fevereiro),
     o lembrete dispara no último dia do mês atual.
@@ -55,8 +59,13 @@ def _calcular_dia_alvo(dia_aniversario: int, ano: int, mes: int) -> int:
     - aniversário dia 31, fevereiro bissex → dia 29
     - aniversário dia 30, fevereiro normal → dia 28
     """
-    ultimo_dia_do_mes = calendar.monthrange(ano, mes)[1]
-    return min(dia_aniversario, ultimo_dia_do_mes)
+    dia = extract("day", coluna_primeira_analise)
+    ultimo_dia_do_mes = calendar.monthrange(hoje.year, hoje.month)[1]
+
+    if hoje.day == ultimo_dia_do_mes:
+        # Último dia do mês: pega também os aniversários que "não cabem" no mês
+        return dia >= hoje.day
+    return dia == hoje.day
 
 
 def _ja_enviou_neste_mes(ultimo_envio: datetime, hoje: datetime) -> bool:
@@ -72,9 +81,62 @@ def _ja_enviou_neste_mes(ultimo_envio: datetime, hoje: datetime) -> bool:
     )
 
 
+def _juncao_resumo():
+    # resumo_analises_usuario.usuario_id é String(36), como analises.usuario_id
+    return ResumoAnalisesUsuario.usuario_id == cast(Usuario.id, String)
+
+
+def consulta_contagens_lembrete():
+    """SELECT (total de Pro ativos, quantos têm análise) — relatório do cron."""
+    return (
+        select(func.count(Usuario.id), func.count(ResumoAnalisesUsuario.usuario_id))
+        .select_from(Usuario)
+        .outerjoin(ResumoAnalisesUsuario, _juncao_resumo())
+        .where(Usuario.pro_ativo == True)
+    )
+
+
+def consulta_candidatos_lembrete(hoje: datetime):
+    """
+    SELECT dos Pro ativos cujo aniversário da 1ª análise cai hoje, com os
+    dados da última análise: (Usuario, ultima_analise_em, ultimo_score,
+    ultimo_folego_caixa, ultimo_mes_referencia, ultimo_ano_referencia).
+    Plano conferido em scripts/verificar_planos.py.
+    """
+    return (
+        select(
+            Usuario,
+            ResumoAnalisesUsuario.ultima_analise_em,
+            ResumoAnalisesUsuario.ultimo_score,
+            ResumoAnalisesUsuario.ultimo_folego_caixa,
+            ResumoAnalisesUsuario.ultimo_mes_referencia,
+            ResumoAnalisesUsuario.ultimo_ano_referencia,
+        )
+        .join(ResumoAnalisesUsuario, _juncao_resumo())
+        .where(
+            Usuario.pro_ativo == True,
+            ResumoAnalisesUsuario.primeira_analise_em.isnot(None),
+            _filtro_dia_aniversario(ResumoAnalisesUsuario.primeira_analise_em, hoje),
+        )
+    )
+
+
+async def buscar_candidatos_lembrete(db: AsyncSession, hoje: datetime) -> tuple[int, int, list]:
+    """
+    (total de Pro ativos, quantos têm análise, candidatos do dia) do lembrete mensal.
+    Medido com 50k usuários em scripts/perfil_lembrete_mensal.py.
+    """
+    # O resumo por usuário (resumo_analises_usuario) já traz a 1ª e a última
+    # análise — uma query com JOIN, e o filtro do dia de aniversário é feito
+    # no banco. Antes eram 2 queries por usuário Pro (2N+1 idas ao banco).
+    total_pro_ativo, com_analise = (await db.execute(consulta_contagens_lembrete())).one()
+    candidatos = (await db.execute(consulta_candidatos_lembrete(hoje))).all()
+    return total_pro_ativo, com_analise, candidatos
+
+
 @router.get("/lembrete-mensal")
 async def lembrete_mensal(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authorization: str = Header(None),
 ):
     """
@@ -91,45 +153,21 @@ async def lembrete_mensal(
     """
     _verificar_cron_secret(authorization)
 
+    inicio = time.perf_counter()
     hoje = datetime.now(timezone.utc)
     sete_dias_atras = hoje - timedelta(days=7)
 
-    # Busca todos os usuários Pro ativos. A filtragem fina (dia-alvo, idempotência,
-    # análise recente) é feita em Python pra deixar a lógica explícita e auditável.
-    usuarios_pro = (
-        db.query(Usuario)
-        .filter(Usuario.pro_ativo == True)
-        .all()
-    )
+    total_pro_ativo, com_analise, candidatos = await buscar_candidatos_lembrete(db, hoje)
 
-    enviados = 0
-    erros = 0
-    pulados_dia_diferente = 0
+    pulados_sem_analise = total_pro_ativo - com_analise
+    pulados_dia_diferente = com_analise - len(candidatos)
     pulados_ja_enviado_no_mes = 0
     pulados_analise_recente = 0
-    pulados_sem_analise = 0
-
-    for usuario in usuarios_pro:
-        # Busca a 1ª análise do usuário (mais antiga) — define o "aniversário mensal"
-        primeira_analise = (
-            db.query(Analise)
-            .filter(Analise.usuario_id == str(usuario.id))
-            .order_by(Analise.created_at.asc())
-            .first()
-        )
-
-        if not primeira_analise or not primeira_analise.created_at:
-            pulados_sem_analise += 1
-            continue
-
-        # Calcula o dia-alvo deste mês
-        dia_aniversario = primeira_analise.created_at.day
-        dia_alvo = _calcular_dia_alvo(dia_aniversario, hoje.year, hoje.month)
 
-        if hoje.day != dia_alvo:
-            pulados_dia_diferente += 1
-            continue
+    # (usuario, email montado) — despachados em lotes depois da filtragem
+    a_enviar = []
 
+    for usuario, ultima_created_at, score_saude, folego_caixa, mes_referencia, ano_referencia in candidatos:
         # Idempotência: já enviei esse mês?
         if _ja_enviou_neste_mes(usuario.ultimo_lembrete_mensal_em, hoje):
             pulados_ja_enviado_no_mes += 1
@@ -145,57 +183,54 @@ async def lembrete_mensal(
                 pulados_analise_recente += 1
                 continue
 
-        # Busca a análise MAIS RECENTE pra extrair score, fôlego e mês de referência
-        ultima_analise = (
-            db.query(Analise)
-            .filter(Analise.usuario_id == str(usuario.id))
-            .order_by(Analise.created_at.desc())
-            .first()
-        )
-
-        if not ultima_analise:
-            pulados_sem_analise += 1
-            continue
-
         # Calcula dias desde a última análise (pra texto do email)
-        ultima_dt = ultima_analise.created_at
+        ultima_dt = ultima_created_at
         if ultima_dt.tzinfo is None:
             ultima_dt = ultima_dt.replace(tzinfo=timezone.utc)
         dias_desde_analise = (hoje - ultima_dt).days
 
         # Mês/ano da última análise pra exibir no email
-        mes_nome = MESES_PT.get(ultima_analise.mes_referencia, "")
-        mes_ultima_analise = f"{mes_nome}/{ultima_analise.ano_referencia}"
+        mes_nome = MESES_PT.get(mes_referencia, "")
+        mes_ultima_analise = f"{mes_nome}/{ano_referencia}"
 
         # Score e fôlego (com fallback pra 0 se nulo)
-        score = int(ultima_analise.score_saude or 0)
-        folego = int(ultima_analise.folego_caixa or 0)
+        score = int(score_saude or 0)
+        folego = int(folego_caixa or 0)
 
-        # Envia o email
-        sucesso = await enviar_email_lembrete_mensal(
+        a_enviar.append((usuario, montar_email_lembrete_mensal(
             nome_empresa=usuario.nome or "Empresário(a)",
             email=usuario.email,
             score_anterior=score,
             folego_anterior=folego,
             dias_desde_analise=dias_desde_analise,
             mes_ultima_analise=mes_ultima_analise,
-        )
-
-        if sucesso:
-            # Marca como enviado ANTES de qualquer outra coisa, pra não correr
-            # risco de enviar 2x se o servidor cair logo depois
-            usuario.ultimo_lembrete_mensal_em = hoje.replace(tzinfo=None)
-            db.commit()
-            enviados += 1
-        else:
-            erros += 1
+        )))
+
+    def _marcar_enviado(item) -> None:
+        usuario, _ = item
+        usuario.ultimo_lembrete_mensal_em = hoje.replace(tzinfo=None)
+
+    # Lotes em paralelo com rate limit. Cada lote é marcado e commitado
+    # assim que o Brevo aceita, pra não correr risco de enviar 2x se o
+    # servidor cair no meio da execução
+    resultado = await despachar_emails(
+        db,
+        a_enviar,
+        montar=lambda item: item[1],
+        marcar_enviado=_marcar_enviado,
+    )
+    enviados = resultado["enviados"]
+    erros = resultado["falhas"]
+    HISTOGRAMA_CRON.observar(time.perf_counter() - inicio, job="lembrete_mensal")
 
     return {
         "mensagem": "Lembrete mensal processado",
         "data_execucao": hoje.isoformat(),
-        "total_pro_ativo": len(usuarios_pro),
+        "total_pro_ativo": total_pro_ativo,
         "enviados": enviados,
         "erros": erros,
+        "lotes_com_falha": resultado["lotes_com_falha"],
+        "detalhes_erros": resultado["erros"],
         "pulados": {
             "dia_diferente_do_aniversario": pulados_dia_diferente,
             "ja_enviado_neste_mes": pulados_ja_enviado_no_mes,
@@ -2,12 +2,24 @@
 Endpoint do Dashboard - retorna dados formatados para o frontend
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from dataclasses import dataclass
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, load_only
 from typing import Optional
 
+from config import get_settings
 from database import get_db
 from models.analise import Analise
+from respostas import resposta_json
+from routers.historico import garantir_versao_atual_lista
+from services.cache_http import CACHE_REVALIDAR, gerar_etag, responder_condicional
+from services.cache_lru import CacheLRU
+from services.indicadores import VERSAO_MOTOR
+from services.recalculo_indicadores import garantir_versao_atual
+from services.resumo_analises import buscar_resumo_email
+
+settings = get_settings()
 
 router = APIRouter(
     prefix="/api/v1/dashboard",
@@ -446,7 +458,7 @@ def gerar_diagnostico(analise: Analise) -> dict:
     }
 
 
-def gerar_plano_acao(analise: Analise) -> dict:
+def gerar_plano_acao(analise: "AnaliseView") -> dict:
     """
     Gera plano de ação 30/60/90 dias personalizado.
     
@@ -880,7 +892,7 @@ def gerar_plano_acao(analise: Analise) -> dict:
         }
     }
 
-def gerar_blocos_indicadores(analise: Analise) -> list:
+def gerar_blocos_indicadores(analise: "AnaliseView") -> list:
     """Gera os 3 blocos de indicadores com status e explicações corretos"""
     
     # Helpers locais
@@ -1051,13 +1063,269 @@ def gerar_blocos_indicadores(analise: Analise) -> list:
     ]
 
 
+# ========== VIEW TIPADA + MONTAGEM DO PAYLOAD ==========
+# As colunas Numeric chegam como Decimal; cada float(analise.x) espalhado
+# pelos geradores convertia o mesmo valor várias vezes por request.
+# A view converte tudo UMA vez e os dois endpoints compartilham o builder.
+
+def _f(valor) -> Optional[float]:
+    return float(valor) if valor is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class AnaliseView:
+    """Campos da análise usados pelo dashboard, com Numeric já em float."""
+    id: object
+    nome_empresa: str
+    email: str
+    estado: Optional[str]
+    setor: Optional[str]
+    mes_referencia: int
+    ano_referencia: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    # Entradas
+    receita_atual: Optional[float]
+    custo_vendas: Optional[float]
+    despesas_fixas: Optional[float]
+    caixa_bancos: Optional[float]
+    contas_receber: Optional[float]
+    contas_pagar: Optional[float]
+    dividas_totais: Optional[float]
+    num_funcionarios: Optional[int]
+
+    # Indicadores
+    margem_bruta: Optional[float]
+    resultado_mes: Optional[float]
+    folego_caixa: Optional[int]
+    ponto_equilibrio: Optional[float]
+    ciclo_financeiro: Optional[int]
+    capital_minimo: Optional[float]
+    receita_funcionario: Optional[float]
+    peso_divida: Optional[float]
+    valor_empresa_min: Optional[float]
+    valor_empresa_max: Optional[float]
+    tendencia_receita: Optional[float]
+    score_saude: Optional[float]
+
+    # Diagnóstico salvo
+    pontos_fortes: list
+    pontos_atencao: list
+
+    @classmethod
+    def de(cls, a: Analise) -> "AnaliseView":
+        return cls(
+            id=a.id,
+            nome_empresa=a.nome_empresa,
+            email=a.email,
+            estado=a.estado,
+            setor=a.setor,
+            mes_referencia=a.mes_referencia,
+            ano_referencia=a.ano_referencia,
+            created_at=a.created_at,
+            updated_at=a.updated_at,
+            receita_atual=_f(a.receita_atual),
+            custo_vendas=_f(a.custo_vendas),
+            despesas_fixas=_f(a.despesas_fixas),
+            caixa_bancos=_f(a.caixa_bancos),
+            contas_receber=_f(a.contas_receber),
+            contas_pagar=_f(a.contas_pagar),
+            dividas_totais=_f(a.dividas_totais),
+            num_funcionarios=a.num_funcionarios,
+            margem_bruta=_f(a.margem_bruta),
+            resultado_mes=_f(a.resultado_mes),
+            folego_caixa=a.folego_caixa,
+            ponto_equilibrio=_f(a.ponto_equilibrio),
+            ciclo_financeiro=a.ciclo_financeiro,
+            capital_minimo=_f(a.capital_minimo),
+            receita_funcionario=_f(a.receita_funcionario),
+            peso_divida=_f(a.peso_divida),
+            valor_empresa_min=_f(a.valor_empresa_min),
+            valor_empresa_max=_f(a.valor_empresa_max),
+            tendencia_receita=_f(a.tendencia_receita),
+            score_saude=_f(a.score_saude),
+            pontos_fortes=a.pontos_fortes or [],
+            pontos_atencao=a.pontos_atencao or [],
+        )
+
+
+# ========== CACHE DO PLANO DE AÇÃO ==========
+# gerar_plano_acao só lê campos gravados da análise: o plano é guardado por
+# (id, versão do motor, updated_at). Qualquer alteração na linha — inclusive
+# o recálculo de versão — muda updated_at e cai numa chave nova; as antigas
+# saem pelo LRU.
+_planos_acao = CacheLRU(max_itens=settings.PLANO_ACAO_CACHE_MAX_ITENS)
+
+
+def plano_acao_memoizado(v: AnaliseView) -> dict:
+    """gerar_plano_acao com cache. O dict devolvido é compartilhado: não alterar."""
+    chave = (v.id, VERSAO_MOTOR, v.updated_at)
+    plano = _planos_acao.get(chave)
+    if plano is None:
+        plano = gerar_plano_acao(v)
+        _planos_acao.set(chave, plano)
+    return plano
+
+
+def buscar_historico_dashboard(db: Session, email: str) -> list[Analise]:
+    """
+    Últimas 10 análises do e-mail — só as colunas do gráfico/lista (e
+    updated_at, do cache HTTP) — já na versão atual do motor: o gráfico
+    não mistura scores do motor antigo com a análise recalculada.
+    """
+    historico = (
+        db.query(Analise)
+        .options(load_only(
+            Analise.id,
+            Analise.created_at,
+            Analise.updated_at,
+            Analise.mes_referencia,
+            Analise.ano_referencia,
+            Analise.score_saude,
+            Analise.versao_motor,
+        ))
+        .filter(Analise.email == email)
+        .order_by(Analise.created_at.desc())
+        .limit(10)
+        .all()
+    )
+    garantir_versao_atual_lista(db, historico)
+    return historico
+
+
+def _montar_influenciadores(v: AnaliseView) -> list:
+    margem = v.margem_bruta
+    folego = v.folego_caixa
+    resultado = v.resultado_mes
+    peso_div = v.peso_divida
+
+    margem_ok = bool(margem) and margem >= 40
+    folego_ok = bool(folego) and folego >= 60
+    resultado_ok = bool(resultado) and resultado > 0
+    divida_ok = not peso_div or peso_div < 30
+
+    return [
+        {
+            "nome": "Margem Bruta",
+            "impacto": "positivo" if margem_ok else "negativo",
+            "peso": 5 if margem_ok else 2,
+            "descricao": f"{margem:.0f}% - {'Acima' if margem_ok else 'Abaixo'} do benchmark" if margem else "Não calculado"
+        },
+        {
+            "nome": "Fôlego de Caixa",
+            "impacto": "positivo" if folego_ok else "negativo",
+            "peso": 4 if folego_ok else 2,
+            "descricao": f"Reserva de {folego} dias" if folego else "Não calculado"
+        },
+        {
+            "nome": "Resultado do Mês",
+            "impacto": "positivo" if resultado_ok else "negativo",
+            "peso": 4 if resultado_ok else 1,
+            "descricao": "Empresa lucrativa" if resultado_ok else "Resultado negativo"
+        },
+        {
+            "nome": "Peso da Dívida",
+            "impacto": "positivo" if divida_ok else "negativo",
+            "peso": 3 if divida_ok else 2,
+            "descricao": f"{peso_div:.0f}% da receita anual" if peso_div else "Sem dívidas"
+        }
+    ]
+
+
+def montar_payload_dashboard(analise: Analise, historico_db: list) -> dict:
+    """
+    Monta a resposta completa do dashboard (mesma estrutura nos dois endpoints).
+    `historico_db` vem de buscar_historico_dashboard (mais recente primeiro).
+    """
+    v = AnaliseView.de(analise)
+
+    score = v.score_saude or 0
+    tendencia = v.tendencia_receita or 0
+    valor_min = v.valor_empresa_min or 0
+    valor_max = v.valor_empresa_max or 0
+
+    # Calcular lucro anual para payback
+    lucro_anual = v.resultado_mes * 12 if v.resultado_mes else 0
+
+    # Histórico: score convertido uma vez por linha
+    historico = [
+        (h, float(h.score_saude) if h.score_saude else 0)
+        for h in historico_db
+    ]
+
+    return {
+        "empresa": {
+            "nome": v.nome_empresa,
+            "email": v.email,
+            "estado": ESTADOS_NOMES.get(v.estado, v.estado),
+            "setor": SETORES_NOMES.get(v.setor, v.setor),
+            "mes_referencia": MESES.get(v.mes_referencia, str(v.mes_referencia)),
+            "ano_referencia": v.ano_referencia
+        },
+
+        "valuation": {
+            "valor_minimo": valor_min,
+            "valor_maximo": valor_max,
+            "multiplo_usado": MULTIPLOS_SETOR.get(v.setor, "2.0x - 4.0x"),
+            "explicacao": "Baseado no faturamento anual × múltiplo do setor"
+        },
+
+        "payback": gerar_payback(valor_min, valor_max, lucro_anual),
+
+        "score": {
+            "valor": int(score),
+            "status": get_status(score, "score"),
+            "tendencia": get_tendencia_tipo(tendencia),
+            "variacao": int(tendencia)
+        },
+
+        "score_evolucao": [
+            {"mes": MESES.get(h.mes_referencia, "")[:3], "score": int(score_h)}
+            for h, score_h in reversed(historico[:6])
+        ],
+
+        "influenciadores": _montar_influenciadores(v),
+
+        "blocos_indicadores": gerar_blocos_indicadores(v),
+
+        "diagnostico": {
+            "pontos_fortes": v.pontos_fortes,
+            "pontos_atencao": v.pontos_atencao
+        },
+
+        "plano_acao": plano_acao_memoizado(v),
+
+        "historico": [
+            {
+                "id": str(h.id),
+                "data": h.created_at.strftime("%Y-%m-%d"),
+                "mes_referencia": f"{MESES.get(h.mes_referencia, '')} {h.ano_referencia}",
+                "score": int(score_h),
+                "status": get_status(score_h, "score")
+            }
+            for h, score_h in historico
+        ],
+
+        "simulador": {
+            "caixa_disponivel": v.caixa_bancos or 0,
+            "receita_mensal": v.receita_atual or 0,
+            "custo_vendas": v.custo_vendas or 0,
+            "despesas_fixas": v.despesas_fixas or 0,
+        }
+    }
+
+
 @router.get("/id/{analise_id}")
 def get_dashboard_by_id(
     analise_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Retorna dados do Dashboard para uma análise específica por ID.
+    Responde 304 (sem montar o payload) se o cliente já tem a versão atual.
     """
     from uuid import UUID
     
@@ -1078,106 +1346,33 @@ def get_dashboard_by_id(
             detail="Análise não encontrada"
         )
     
-    # Buscar histórico do mesmo email
-    historico_db = db.query(Analise).filter(
-        Analise.email == analise.email
-    ).order_by(
-        Analise.created_at.desc()
-    ).limit(10).all()
-    
-    # Calcular lucro anual para payback
-    lucro_anual = float(analise.resultado_mes) * 12 if analise.resultado_mes else 0
-    
-    # Montar resposta (mesma estrutura do endpoint por email)
-    return {
-        "empresa": {
-            "nome": analise.nome_empresa,
-            "email": analise.email,
-            "estado": ESTADOS_NOMES.get(analise.estado, analise.estado),
-            "setor": SETORES_NOMES.get(analise.setor, analise.setor),
-            "mes_referencia": MESES.get(analise.mes_referencia, str(analise.mes_referencia)),
-            "ano_referencia": analise.ano_referencia
-        },
-        
-        "valuation": {
-            "valor_minimo": float(analise.valor_empresa_min) if analise.valor_empresa_min else 0,
-            "valor_maximo": float(analise.valor_empresa_max) if analise.valor_empresa_max else 0,
-            "multiplo_usado": MULTIPLOS_SETOR.get(analise.setor, "2.0x - 4.0x"),
-            "explicacao": "Baseado no faturamento anual × múltiplo do setor"
-        },
-        
-        "payback": gerar_payback(
-            float(analise.valor_empresa_min) if analise.valor_empresa_min else 0,
-            float(analise.valor_empresa_max) if analise.valor_empresa_max else 0,
-            lucro_anual
+    # Análise de versão anterior do motor: recalculada e gravada de volta
+    garantir_versao_atual([analise])
+
+    # Histórico do mesmo email — também entra no ETag e no Last-Modified
+    # (nova análise ou score recalculado no histórico muda o payload)
+    historico_db = buscar_historico_dashboard(db, analise.email)
+    nao_modificado = responder_condicional(
+        request, response,
+        etag=gerar_etag(
+            analise.id, analise.updated_at, VERSAO_MOTOR,
+            *((h.id, h.updated_at, h.score_saude) for h in historico_db),
         ),
-        
-        "score": {
-            "valor": int(analise.score_saude) if analise.score_saude else 0,
-            "status": get_status(float(analise.score_saude) if analise.score_saude else 0, "score"),
-            "tendencia": get_tendencia_tipo(float(analise.tendencia_receita) if analise.tendencia_receita else 0),
-            "variacao": int(analise.tendencia_receita) if analise.tendencia_receita else 0
-        },
-        
-        "score_evolucao": [
-            {"mes": MESES.get(a.mes_referencia, "")[:3], "score": int(a.score_saude) if a.score_saude else 0}
-            for a in reversed(historico_db[:6])
-        ],
-        
-        "influenciadores": [
-            {
-                "nome": "Margem Bruta",
-                "impacto": "positivo" if analise.margem_bruta and float(analise.margem_bruta) >= 40 else "negativo",
-                "peso": 5 if analise.margem_bruta and float(analise.margem_bruta) >= 40 else 2,
-                "descricao": f"{float(analise.margem_bruta):.0f}% - {'Acima' if float(analise.margem_bruta) >= 40 else 'Abaixo'} do benchmark" if analise.margem_bruta else "Não calculado"
-            },
-            {
-                "nome": "Fôlego de Caixa",
-                "impacto": "positivo" if analise.folego_caixa and analise.folego_caixa >= 60 else "negativo",
-                "peso": 4 if analise.folego_caixa and analise.folego_caixa >= 60 else 2,
-                "descricao": f"Reserva de {analise.folego_caixa} dias" if analise.folego_caixa else "Não calculado"
-            },
-            {
-                "nome": "Resultado do Mês",
-                "impacto": "positivo" if analise.resultado_mes and float(analise.resultado_mes) > 0 else "negativo",
-                "peso": 4 if analise.resultado_mes and float(analise.resultado_mes) > 0 else 1,
-                "descricao": "Empresa lucrativa" if analise.resultado_mes and float(analise.resultado_mes) > 0 else "Resultado negativo"
-            },
-            {
-                "nome": "Peso da Dívida",
-                "impacto": "positivo" if not analise.peso_divida or float(analise.peso_divida) < 30 else "negativo",
-                "peso": 3 if not analise.peso_divida or float(analise.peso_divida) < 30 else 2,
-                "descricao": f"{float(analise.peso_divida):.0f}% da receita anual" if analise.peso_divida else "Sem dívidas"
-            }
-        ],
-        
-        "blocos_indicadores": gerar_blocos_indicadores(analise),
-        
-        "diagnostico": {
-            "pontos_fortes": analise.pontos_fortes or [],
-            "pontos_atencao": analise.pontos_atencao or []
-        },
-        
-        "plano_acao": gerar_plano_acao(analise),
-        
-        "historico": [
-            {
-                "id": str(a.id),
-                "data": a.created_at.strftime("%Y-%m-%d"),
-                "mes_referencia": f"{MESES.get(a.mes_referencia, '')} {a.ano_referencia}",
-                "score": int(a.score_saude) if a.score_saude else 0,
-                "status": get_status(float(a.score_saude) if a.score_saude else 0, "score")
-            }
-            for a in historico_db
-        ],
+        ultima_modificacao=max(
+            (
+                m for m in (analise.updated_at, *(h.updated_at or h.created_at for h in historico_db))
+                if m is not None
+            ),
+            default=None,
+        ),
+        cache_control=CACHE_REVALIDAR,
+    )
+    if nao_modificado:
+        return nao_modificado
+
+    # Payload (mesma estrutura do endpoint por email), direto pro orjson
+    return resposta_json(montar_payload_dashboard(analise, historico_db), response)
 
-        "simulador": {
-            "caixa_disponivel": float(analise.caixa_bancos) if analise.caixa_bancos else 0,
-            "receita_mensal": float(analise.receita_atual) if analise.receita_atual else 0,
-            "custo_vendas": float(analise.custo_vendas) if analise.custo_vendas else 0,
-            "despesas_fixas": float(analise.despesas_fixas) if analise.despesas_fixas else 0,
-        }
-    }
 
 @router.get("/{email}")
 def get_dashboard(
@@ -1189,12 +1384,16 @@ def get_dashboard(
     Busca a análise mais recente do email.
     """
     
-    # Buscar análise mais recente
-    analise = db.query(Analise).filter(
-        Analise.email == email
-    ).order_by(
-        Analise.created_at.desc()
-    ).first()
+    # Buscar análise mais recente (pelo resumo do e-mail: busca por chave primária)
+    resumo = buscar_resumo_email(db, email)
+    if resumo is not None and resumo.ultima_analise_id is not None:
+        analise = db.get(Analise, resumo.ultima_analise_id)
+    else:
+        analise = db.query(Analise).filter(
+            Analise.email == email
+        ).order_by(
+            Analise.created_at.desc()
+        ).first()
     
     if not analise:
         raise HTTPException(
@@ -1202,103 +1401,5 @@ def get_dashboard(
             detail="Nenhuma análise encontrada para este email"
         )
     
-    # Buscar histórico
-    historico_db = db.query(Analise).filter(
-        Analise.email == email
-    ).order_by(
-        Analise.created_at.desc()
-    ).limit(10).all()
-    
-    # Calcular lucro anual para payback
-    lucro_anual = float(analise.resultado_mes) * 12 if analise.resultado_mes else 0
-    
-    # Montar resposta
-    return {
-        "empresa": {
-            "nome": analise.nome_empresa,
-            "email": analise.email,
-            "estado": ESTADOS_NOMES.get(analise.estado, analise.estado),
-            "setor": SETORES_NOMES.get(analise.setor, analise.setor),
-            "mes_referencia": MESES.get(analise.mes_referencia, str(analise.mes_referencia)),
-            "ano_referencia": analise.ano_referencia
-        },
-        
-        "valuation": {
-            "valor_minimo": float(analise.valor_empresa_min) if analise.valor_empresa_min else 0,
-            "valor_maximo": float(analise.valor_empresa_max) if analise.valor_empresa_max else 0,
-            "multiplo_usado": MULTIPLOS_SETOR.get(analise.setor, "2.0x - 4.0x"),
-            "explicacao": "Baseado no faturamento anual × múltiplo do setor"
-        },
-        
-        "payback": gerar_payback(
-            float(analise.valor_empresa_min) if analise.valor_empresa_min else 0,
-            float(analise.valor_empresa_max) if analise.valor_empresa_max else 0,
-            lucro_anual
-        ),
-        
-        "score": {
-            "valor": int(analise.score_saude) if analise.score_saude else 0,
-            "status": get_status(float(analise.score_saude) if analise.score_saude else 0, "score"),
-            "tendencia": get_tendencia_tipo(float(analise.tendencia_receita) if analise.tendencia_receita else 0),
-            "variacao": int(analise.tendencia_receita) if analise.tendencia_receita else 0
-        },
-        
-        "score_evolucao": [
-            {"mes": MESES.get(a.mes_referencia, "")[:3], "score": int(a.score_saude) if a.score_saude else 0}
-            for a in reversed(historico_db[:6])
-        ],
-        
-        "influenciadores": [
-            {
-                "nome": "Margem Bruta",
-                "impacto": "positivo" if analise.margem_bruta and float(analise.margem_bruta) >= 40 else "negativo",
-                "peso": 5 if analise.margem_bruta and float(analise.margem_bruta) >= 40 else 2,
-                "descricao": f"{float(analise.margem_bruta):.0f}% - {'Acima' if float(analise.margem_bruta) >= 40 else 'Abaixo'} do benchmark" if analise.margem_bruta else "Não calculado"
-            },
-            {
-                "nome": "Fôlego de Caixa",
-                "impacto": "positivo" if analise.folego_caixa and analise.folego_caixa >= 60 else "negativo",
-                "peso": 4 if analise.folego_caixa and analise.folego_caixa >= 60 else 2,
-                "descricao": f"Reserva de {analise.folego_caixa} dias" if analise.folego_caixa else "Não calculado"
-            },
-            {
-                "nome": "Resultado do Mês",
-                "impacto": "positivo" if analise.resultado_mes and float(analise.resultado_mes) > 0 else "negativo",
-                "peso": 4 if analise.resultado_mes and float(analise.resultado_mes) > 0 else 1,
-                "descricao": "Empresa lucrativa" if analise.resultado_mes and float(analise.resultado_mes) > 0 else "Resultado negativo"
-            },
-            {
-                "nome": "Peso da Dívida",
-                "impacto": "positivo" if not analise.peso_divida or float(analise.peso_divida) < 30 else "negativo",
-                "peso": 3 if not analise.peso_divida or float(analise.peso_divida) < 30 else 2,
-                "descricao": f"{float(analise.peso_divida):.0f}% da receita anual" if analise.peso_divida else "Sem dívidas"
-            }
-        ],
-        
-        "blocos_indicadores": gerar_blocos_indicadores(analise),
-        
-        "diagnostico": {
-    "pontos_fortes": analise.pontos_fortes or [],
-    "pontos_atencao": analise.pontos_atencao or []
-},
-        
-        "plano_acao": gerar_plano_acao(analise),
-        
-        "historico": [
-            {
-                "id": str(a.id),
-                "data": a.created_at.strftime("%Y-%m-%d"),
-                "mes_referencia": f"{MESES.get(a.mes_referencia, '')} {a.ano_referencia}",
-                "score": int(a.score_saude) if a.score_saude else 0,
-                "status": get_status(float(a.score_saude) if a.score_saude else 0, "score")
-            }
-            for a in historico_db
-        ],
-
-        "simulador": {
-            "caixa_disponivel": float(analise.caixa_bancos) if analise.caixa_bancos else 0,
-            "receita_mensal": float(analise.receita_atual) if analise.receita_atual else 0,
-            "custo_vendas": float(analise.custo_vendas) if analise.custo_vendas else 0,
-            "despesas_fixas": float(analise.despesas_fixas) if analise.despesas_fixas else 0,
-        }
-    }
\ No newline at end of file
+    garantir_versao_atual([analise])
+    return resposta_json(montar_payload_dashboard(analise, buscar_historico_dashboard(db, email)))
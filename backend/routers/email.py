@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from database import get_db
 from services.abandono_job import processar_abandonos, processar_abandono_manual
 from services.reengajamento_job import processar_reengajamento_30_dias, enviar_email_30d_manual
+from services.metricas import HISTOGRAMA_CRON, medir_duracao
 
 router = APIRouter(
     prefix="/email",
@@ -34,7 +35,8 @@ async def endpoint_processar_abandonos(db: Session = Depends(get_db)):
     Retorna estatísticas de quantos e-mails foram enviados.
     """
     
-    stats = await processar_abandonos(db)
+    with medir_duracao(HISTOGRAMA_CRON, job="abandonos"):
+        stats = await processar_abandonos(db)
     
     return {
         "mensagem": "Processamento de abandonos concluído",
@@ -50,7 +52,8 @@ async def endpoint_processar_30_dias(db: Session = Depends(get_db)):
     Retorna estatísticas de quantos e-mails foram enviados.
     """
     
-    stats = await processar_reengajamento_30_dias(db)
+    with medir_duracao(HISTOGRAMA_CRON, job="reengajamento_30d"):
+        stats = await processar_reengajamento_30_dias(db)
     
     return {
         "mensagem": "Processamento de 30 dias concluído",
@@ -66,8 +69,10 @@ async def endpoint_processar_todos(db: Session = Depends(get_db)):
     Este é o endpoint principal para o cron job.
     """
     
-    stats_abandonos = await processar_abandonos(db)
-    stats_30d = await processar_reengajamento_30_dias(db)
+    with medir_duracao(HISTOGRAMA_CRON, job="abandonos"):
+        stats_abandonos = await processar_abandonos(db)
+    with medir_duracao(HISTOGRAMA_CRON, job="reengajamento_30d"):
+        stats_30d = await processar_reengajamento_30_dias(db)
     
     return {
         "mensagem": "Processamento completo concluído",
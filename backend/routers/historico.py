@@ -1,7 +1,7 @@
 """
 Endpoints de histórico de análises — usuários Pro
 
-GET /api/v1/historico/                          → lista todas as análises do usuário logado
+GET /api/v1/historico/                          → lista as análises do usuário logado (paginada por cursor)
 GET /api/v1/historico/{id}                      → retorna dados completos de uma análise específica
 GET /api/v1/historico/comparativo               → retorna atual + anterior + variações calculadas
 GET /api/v1/historico/{id}/fatores-score        → retorna fatores positivos e negativos do score
@@ -9,12 +9,22 @@ PATCH /api/v1/historico/{id}/vincular           → vincula análise existente a
 """
 
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, load_only
 
 from database import get_db
 from models.analise import Analise
+from respostas import resposta_json
 from routers.auth import get_usuario_atual
+from services.cache_http import CACHE_REVALIDAR, gerar_etag, responder_condicional
+from services.indicadores import VERSAO_MOTOR
+from services.paginacao import Pagina, aplicar_keyset, cortar_pagina, parametros_paginacao
+from services.recalculo_indicadores import garantir_versao_atual
+from services.resumo_analises import (
+    buscar_resumo_usuario,
+    recalcular_resumo_usuario,
+    recalcular_resumo_email,
+)
 
 router = APIRouter(
     prefix="/api/v1/historico",
@@ -167,7 +177,7 @@ LABELS_NEGATIVO = {
 }
 
 
-def _calcular_fatores_score(analise: Analise) -> dict:
+def calcular_fatores_score(analise: Analise) -> dict:
     """
     Lógica determinística: verifica cada indicador contra seu benchmark
     e classifica como positivo ou negativo, com impacto proporcional ao peso.
@@ -224,65 +234,84 @@ def _calcular_fatores_score(analise: Analise) -> dict:
     return {"positivos": positivos, "negativos": negativos}
 
 
-# ── GET /api/v1/historico/ ────────────────────────────────────────────────────
+def item_historico(a: Analise) -> dict:
+    """Linha da lista do histórico."""
+    return {
+        "id": str(a.id),
+        "nome_empresa": a.nome_empresa,
+        "setor": a.setor,
+        "mes_referencia": a.mes_referencia,
+        "ano_referencia": a.ano_referencia,
+        "score_saude": float(a.score_saude) if a.score_saude else None,
+        "tendencia_status": a.tendencia_status,
+        "created_at": a.created_at.isoformat() if a.created_at else None,
+    }
 
-@router.get("/")
-def listar_historico(
-    usuario=Depends(get_usuario_pro),
-    db: Session = Depends(get_db)
-):
+
+# Colunas de item_historico + a versão do motor (decide se precisa recalcular)
+COLUNAS_LISTA = (
+    Analise.nome_empresa,
+    Analise.setor,
+    Analise.mes_referencia,
+    Analise.ano_referencia,
+    Analise.score_saude,
+    Analise.tendencia_status,
+    Analise.created_at,
+    Analise.versao_motor,
+)
+
+
+def buscar_pagina_historico(db: Session, usuario_id, pagina: Pagina) -> list[Analise]:
     """
-    Retorna todas as análises vinculadas ao usuário autenticado,
-    ordenadas da mais recente para a mais antiga.
+    Uma página (keyset, ver services/paginacao.py) das análises não
+    arquivadas do usuário, mais recente primeiro — só com as colunas da
+    lista, sem os JSON do diagnóstico. Vem com a linha extra de
+    aplicar_keyset; passar por cortar_pagina/dividir_pagina.
     """
-    analises = (
+    consulta = (
         db.query(Analise)
-        .filter(Analise.usuario_id == str(usuario.id), Analise.arquivada != True)
-        .order_by(Analise.created_at.desc())
-        .all()
+        .options(load_only(*COLUNAS_LISTA))
+        # == False (e não != True): mesma semântica para NULL, mas é igualdade
+        # e usa o índice (usuario_id, arquivada, created_at DESC)
+        .filter(Analise.usuario_id == str(usuario_id), Analise.arquivada == False)
     )
+    return aplicar_keyset(consulta, Analise.created_at, Analise.id, pagina).all()
 
-    return [
-        {
-            "id": str(a.id),
-            "nome_empresa": a.nome_empresa,
-            "setor": a.setor,
-            "mes_referencia": a.mes_referencia,
-            "ano_referencia": a.ano_referencia,
-            "score_saude": float(a.score_saude) if a.score_saude else None,
-            "tendencia_status": a.tendencia_status,
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        }
-        for a in analises
-    ]
 
+def garantir_versao_atual_lista(db: Session, analises: list[Analise]) -> None:
+    """
+    garantir_versao_atual para linhas carregadas com load_only: as de versão
+    anterior do motor são completadas numa query só (o identity map preenche
+    os mesmos objetos) e recalculadas. Depois do backfill não há nenhuma.
+    """
+    desatualizadas = [a.id for a in analises if a.versao_motor != VERSAO_MOTOR]
+    if desatualizadas:
+        garantir_versao_atual(db.query(Analise).filter(Analise.id.in_(desatualizadas)).all())
 
-# ── GET /api/v1/historico/comparativo ────────────────────────────────────────
-# ATENÇÃO: esta rota deve ser declarada ANTES de /{analise_id}
-# para que o FastAPI não interprete "comparativo" como um UUID.
 
-@router.get("/comparativo")
-def buscar_comparativo(
-    usuario=Depends(get_usuario_pro),
-    db: Session = Depends(get_db)
-):
+def buscar_analises_comparativo(db: Session, usuario_id) -> list[Analise]:
     """
-    Retorna as duas análises mais recentes do usuário lado a lado,
-    com as variações de cada indicador já calculadas.
-
-    Se o usuário tiver apenas 1 análise, retorna anterior=null e variacoes=null.
+    Última e penúltima análise do usuário (mais recente primeiro). Vêm do
+    resumo do usuário (busca por chave primária).
     """
-    analises = (
-        db.query(Analise)
-        .filter(Analise.usuario_id == str(usuario.id))
-        .order_by(Analise.created_at.desc())
-        .limit(2)
-        .all()
-    )
+    resumo = buscar_resumo_usuario(db, usuario_id)
+    if resumo is None:
+        # Resumo ainda não reconstruído — caminho antigo
+        return (
+            db.query(Analise)
+            .filter(Analise.usuario_id == str(usuario_id))
+            .order_by(Analise.created_at.desc())
+            .limit(2)
+            .all()
+        )
+
+    ids = [i for i in (resumo.ultima_analise_id, resumo.penultima_analise_id) if i is not None]
+    por_id = {a.id: a for a in db.query(Analise).filter(Analise.id.in_(ids)).all()}
+    return [por_id[i] for i in ids if i in por_id]
 
-    if not analises:
-        raise HTTPException(status_code=404, detail="Nenhuma análise encontrada")
 
+def montar_comparativo(analises: list[Analise]) -> dict:
+    """Atual x anterior com variações; `analises` vem de buscar_analises_comparativo (não vazia)."""
     atual_dict = _analise_para_dict_resumido(analises[0])
 
     if len(analises) == 1:
@@ -310,17 +339,64 @@ def buscar_comparativo(
     }
 
 
+# ── GET /api/v1/historico/ ────────────────────────────────────────────────────
+
+@router.get("/")
+def listar_historico(
+    response: Response,
+    pagina: Pagina = Depends(parametros_paginacao),
+    usuario=Depends(get_usuario_pro),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna as análises vinculadas ao usuário autenticado, da mais recente
+    para a mais antiga, paginadas por cursor (header X-Proximo-Cursor)
+    quando vem ?limite=; sem limite nem cursor, todas — como antes.
+    """
+    analises = cortar_pagina(buscar_pagina_historico(db, usuario.id, pagina), pagina, response)
+    # Versão anterior do motor: recalculadas e gravadas de volta uma vez
+    garantir_versao_atual_lista(db, analises)
+
+    return resposta_json([item_historico(a) for a in analises], response)
+
+
+# ── GET /api/v1/historico/comparativo ────────────────────────────────────────
+# ATENÇÃO: esta rota deve ser declarada ANTES de /{analise_id}
+# para que o FastAPI não interprete "comparativo" como um UUID.
+
+@router.get("/comparativo")
+def buscar_comparativo(
+    usuario=Depends(get_usuario_pro),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna as duas análises mais recentes do usuário lado a lado,
+    com as variações de cada indicador já calculadas.
+
+    Se o usuário tiver apenas 1 análise, retorna anterior=null e variacoes=null.
+    """
+    analises = buscar_analises_comparativo(db, usuario.id)
+    if not analises:
+        raise HTTPException(status_code=404, detail="Nenhuma análise encontrada")
+
+    garantir_versao_atual(analises)
+    return resposta_json(montar_comparativo(analises))
+
+
 # ── GET /api/v1/historico/{id} ────────────────────────────────────────────────
 
 @router.get("/{analise_id}")
 def buscar_analise_completa(
     analise_id: UUID,
+    request: Request,
+    response: Response,
     usuario=Depends(get_usuario_pro),
     db: Session = Depends(get_db)
 ):
     """
     Retorna os dados completos de uma análise específica.
     Valida que a análise pertence ao usuário autenticado.
+    Responde 304 se o cliente já tem a versão atual.
     """
     analise = db.query(Analise).filter(Analise.id == analise_id).first()
 
@@ -330,7 +406,21 @@ def buscar_analise_completa(
     if str(analise.usuario_id) != str(usuario.id):
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    return {
+    garantir_versao_atual([analise])
+
+    # Depois da checagem de dono: 304 só para quem pode ver a análise
+    nao_modificado = responder_condicional(
+        request, response,
+        etag=gerar_etag(analise.id, analise.updated_at, VERSAO_MOTOR),
+        ultima_modificacao=analise.updated_at,
+        cache_control=CACHE_REVALIDAR,
+        # A sessão vem no cookie leme_token: outra sessão = outra resposta
+        vary="Cookie",
+    )
+    if nao_modificado:
+        return nao_modificado
+
+    return resposta_json({
         "id": str(analise.id),
         "nome_empresa": analise.nome_empresa,
         "email": analise.email,
@@ -366,7 +456,7 @@ def buscar_analise_completa(
         "comparativo_setorial": analise.comparativo_setorial,
         # Meta
         "created_at": analise.created_at.isoformat() if analise.created_at else None,
-    }
+    }, response)
 
 
 # ── GET /api/v1/historico/{id}/fatores-score ─────────────────────────────────
@@ -389,7 +479,8 @@ def buscar_fatores_score(
     if str(analise.usuario_id) != str(usuario.id):
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    return _calcular_fatores_score(analise)
+    garantir_versao_atual([analise])
+    return calcular_fatores_score(analise)
 
 
 # ── PATCH /api/v1/historico/{id}/vincular ────────────────────────────────────
@@ -416,7 +507,8 @@ def vincular_analise(
             raise HTTPException(status_code=403, detail="Análise já pertence a outro usuário")
         return {"ok": True, "mensagem": "Análise já estava vinculada a este usuário"}
 
-    analise.usuario_id = usuario.id
+    analise.usuario_id = str(usuario.id)
+    recalcular_resumo_usuario(db, usuario.id)
     db.commit()
 
     return {"ok": True, "mensagem": "Análise vinculada com sucesso"}
@@ -441,6 +533,8 @@ def arquivar_analise(
         raise HTTPException(status_code=403, detail="Acesso negado")
 
     analise.arquivada = True
+    recalcular_resumo_usuario(db, usuario.id)
+    recalcular_resumo_email(db, analise.email)
     db.commit()
 
     return {"ok": True}
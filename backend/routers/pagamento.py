@@ -4,19 +4,23 @@ Features: Checkout Session, Webhook, Verificação de Status
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Header
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
-import stripe
+import logging
 
-from database import get_db
+from database import get_db, get_async_db
 from models.analise import Analise
-from services.stripe_service import stripe_service
+from services.stripe_service import stripe_service, get_stripe
 from config import get_settings
 
 settings = get_settings()
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/pagamento",
     tags=["Pagamento"]
@@ -144,7 +148,7 @@ async def verificar_session(
 @router.post("/webhook")
 async def webhook_stripe(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Webhook para receber notificações do Stripe.
@@ -159,6 +163,7 @@ async def webhook_stripe(
     
     # Se tem webhook secret configurado, valida a assinatura
     if settings.STRIPE_WEBHOOK_SECRET:
+        stripe = get_stripe()
         try:
             event = stripe.Webhook.construct_event(
                 payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
@@ -172,7 +177,7 @@ async def webhook_stripe(
         import json
         event = json.loads(payload)
     
-    print(f"[Webhook Stripe] Evento: {event.get('type', event.get('id', 'unknown'))}")
+    logger.info("Webhook Stripe: evento %s", event.get("type", event.get("id", "unknown")))
     
     # Processa evento de checkout concluído
     event_type = event.get("type", "")
@@ -182,22 +187,22 @@ async def webhook_stripe(
         analise_id = session.get("metadata", {}).get("analise_id")
         payment_status = session.get("payment_status")
         
-        print(f"[Webhook Stripe] Análise: {analise_id}, Status: {payment_status}")
+        logger.info("Webhook Stripe: análise %s, status %s", analise_id, payment_status)
         
         if analise_id and payment_status == "paid":
-            analise = db.query(Analise).filter(
-                Analise.id == analise_id
-            ).first()
+            analise = (await db.execute(
+                select(Analise).where(Analise.id == analise_id)
+            )).scalars().first()
             
             if analise:
                 analise.pago = True
                 analise.pago_em = datetime.utcnow()
                 analise.stripe_session_id = session.get("id")
-                db.commit()
+                await db.commit()
                 
-                print(f"[Webhook Stripe] ✅ Pagamento confirmado para análise {analise_id}")
+                logger.info("Webhook Stripe: pagamento confirmado para análise %s", analise_id)
             else:
-                print(f"[Webhook Stripe] ⚠️ Análise não encontrada: {analise_id}")
+                logger.warning("Webhook Stripe: análise não encontrada: %s", analise_id)
     
     return {"status": "ok"}
 
@@ -260,6 +265,6 @@ async def confirmar_retorno_stripe(
                 db.commit()
                 return {"confirmado": True, "mensagem": "Pagamento confirmado"}
         except Exception as e:
-            print(f"[Confirmar Retorno] Erro ao verificar session: {e}")
+            logger.error("Confirmar retorno: erro ao verificar session: %s", e)
     
     return {"confirmado": False, "mensagem": "Pagamento ainda não confirmado"}
\ No newline at end of file
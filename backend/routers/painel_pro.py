@@ -0,0 +1,133 @@
+"""
+Painel Pro em uma ida ao servidor — usuários Pro
+
+GET /api/v1/painel/{analise_id}  → dashboard, histórico, comparativo, fatores do score e progresso
+
+A página /dashboard/pro/{id} chamava dashboard/id, historico, comparativo,
+fatores-score e progresso separadamente: cada chamada autenticava de novo
+(busca do usuário), buscava a mesma análise e checava o dono. Aqui o
+usuário é buscado uma vez; a análise é carregada, tem o dono checado e é
+trazida para a versão atual do motor UMA vez, antes de tudo (ela também
+aparece no histórico e no comparativo: recalculá-la em duas threads seria
+trabalho e gravação em dobro). Depois, os três blocos independentes rodam
+ao mesmo tempo, cada um na sua thread e na sua sessão (Session não é
+thread-safe):
+
+- histórico do e-mail → payload do dashboard e fatores do score
+- primeira página do histórico do usuário + última/penúltima → lista do
+  histórico (cursor da próxima página em historico_proximo_cursor) e
+  comparativo
+- progresso do plano de ação
+
+O JSON de cada parte é o mesmo dos endpoints individuais.
+"""
+
+import asyncio
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from config import get_settings
+from database import SessionLocal
+from models.analise import Analise
+from respostas import resposta_json
+from routers.dashboard import buscar_historico_dashboard, montar_payload_dashboard
+from routers.historico import (
+    buscar_analises_comparativo,
+    buscar_pagina_historico,
+    calcular_fatores_score,
+    garantir_versao_atual_lista,
+    get_usuario_pro,
+    item_historico,
+    montar_comparativo,
+)
+from routers.progresso import itens_progresso
+from services.paginacao import Pagina, dividir_pagina
+from services.recalculo_indicadores import garantir_versao_atual
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/api/v1/painel",
+    tags=["Painel Pro"]
+)
+
+
+# ========== BLOCOS (cada um em sua thread) ==========
+
+def _carregar_analise(analise_id: UUID, usuario_id) -> Analise:
+    """Análise pedida: checa o dono e a traz para a versão atual do motor (gravada de volta)."""
+    with SessionLocal() as db:
+        analise = db.get(Analise, analise_id)
+        if not analise:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Análise não encontrada")
+        if str(analise.usuario_id) != str(usuario_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
+
+        garantir_versao_atual([analise])
+    return analise
+
+
+def _bloco_analise(analise: Analise) -> dict:
+    """Dashboard + fatores do score da análise já conferida."""
+    with SessionLocal() as db:
+        historico_db = buscar_historico_dashboard(db, analise.email)
+
+    return {
+        "dashboard": montar_payload_dashboard(analise, historico_db),
+        "fatores_score": calcular_fatores_score(analise),
+    }
+
+
+def _bloco_historico(usuario_id) -> dict:
+    """Primeira página do histórico e comparativo (última x penúltima) do usuário."""
+    pagina = Pagina(limite=settings.LISTAGEM_LIMITE_PADRAO)
+    with SessionLocal() as db:
+        analises, proximo_cursor = dividir_pagina(buscar_pagina_historico(db, usuario_id, pagina), pagina)
+        garantir_versao_atual_lista(db, analises)
+        comparadas = buscar_analises_comparativo(db, usuario_id)
+        garantir_versao_atual(comparadas)
+
+    return {
+        "historico": [item_historico(a) for a in analises],
+        "historico_proximo_cursor": proximo_cursor,
+        "comparativo": montar_comparativo(comparadas) if comparadas else None,
+    }
+
+
+def _bloco_progresso(analise_id: UUID, usuario_id) -> list[dict]:
+    # Filtra pelo usuário (o dono já foi checado em _carregar_analise)
+    with SessionLocal() as db:
+        return itens_progresso(db, analise_id, usuario_id)
+
+
+# ========== ENDPOINT ==========
+
+@router.get("/{analise_id}")
+async def carregar_painel(
+    analise_id: UUID,
+    usuario=Depends(get_usuario_pro),
+):
+    """
+    Estado completo do painel Pro de uma análise do usuário autenticado.
+    404/403 como nos endpoints individuais; comparativo null onde o
+    /historico/comparativo responderia 404.
+    """
+    # Antes do fan-out: 404/403 sem disparar os outros blocos, e a análise já
+    # na versão atual do motor quando o histórico/comparativo a lerem
+    analise = await asyncio.to_thread(_carregar_analise, analise_id, usuario.id)
+
+    bloco_analise, historico, progresso = await asyncio.gather(
+        asyncio.to_thread(_bloco_analise, analise),
+        asyncio.to_thread(_bloco_historico, usuario.id),
+        asyncio.to_thread(_bloco_progresso, analise_id, usuario.id),
+    )
+
+    return resposta_json({
+        "dashboard": bloco_analise["dashboard"],
+        "historico": historico["historico"],
+        "historico_proximo_cursor": historico["historico_proximo_cursor"],
+        "comparativo": historico["comparativo"],
+        "fatores_score": bloco_analise["fatores_score"],
+        "progresso": progresso,
+    })
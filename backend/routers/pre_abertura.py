@@ -4,7 +4,8 @@ Feature: Ainda não tenho empresa
 """
 
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -21,6 +22,8 @@ from schemas.pre_abertura import (
     CategoriaAlertaEnum,
     SeveridadeAlertaEnum
 )
+from services.cache_http import CACHE_IMUTAVEL, gerar_etag, responder_condicional
+from services.paginacao import Pagina, aplicar_keyset, cortar_pagina, parametros_paginacao
 from services.pre_abertura import (
     processar_analise_pre_abertura,
     SETOR_LABELS
@@ -119,10 +122,13 @@ def criar_analise_pre_abertura(
 @router.get("/{analise_id}", response_model=PreAberturaResponse)
 def buscar_analise_pre_abertura(
     analise_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Busca uma análise pré-abertura pelo ID.
+    Não é alterada depois de criada: cache curto no navegador + 304.
     """
     analise = db.query(AnalisePreAbertura).filter(
         AnalisePreAbertura.id == analise_id
@@ -134,6 +140,15 @@ def buscar_analise_pre_abertura(
             detail="Análise não encontrada"
         )
     
+    nao_modificado = responder_condicional(
+        request, response,
+        etag=gerar_etag(analise.id, analise.updated_at),
+        ultima_modificacao=analise.updated_at,
+        cache_control=CACHE_IMUTAVEL,
+    )
+    if nao_modificado:
+        return nao_modificado
+    
     # Reconstruir objetos para resposta
     comparativo_capital = ComparativoCapital(
         capital_informado=float(analise.capital_disponivel),
@@ -208,15 +223,26 @@ def buscar_analise_pre_abertura(
 @router.get("/email/{email}", response_model=list[PreAberturaResumo])
 def listar_por_email(
     email: str,
+    response: Response,
+    pagina: Pagina = Depends(parametros_paginacao),
     db: Session = Depends(get_db)
 ):
     """
-    Lista todas as análises pré-abertura de um email.
+    Lista as análises pré-abertura de um email, da mais recente para a mais
+    antiga, paginadas por cursor (header X-Proximo-Cursor) quando vem
+    ?limite=; sem limite nem cursor, todas. Só as colunas do resumo — sem
+    alertas, checklist e cálculos.
     """
-    analises = db.query(AnalisePreAbertura).filter(
-        AnalisePreAbertura.email == email
-    ).order_by(
-        AnalisePreAbertura.created_at.desc()
+    consulta = select(
+        AnalisePreAbertura.id,
+        AnalisePreAbertura.setor,
+        AnalisePreAbertura.mes_abertura,
+        AnalisePreAbertura.ano_abertura,
+        AnalisePreAbertura.capital_status,
+        AnalisePreAbertura.created_at,
+    ).where(AnalisePreAbertura.email == email)
+    linhas = db.execute(
+        aplicar_keyset(consulta, AnalisePreAbertura.created_at, AnalisePreAbertura.id, pagina)
     ).all()
     
     meses = ["", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
@@ -231,5 +257,5 @@ def listar_por_email(
             capital_status=a.capital_status,
             created_at=a.created_at
         )
-        for a in analises
+        for a in cortar_pagina(linhas, pagina, response)
     ]
\ No newline at end of file
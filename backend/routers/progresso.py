@@ -31,6 +31,23 @@ class ProgressoInput(BaseModel):
     marcado: bool
 
 
+def itens_progresso(db: Session, analise_id: UUID, usuario_id) -> list[dict]:
+    """Checkboxes salvos da análise para o usuário (sem checar o dono da análise)."""
+    itens = db.query(PlanoAcaoProgresso).filter(
+        PlanoAcaoProgresso.analise_id == analise_id,
+        PlanoAcaoProgresso.usuario_id == usuario_id,
+    ).all()
+
+    return [
+        {
+            "periodo": i.periodo,
+            "indice_acao": i.indice_acao,
+            "marcado": i.marcado,
+        }
+        for i in itens
+    ]
+
+
 # ── POST /api/v1/progresso/{analise_id} ───────────────────────────────────────
 
 @router.post("/{analise_id}")
@@ -97,16 +114,4 @@ def buscar_progresso(
     if str(analise.usuario_id) != str(usuario.id):
         raise HTTPException(status_code=403, detail="Acesso negado")
 
-    itens = db.query(PlanoAcaoProgresso).filter(
-        PlanoAcaoProgresso.analise_id == analise_id,
-        PlanoAcaoProgresso.usuario_id == usuario.id,
-    ).all()
-
-    return [
-        {
-            "periodo": i.periodo,
-            "indice_acao": i.indice_acao,
-            "marcado": i.marcado,
-        }
-        for i in itens
-    ]
+    return itens_progresso(db, analise_id, usuario.id)
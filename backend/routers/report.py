@@ -6,7 +6,6 @@ from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
 from schemas.report import ReportPayload
-from services.pdf_report import build_pdf_report
 
 router = APIRouter(
     prefix="/report",
@@ -22,6 +21,9 @@ def generate_report(payload: ReportPayload):
     Recebe os dados do dashboard e retorna um PDF de 2 páginas
     com a visão executiva, indicadores, diagnóstico e plano de ação.
     """
+    # reportlab só é carregado quando alguém pede PDF (fora do cold start)
+    from services.pdf_report import build_pdf_report
+
     # Gera o PDF
     pdf_bytes = build_pdf_report(payload)
     
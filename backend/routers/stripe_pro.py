@@ -7,18 +7,21 @@ Endpoints:
 - POST /stripe-pro/webhook         — recebe eventos do Stripe (pagamento, cancelamento)
 """
 
-import stripe
 import os
 import json
+import logging
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.stripe_pro_service import criar_checkout_assinatura, cancelar_assinatura
+from services.stripe_service import get_stripe
 from services.email_service import enviar_email_boas_vindas_pro
-from database import get_db
+from database import get_db, get_async_db
 from models.usuario import Usuario
 from routers.auth import get_usuario_atual
 
@@ -29,6 +32,8 @@ router = APIRouter(
 
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
 
+logger = logging.getLogger(__name__)
+
 
 # ========== CRIAR CHECKOUT ==========
 
@@ -88,7 +93,7 @@ async def cancelar_pro(
         usuario.updated_at = datetime.utcnow()
         db.commit()
 
-        print(f"[Stripe Pro] ❌ Assinatura cancelada para {usuario.email}")
+        logger.info("Stripe Pro: assinatura cancelada para %s", usuario.email)
         return {"status": "cancelado"}
 
     except Exception as e:
@@ -100,7 +105,7 @@ async def cancelar_pro(
 @router.post("/webhook")
 async def webhook_stripe_pro(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Recebe eventos do Stripe e atualiza o status Pro do usuário.
@@ -114,6 +119,7 @@ async def webhook_stripe_pro(
     sig_header = request.headers.get("stripe-signature")
 
     if STRIPE_WEBHOOK_SECRET:
+        stripe = get_stripe()
         try:
             event = stripe.Webhook.construct_event(
                 payload, sig_header, STRIPE_WEBHOOK_SECRET
@@ -124,12 +130,12 @@ async def webhook_stripe_pro(
             raise HTTPException(status_code=400, detail="Assinatura inválida")
     else:
         event = json.loads(payload)
-        print("[Stripe Pro Webhook] ⚠️ Rodando sem validação de assinatura")
+        logger.warning("Stripe Pro webhook: rodando sem validação de assinatura")
 
     # Stripe construct_event retorna um objeto Stripe (não dict)
     # Usar acesso por atributo (.type, .data.object) em vez de .get()
     event_type = event.type if hasattr(event, "type") else event.get("type", "")
-    print(f"[Stripe Pro Webhook] Evento recebido: {event_type}")
+    logger.info("Stripe Pro webhook: evento recebido %s", event_type)
 
     # Extrair o objeto de dados (funciona tanto como objeto Stripe quanto dict)
     if hasattr(event, "data"):
@@ -145,13 +151,13 @@ async def webhook_stripe_pro(
         subscription_id = session.get("subscription") if isinstance(session, dict) else session.subscription
         customer_id = session.get("customer") if isinstance(session, dict) else session.customer
 
-        print(f"[Stripe Pro Webhook] usuario_id={usuario_id}, subscription={subscription_id}")
+        logger.info("Stripe Pro webhook: usuario_id=%s, subscription=%s", usuario_id, subscription_id)
 
         if usuario_id:
             import uuid
-            usuario = db.query(Usuario).filter(
-                Usuario.id == uuid.UUID(usuario_id)
-            ).first()
+            usuario = (await db.execute(
+                select(Usuario).where(Usuario.id == uuid.UUID(usuario_id))
+            )).scalars().first()
 
             if usuario:
                 usuario.pro_ativo = True
@@ -159,8 +165,8 @@ async def webhook_stripe_pro(
                 usuario.stripe_customer_id = customer_id
                 usuario.stripe_subscription_id = subscription_id
                 usuario.updated_at = datetime.utcnow()
-                db.commit()
-                print(f"[Stripe Pro Webhook] ✅ Pro ativado para {usuario.email}")
+                await db.commit()
+                logger.info("Stripe Pro webhook: Pro ativado para %s", usuario.email)
 
                 # ── EMAIL DE BOAS-VINDAS PRO ─────────────────────────────────
                 # Envia uma única vez por usuário. Se o webhook chegar de novo
@@ -175,42 +181,42 @@ async def webhook_stripe_pro(
                         )
                         if sucesso:
                             usuario.email_boas_vindas_pro_enviado_em = datetime.utcnow()
-                            db.commit()
-                            print(f"[Stripe Pro Webhook] 📧 Email de boas-vindas Pro enviado para {usuario.email}")
+                            await db.commit()
+                            logger.info("Stripe Pro webhook: email de boas-vindas Pro enviado para %s", usuario.email)
                         else:
-                            print(f"[Stripe Pro Webhook] ⚠️ Falha ao enviar email de boas-vindas Pro para {usuario.email}")
+                            logger.warning("Stripe Pro webhook: falha ao enviar email de boas-vindas Pro para %s", usuario.email)
                     except Exception as e:
                         # Erro no email não derruba o webhook — Pro já foi ativado.
                         # O Stripe não precisa fazer retry por isso.
-                        print(f"[Stripe Pro Webhook] ⚠️ Exceção ao enviar email de boas-vindas Pro: {e}")
+                        logger.exception("Stripe Pro webhook: exceção ao enviar email de boas-vindas Pro: %s", e)
                 else:
-                    print(f"[Stripe Pro Webhook] Email de boas-vindas Pro já foi enviado anteriormente para {usuario.email}")
+                    logger.info("Stripe Pro webhook: email de boas-vindas Pro já foi enviado anteriormente para %s", usuario.email)
             else:
-                print(f"[Stripe Pro Webhook] ⚠️ Usuário não encontrado: {usuario_id}")
+                logger.warning("Stripe Pro webhook: usuário não encontrado: %s", usuario_id)
 
     # ── ASSINATURA CANCELADA ──────────────────────────────────────────────────
     elif event_type == "customer.subscription.deleted":
         subscription = data_object
         customer_id = subscription.get("customer") if isinstance(subscription, dict) else subscription.customer
 
-        usuario = db.query(Usuario).filter(
-            Usuario.stripe_customer_id == customer_id
-        ).first()
+        usuario = (await db.execute(
+            select(Usuario).where(Usuario.stripe_customer_id == customer_id)
+        )).scalars().first()
 
         if usuario:
             usuario.pro_ativo = False
             usuario.plano = "free"
             usuario.stripe_subscription_id = None
             usuario.updated_at = datetime.utcnow()
-            db.commit()
-            print(f"[Stripe Pro Webhook] ❌ Pro desativado para {usuario.email}")
+            await db.commit()
+            logger.info("Stripe Pro webhook: Pro desativado para %s", usuario.email)
         else:
-            print(f"[Stripe Pro Webhook] ⚠️ Usuário não encontrado para customer: {customer_id}")
+            logger.warning("Stripe Pro webhook: usuário não encontrado para customer %s", customer_id)
 
     # ── PAGAMENTO FALHOU ─────────────────────────────────────────────────────
     elif event_type == "invoice.payment_failed":
         invoice = data_object
         customer_id = invoice.get("customer") if isinstance(invoice, dict) else invoice.customer
-        print(f"[Stripe Pro Webhook] ⚠️ Pagamento falhou para customer: {customer_id}")
+        logger.warning("Stripe Pro webhook: pagamento falhou para customer %s", customer_id)
 
     return {"status": "ok"}
\ No newline at end of file
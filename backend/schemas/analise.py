@@ -4,7 +4,7 @@ Schemas de validação para a análise financeira
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field, field_validator, model_validator, EmailStr
 
@@ -303,6 +303,31 @@ class AnaliseResumo(BaseModel):
         from_attributes = True
 
 
+class AnaliseLoteInput(BaseModel):
+    """
+    Lote de empresas para POST /lote (contadores com a carteira toda).
+    Cada item tem o formato de /nova e é validado separadamente — um item
+    inválido vira erro no resultado dele, sem derrubar o lote.
+    """
+    itens: list[dict[str, Any]] = Field(..., min_length=1, description="Dados de cada empresa (formato de /nova)")
+
+
+class ItemLoteResultado(BaseModel):
+    """Resultado de um item do lote, na mesma posição do pedido"""
+    indice: int
+    sucesso: bool
+    analise: Optional[AnaliseResponse] = None
+    erros: list[str] = Field(default_factory=list)
+
+
+class AnaliseLoteResponse(BaseModel):
+    """Resposta do POST /lote"""
+    total: int
+    criadas: int
+    com_erro: int
+    resultados: list[ItemLoteResultado]
+
+
 class ValidacaoResponse(BaseModel):
     """Resposta de validação do formulário"""
     valido: bool
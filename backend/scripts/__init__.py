@@ -0,0 +1 @@
+"""Scripts de manutenção (rodar com python -m scripts.<nome> a partir de backend/)"""
@@ -0,0 +1,30 @@
+"""
+Banco descartável para os scripts de perfil que precisam de dados
+
+    from scripts.banco_temporario import preparar_banco
+    preparar_banco(args.banco)   # ANTES de importar database/models
+    from database import SessionLocal
+    ...
+
+Sem --banco, cria um SQLite novo num diretório temporário e aplica as
+migrações (mesmo schema do deploy). Com --banco, usa a URL informada —
+nunca aponte para o banco de produção: os scripts inserem milhares de linhas.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+def preparar_banco(url: Optional[str] = None) -> str:
+    """Define DATABASE_URL e aplica as migrações pendentes. Retorna a URL usada."""
+    if url is None:
+        caminho = Path(tempfile.mkdtemp(prefix="leme-perfil-")) / "perfil.db"
+        url = f"sqlite:///{caminho}"
+    # O settings (e o engine) são criados no primeiro import de database
+    os.environ["DATABASE_URL"] = url
+
+    from migracoes import aplicar_migracoes
+    aplicar_migracoes()
+    return url
@@ -0,0 +1,236 @@
+"""
+Teste de carga do cliente da Claude API (ia_client.gerar_texto) contra um
+servidor fake local — sem chave de verdade e sem custo
+
+Sobe um stub de POST /v1/messages com latência simulada, aponta
+ANTHROPIC_BASE_URL para ele e dispara N gerações simultâneas. Ao mesmo
+tempo, no mesmo event loop, clientes Free chamam o POST /api/v1/analise/nova
+de verdade (httpx + ASGITransport, banco descartável, Brevo fake) — é o
+que as gerações Pro não podem atrasar. Confere:
+
+- vazão e latência (p50/p95) das gerações
+- pico de chamadas simultâneas visto pelo servidor ≤ IA_MAX_CONCORRENCIA
+- atraso do event loop durante a carga (o SDK síncrono travava o loop
+  pelos segundos de cada geração; aqui deve ficar em milissegundos)
+- p95 do /analise/nova Free durante a carga x sozinho (antes das gerações)
+
+    cd backend && python -m scripts.carga_ia
+    cd backend && python -m scripts.carga_ia --chamadas 200 --latencia 0.5 --concorrencia 8
+    cd backend && python -m scripts.carga_ia --free 300 --free-concorrencia 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+from scripts.banco_temporario import preparar_banco
+from scripts.servidor_stub import ServidorStub
+
+# Atraso do event loop acima disso indica chamada bloqueante no caminho
+LIMITE_ATRASO_LOOP_SEGUNDOS = 0.05
+
+# p95 do Free durante a carga de IA: até 2x o p95 sozinho, com folga fixa
+# para o ruído de latências de poucos milissegundos
+FATOR_P95_FREE = 2.0
+FOLGA_P95_FREE_SEGUNDOS = 0.05
+
+
+def _responder_messages(caminho: str, corpo) -> tuple[int, dict]:
+    """Resposta no formato da Messages API."""
+    if not caminho.startswith("/v1/messages"):
+        return 404, {"type": "error", "error": {"type": "not_found_error", "message": caminho}}
+    return 200, {
+        "id": "msg_carga",
+        "type": "message",
+        "role": "assistant",
+        "model": corpo["model"],
+        "content": [{"type": "text", "text": "Resumo gerado pelo servidor fake."}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 120, "output_tokens": 40},
+    }
+
+
+async def _medir_atraso_loop(parar: asyncio.Event, atrasos: list[float], intervalo: float = 0.01) -> None:
+    """Acorda a cada `intervalo` e anota quanto o loop demorou além disso."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        atrasos.append(time.perf_counter() - inicio - intervalo)
+
+
+def _payload_free(i: int) -> dict:
+    """Corpo do POST /api/v1/analise/nova de um usuário Free (sem usuario_id)."""
+    return {
+        "nome_empresa": f"Empresa Free {i}",
+        "email": f"free{i % 50}@exemplo.com",
+        "setor": "servicos",
+        "estado": "SP",
+        "mes_referencia": 9,
+        "ano_referencia": 2026,
+        "receita_historico": {"tres_meses_atras": 50000, "dois_meses_atras": 52000, "mes_passado": 51000},
+        "receita_atual": 55000 + i,
+        "custo_vendas": 20000,
+        "despesas_fixas": 15000,
+        "caixa_bancos": 30000,
+        "contas_receber": 10000,
+        "contas_pagar": 8000,
+        "num_funcionarios": 5,
+    }
+
+
+async def _requisicoes_free(cliente, quantidade: int, concorrencia: int) -> tuple[list[float], int]:
+    """(latências, erros) de `quantidade` POST /analise/nova, `concorrencia` em voo."""
+    semaforo = asyncio.Semaphore(concorrencia)
+    latencias: list[float] = []
+    erros = 0
+
+    async def _uma(i: int) -> None:
+        nonlocal erros
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await cliente.post("/api/v1/analise/nova", json=_payload_free(i))
+            latencias.append(time.perf_counter() - inicio)
+            if resposta.status_code != 201:
+                erros += 1
+
+    await asyncio.gather(*(_uma(i) for i in range(quantidade)))
+    return latencias, erros
+
+
+async def _carga(chamadas: int, free: int, free_concorrencia: int) -> dict:
+    import httpx
+
+    import main
+    from services.email_service import fechar_http_client
+    from services.ia_client import fechar_cliente, gerar_texto, get_client
+
+    async def _uma(i: int) -> float:
+        inicio = time.perf_counter()
+        await gerar_texto(
+            system="Você é um consultor financeiro.",
+            messages=[{"role": "user", "content": f"Análise {i}"}],
+            max_tokens=300,
+        )
+        return time.perf_counter() - inicio
+
+    # O SDK é importado no primeiro uso (get_client): custo único do worker,
+    # medido à parte para não aparecer como travamento durante a carga
+    inicio = time.perf_counter()
+    get_client()
+    aquecimento = time.perf_counter() - inicio
+
+    transporte = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://carga") as cliente:
+        # Referência: o Free sozinho (o aquecimento tira imports e pool da conta)
+        await _requisicoes_free(cliente, 5, 1)
+        free_sozinho, erros_sozinho = await _requisicoes_free(cliente, free, free_concorrencia)
+
+        parar = asyncio.Event()
+        atrasos: list[float] = []
+        medidor = asyncio.create_task(_medir_atraso_loop(parar, atrasos))
+
+        inicio = time.perf_counter()
+        try:
+            geracoes = asyncio.gather(*(_uma(i) for i in range(chamadas)))
+            free_com_ia, erros_com_ia = await _requisicoes_free(cliente, free, free_concorrencia)
+            free_terminou_antes = not geracoes.done()
+            latencias = await geracoes
+        finally:
+            total = time.perf_counter() - inicio
+            parar.set()
+            await medidor
+            await fechar_cliente()
+            await fechar_http_client()
+
+    return {
+        "latencias": list(latencias),
+        "atrasos": atrasos,
+        "total": total,
+        "aquecimento": aquecimento,
+        "free_sozinho": free_sozinho,
+        "free_com_ia": free_com_ia,
+        "erros_free": erros_sozinho + erros_com_ia,
+        "free_terminou_antes": free_terminou_antes,
+    }
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Carga do ia_client contra um servidor fake da Claude API")
+    parser.add_argument("--chamadas", type=int, default=100, help="gerações disparadas de uma vez (padrão: 100)")
+    parser.add_argument("--latencia", type=float, default=0.2, help="segundos por resposta no fake (padrão: 0.2)")
+    parser.add_argument("--concorrencia", type=int, default=None, help="IA_MAX_CONCORRENCIA (padrão: o do config)")
+    parser.add_argument("--free", type=int, default=100,
+                        help="POST /analise/nova Free por fase, sozinho e com IA (padrão: 100)")
+    parser.add_argument("--free-concorrencia", type=int, default=5, help="requisições Free em voo (padrão: 5)")
+    parser.add_argument("--banco", default=None, help="URL do banco (padrão: SQLite temporário)")
+    args = parser.parse_args()
+
+    brevo = ServidorStub(lambda caminho, corpo: (201, {"messageId": "<carga@fake>"}))
+    with ServidorStub(_responder_messages, latencia=args.latencia) as stub, brevo:
+        # O settings é lido no import do ia_client: ambiente primeiro
+        os.environ["ANTHROPIC_BASE_URL"] = stub.url
+        os.environ["ANTHROPIC_API_KEY"] = "chave-de-carga"
+        os.environ["BREVO_API_KEY"] = "chave-de-carga"
+        os.environ["IA_CACHE_ATIVO"] = "false"
+        if args.concorrencia is not None:
+            os.environ["IA_MAX_CONCORRENCIA"] = str(args.concorrencia)
+        preparar_banco(args.banco)
+
+        from config import get_settings
+        from services import email_service
+        limite = get_settings().IA_MAX_CONCORRENCIA
+        email_service.BREVO_API_URL = f"{brevo.url}/v3/smtp/email"
+        import main  # noqa: F401 — configura os logs; depois, só WARNING (uma linha por requisição distorce)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        r = asyncio.run(_carga(args.chamadas, args.free, args.free_concorrencia))
+    latencias, atrasos, total, aquecimento = r["latencias"], r["atrasos"], r["total"], r["aquecimento"]
+
+    print(f"[CargaIA] primeiro uso do cliente (import do SDK): {aquecimento * 1000:.0f} ms, fora da medição")
+    minimo_teorico = args.chamadas / limite * args.latencia
+    print(f"[CargaIA] {args.chamadas} gerações em {total:.2f}s ({args.chamadas / total:.1f}/s; "
+          f"mínimo com {limite} simultâneas: {minimo_teorico:.2f}s)")
+    print(f"[CargaIA] latência por geração: p50 {statistics.median(latencias) * 1000:.0f} ms, "
+          f"p95 {_percentil(latencias, 0.95) * 1000:.0f} ms (inclui a fila do semáforo)")
+    print(f"[CargaIA] pico de chamadas simultâneas no servidor: {stub.pico_simultaneas} "
+          f"(IA_MAX_CONCORRENCIA={limite})")
+    atraso_max = max(atrasos, default=0.0)
+    print(f"[CargaIA] atraso do event loop: máx {atraso_max * 1000:.1f} ms, "
+          f"p95 {_percentil(atrasos, 0.95) * 1000 if atrasos else 0:.1f} ms")
+    p95_sozinho = _percentil(r["free_sozinho"], 0.95)
+    p95_com_ia = _percentil(r["free_com_ia"], 0.95)
+    limite_p95 = p95_sozinho * FATOR_P95_FREE + FOLGA_P95_FREE_SEGUNDOS
+    print(f"[CargaIA] /analise/nova Free ({args.free} por fase, {args.free_concorrencia} em voo): "
+          f"p95 sozinho {p95_sozinho * 1000:.0f} ms, com IA {p95_com_ia * 1000:.0f} ms "
+          f"(limite {limite_p95 * 1000:.0f} ms)")
+
+    falhas = []
+    if stub.requisicoes != args.chamadas:
+        falhas.append(f"servidor recebeu {stub.requisicoes} chamadas (esperado {args.chamadas})")
+    if stub.pico_simultaneas > limite:
+        falhas.append(f"pico de {stub.pico_simultaneas} chamadas simultâneas passou do limite {limite}")
+    if atraso_max > LIMITE_ATRASO_LOOP_SEGUNDOS:
+        falhas.append(f"event loop travou {atraso_max * 1000:.0f} ms")
+    if r["erros_free"]:
+        falhas.append(f"{r['erros_free']} requisições Free sem 201")
+    if not r["free_terminou_antes"]:
+        falhas.append("as gerações acabaram antes do Free: aumente --chamadas ou --latencia")
+    if p95_com_ia > limite_p95:
+        falhas.append(f"p95 do Free subiu de {p95_sozinho * 1000:.0f} para {p95_com_ia * 1000:.0f} ms com IA")
+    for falha in falhas:
+        print(f"[CargaIA] ❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
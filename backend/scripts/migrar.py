@@ -0,0 +1,40 @@
+"""
+Aplica as migrações pendentes do banco (ver migracoes.py)
+
+Rodar no deploy, antes de subir os workers:
+
+    cd backend && python -m scripts.migrar            # aplica
+    cd backend && python -m scripts.migrar --status   # só lista (exit 1 se houver pendente)
+"""
+
+import argparse
+import sys
+import time
+
+from logs import configurar_logs
+from migracoes import MIGRACOES, aplicar_migracoes, migracoes_pendentes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Migrações versionadas do banco")
+    parser.add_argument("--status", action="store_true", help="lista as pendentes sem aplicar")
+    args = parser.parse_args()
+    # Progresso de cada migração sai pelo logger do migracoes.py
+    configurar_logs()
+
+    if args.status:
+        pendentes = {m.versao for m in migracoes_pendentes()}
+        for migracao in MIGRACOES:
+            marca = "pendente" if migracao.versao in pendentes else "aplicada"
+            print(f"[Migration] {migracao.versao:03d} {marca:<8} — {migracao.descricao}")
+        return 1 if pendentes else 0
+
+    inicio = time.monotonic()
+    aplicadas = aplicar_migracoes()
+    duracao = time.monotonic() - inicio
+    print(f"[Migration] ✅ {len(aplicadas)} migração(ões) aplicada(s) em {duracao:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark do AnaliseView: ler os campos direto da linha do ORM
+(float(Decimal) a cada acesso, como era) x converter uma vez para o
+dataclass com slots e ler dele
+
+Usa análises sintéticas em memória (mesmo gerador do perfil_serializacao)
+— não precisa de banco. Mede:
+
+- o custo de uma leitura de campo em cada caminho
+- gerar_blocos_indicadores + gerar_plano_acao lendo da linha do ORM x
+  AnaliseView.de + as mesmas funções lendo da view (conversão incluída)
+
+e confere que os dois caminhos geram o mesmo resultado.
+
+    cd backend && python -m scripts.perfil_analise_view
+    cd backend && python -m scripts.perfil_analise_view --analises 500 --repeticoes 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+
+from routers.dashboard import AnaliseView, gerar_blocos_indicadores, gerar_plano_acao
+from scripts.perfil_serializacao import analise_sintetica
+
+
+class _LeituraORM:
+    """
+    Lê da linha do ORM a cada acesso, convertendo Decimal em float na hora —
+    o que o dashboard fazia antes (float(analise.margem_bruta) em cada uso).
+    Conta as leituras para mostrar quantas um dashboard faz.
+    """
+
+    __slots__ = ("_analise", "leituras")
+
+    def __init__(self, analise):
+        self._analise = analise
+        self.leituras = 0
+
+    def __getattr__(self, nome):
+        self.leituras += 1
+        valor = getattr(self._analise, nome)
+        if isinstance(valor, Decimal):
+            return float(valor)
+        if valor is None and nome in ("pontos_fortes", "pontos_atencao"):
+            return []
+        return valor
+
+
+def _montar(fonte) -> tuple:
+    return gerar_blocos_indicadores(fonte), gerar_plano_acao(fonte)
+
+
+def _por_chamada(funcao, itens: list, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for item in itens:
+            funcao(item)
+    return (time.perf_counter() - inicio) / (repeticoes * len(itens))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Dashboard lendo do ORM x do AnaliseView")
+    parser.add_argument("--analises", type=int, default=200, help="análises distintas (padrão: 200)")
+    parser.add_argument("--repeticoes", type=int, default=20, help="passadas por análise (padrão: 20)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    analises = [analise_sintetica(rng) for _ in range(args.analises)]
+
+    divergentes = sum(
+        json.dumps(_montar(_LeituraORM(a)), default=str) != json.dumps(_montar(AnaliseView.de(a)), default=str)
+        for a in analises
+    )
+    if divergentes:
+        print(f"[AnaliseView] ❌ {divergentes} análise(s) com resultado diferente entre os dois caminhos")
+        return 1
+
+    contador = _LeituraORM(analises[0])
+    _montar(contador)
+    leituras = contador.leituras
+
+    # Custo de uma leitura de campo Numeric em cada caminho
+    views = [AnaliseView.de(a) for a in analises]
+    leitura_orm = _por_chamada(lambda a: float(a.margem_bruta), analises, args.repeticoes * 10)
+    leitura_view = _por_chamada(lambda v: v.margem_bruta, views, args.repeticoes * 10)
+    conversao = _por_chamada(AnaliseView.de, analises, args.repeticoes)
+
+    # Blocos + plano de ação completos (na view, a conversão entra na conta)
+    orm = _por_chamada(lambda a: _montar(_LeituraORM(a)), analises, args.repeticoes)
+    view = _por_chamada(lambda a: _montar(AnaliseView.de(a)), analises, args.repeticoes)
+
+    print(f"[AnaliseView] leitura de um campo Numeric: ORM + float() {leitura_orm * 1e9:6.0f} ns, "
+          f"view {leitura_view * 1e9:6.0f} ns")
+    print(f"[AnaliseView] AnaliseView.de (uma vez por request): {conversao * 1e6:6.1f} µs; "
+          f"blocos + plano leem {leituras} campos")
+    print(f"[AnaliseView] blocos + plano lendo do ORM:  {orm * 1e6:8.1f} µs por análise")
+    print(f"[AnaliseView] blocos + plano com a view:    {view * 1e6:8.1f} µs por análise "
+          f"({orm / view:.2f}x, mesmo resultado)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Mede o envio dos e-mails de cron contra um Brevo fake local: um POST por
+destinatário (como era) x enviar_emails_em_lote (messageVersions)
+
+Sobe um stub de POST /v3/smtp/email com latência simulada e aponta
+BREVO_API_URL para ele. Três caminhos, mesmos e-mails (lembrete mensal):
+
+- individual, cliente novo por e-mail: o enviar_email antigo (handshake a cada envio)
+- individual, cliente compartilhado: enviar_email atual, um a um
+- lote: enviar_emails_em_lote (até MAX_VERSOES_POR_LOTE por chamada)
+
+Confere que o servidor recebeu todos os destinatários nos três caminhos.
+
+    cd backend && python -m scripts.perfil_brevo
+    cd backend && python -m scripts.perfil_brevo --destinatarios 2000 --latencia 0.08
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from scripts.servidor_stub import ServidorStub
+
+
+class _BrevoFake:
+    """Responde como o Brevo e conta os destinatários recebidos."""
+
+    def __init__(self):
+        self.destinatarios = 0
+
+    def __call__(self, caminho: str, corpo) -> tuple[int, dict]:
+        versoes = corpo.get("messageVersions")
+        if versoes:
+            self.destinatarios += len(versoes)
+            return 201, {"messageIds": [f"<lote-{i}@fake>" for i in range(len(versoes))]}
+        self.destinatarios += len(corpo["to"])
+        return 201, {"messageId": "<avulso@fake>"}
+
+
+def _emails(quantidade: int) -> list[dict]:
+    from services.email_service import montar_email_lembrete_mensal
+
+    return [
+        montar_email_lembrete_mensal(
+            nome_empresa=f"Empresa {i}",
+            email=f"perfil{i}@exemplo.com",
+            score_anterior=60 + i % 40,
+            folego_anterior=30 + i % 60,
+            dias_desde_analise=30,
+            mes_ultima_analise="setembro",
+        )
+        for i in range(quantidade)
+    ]
+
+
+async def _individual_cliente_novo(emails: list[dict]) -> int:
+    """Como era antes do cliente compartilhado: um AsyncClient por e-mail."""
+    from services import email_service
+
+    enviados = 0
+    for email in emails:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0)) as client:
+            resposta = await client.post(
+                email_service.BREVO_API_URL,
+                json={
+                    "sender": {"name": email_service.DEFAULT_SENDER_NAME, "email": email_service.DEFAULT_SENDER_EMAIL},
+                    "to": [{"email": email["para_email"], "name": email["para_nome"]}],
+                    "subject": email["assunto"],
+                    "htmlContent": email["html_content"],
+                },
+                headers=email_service._headers_brevo(),
+            )
+        enviados += resposta.status_code in (200, 201)
+    return enviados
+
+
+async def _individual_compartilhado(emails: list[dict]) -> int:
+    from services.email_service import enviar_email
+
+    enviados = 0
+    for email in emails:
+        enviados += await enviar_email(**email)
+    return enviados
+
+
+async def _lote(emails: list[dict]) -> int:
+    from services.email_service import enviar_emails_em_lote
+
+    return sum(await enviar_emails_em_lote(emails))
+
+
+async def _medir(funcao, emails: list[dict]) -> tuple[float, int]:
+    from services.email_service import fechar_http_client
+
+    inicio = time.perf_counter()
+    try:
+        enviados = await funcao(emails)
+    finally:
+        await fechar_http_client()
+    return time.perf_counter() - inicio, enviados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Envio de e-mails de cron: individual x lote (Brevo fake)")
+    parser.add_argument("--destinatarios", type=int, default=500, help="e-mails por caminho (padrão: 500)")
+    parser.add_argument("--latencia", type=float, default=0.03, help="segundos por chamada no fake (padrão: 0.03)")
+    args = parser.parse_args()
+
+    # A chave é lida do settings no import do email_service
+    os.environ["BREVO_API_KEY"] = "chave-de-perfil"
+    from services import email_service
+
+    logging_nivel = email_service.logger.level
+    # Uma linha de log por e-mail enviado distorceria a medição
+    email_service.logger.setLevel("WARNING")
+
+    emails = _emails(args.destinatarios)
+    caminhos = [
+        ("individual, cliente novo por e-mail", _individual_cliente_novo),
+        ("individual, cliente compartilhado", _individual_compartilhado),
+        ("lote (messageVersions)", _lote),
+    ]
+
+    falhas = 0
+    tempos = []
+    for nome, funcao in caminhos:
+        brevo = _BrevoFake()
+        with ServidorStub(brevo, latencia=args.latencia) as stub:
+            email_service.BREVO_API_URL = f"{stub.url}/v3/smtp/email"
+            tempo, enviados = asyncio.run(_medir(funcao, emails))
+
+        tempos.append(tempo)
+        print(f"[Brevo] {nome:38s} {tempo:7.2f}s  {stub.requisicoes:5d} chamadas  "
+              f"({args.destinatarios / tempo:8.1f} e-mails/s)")
+        if enviados != args.destinatarios or brevo.destinatarios != args.destinatarios:
+            print(f"[Brevo] ❌ {nome}: {enviados} enviados, {brevo.destinatarios} recebidos "
+                  f"(esperado {args.destinatarios})")
+            falhas += 1
+
+    email_service.logger.setLevel(logging_nivel)
+    print(f"[Brevo] lote x individual com cliente novo: {tempos[0] / tempos[2]:.0f}x mais rápido")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Carga no POST /api/v1/analise/nova: versão síncrona (Session no threadpool,
+como era) x versão assíncrona atual (AsyncSession no event loop)
+
+Sobe a aplicação em processo (httpx + ASGITransport, sem uvicorn) sobre um
+banco descartável, registra ao lado a versão síncrona antiga do endpoint
+(mesmos helpers, Session/get_db) e dispara --requisicoes criações com
+--concorrencia em voo. Enquanto isso, um cliente leve chama GET /health
+e um medidor anota o atraso do event loop. Os e-mails pós-conclusão vão
+para um Brevo fake local.
+
+Por versão: vazão, latência (p50/p95) e erros; do lado: latência do
+/health durante a carga e atraso máximo do loop. No fim, confere que cada
+201 virou uma linha em analises.
+
+    cd backend && python -m scripts.perfil_criar_analise
+    cd backend && python -m scripts.perfil_criar_analise --requisicoes 1000 --concorrencia 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+from scripts.banco_temporario import preparar_banco
+from scripts.servidor_stub import ServidorStub
+
+ROTA_ASSINCRONA = "/api/v1/analise/nova"
+ROTA_SINCRONA = "/perfil/analise/nova-sincrona"
+
+# Requisições de aquecimento por versão (também gravam análises)
+AQUECIMENTO = 5
+
+
+def _payload(i: int) -> dict:
+    return {
+        "nome_empresa": f"Empresa {i}",
+        "email": f"carga{i % 200}@exemplo.com",
+        "setor": "servicos",
+        "estado": "SP",
+        "mes_referencia": 9,
+        "ano_referencia": 2026,
+        "receita_historico": {"tres_meses_atras": 50000, "dois_meses_atras": 52000, "mes_passado": 51000},
+        "receita_atual": 55000 + i,
+        "custo_vendas": 20000,
+        "despesas_fixas": 15000,
+        "caixa_bancos": 30000,
+        "contas_receber": 10000,
+        "contas_pagar": 8000,
+        "num_funcionarios": 5,
+    }
+
+
+def _registrar_rota_sincrona(app) -> None:
+    """O criar_analise de antes da AsyncSession, com os helpers de hoje."""
+    from fastapi import BackgroundTasks, Depends
+    from sqlalchemy.orm import Session
+
+    from database import get_db
+    from models.usuario import Usuario
+    from routers.analise import _montar_resposta, _nova_analise
+    from schemas.analise import AnaliseResponse, DadosAnaliseInput
+    from services.diagnostico import gerar_diagnostico
+    from services.email_service import enviar_email_pos_conclusao
+    from services.ia_jobs import enfileirar_geracao_ia
+    from services.indicadores import calcular_indicadores
+    from services.resumo_analises import registrar_nova_analise
+
+    def criar_analise_sincrona(
+        dados: DadosAnaliseInput,
+        background_tasks: BackgroundTasks,
+        db: Session = Depends(get_db),
+    ):
+        indicadores = calcular_indicadores(dados)
+        diagnostico = gerar_diagnostico(dados, indicadores)
+
+        usuario_id = dados.usuario_id or None
+        if usuario_id:
+            usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
+            if not usuario or not usuario.pro_ativo:
+                usuario_id = None
+
+        analise = _nova_analise(dados, indicadores, diagnostico, usuario_id)
+        db.add(analise)
+        db.flush()
+        registrar_nova_analise(db, analise)
+        if usuario_id:
+            enfileirar_geracao_ia(db, analise.id)
+        db.commit()
+        db.refresh(analise)
+
+        background_tasks.add_task(
+            enviar_email_pos_conclusao,
+            nome_empresa=analise.nome_empresa,
+            email=analise.email,
+            analise_id=str(analise.id),
+        )
+        return _montar_resposta(analise, indicadores)
+
+    app.add_api_route(
+        ROTA_SINCRONA, criar_analise_sincrona, methods=["POST"],
+        response_model=AnaliseResponse, status_code=201, include_in_schema=False,
+    )
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+async def _carga(app, rota: str, requisicoes: int, concorrencia: int) -> dict:
+    import httpx
+
+    latencias: list[float] = []
+    latencias_health: list[float] = []
+    atrasos_loop: list[float] = []
+    erros = 0
+    fim = asyncio.Event()
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://perfil") as cliente:
+
+        async def _criar(i: int) -> None:
+            nonlocal erros
+            async with semaforo:
+                inicio = time.perf_counter()
+                resposta = await cliente.post(rota, json=_payload(i))
+                latencias.append(time.perf_counter() - inicio)
+                if resposta.status_code != 201:
+                    erros += 1
+
+        async def _health() -> None:
+            while not fim.is_set():
+                inicio = time.perf_counter()
+                await cliente.get("/health")
+                latencias_health.append(time.perf_counter() - inicio)
+                await asyncio.sleep(0.02)
+
+        async def _medir_loop() -> None:
+            while not fim.is_set():
+                inicio = time.perf_counter()
+                await asyncio.sleep(0.01)
+                atrasos_loop.append(time.perf_counter() - inicio - 0.01)
+
+        auxiliares = [asyncio.create_task(_health()), asyncio.create_task(_medir_loop())]
+        inicio = time.perf_counter()
+        await asyncio.gather(*(_criar(i) for i in range(requisicoes)))
+        total = time.perf_counter() - inicio
+        fim.set()
+        await asyncio.gather(*auxiliares)
+
+    return {
+        "total": total,
+        "latencias": latencias,
+        "health": latencias_health,
+        "atraso_loop": max(atrasos_loop, default=0.0),
+        "erros": erros,
+    }
+
+
+async def _medir(app, requisicoes: int, concorrencia: int) -> dict:
+    """Roda as duas versões no mesmo event loop (o cliente HTTP do Brevo é global)."""
+    from services.email_service import fechar_http_client
+
+    resultados = {}
+    for nome, rota in (("síncrona (threadpool)", ROTA_SINCRONA), ("assíncrona (atual)", ROTA_ASSINCRONA)):
+        # Aquecimento: imports preguiçosos e pool de conexões fora da medição
+        await _carga(app, rota, AQUECIMENTO, 1)
+        resultados[nome] = await _carga(app, rota, requisicoes, concorrencia)
+    await fechar_http_client()
+    return resultados
+
+
+def _total_analises() -> int:
+    from sqlalchemy import func, select
+
+    from database import SessionLocal
+    from models.analise import Analise
+
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Analise))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="POST /analise/nova: sessão síncrona x assíncrona sob carga")
+    parser.add_argument("--requisicoes", type=int, default=300, help="criações por versão (padrão: 300)")
+    parser.add_argument("--concorrencia", type=int, default=20, help="requisições em voo (padrão: 20)")
+    parser.add_argument("--banco", default=None, help="URL do banco (padrão: SQLite temporário)")
+    args = parser.parse_args()
+
+    os.environ["BREVO_API_KEY"] = "chave-de-perfil"
+    preparar_banco(args.banco)
+
+    with ServidorStub(lambda caminho, corpo: (201, {"messageId": "<perfil@fake>"})) as brevo:
+        import main as aplicacao
+        from services import email_service
+
+        email_service.BREVO_API_URL = f"{brevo.url}/v3/smtp/email"
+        # Uma linha de log por requisição distorceria a medição
+        logging.getLogger().setLevel(logging.WARNING)
+        _registrar_rota_sincrona(aplicacao.app)
+
+        resultados = asyncio.run(_medir(aplicacao.app, args.requisicoes, args.concorrencia))
+
+    gravadas = _total_analises()
+    esperadas = len(resultados) * (args.requisicoes + AQUECIMENTO)
+
+    print(f"[CriarAnalise] {args.requisicoes} requisições, {args.concorrencia} em voo")
+    for nome, r in resultados.items():
+        print(
+            f"[CriarAnalise] {nome:22s} {args.requisicoes / r['total']:7.1f} req/s  "
+            f"p50 {statistics.median(r['latencias']) * 1000:6.0f} ms  "
+            f"p95 {_percentil(r['latencias'], 0.95) * 1000:6.0f} ms  "
+            f"/health p95 {_percentil(r['health'], 0.95) * 1000:5.0f} ms  "
+            f"loop máx {r['atraso_loop'] * 1000:5.0f} ms  erros {r['erros']}"
+        )
+
+    print(f"[CriarAnalise] análises gravadas: {gravadas}")
+
+    falhas = [f"{nome}: {r['erros']} requisições sem 201" for nome, r in resultados.items() if r["erros"]]
+    if gravadas != esperadas:
+        falhas.append(f"{gravadas} análises gravadas (esperado {esperadas})")
+    for falha in falhas:
+        print(f"[CriarAnalise] ❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
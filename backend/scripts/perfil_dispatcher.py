@@ -0,0 +1,199 @@
+"""
+Mede o disparo em massa do email_dispatcher contra um Brevo fake local
+
+Cria --destinatarios usuários num banco descartável, monta o lembrete
+mensal de cada um (como o cron) e chama despachar_emails com AsyncSession
+— lotes em paralelo, rate limit e commit da marcação por lote. Compara
+com o envio antigo (um await por destinatário), estimado a partir de uma
+amostra enviada um a um.
+
+Confere que:
+- todos os destinatários chegaram ao servidor e foram marcados no banco
+- o servidor nunca viu mais que EMAIL_MAX_CONCORRENCIA chamadas simultâneas
+- a taxa de chamadas respeitou EMAIL_REQUISICOES_POR_SEGUNDO
+
+    cd backend && python -m scripts.perfil_dispatcher
+    cd backend && python -m scripts.perfil_dispatcher --destinatarios 20000 --latencia 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from scripts.banco_temporario import preparar_banco
+from scripts.servidor_stub import ServidorStub
+
+# Chamadas do envio antigo usadas para estimar o tempo total dele
+AMOSTRA_SEQUENCIAL = 20
+
+
+class _BrevoFake:
+    """Responde como o Brevo, conta destinatários e anota o instante de cada chamada."""
+
+    def __init__(self):
+        self.destinatarios = 0
+        self.instantes: list[float] = []
+
+    def __call__(self, caminho: str, corpo) -> tuple[int, dict]:
+        self.instantes.append(time.monotonic())
+        versoes = corpo.get("messageVersions") or [corpo]
+        self.destinatarios += len(versoes)
+        return 201, {"messageIds": [f"<{i}@fake>" for i in range(len(versoes))]}
+
+
+def _criar_usuarios(quantidade: int) -> None:
+    from sqlalchemy import insert
+
+    from database import SessionLocal
+    from models.usuario import Usuario
+
+    agora = datetime.utcnow()
+    with SessionLocal() as db:
+        db.execute(insert(Usuario), [
+            {
+                "id": uuid.uuid4(),
+                "nome": f"Empresa {i}",
+                "email": f"disparo{i}@exemplo.com",
+                "senha_hash": "x",
+                "plano": "pro",
+                "pro_ativo": True,
+                "created_at": agora,
+                "updated_at": agora,
+            }
+            for i in range(quantidade)
+        ])
+        db.commit()
+
+
+def _montar(usuario) -> dict:
+    from services.email_service import montar_email_lembrete_mensal
+
+    return montar_email_lembrete_mensal(
+        nome_empresa=usuario.nome,
+        email=usuario.email,
+        score_anterior=72,
+        folego_anterior=45,
+        dias_desde_analise=30,
+        mes_ultima_analise="Setembro/2026",
+    )
+
+
+async def _sequencial(amostra: int) -> float:
+    """Segundos por destinatário no envio antigo (enviar_email em sequência)."""
+    from services.email_service import enviar_email, fechar_http_client
+
+    emails = [_montar(SimpleNamespace(nome=f"Amostra {i}", email=f"amostra{i}@exemplo.com"))
+              for i in range(amostra)]
+    inicio = time.perf_counter()
+    for email in emails:
+        await enviar_email(**email)
+    await fechar_http_client()
+    return (time.perf_counter() - inicio) / amostra
+
+
+async def _despachar() -> tuple[float, dict]:
+    from sqlalchemy import select
+
+    from database import AsyncSessionLocal
+    from models.usuario import Usuario
+    from services.email_dispatcher import despachar_emails
+    from services.email_service import fechar_http_client
+
+    hoje = datetime.utcnow()
+
+    def _marcar_enviado(usuario) -> None:
+        usuario.ultimo_lembrete_mensal_em = hoje
+
+    async with AsyncSessionLocal() as db:
+        usuarios = (await db.execute(select(Usuario))).scalars().all()
+        inicio = time.perf_counter()
+        resultado = await despachar_emails(db, usuarios, montar=_montar, marcar_enviado=_marcar_enviado)
+        tempo = time.perf_counter() - inicio
+    await fechar_http_client()
+    return tempo, resultado
+
+
+def _marcados() -> int:
+    from sqlalchemy import func, select
+
+    from database import SessionLocal
+    from models.usuario import Usuario
+
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).where(Usuario.ultimo_lembrete_mensal_em.isnot(None)))
+
+
+def _pico_por_segundo(instantes: list[float]) -> int:
+    """Maior número de chamadas numa janela deslizante de 1s."""
+    pico, inicio = 0, 0
+    for fim, instante in enumerate(instantes):
+        while instante - instantes[inicio] >= 1.0:
+            inicio += 1
+        pico = max(pico, fim - inicio + 1)
+    return pico
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Disparo em massa (email_dispatcher) contra Brevo fake")
+    parser.add_argument("--destinatarios", type=int, default=5000, help="usuários notificados (padrão: 5000)")
+    parser.add_argument("--latencia", type=float, default=0.1, help="segundos por chamada no fake (padrão: 0.1)")
+    parser.add_argument("--banco", default=None, help="URL do banco (padrão: SQLite temporário)")
+    args = parser.parse_args()
+
+    os.environ["BREVO_API_KEY"] = "chave-de-perfil"
+    preparar_banco(args.banco)
+
+    from config import get_settings
+    from services import email_service
+
+    settings = get_settings()
+    # Uma linha de log por chamada distorceria a medição
+    email_service.logger.setLevel("WARNING")
+
+    _criar_usuarios(args.destinatarios)
+
+    with ServidorStub(_BrevoFake(), latencia=args.latencia) as stub:
+        email_service.BREVO_API_URL = f"{stub.url}/v3/smtp/email"
+        por_destinatario = asyncio.run(_sequencial(AMOSTRA_SEQUENCIAL))
+
+    brevo = _BrevoFake()
+    with ServidorStub(brevo, latencia=args.latencia) as stub:
+        email_service.BREVO_API_URL = f"{stub.url}/v3/smtp/email"
+        tempo, resultado = asyncio.run(_despachar())
+
+    marcados = _marcados()
+    estimado_sequencial = por_destinatario * args.destinatarios
+    pico_por_segundo = _pico_por_segundo(brevo.instantes)
+
+    print(f"[Disparo] {args.destinatarios} destinatários em {resultado['lotes']} lotes de "
+          f"{settings.EMAIL_LOTE_TAMANHO}: {tempo:.2f}s")
+    print(f"[Disparo] envio antigo (um await por destinatário): ~{estimado_sequencial:.0f}s "
+          f"(amostra de {AMOSTRA_SEQUENCIAL}: {por_destinatario * 1000:.0f} ms cada) → "
+          f"{estimado_sequencial / tempo:.0f}x")
+    print(f"[Disparo] pico de chamadas simultâneas: {stub.pico_simultaneas} "
+          f"(EMAIL_MAX_CONCORRENCIA={settings.EMAIL_MAX_CONCORRENCIA})")
+    print(f"[Disparo] pico de chamadas em 1s: {pico_por_segundo} "
+          f"(EMAIL_REQUISICOES_POR_SEGUNDO={settings.EMAIL_REQUISICOES_POR_SEGUNDO:g})")
+    print(f"[Disparo] marcados no banco: {marcados}, falhas: {resultado['falhas']}")
+
+    falhas = []
+    if brevo.destinatarios != args.destinatarios or marcados != args.destinatarios:
+        falhas.append(f"{brevo.destinatarios} recebidos e {marcados} marcados (esperado {args.destinatarios})")
+    if stub.pico_simultaneas > settings.EMAIL_MAX_CONCORRENCIA:
+        falhas.append(f"{stub.pico_simultaneas} chamadas simultâneas passou do limite")
+    # O balde começa cheio: até EMAIL_MAX_CONCORRENCIA chamadas de rajada além da taxa
+    limite_por_segundo = settings.EMAIL_REQUISICOES_POR_SEGUNDO + settings.EMAIL_MAX_CONCORRENCIA
+    if pico_por_segundo > limite_por_segundo:
+        falhas.append(f"{pico_por_segundo} chamadas em 1s passou do rate limit")
+    for falha in falhas:
+        print(f"[Disparo] ❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
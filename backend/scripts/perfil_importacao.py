@@ -0,0 +1,82 @@
+"""
+Perfil de importação da API (cold start)
+
+Importa main.py num processo novo com python -X importtime, mostra os
+módulos mais caros (tempo acumulado) e falha (exit 1) se:
+- algum SDK pesado carregado sob demanda entrou no import (reportlab,
+  anthropic, stripe, bcrypt) — alguém voltou a importar no topo do módulo
+- o tempo total passou de --limite-ms (quando informado)
+
+    cd backend && python -m scripts.perfil_importacao
+    cd backend && python -m scripts.perfil_importacao --top 30 --limite-ms 1500
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Carregados só no primeiro uso (ver ia_client, stripe_service, auth_service, report)
+MODULOS_SOB_DEMANDA = ["reportlab", "anthropic", "stripe", "bcrypt"]
+
+# "import time:       self [us] |  cumulative | imported package"
+LINHA_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)$")
+
+
+def _medir() -> list[tuple[str, int, int]]:
+    """Roda o import em processo limpo. Retorna (módulo, self_us, acumulado_us)."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+    )
+    if processo.returncode != 0:
+        print(processo.stderr[-2000:])
+        raise SystemExit("[Importação] ❌ Falha ao importar main.py")
+
+    medidas = []
+    for linha in processo.stderr.splitlines():
+        casou = LINHA_IMPORTTIME.match(linha)
+        if casou:
+            proprio, acumulado, modulo = casou.groups()
+            medidas.append((modulo, int(proprio), int(acumulado)))
+    return medidas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Perfil de importação da API")
+    parser.add_argument("--top", type=int, default=20, help="quantos módulos listar")
+    parser.add_argument("--limite-ms", type=float, default=None, help="falha se o import total passar disso")
+    args = parser.parse_args()
+
+    medidas = _medir()
+    total_ms = next((acc for modulo, _, acc in medidas if modulo == "main"), 0) / 1000
+
+    print(f"[Importação] import main: {total_ms:.0f} ms\n")
+    print(f"{'acumulado':>11} {'próprio':>9}  módulo")
+    for modulo, proprio, acumulado in sorted(medidas, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{acumulado / 1000:>9.1f}ms {proprio / 1000:>7.1f}ms  {modulo}")
+
+    # Submódulo (ex: reportlab.pdfgen) conta como o pacote
+    carregados = {modulo.split(".")[0] for modulo, *_ in medidas}
+    indevidos = [m for m in MODULOS_SOB_DEMANDA if m in carregados]
+
+    falhou = False
+    if indevidos:
+        falhou = True
+        print(f"\n[Importação] ❌ Carregados no startup (deviam ser sob demanda): {', '.join(indevidos)}")
+    if args.limite_ms is not None and total_ms > args.limite_ms:
+        falhou = True
+        print(f"\n[Importação] ❌ {total_ms:.0f} ms > limite de {args.limite_ms:.0f} ms")
+
+    if not falhou:
+        print("\n[Importação] ✅ Cold start dentro do esperado")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Mede a seleção de candidatos do cron de lembrete mensal com muitos usuários Pro
+
+Popula um banco descartável com --usuarios Pro (padrão: 50 mil), de 1 a 4
+análises cada (10% sem análise), reconstrói os resumos e compara três
+formas de achar quem recebe o lembrete hoje:
+
+- 2N+1: 1ª análise de cada usuário e, no dia certo, a última — uma query
+  por usuário (como era); medido numa amostra e extrapolado
+- window function: MIN()/ROW_NUMBER() OVER sobre analises numa query só
+  (primeira versão da otimização)
+- resumo: buscar_candidatos_lembrete do cron (JOIN com resumo_analises_usuario)
+
+Confere que as três escolhem os mesmos usuários com a mesma última análise.
+
+    cd backend && python -m scripts.perfil_lembrete_mensal
+    cd backend && python -m scripts.perfil_lembrete_mensal --usuarios 200000 --amostra 5000
+"""
+
+import argparse
+import asyncio
+import calendar
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from scripts.banco_temporario import preparar_banco
+
+# Dia fixo: o mesmo seed escolhe sempre os mesmos candidatos
+HOJE = datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc)
+
+INSERCAO_POR_VEZ = 5000
+
+
+def _popular(quantidade: int, rng: random.Random) -> int:
+    """Usuários Pro + análises; retorna quantas análises foram criadas."""
+    from sqlalchemy import insert
+
+    from database import SessionLocal
+    from models.analise import Analise
+    from models.usuario import Usuario
+    from services.resumo_analises import reconstruir_resumos
+
+    agora = datetime.utcnow()
+    usuarios, analises = [], []
+    for i in range(quantidade):
+        usuario_id = uuid.uuid4()
+        email = f"pro{i}@exemplo.com"
+        usuarios.append({
+            "id": usuario_id, "nome": f"Empresa {i}", "email": email, "senha_hash": "x",
+            "plano": "pro", "pro_ativo": True, "created_at": agora, "updated_at": agora,
+        })
+        if rng.random() < 0.10:
+            continue
+
+        criada_em = HOJE.replace(tzinfo=None) - timedelta(days=rng.randint(40, 400), minutes=rng.randint(0, 1440))
+        for _ in range(rng.randint(1, 4)):
+            analises.append({
+                "id": uuid.uuid4(), "usuario_id": str(usuario_id), "email": email,
+                "nome_empresa": f"Empresa {i}", "setor": "servicos", "estado": "SP",
+                "mes_referencia": criada_em.month, "ano_referencia": criada_em.year,
+                "receita_3_meses_atras": 1, "receita_2_meses_atras": 1, "receita_mes_passado": 1,
+                "receita_atual": 1, "custo_vendas": 1, "despesas_fixas": 1, "caixa_bancos": 1,
+                "contas_receber": 1, "contas_pagar": 1, "num_funcionarios": 1,
+                "score_saude": rng.randint(0, 100), "folego_caixa": rng.randint(0, 180),
+                "arquivada": False, "created_at": criada_em, "updated_at": criada_em,
+            })
+            criada_em += timedelta(days=rng.randint(20, 40))
+
+    with SessionLocal() as db:
+        for tabela, linhas in ((Usuario, usuarios), (Analise, analises)):
+            for inicio in range(0, len(linhas), INSERCAO_POR_VEZ):
+                db.execute(insert(tabela), linhas[inicio:inicio + INSERCAO_POR_VEZ])
+        reconstruir_resumos(db)
+        db.commit()
+    return len(analises)
+
+
+def _dia_alvo(primeira_em: datetime) -> bool:
+    """Mesma regra do _filtro_dia_aniversario, em Python."""
+    ultimo_dia = calendar.monthrange(HOJE.year, HOJE.month)[1]
+    if HOJE.day == ultimo_dia:
+        return primeira_em.day >= HOJE.day
+    return primeira_em.day == HOJE.day
+
+
+def _por_usuario(amostra: int) -> tuple[float, float, int, set, dict]:
+    """
+    Versão 2N+1: (segundos da lista de Pro, segundos do laço na amostra,
+    usuários Pro, ids da amostra, candidatos da amostra).
+    """
+    from database import SessionLocal
+    from models.analise import Analise
+    from models.usuario import Usuario
+
+    candidatos = {}
+    with SessionLocal() as db:
+        inicio = time.perf_counter()
+        usuarios_pro = db.query(Usuario).filter(Usuario.pro_ativo == True).all()
+        tempo_lista = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for usuario in usuarios_pro[:amostra]:
+            primeira = (
+                db.query(Analise)
+                .filter(Analise.usuario_id == str(usuario.id))
+                .order_by(Analise.created_at.asc())
+                .first()
+            )
+            if not primeira or not _dia_alvo(primeira.created_at):
+                continue
+            ultima = (
+                db.query(Analise)
+                .filter(Analise.usuario_id == str(usuario.id))
+                .order_by(Analise.created_at.desc())
+                .first()
+            )
+            candidatos[usuario.id] = (ultima.created_at, int(ultima.score_saude))
+        tempo = time.perf_counter() - inicio
+        ids_amostra = {usuario.id for usuario in usuarios_pro[:amostra]}
+    return tempo_lista, tempo, len(usuarios_pro), ids_amostra, candidatos
+
+
+def _janela() -> tuple[float, dict]:
+    """Versão com window function sobre analises."""
+    from sqlalchemy import String, and_, cast, func, select
+
+    from database import SessionLocal
+    from models.analise import Analise
+    from models.usuario import Usuario
+    from routers.cron import _filtro_dia_aniversario
+
+    janela = (
+        select(
+            Analise.usuario_id,
+            Analise.created_at,
+            Analise.score_saude,
+            func.min(Analise.created_at).over(partition_by=Analise.usuario_id).label("primeira_em"),
+            func.row_number()
+                .over(partition_by=Analise.usuario_id, order_by=Analise.created_at.desc())
+                .label("ordem"),
+        )
+        .where(Analise.usuario_id.isnot(None))
+        .subquery()
+    )
+    with SessionLocal() as db:
+        inicio = time.perf_counter()
+        linhas = db.execute(
+            select(Usuario, janela.c.created_at, janela.c.score_saude)
+            .join(janela, and_(janela.c.usuario_id == cast(Usuario.id, String), janela.c.ordem == 1))
+            .where(Usuario.pro_ativo == True, _filtro_dia_aniversario(janela.c.primeira_em, HOJE))
+        ).all()
+        tempo = time.perf_counter() - inicio
+    return tempo, {usuario.id: (criada_em, int(score)) for usuario, criada_em, score in linhas}
+
+
+def _resumo() -> tuple[float, int, dict]:
+    """Versão atual do cron: (segundos, queries, candidatos)."""
+    from database import AsyncSessionLocal
+    from routers.cron import buscar_candidatos_lembrete
+    from services.contador_queries import contar_queries
+
+    async def _buscar():
+        async with AsyncSessionLocal() as db:
+            return await buscar_candidatos_lembrete(db, HOJE)
+
+    with contar_queries() as estatisticas:
+        inicio = time.perf_counter()
+        _, _, linhas = asyncio.run(_buscar())
+        tempo = time.perf_counter() - inicio
+    return tempo, estatisticas.queries, {
+        usuario.id: (ultima_em, int(score)) for usuario, ultima_em, score, *_ in linhas
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Candidatos do lembrete mensal: 2N+1 x window x resumo")
+    parser.add_argument("--usuarios", type=int, default=50_000, help="usuários Pro (padrão: 50000)")
+    parser.add_argument("--amostra", type=int, default=2000, help="usuários medidos na versão 2N+1 (padrão: 2000)")
+    parser.add_argument("--banco", default=None, help="URL do banco (padrão: SQLite temporário)")
+    args = parser.parse_args()
+
+    preparar_banco(args.banco)
+
+    inicio = time.perf_counter()
+    total_analises = _popular(args.usuarios, random.Random(42))
+    print(f"[Lembrete] {args.usuarios} usuários Pro e {total_analises} análises criados "
+          f"em {time.perf_counter() - inicio:.1f}s")
+
+    tempo_lista, tempo_2n, total_pro, ids_amostra, candidatos_2n = _por_usuario(args.amostra)
+    amostra = len(ids_amostra)
+    estimado_2n = tempo_lista + tempo_2n / amostra * total_pro
+    tempo_janela, candidatos_janela = _janela()
+    tempo_resumo, queries_resumo, candidatos_resumo = _resumo()
+
+    print(f"[Lembrete] 2N+1 (amostra de {amostra}): {tempo_2n:.2f}s → ~{estimado_2n:.1f}s "
+          f"para {total_pro} usuários (~{total_pro + 1 + len(candidatos_resumo)} queries)")
+    print(f"[Lembrete] window function:          {tempo_janela * 1000:8.0f} ms (1 query)")
+    print(f"[Lembrete] resumo (cron atual):      {tempo_resumo * 1000:8.0f} ms ({queries_resumo} queries, "
+          f"{estimado_2n / tempo_resumo:.0f}x mais rápido que 2N+1)")
+    print(f"[Lembrete] candidatos hoje ({HOJE:%d/%m}): {len(candidatos_resumo)}")
+
+    falhas = []
+    if candidatos_janela != candidatos_resumo:
+        falhas.append("window function e resumo escolheram candidatos diferentes")
+    # O 2N+1 só percorreu a amostra — compara só os usuários dela
+    esperados_amostra = {k: v for k, v in candidatos_resumo.items() if k in ids_amostra}
+    if candidatos_2n != esperados_amostra:
+        falhas.append("2N+1 e resumo divergem na amostra")
+    for falha in falhas:
+        print(f"[Lembrete] ❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
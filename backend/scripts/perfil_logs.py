@@ -0,0 +1,196 @@
+"""
+Mede a vazão de logs sob carga: print() síncrono x logging com StreamHandler
+direto x pipeline do logs.py (QueueHandler + thread de escrita)
+
+--threads threads (como o threadpool do Starlette) registram juntas
+--mensagens linhas no total, cada uma com seu request_id. O stdout é
+trocado por um destino lento (--latencia-escrita por linha, uma escrita
+por vez — como um pipe para o coletor de logs do container).
+
+Por versão:
+- tempo de quem loga (p50/p99 por chamada): é o que o request espera
+- vazão ponta a ponta: até a última linha chegar ao destino
+- confere que todas as linhas chegaram, em JSON válido e com o request_id
+  da thread que logou (nas versões com logging)
+
+    cd backend && python -m scripts.perfil_logs
+    cd backend && python -m scripts.perfil_logs --threads 16 --mensagens 50000 --latencia-escrita 0.0005
+"""
+
+import argparse
+import io
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from typing import Callable
+
+
+class _DestinoLento(io.TextIOBase):
+    """stdout falso: cada write espera --latencia-escrita, um de cada vez."""
+
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.linhas: list[str] = []
+        self._trava = threading.Lock()
+        self._pendente = ""
+
+    def write(self, texto: str) -> int:
+        with self._trava:
+            time.sleep(self.latencia)
+            self._pendente += texto
+            *completas, self._pendente = self._pendente.split("\n")
+            self.linhas.extend(completas)
+        return len(texto)
+
+    def flush(self) -> None:
+        pass
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def _carga(registrar: Callable[[int, int], None], threads: int, por_thread: int) -> tuple[float, list[float]]:
+    """Dispara as threads; retorna (segundos até a última chamada voltar, latências por chamada)."""
+    from logs import request_id_atual
+
+    latencias: list[list[float]] = [[] for _ in range(threads)]
+    largada = threading.Barrier(threads + 1)
+
+    def _trabalho(numero: int) -> None:
+        request_id_atual.set(f"perfil-{numero}")
+        largada.wait()
+        medidas = latencias[numero]
+        for i in range(por_thread):
+            inicio = time.perf_counter()
+            registrar(numero, i)
+            medidas.append(time.perf_counter() - inicio)
+
+    trabalhadores = [threading.Thread(target=_trabalho, args=(n,)) for n in range(threads)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+    return time.perf_counter() - inicio, [x for medidas in latencias for x in medidas]
+
+
+def _com_print(destino: _DestinoLento, threads: int, por_thread: int) -> tuple[float, float, list[float]]:
+    def _registrar(numero: int, i: int) -> None:
+        print(f"[Perfil] Evento {i} da thread {numero}")
+
+    sys.stdout = destino
+    try:
+        tempo, latencias = _carga(_registrar, threads, por_thread)
+    finally:
+        sys.stdout = sys.__stdout__
+    return tempo, tempo, latencias
+
+
+def _com_handler_direto(destino: _DestinoLento, threads: int, por_thread: int) -> tuple[float, float, list[float]]:
+    """Mesmo formato JSON do logs.py, mas escrevendo na thread de quem loga."""
+    from logs import FiltroRequestId, FormatadorJSON
+
+    handler = logging.StreamHandler(destino)
+    handler.setFormatter(FormatadorJSON())
+    handler.addFilter(FiltroRequestId())
+    logger = logging.getLogger("perfil.logs.direto")
+    logger.propagate = False
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    def _registrar(numero: int, i: int) -> None:
+        logger.info("Evento %d da thread %d", i, numero, extra={"thread_perfil": numero})
+
+    tempo, latencias = _carga(_registrar, threads, por_thread)
+    logger.removeHandler(handler)
+    return tempo, tempo, latencias
+
+
+def _com_fila(destino: _DestinoLento, threads: int, por_thread: int) -> tuple[float, float, list[float]]:
+    """Pipeline do logs.py; o tempo ponta a ponta vai até a fila esvaziar."""
+    import logs
+
+    logs.encerrar_logs()
+    sys.stdout = destino
+    try:
+        # O StreamHandler do pipeline pega o sys.stdout da hora da configuração
+        logs.configurar_logs()
+    finally:
+        sys.stdout = sys.__stdout__
+    logger = logging.getLogger("perfil.logs.fila")
+
+    def _registrar(numero: int, i: int) -> None:
+        logger.info("Evento %d da thread %d", i, numero, extra={"thread_perfil": numero})
+
+    inicio = time.perf_counter()
+    tempo, latencias = _carga(_registrar, threads, por_thread)
+    # stop() espera a thread de escrita esvaziar a fila
+    logs.encerrar_logs()
+    return tempo, time.perf_counter() - inicio, latencias
+
+
+def _conferir_json(linhas: list[str], esperadas: int) -> list[str]:
+    problemas = []
+    if len(linhas) != esperadas:
+        problemas.append(f"{len(linhas)} linhas (esperado {esperadas})")
+    for linha in linhas:
+        try:
+            dados = json.loads(linha)
+        except ValueError:
+            problemas.append(f"linha fora do JSON: {linha[:80]}")
+            break
+        if dados.get("request_id") != f"perfil-{dados.get('thread_perfil')}":
+            problemas.append(f"request_id trocado: {linha[:120]}")
+            break
+    return problemas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vazão de logs: print x StreamHandler x fila do logs.py")
+    parser.add_argument("--threads", type=int, default=8, help="threads logando juntas (padrão: 8)")
+    parser.add_argument("--mensagens", type=int, default=20_000, help="linhas no total (padrão: 20000)")
+    parser.add_argument("--latencia-escrita", type=float, default=0.0001,
+                        help="segundos por escrita no stdout falso (padrão: 0.0001)")
+    args = parser.parse_args()
+
+    por_thread = args.mensagens // args.threads
+    total = por_thread * args.threads
+
+    versoes = (
+        ("print() síncrono", _com_print, False),
+        ("StreamHandler direto", _com_handler_direto, True),
+        ("fila (logs.py)", _com_fila, True),
+    )
+    resultados, falhas = {}, []
+    for nome, medir, json_por_linha in versoes:
+        destino = _DestinoLento(args.latencia_escrita)
+        tempo_chamadas, tempo_total, latencias = medir(destino, args.threads, por_thread)
+        resultados[nome] = (tempo_chamadas, tempo_total, latencias)
+        if json_por_linha:
+            falhas += [f"{nome}: {problema}" for problema in _conferir_json(destino.linhas, total)]
+        elif len(destino.linhas) != total:
+            falhas.append(f"{nome}: {len(destino.linhas)} linhas (esperado {total})")
+
+    print(f"[Logs] {total} linhas de {args.threads} threads, "
+          f"escrita de {args.latencia_escrita * 1e6:.0f} µs por linha")
+    for nome, (tempo_chamadas, tempo_total, latencias) in resultados.items():
+        print(
+            f"[Logs] {nome:22s} chamada p50 {statistics.median(latencias) * 1e6:8.1f} µs  "
+            f"p99 {_percentil(latencias, 0.99) * 1e6:9.1f} µs  "
+            f"threads livres em {tempo_chamadas:6.2f}s  "
+            f"ponta a ponta {total / tempo_total:8.0f} linhas/s"
+        )
+
+    for falha in falhas:
+        print(f"[Logs] ❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
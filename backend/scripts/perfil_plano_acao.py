@@ -0,0 +1,92 @@
+"""
+Mede o CPU do plano de ação do dashboard: gerar_plano_acao a cada request
+(como era) x plano_acao_memoizado (cache por análise/versão/updated_at)
+
+Usa análises sintéticas em memória — não precisa de banco.
+
+    cd backend && python -m scripts.perfil_plano_acao
+    cd backend && python -m scripts.perfil_plano_acao --analises 500 --requisicoes 20
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from routers.dashboard import AnaliseView, gerar_plano_acao, plano_acao_memoizado
+from schemas.analise import SetorEnum
+
+
+def _analise(rng: random.Random) -> AnaliseView:
+    receita = round(rng.uniform(5_000, 500_000), 2)
+    custo = round(receita * rng.uniform(0.2, 0.9), 2)
+    despesas = round(receita * rng.uniform(0.05, 0.5), 2)
+    resultado = receita - custo - despesas
+    return AnaliseView(
+        id=uuid.uuid4(),
+        nome_empresa="Empresa",
+        email="perfil@exemplo.com",
+        estado="SP",
+        setor=rng.choice(list(SetorEnum)).value,
+        mes_referencia=rng.randint(1, 12),
+        ano_referencia=2025,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        receita_atual=receita,
+        custo_vendas=custo,
+        despesas_fixas=despesas,
+        caixa_bancos=round(receita * rng.uniform(0, 3), 2),
+        contas_receber=round(receita * rng.uniform(0, 1), 2),
+        contas_pagar=round(receita * rng.uniform(0, 1), 2),
+        dividas_totais=round(receita * rng.uniform(0, 10), 2),
+        num_funcionarios=rng.randint(1, 50),
+        margem_bruta=(receita - custo) / receita * 100,
+        resultado_mes=resultado,
+        folego_caixa=rng.randint(0, 365),
+        ponto_equilibrio=round(despesas / ((receita - custo) / receita), 2),
+        ciclo_financeiro=rng.randint(-60, 120),
+        capital_minimo=round(receita * rng.uniform(-0.5, 1), 2),
+        receita_funcionario=round(receita / rng.randint(1, 50), 2),
+        peso_divida=rng.uniform(0, 80),
+        valor_empresa_min=resultado * 12 * 2 if resultado > 0 else None,
+        valor_empresa_max=resultado * 12 * 4 if resultado > 0 else None,
+        tendencia_receita=rng.uniform(-30, 30),
+        score_saude=rng.uniform(0, 100),
+        pontos_fortes=[],
+        pontos_atencao=[],
+    )
+
+
+def _cpu_por_chamada(funcao, analises: list, requisicoes: int) -> float:
+    inicio = time.process_time()
+    for _ in range(requisicoes):
+        for analise in analises:
+            funcao(analise)
+    return (time.process_time() - inicio) / (requisicoes * len(analises))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CPU do plano de ação com e sem cache")
+    parser.add_argument("--analises", type=int, default=200, help="análises distintas (padrão: 200)")
+    parser.add_argument("--requisicoes", type=int, default=10, help="acessos ao dashboard por análise (padrão: 10)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    analises = [_analise(rng) for _ in range(args.analises)]
+
+    sem_cache = _cpu_por_chamada(gerar_plano_acao, analises, args.requisicoes)
+    com_cache = _cpu_por_chamada(plano_acao_memoizado, analises, args.requisicoes)
+
+    print(f"[PlanoAcao] sem cache: {sem_cache * 1e6:8.1f} µs de CPU por request")
+    print(
+        f"[PlanoAcao] com cache: {com_cache * 1e6:8.1f} µs de CPU por request "
+        f"(1ª visita de cada análise gera, as outras {args.requisicoes - 1} reaproveitam)"
+    )
+    print(f"[PlanoAcao] economia:  {(sem_cache - com_cache) * 1e6:8.1f} µs por request")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
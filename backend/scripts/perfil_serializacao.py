@@ -0,0 +1,143 @@
+"""
+Mede a serialização do payload do dashboard: jsonable_encoder + json da
+stdlib (caminho padrão do FastAPI) x resposta_json (orjson direto)
+
+Monta análises sintéticas em memória com o motor e o diagnóstico reais —
+não precisa de banco — e confere que os dois caminhos geram o mesmo JSON.
+
+    cd backend && python -m scripts.perfil_serializacao
+    cd backend && python -m scripts.perfil_serializacao --analises 100 --repeticoes 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from models.analise import Analise
+from respostas import resposta_json
+from routers.dashboard import montar_payload_dashboard
+from schemas.analise import SetorEnum
+from services.diagnostico import gerar_diagnostico
+from services.indicadores import VERSAO_MOTOR, calcular_indicadores
+from services.recalculo_indicadores import CAMPOS_DIAGNOSTICO, dados_da_analise, valores_persistidos
+
+
+def _dinheiro(valor: float) -> Decimal:
+    # Colunas Numeric voltam do banco como Decimal
+    return Decimal(str(round(valor, 2)))
+
+
+def analise_sintetica(rng: random.Random) -> Analise:
+    """Analise (ORM, fora de sessão) com indicadores e diagnóstico do motor real."""
+    receita = rng.uniform(5_000, 500_000)
+    analise = Analise(
+        id=uuid.uuid4(),
+        nome_empresa="Empresa Exemplo Ltda",
+        email="perfil@exemplo.com",
+        setor=rng.choice(list(SetorEnum)).value,
+        estado="SP",
+        mes_referencia=rng.randint(1, 12),
+        ano_referencia=2025,
+        receita_3_meses_atras=_dinheiro(receita * rng.uniform(0.7, 1.3)),
+        receita_2_meses_atras=_dinheiro(receita * rng.uniform(0.7, 1.3)),
+        receita_mes_passado=_dinheiro(receita * rng.uniform(0.7, 1.3)),
+        receita_atual=_dinheiro(receita),
+        custo_vendas=_dinheiro(receita * rng.uniform(0.2, 0.9)),
+        despesas_fixas=_dinheiro(receita * rng.uniform(0.05, 0.5)),
+        caixa_bancos=_dinheiro(receita * rng.uniform(0, 3)),
+        contas_receber=_dinheiro(receita * rng.uniform(0, 1)),
+        contas_pagar=_dinheiro(receita * rng.uniform(0, 1)),
+        tem_estoque=False,
+        estoque=None,
+        tem_dividas=True,
+        dividas_totais=_dinheiro(receita * rng.uniform(0, 10)),
+        num_funcionarios=rng.randint(1, 50),
+        versao_motor=VERSAO_MOTOR,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+
+    dados = dados_da_analise(analise)
+    indicadores = calcular_indicadores(dados)
+    diagnostico = gerar_diagnostico(dados, indicadores)
+    for campo, valor in valores_persistidos(indicadores).items():
+        setattr(analise, campo, _dinheiro(valor) if isinstance(valor, float) else valor)
+    for campo in CAMPOS_DIAGNOSTICO:
+        setattr(analise, campo, diagnostico[campo])
+    return analise
+
+
+def historico_sintetico(rng: random.Random, analise: Analise) -> list:
+    """Linhas no formato de buscar_historico_dashboard (10 últimas, mais recente primeiro)."""
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            created_at=analise.created_at - timedelta(days=30 * k),
+            mes_referencia=(analise.mes_referencia - k - 1) % 12 + 1,
+            ano_referencia=analise.ano_referencia,
+            score_saude=_dinheiro(rng.uniform(0, 100)),
+        )
+        for k in range(10)
+    ]
+
+
+def _padrao_fastapi(payload: dict) -> bytes:
+    # O que JSONResponse faz com o retorno de uma rota sem response_model
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _orjson(payload: dict) -> bytes:
+    return resposta_json(payload).body
+
+
+def _tempo_por_chamada(funcao, payloads: list, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for payload in payloads:
+            funcao(payload)
+    return (time.perf_counter() - inicio) / (repeticoes * len(payloads))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serialização do dashboard: jsonable_encoder x orjson")
+    parser.add_argument("--analises", type=int, default=50, help="payloads distintos (padrão: 50)")
+    parser.add_argument("--repeticoes", type=int, default=20, help="serializações de cada payload (padrão: 20)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    payloads = []
+    for _ in range(args.analises):
+        analise = analise_sintetica(rng)
+        payloads.append(montar_payload_dashboard(analise, historico_sintetico(rng, analise)))
+
+    divergentes = sum(json.loads(_padrao_fastapi(p)) != json.loads(_orjson(p)) for p in payloads)
+    if divergentes:
+        print(f"[Serializacao] ❌ {divergentes} payload(s) com JSON diferente entre os dois caminhos")
+        return 1
+
+    tamanho = sum(len(_orjson(p)) for p in payloads) / len(payloads)
+    padrao = _tempo_por_chamada(_padrao_fastapi, payloads, args.repeticoes)
+    rapido = _tempo_por_chamada(_orjson, payloads, args.repeticoes)
+
+    print(f"[Serializacao] payload médio: {tamanho / 1024:.1f} KiB (mesmo JSON nos dois caminhos)")
+    print(f"[Serializacao] jsonable_encoder + json: {padrao * 1e6:8.1f} µs por resposta")
+    print(f"[Serializacao] orjson (resposta_json):  {rapido * 1e6:8.1f} µs por resposta ({padrao / rapido:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
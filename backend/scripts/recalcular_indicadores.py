@@ -0,0 +1,183 @@
+"""
+Backfill: recalcula score e indicadores de todas as análises com a versão
+atual do motor (services/indicadores.py) e grava só o que mudou — e as de
+versão anterior (versao_motor), inclusive o diagnóstico
+
+A leitura já atualiza as análises antigas aos poucos (garantir_versao_atual);
+este script é para virar a tabela inteira de uma vez.
+
+    cd backend && python -m scripts.recalcular_indicadores
+    cd backend && python -m scripts.recalcular_indicadores --processos 4 --bloco 5000
+    cd backend && python -m scripts.recalcular_indicadores --simular   # só conta, não grava
+
+Como roda sem travar a tabela nem estourar memória:
+- a tabela é dividida por faixas de id (UUID) — uma por processo
+- cada faixa é lida em blocos por keyset (id > último id, ORDER BY id,
+  LIMIT --bloco) e cada bloco é uma transação curta: lê, recalcula com o
+  motor em lote, UPDATE em lote só das linhas alteradas, commit
+- dentro do bloco as linhas chegam em partes (yield_per)
+- após cada commit o último id da faixa vai para o checkpoint: se o
+  processo cair, rodar de novo continua de onde parou (--recomecar ignora)
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from logs import configurar_logs
+from models.analise import Analise
+from services.recalculo_indicadores import COLUNAS_RECALCULO, gravar_mudancas, recalcular_bloco
+
+logger = logging.getLogger("scripts.recalcular_indicadores")
+
+# Linhas por ida ao banco dentro de um bloco (yield_per)
+LINHAS_POR_PARTE = 1000
+
+DIRETORIO_CHECKPOINT = ".recalculo_indicadores"
+
+
+def _faixas(processos: int) -> list[tuple[UUID, Optional[UUID]]]:
+    """Divide o espaço de UUIDs em faixas [início, fim) do mesmo tamanho."""
+    limites = [UUID(int=(k * 2**128) // processos) for k in range(processos)]
+    return [(inicio, limites[k + 1] if k + 1 < processos else None) for k, inicio in enumerate(limites)]
+
+
+def _estado_inicial() -> dict:
+    return {"ultimo_id": None, "lidas": 0, "atualizadas": 0, "concluida": False}
+
+
+def _ler_checkpoint(arquivo: Path) -> dict:
+    if arquivo.exists():
+        return json.loads(arquivo.read_text())
+    return _estado_inicial()
+
+
+def _gravar_checkpoint(arquivo: Path, estado: dict) -> None:
+    # Escreve ao lado e troca: um checkpoint pela metade nunca fica no disco
+    temporario = arquivo.with_suffix(".tmp")
+    temporario.write_text(json.dumps(estado))
+    os.replace(temporario, arquivo)
+
+
+def _processar_faixa(
+    faixa: int,
+    processos: int,
+    bloco: int,
+    diretorio: str,
+    simular: bool,
+    recomecar: bool,
+) -> dict:
+    """Percorre uma faixa de ids em blocos; roda num processo próprio."""
+    configurar_logs()
+    inicio, fim = _faixas(processos)[faixa]
+    arquivo = Path(diretorio) / f"faixa_{faixa + 1}_de_{processos}.json"
+
+    # Simulação não lê nem grava checkpoint: não pode pular linhas de uma execução real
+    estado = _estado_inicial() if recomecar or simular else _ler_checkpoint(arquivo)
+    if estado["concluida"]:
+        logger.info("Faixa %d/%d já concluída (checkpoint)", faixa + 1, processos)
+        return {"lidas": 0, "atualizadas": 0}
+
+    lidas = atualizadas = 0
+    relogio = time.monotonic()
+
+    while True:
+        consulta = select(*COLUNAS_RECALCULO).order_by(Analise.id).limit(bloco)
+        if estado["ultimo_id"]:
+            consulta = consulta.where(Analise.id > UUID(estado["ultimo_id"]))
+        else:
+            consulta = consulta.where(Analise.id >= inicio)
+        if fim is not None:
+            consulta = consulta.where(Analise.id < fim)
+
+        lidas_bloco = 0
+        ultimo_id = None
+        with SessionLocal() as db:
+            resultado = db.execute(consulta.execution_options(yield_per=LINHAS_POR_PARTE))
+            mudancas = []
+            for parte in resultado.partitions():
+                mudancas.extend(recalcular_bloco(parte))
+                lidas_bloco += len(parte)
+                ultimo_id = parte[-1].id
+
+            if mudancas and not simular:
+                gravar_mudancas(db, mudancas)
+                db.commit()
+
+        if not lidas_bloco:
+            break
+
+        lidas += lidas_bloco
+        atualizadas += len(mudancas)
+        estado.update(
+            ultimo_id=str(ultimo_id),
+            lidas=estado["lidas"] + lidas_bloco,
+            atualizadas=estado["atualizadas"] + len(mudancas),
+        )
+        if not simular:
+            _gravar_checkpoint(arquivo, estado)
+
+        decorrido = time.monotonic() - relogio
+        logger.info(
+            "Faixa %d/%d: %d lidas, %d alteradas (%.0f linhas/s)",
+            faixa + 1, processos, lidas, atualizadas, lidas / decorrido if decorrido else 0,
+        )
+
+        if lidas_bloco < bloco:
+            break
+
+    if not simular:
+        estado["concluida"] = True
+        _gravar_checkpoint(arquivo, estado)
+    return {"lidas": lidas, "atualizadas": atualizadas}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recalcula os indicadores gravados em analises")
+    parser.add_argument("--processos", type=int, default=1, help="processos em paralelo (padrão: 1)")
+    parser.add_argument("--bloco", type=int, default=2000, help="linhas por transação (padrão: 2000)")
+    parser.add_argument("--checkpoint", default=DIRETORIO_CHECKPOINT, help=f"diretório do checkpoint (padrão: {DIRETORIO_CHECKPOINT})")
+    parser.add_argument("--simular", action="store_true", help="só conta o que mudaria, sem gravar")
+    parser.add_argument("--recomecar", action="store_true", help="ignora o checkpoint e começa do zero")
+    args = parser.parse_args()
+    configurar_logs()
+
+    Path(args.checkpoint).mkdir(parents=True, exist_ok=True)
+    tarefas = [
+        (faixa, args.processos, args.bloco, args.checkpoint, args.simular, args.recomecar)
+        for faixa in range(args.processos)
+    ]
+
+    inicio = time.monotonic()
+    if args.processos == 1:
+        totais = [_processar_faixa(*tarefas[0])]
+    else:
+        # spawn: cada processo abre seus próprios engines (conexões não atravessam fork)
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.processos, mp_context=contexto) as executor:
+            totais = list(executor.map(_processar_faixa, *zip(*tarefas)))
+    duracao = time.monotonic() - inicio
+
+    lidas = sum(t["lidas"] for t in totais)
+    atualizadas = sum(t["atualizadas"] for t in totais)
+    verbo = "mudariam" if args.simular else "atualizadas"
+    print(
+        f"[Recalculo] ✅ {lidas} análises lidas, {atualizadas} {verbo} em {duracao:.1f}s "
+        f"({lidas / duracao if duracao else 0:.0f} linhas/s, {args.processos} processo(s))"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Reconstrói as tabelas resumo_analises_usuario e resumo_analises_email
+a partir da tabela analises.
+
+O preenchimento inicial é feito pela migração 004 (python -m scripts.migrar);
+rodar este script sempre que houver suspeita de divergência:
+
+    cd backend && python -m scripts.reconstruir_resumos
+"""
+
+import time
+
+from database import SessionLocal
+import models  # noqa: F401 — registra todas as tabelas no Base
+from services.resumo_analises import reconstruir_resumos
+
+
+def main() -> None:
+    inicio = time.monotonic()
+    db = SessionLocal()
+    try:
+        totais = reconstruir_resumos(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    duracao = time.monotonic() - inicio
+    print(
+        f"[Resumos] ✅ {totais['usuarios']} usuários e {totais['emails']} e-mails "
+        f"reconstruídos em {duracao:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Servidor HTTP local para os scripts de carga (Claude API, Brevo...)
+
+Sobe um ThreadingHTTPServer numa thread daemon, numa porta livre, e
+responde cada POST com a função informada depois de uma latência
+simulada. Conta requisições e o pico de requisições simultâneas —
+é o que os scripts comparam com os limites do lado do cliente.
+
+    with ServidorStub(responder, latencia=0.2) as stub:
+        ...  # chamadas para stub.url
+    print(stub.requisicoes, stub.pico_simultaneas)
+
+responder(caminho, corpo_json) -> (status, corpo_json_da_resposta)
+
+Só stdlib: roda sem uvicorn e sem rede externa.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+Responder = Callable[[str, Any], tuple[int, Any]]
+
+
+class ServidorStub:
+    def __init__(self, responder: Responder, latencia: float = 0.0):
+        self.responder = responder
+        self.latencia = latencia
+        self.requisicoes = 0
+        self.pico_simultaneas = 0
+        self._simultaneas = 0
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._servidor.daemon_threads = True
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def _entrar(self) -> None:
+        with self._lock:
+            self.requisicoes += 1
+            self._simultaneas += 1
+            self.pico_simultaneas = max(self.pico_simultaneas, self._simultaneas)
+
+    def _sair(self) -> None:
+        with self._lock:
+            self._simultaneas -= 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive: o cliente reaproveita conexões como em produção
+            protocol_version = "HTTP/1.1"
+            # Headers e corpo saem em writes separados: com Nagle + ACK atrasado
+            # cada resposta ganharia ~40ms que não existem no servidor real
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                stub._entrar()
+                try:
+                    tamanho = int(self.headers.get("Content-Length") or 0)
+                    bruto = self.rfile.read(tamanho) if tamanho else b""
+                    corpo = json.loads(bruto) if bruto else None
+                    if stub.latencia:
+                        time.sleep(stub.latencia)
+                    status, resposta = stub.responder(self.path, corpo)
+                finally:
+                    stub._sair()
+
+                dados = json.dumps(resposta).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                # Sem uma linha no stderr por requisição
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "ServidorStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
@@ -0,0 +1,111 @@
+"""
+Conferência diferencial: motor em lote (indicadores_lote) x escalar (indicadores)
+
+Gera empresas aleatórias — incluindo placeholders (0,01), zeros, receita
+baixa, setores com e sem custo, estoque/dívida ligados e desligados — roda
+as duas implementações e falha (exit 1) se qualquer campo de qualquer
+empresa divergir. Também mostra o tempo de cada uma.
+
+    cd backend && python -m scripts.verificar_indicadores_lote
+    cd backend && python -m scripts.verificar_indicadores_lote --quantidade 100000 --semente 7
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from schemas.analise import DadosAnaliseInput, ReceitaHistorico, SetorEnum
+from services.indicadores import calcular_indicadores
+from services.indicadores_lote import LoteIndicadores, calcular_indicadores_lote
+
+# Valores que caem nas bordas das regras (placeholder, zero, limiar de R$ 500)
+VALORES_BORDA = [0.0, 0.01, 0.5, 0.99, 1.0, 499.99, 500.0, 500.01]
+
+MAX_DIVERGENCIAS_MOSTRADAS = 10
+
+
+def _valor(rng: random.Random, maximo: float) -> float:
+    sorteio = rng.random()
+    if sorteio < 0.15:
+        return rng.choice(VALORES_BORDA)
+    if sorteio < 0.25:
+        return float(rng.randint(0, int(maximo)))
+    return round(rng.uniform(0, maximo), 2)
+
+
+def _empresa(rng: random.Random) -> DadosAnaliseInput:
+    receita = rng.choice([rng.uniform(1, 600), rng.uniform(500, 50_000), rng.uniform(10_000, 2_000_000)])
+    receita = round(receita, 2)
+    tem_estoque = rng.random() < 0.5
+    tem_dividas = rng.random() < 0.5
+
+    # model_construct: sem validação, para também cobrir combinações que o
+    # formulário rejeitaria mas podem existir em dados antigos
+    return DadosAnaliseInput.model_construct(
+        setor=rng.choice(list(SetorEnum)),
+        receita_historico=ReceitaHistorico.model_construct(
+            tres_meses_atras=_valor(rng, receita * 1.5),
+            dois_meses_atras=_valor(rng, receita * 1.5),
+            mes_passado=_valor(rng, receita * 1.5),
+        ),
+        receita_atual=receita,
+        custo_vendas=_valor(rng, receita * 1.2),
+        despesas_fixas=_valor(rng, receita * 0.8),
+        caixa_bancos=_valor(rng, receita * 6),
+        contas_receber=_valor(rng, receita * 2),
+        contas_pagar=_valor(rng, receita * 2),
+        tem_estoque=tem_estoque,
+        estoque=_valor(rng, receita * 3) if tem_estoque else None,
+        tem_dividas=tem_dividas,
+        dividas_totais=_valor(rng, receita * 30) if tem_dividas else None,
+        tem_bens=False,
+        bens_equipamentos=None,
+        num_funcionarios=rng.randint(1, 200),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara o motor de indicadores em lote com o escalar")
+    parser.add_argument("--quantidade", type=int, default=20_000, help="empresas geradas (padrão: 20000)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do gerador (padrão: 42)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    dados = [_empresa(rng) for _ in range(args.quantidade)]
+
+    inicio = time.perf_counter()
+    esperados = [calcular_indicadores(d) for d in dados]
+    tempo_escalar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = calcular_indicadores_lote(LoteIndicadores.de_dados(dados))
+    tempo_lote = time.perf_counter() - inicio
+    obtidos = resultado.linhas()
+
+    divergencias = 0
+    for i, (esperado, obtido) in enumerate(zip(esperados, obtidos)):
+        if esperado == obtido:
+            continue
+        divergencias += 1
+        if divergencias <= MAX_DIVERGENCIAS_MOSTRADAS:
+            campos = {
+                campo: (getattr(esperado, campo), getattr(obtido, campo))
+                for campo in type(esperado).model_fields
+                if getattr(esperado, campo) != getattr(obtido, campo)
+            }
+            print(f"[Indicadores] ❌ empresa {i}: {campos}")
+
+    print(
+        f"[Indicadores] {args.quantidade} empresas — escalar {tempo_escalar:.2f}s, "
+        f"lote {tempo_lote:.2f}s (sem a conversão por linha)"
+    )
+    if divergencias:
+        print(f"[Indicadores] ❌ {divergencias} empresa(s) divergente(s)")
+        return 1
+    print("[Indicadores] ✅ lote idêntico ao escalar")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Verificação dos planos de execução das queries quentes (analises, resumos,
+lembrete mensal e limpeza do cache_ia)
+
+Popula o banco configurado (DATABASE_URL) com dados sintéticos DENTRO de
+uma transação, atualiza as estatísticas (ANALYZE), roda EXPLAIN em cada
+query abaixo e desfaz tudo no fim (rollback) — nada fica gravado.
+Falha (exit 1) se o plano tiver varredura sequencial da tabela vigiada
+de cada query ou sort — sinal de que um índice sumiu ou a query deixou
+de casar com ele.
+
+    cd backend && python -m scripts.verificar_planos
+    cd backend && python -m scripts.verificar_planos --usuarios 5000
+
+No SQLite, as mesmas verificações rodam no pytest (tests/test_planos.py).
+
+No PostgreSQL, seq scan e sort são desestimulados na sessão (enable_seqscan /
+enable_sort = off): o que interessa aqui é se o índice PODE ser usado.
+Os dados sintéticos deixam as estatísticas parecidas com as de produção
+(muitos e-mails e usuários, poucas análises por chave) — com a tabela
+vazia o planner não diz nada sobre o índice.
+"""
+
+import argparse
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from database import engine
+from models.analise import Analise
+from models.cache_ia import CacheIA
+from models.pre_abertura import AnalisePreAbertura
+from models.resumo_analises import ResumoAnalisesUsuario
+from models.usuario import Usuario
+from routers.cron import consulta_candidatos_lembrete, consulta_contagens_lembrete
+from services.ia_cache import LIMPEZA_POR_GRAVACAO
+from services.paginacao import Pagina, aplicar_keyset
+
+EMAIL = "plano@exemplo.com"
+USUARIO_ID = str(uuid.UUID(int=0))
+AGORA = datetime.utcnow()
+
+# Cursor de uma página do meio: exercita o filtro (created_at, id) < cursor
+PAGINA = Pagina(limite=50, apos=(AGORA - timedelta(days=90), uuid.UUID(int=2 ** 127)))
+
+INSERCAO_POR_VEZ = 2000
+
+
+def _queries() -> dict:
+    """Mesmos filtros e ordenações usados pelos endpoints/jobs: nome → (stmt, tabela vigiada)."""
+    return {
+        "get_dashboard (histórico por e-mail)": (
+            select(Analise.id)
+            .where(Analise.email == EMAIL)
+            .order_by(Analise.created_at.desc())
+            .limit(10),
+            "analises",
+        ),
+        "listar_historico (página por cursor)": (
+            aplicar_keyset(
+                select(Analise.id).where(Analise.usuario_id == USUARIO_ID, Analise.arquivada == False),
+                Analise.created_at, Analise.id, PAGINA,
+            ),
+            "analises",
+        ),
+        "analise/email (página por cursor)": (
+            aplicar_keyset(select(Analise.id).where(Analise.email == EMAIL), Analise.created_at, Analise.id, PAGINA),
+            "analises",
+        ),
+        "pre-abertura/email (página por cursor)": (
+            aplicar_keyset(
+                select(AnalisePreAbertura.id).where(AnalisePreAbertura.email == EMAIL),
+                AnalisePreAbertura.created_at, AnalisePreAbertura.id, PAGINA,
+            ),
+            "analises_pre_abertura",
+        ),
+        "buscar_comparativo sem resumo (score anterior)": (
+            select(Analise.id)
+            .where(Analise.usuario_id == USUARIO_ID)
+            .order_by(Analise.created_at.desc())
+            .limit(2),
+            "analises",
+        ),
+        "processar_reengajamento_30_dias": (
+            select(Analise.id)
+            .where(
+                Analise.created_at >= AGORA - timedelta(days=31),
+                Analise.created_at <= AGORA - timedelta(days=29),
+                Analise.email_30d_enviado_em.is_(None),
+            ),
+            "analises",
+        ),
+        "cache_ia (limpeza das expiradas)": (
+            select(CacheIA.chave).where(CacheIA.expira_em <= AGORA).limit(LIMPEZA_POR_GRAVACAO),
+            "cache_ia",
+        ),
+        # Percorre os Pro ativos (é o cron); o resumo tem que vir pela chave primária
+        "lembrete_mensal (candidatos do dia)": (
+            consulta_candidatos_lembrete(AGORA),
+            "resumo_analises_usuario",
+        ),
+        "lembrete_mensal (contagens do relatório)": (
+            consulta_contagens_lembrete(),
+            "resumo_analises_usuario",
+        ),
+    }
+
+
+# ========== DADOS SINTÉTICOS ==========
+
+def _inserir(conn, tabela, linhas: list[dict]) -> None:
+    for inicio in range(0, len(linhas), INSERCAO_POR_VEZ):
+        conn.execute(insert(tabela), linhas[inicio:inicio + INSERCAO_POR_VEZ])
+
+
+def _popular(conn, quantidade: int) -> None:
+    """
+    `quantidade` usuários Pro (mais o USUARIO_ID/EMAIL das queries), de 1 a 6
+    análises cada, resumo por usuário, algumas análises pré-abertura e
+    duas entradas de cache_ia por usuário (poucas já expiradas).
+    """
+    rng = random.Random(42)
+    usuarios, analises, resumos, pre_aberturas, cache = [], [], [], [], []
+
+    for i in range(quantidade + 1):
+        usuario_id = USUARIO_ID if i == 0 else str(uuid.uuid4())
+        email = EMAIL if i == 0 else f"plano{i}@exemplo.com"
+        usuarios.append({
+            "id": usuario_id, "nome": f"Empresa {i}", "email": email, "senha_hash": "x",
+            "plano": "pro", "pro_ativo": rng.random() < 0.8, "created_at": AGORA, "updated_at": AGORA,
+        })
+
+        criada_em = AGORA - timedelta(days=rng.randint(30, 700), minutes=rng.randint(0, 1440))
+        primeira_id, primeira_em = None, criada_em
+        for _ in range(rng.randint(1, 6)):
+            analise_id = uuid.uuid4()
+            primeira_id = primeira_id or analise_id
+            analises.append({
+                "id": analise_id, "usuario_id": usuario_id, "email": email,
+                "nome_empresa": f"Empresa {i}", "setor": "servicos", "estado": "SP",
+                "mes_referencia": criada_em.month, "ano_referencia": criada_em.year,
+                "receita_3_meses_atras": 1, "receita_2_meses_atras": 1, "receita_mes_passado": 1,
+                "receita_atual": 1, "custo_vendas": 1, "despesas_fixas": 1, "caixa_bancos": 1,
+                "contas_receber": 1, "contas_pagar": 1, "num_funcionarios": 1,
+                "score_saude": rng.randint(0, 100), "folego_caixa": rng.randint(0, 180),
+                "arquivada": rng.random() < 0.1, "created_at": criada_em, "updated_at": criada_em,
+            })
+            ultima_id, ultima_em = analise_id, criada_em
+            criada_em += timedelta(days=rng.randint(20, 40))
+
+        resumos.append({
+            "usuario_id": usuario_id,
+            "primeira_analise_id": primeira_id, "primeira_analise_em": primeira_em,
+            "ultima_analise_id": ultima_id, "ultima_analise_em": ultima_em,
+            "ultimo_score": 50, "ultimo_folego_caixa": 30,
+            "ultimo_mes_referencia": ultima_em.month, "ultimo_ano_referencia": ultima_em.year,
+            "total_analises": 1, "total_arquivadas": 0,
+        })
+
+        if rng.random() < 0.2:
+            pre_aberturas.append({
+                "id": uuid.uuid4(), "email": email, "tipo_negocio": "servico", "setor": "servicos",
+                "estado": "SP", "mes_abertura": 1, "ano_abertura": 2027,
+                "capital_disponivel": 1, "faturamento_esperado": 1, "prolabore": "sim",
+                "tem_funcionarios": False, "clientes_garantidos": "sim",
+                "capital_recomendado": 1, "capital_diferenca_percentual": 0, "capital_status": "adequado",
+                "faturamento_referencia": 1, "faturamento_diferenca_percentual": 0,
+                "faturamento_status": "adequado", "capital_base_setor": 1, "custo_por_funcionario": 1,
+                "margem_setor": "25-35%", "created_at": AGORA - timedelta(days=rng.randint(0, 700)),
+            })
+
+        for _ in range(2):
+            expirada = rng.random() < 0.05
+            cache.append({
+                "chave": uuid.uuid4().hex * 2, "funcao": "resumo_executivo", "texto": "x", "hits": 0,
+                "created_at": AGORA,
+                "expira_em": AGORA + timedelta(hours=-1 if expirada else rng.randint(1, 24 * 30)),
+            })
+
+    _inserir(conn, Usuario, usuarios)
+    _inserir(conn, Analise, analises)
+    _inserir(conn, ResumoAnalisesUsuario, resumos)
+    _inserir(conn, AnalisePreAbertura, pre_aberturas)
+    _inserir(conn, CacheIA, cache)
+    # Estatísticas novas para o planner (dentro da transação: somem no rollback)
+    conn.exec_driver_sql("ANALYZE")
+
+
+def _explicar(conn, stmt) -> list[str]:
+    """Executa EXPLAIN e devolve as linhas do plano como texto."""
+    compilado = stmt.compile(dialect=engine.dialect)
+    # exec_driver_sql não passa pelos tipos do SQLAlchemy: UUID (GUID) vai como texto
+    valores = {nome: str(v) if isinstance(v, uuid.UUID) else v for nome, v in compilado.params.items()}
+    if compilado.positional:
+        params = tuple(valores[nome] for nome in compilado.positiontup)
+    else:
+        params = valores
+
+    if engine.dialect.name == "sqlite":
+        linhas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compilado}", params).fetchall()
+        return [linha[-1] for linha in linhas]  # coluna 'detail'
+
+    linhas = conn.exec_driver_sql(f"EXPLAIN {compilado}", params).fetchall()
+    return [linha[0] for linha in linhas]
+
+
+def _problemas(plano: list[str], tabela: str) -> list[str]:
+    encontrados = []
+    for linha in plano:
+        if engine.dialect.name == "sqlite":
+            if (linha.startswith(f"SCAN {tabela}") or f" SCAN {tabela}" in linha) and "USING" not in linha:
+                encontrados.append(f"varredura sequencial de {tabela}")
+            if "TEMP B-TREE" in linha:
+                encontrados.append("sort")
+        else:
+            if f"Seq Scan on {tabela}" in linha:
+                encontrados.append(f"varredura sequencial de {tabela}")
+            if linha.strip().lstrip("->").strip().startswith("Sort"):
+                encontrados.append("sort")
+    return encontrados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Planos de execução das queries quentes")
+    parser.add_argument("--usuarios", type=int, default=2000, help="usuários sintéticos (padrão: 2000)")
+    args = parser.parse_args()
+
+    falhas = 0
+    with engine.connect() as conn:
+        transacao = conn.begin()
+        try:
+            if engine.dialect.name == "postgresql":
+                conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                conn.exec_driver_sql("SET LOCAL enable_sort = off")
+
+            _popular(conn, args.usuarios)
+
+            for nome, (stmt, tabela) in _queries().items():
+                plano = _explicar(conn, stmt)
+                problemas = _problemas(plano, tabela)
+                if problemas:
+                    falhas += 1
+                    print(f"[Planos] ❌ {nome}: {', '.join(sorted(set(problemas)))}")
+                    for linha in plano:
+                        print(f"           {linha}")
+                else:
+                    print(f"[Planos] ✅ {nome}")
+        finally:
+            # Nada dos dados sintéticos fica no banco
+            transacao.rollback()
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
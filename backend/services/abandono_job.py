@@ -16,7 +16,13 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from models.sessao import SessaoAnalise
-from services.email_service import enviar_email_abandono_1, enviar_email_abandono_2
+from services.email_service import (
+    enviar_email_abandono_1,
+    enviar_email_abandono_2,
+    montar_email_abandono_1,
+    montar_email_abandono_2,
+)
+from services.email_dispatcher import despachar_emails
 
 
 async def processar_abandonos(db: Session) -> dict:
@@ -37,6 +43,8 @@ async def processar_abandonos(db: Session) -> dict:
         "email_1_falhas": 0,
         "email_2_enviados": 0,
         "email_2_falhas": 0,
+        "lotes_com_falha": 0,
+        "erros": [],
     }
     
     # ========== E-MAIL 1: 3-6 horas após início ==========
@@ -55,19 +63,25 @@ async def processar_abandonos(db: Session) -> dict:
         )
     ).all()
     
-    for sessao in sessoes_email_1:
-        sucesso = await enviar_email_abandono_1(
+    def _marcar_email_1(sessao: SessaoAnalise) -> None:
+        sessao.email_1_enviado_em = agora
+        sessao.status = "abandono_email_1"
+    
+    # Lotes em paralelo com rate limit; cada lote enviado é commitado na hora
+    resultado = await despachar_emails(
+        db,
+        sessoes_email_1,
+        montar=lambda sessao: montar_email_abandono_1(
             nome_empresa=sessao.nome_empresa,
             email=sessao.email,
             sessao_id=str(sessao.id),  # Passa o ID para o link de continuação
-        )
-        
-        if sucesso:
-            sessao.email_1_enviado_em = agora
-            sessao.status = "abandono_email_1"
-            stats["email_1_enviados"] += 1
-        else:
-            stats["email_1_falhas"] += 1
+        ),
+        marcar_enviado=_marcar_email_1,
+    )
+    stats["email_1_enviados"] = resultado["enviados"]
+    stats["email_1_falhas"] = resultado["falhas"]
+    stats["lotes_com_falha"] += resultado["lotes_com_falha"]
+    stats["erros"].extend(resultado["erros"])
     
     # ========== E-MAIL 2: 48 horas após início ==========
     # Busca sessões que já receberam e-mail 1 há mais de 45 horas
@@ -83,19 +97,24 @@ async def processar_abandonos(db: Session) -> dict:
         )
     ).all()
     
-    for sessao in sessoes_email_2:
-        sucesso = await enviar_email_abandono_2(
+    def _marcar_email_2(sessao: SessaoAnalise) -> None:
+        sessao.email_2_enviado_em = agora
+        sessao.status = "abandono_email_2"
+    
+    resultado = await despachar_emails(
+        db,
+        sessoes_email_2,
+        montar=lambda sessao: montar_email_abandono_2(
             nome_empresa=sessao.nome_empresa,
             email=sessao.email,
             sessao_id=str(sessao.id),  # Passa o ID para o link de continuação
-        )
-        
-        if sucesso:
-            sessao.email_2_enviado_em = agora
-            sessao.status = "abandono_email_2"
-            stats["email_2_enviados"] += 1
-        else:
-            stats["email_2_falhas"] += 1
+        ),
+        marcar_enviado=_marcar_email_2,
+    )
+    stats["email_2_enviados"] = resultado["enviados"]
+    stats["email_2_falhas"] = resultado["falhas"]
+    stats["lotes_com_falha"] += resultado["lotes_com_falha"]
+    stats["erros"].extend(resultado["erros"])
     
     # Commit das alterações
     db.commit()
@@ -15,7 +15,6 @@ import os
 import secrets
 import hashlib
 
-import bcrypt
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 
@@ -38,6 +37,8 @@ def hash_senha(senha: str) -> str:
     Converte a senha em texto puro para um hash seguro.
     Usa bcrypt diretamente (sem passlib) para evitar bug de compatibilidade.
     """
+    import bcrypt  # só login/cadastro usam — fora do cold start
+
     senha_bytes = senha.encode("utf-8")[:72]  # bcrypt aceita no máximo 72 bytes
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(senha_bytes, salt).decode("utf-8")
@@ -48,6 +49,8 @@ def verificar_senha(senha: str, senha_hash: str) -> bool:
     Compara a senha digitada com o hash salvo no banco.
     Retorna True se bater, False se não bater.
     """
+    import bcrypt
+
     senha_bytes = senha.encode("utf-8")[:72]
     hash_bytes = senha_hash.encode("utf-8")
     return bcrypt.checkpw(senha_bytes, hash_bytes)
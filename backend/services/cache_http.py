@@ -0,0 +1,108 @@
+"""
+Cache condicional HTTP (ETag / Last-Modified + 304) para leituras que quase
+não mudam depois de criadas (dashboard, histórico, análise, pré-abertura)
+
+O endpoint carrega a linha, monta o ETag a partir do que define o payload
+(id, updated_at, versão do motor...) e chama responder_condicional ANTES de
+montar a resposta. Se o navegador já tem essa versão (If-None-Match /
+If-Modified-Since), volta 304 sem corpo — sem gerar plano de ação, sem
+serializar, sem tráfego.
+
+    analise = db.get(...)
+    nao_modificado = responder_condicional(
+        request, response,
+        etag=gerar_etag(analise.id, analise.updated_at, VERSAO_MOTOR),
+        ultima_modificacao=analise.updated_at,
+        cache_control=CACHE_REVALIDAR,
+    )
+    if nao_modificado:
+        return nao_modificado
+    ...
+
+ETag fraco (W/): o GZip muda os bytes do corpo, e o que o ETag garante é o
+mesmo conteúdo, não o mesmo byte a byte.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Dados financeiros de uma pessoa: nunca em cache compartilhado (CDN/proxy).
+# no-cache = o navegador guarda, mas revalida a cada uso (304 se igual)
+CACHE_REVALIDAR = "private, no-cache"
+
+# Linhas que não são alteradas depois de criadas (pré-abertura): o navegador
+# reaproveita sem perguntar por alguns minutos
+CACHE_IMUTAVEL = "private, max-age=300, must-revalidate"
+
+
+def gerar_etag(*partes: Any) -> str:
+    """ETag fraco a partir do que define o conteúdo da resposta."""
+    digest = hashlib.sha1("|".join(str(p) for p in partes).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _sem_fraco(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _etag_confere(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca (RFC 9110 §13.1.2): W/"x" casa com "x"."""
+    if if_none_match.strip() == "*":
+        return True
+    alvo = _sem_fraco(etag)
+    return any(_sem_fraco(candidato.strip()) == alvo for candidato in if_none_match.split(","))
+
+
+def _para_utc(momento: datetime) -> datetime:
+    # Colunas DateTime do projeto são naive em UTC (datetime.utcnow)
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=timezone.utc)
+    return momento.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _nao_modificado_desde(if_modified_since: str, ultima_modificacao: datetime) -> bool:
+    try:
+        desde = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return _para_utc(ultima_modificacao) <= _para_utc(desde)
+
+
+def responder_condicional(
+    request: Request,
+    response: Response,
+    *,
+    etag: str,
+    ultima_modificacao: Optional[datetime],
+    cache_control: str,
+    vary: Optional[str] = None,
+) -> Optional[Response]:
+    """
+    Coloca ETag/Last-Modified/Cache-Control na resposta do endpoint e devolve
+    uma resposta 304 pronta se o cliente já tem essa versão; senão None.
+    If-None-Match tem precedência sobre If-Modified-Since.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if ultima_modificacao is not None:
+        headers["Last-Modified"] = format_datetime(_para_utc(ultima_modificacao), usegmt=True)
+    if vary:
+        headers["Vary"] = vary
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        nao_mudou = _etag_confere(if_none_match, etag)
+    elif if_modified_since is not None and ultima_modificacao is not None:
+        nao_mudou = _nao_modificado_desde(if_modified_since, ultima_modificacao)
+    else:
+        nao_mudou = False
+
+    if nao_mudou:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,79 @@
+"""
+Cache em memória com expulsão LRU e TTL
+Reutilizável por qualquer serviço que precise guardar resultados caros
+(textos de IA, payloads recalculados...).
+
+Thread-safe: pode ser usado tanto no event loop quanto em asyncio.to_thread.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Dicionário limitado a `max_itens` entradas, cada uma válida por `ttl_segundos`.
+    Quando cheio, descarta a entrada usada há mais tempo.
+    Mantém contadores de acerto/erro para observabilidade.
+    """
+
+    def __init__(self, max_itens: int = 1000, ttl_segundos: Optional[float] = None):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._itens: OrderedDict = OrderedDict()  # chave → (expira_em, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expulsoes = 0
+
+    def get(self, chave: Hashable) -> Optional[Any]:
+        """Retorna o valor ou None (ausente/expirado). Valores None não são armazenáveis."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expira_em, valor = item
+            if expira_em is not None and time.monotonic() >= expira_em:
+                del self._itens[chave]
+                self.misses += 1
+                return None
+
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return valor
+
+    def set(self, chave: Hashable, valor: Any, ttl_segundos: Optional[float] = None) -> None:
+        """Guarda o valor. `ttl_segundos` sobrescreve o TTL padrão do cache."""
+        ttl = ttl_segundos if ttl_segundos is not None else self.ttl_segundos
+        expira_em = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._itens[chave] = (expira_em, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.expulsoes += 1
+
+    def invalidar(self, chave: Hashable) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expulsoes": self.expulsoes,
+                "taxa_acerto": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,146 @@
+"""
+Contador de queries SQL por requisição (e detector de N+1)
+
+Eventos do SQLAlchemy nos dois engines (síncrono e assíncrono) somam, na
+requisição corrente, quantas queries rodaram, o tempo no banco e quantas
+vezes cada SQL se repetiu. A requisição corrente vem de um ContextVar
+aberto pelo middleware do main.py — vale também para endpoints síncronos
+(o threadpool do Starlette copia o contexto) e para a sessão assíncrona.
+
+Fora de uma contagem ativa (jobs, scripts) os eventos não fazem nada.
+Nos scripts dá pra medir um trecho com:
+
+    with contar_queries() as estatisticas:
+        ...
+    print(estatisticas.queries, estatisticas.tempo_segundos)
+
+instrumentar_pool() mede o pool de conexões (checkouts, espera e conexões
+em uso) para o /metrics.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from services.metricas import CONTADOR_CHECKOUTS, HISTOGRAMA_ESPERA_POOL, registrar_medidor
+
+# Mesmo SQL repetido a partir disso numa requisição = suspeita de N+1
+LIMIAR_N_MAIS_1 = 5
+
+# Tamanho do SQL mostrado no aviso de N+1
+MAX_CARACTERES_SQL = 160
+
+
+@dataclass
+class EstatisticasSQL:
+    queries: int = 0
+    tempo_segundos: float = 0.0
+    por_sql: Counter = field(default_factory=Counter)
+
+    def suspeitas_n_mais_1(self) -> list[tuple[str, int]]:
+        """SQLs repetidos LIMIAR_N_MAIS_1 vezes ou mais, do mais repetido ao menos."""
+        return [(sql, n) for sql, n in self.por_sql.most_common() if n >= LIMIAR_N_MAIS_1]
+
+
+_estatisticas: ContextVar[Optional[EstatisticasSQL]] = ContextVar("estatisticas_sql", default=None)
+
+_engines_instrumentados: set[int] = set()
+
+# nome → engine, lidos na hora da coleta do /metrics
+_pools: dict[str, Engine] = {}
+
+
+@contextmanager
+def contar_queries() -> Iterator[EstatisticasSQL]:
+    """Abre uma contagem; queries feitas dentro do bloco (e de tarefas filhas) entram nela."""
+    estatisticas = EstatisticasSQL()
+    token = _estatisticas.set(estatisticas)
+    try:
+        yield estatisticas
+    finally:
+        _estatisticas.reset(token)
+
+
+def _normalizar(sql: str) -> str:
+    """Colapsa espaços: o mesmo SQL com parâmetros diferentes vira a mesma chave."""
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Registra os eventos no engine (síncrono ou o sync_engine do assíncrono)."""
+    if id(engine) in _engines_instrumentados:
+        return
+    _engines_instrumentados.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        if _estatisticas.get() is not None:
+            conn.info["_contador_queries_inicio"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        estatisticas = _estatisticas.get()
+        inicio = conn.info.pop("_contador_queries_inicio", None)
+        if estatisticas is None or inicio is None:
+            return
+        estatisticas.queries += 1
+        estatisticas.tempo_segundos += time.perf_counter() - inicio
+        estatisticas.por_sql[_normalizar(statement)] += 1
+
+
+def resumir_sql(sql: str) -> str:
+    """SQL encurtado para logs."""
+    if len(sql) <= MAX_CARACTERES_SQL:
+        return sql
+    return sql[:MAX_CARACTERES_SQL] + "…"
+
+
+# ========== POOL DE CONEXÕES ==========
+
+def _ler_conexoes_em_uso() -> list[tuple[dict, float]]:
+    series = []
+    for nome, engine in _pools.items():
+        # engine.pool é relido a cada coleta (dispose() troca o pool)
+        checkedout = getattr(engine.pool, "checkedout", None)
+        if checkedout is not None:
+            series.append(({"engine": nome}, checkedout()))
+    return series
+
+
+registrar_medidor(
+    "leme_db_pool_conexoes_em_uso",
+    "Conexões do pool emprestadas agora",
+    rotulos=("engine",),
+    ler=_ler_conexoes_em_uso,
+)
+
+
+def instrumentar_pool(engine: Engine, nome: str) -> None:
+    """Checkouts e tempo de espera por conexão do pool do engine."""
+    if nome in _pools:
+        return
+    _pools[nome] = engine
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        CONTADOR_CHECKOUTS.incrementar(engine=nome)
+
+    # O pool não tem evento de "início da espera": mede em volta do connect()
+    pool = engine.pool
+    connect_original = pool.connect
+
+    def _connect_medido():
+        inicio = time.perf_counter()
+        try:
+            return connect_original()
+        finally:
+            HISTOGRAMA_ESPERA_POOL.observar(time.perf_counter() - inicio, engine=nome)
+
+    pool.connect = _connect_medido
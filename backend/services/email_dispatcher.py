@@ -0,0 +1,153 @@
+"""
+Disparo de e-mails em massa para os crons (abandono, 30 dias, lembrete mensal)
+
+Antes cada destinatário era um await em sequência: o tempo total crescia
+com (destinatários × latência do Brevo) e o cron-job.org estourava o timeout.
+
+Aqui:
+- os destinatários são divididos em lotes de EMAIL_LOTE_TAMANHO (1 chamada cada)
+- até EMAIL_MAX_CONCORRENCIA lotes em voo ao mesmo tempo
+- balde de tokens limita a EMAIL_REQUISICOES_POR_SEGUNDO chamadas ao Brevo
+- a marcação de "enviado" (idempotência) é commitada ao fim de CADA lote:
+  se o processo cair no meio, a próxima execução não reenvia o que já saiu
+- aceita Session ou AsyncSession (o cron de lembrete mensal usa a assíncrona)
+- falhas parciais voltam no dict de estatísticas, sem abortar os outros lotes
+- lote recusado pelo Brevo (4xx) é dividido ao meio até isolar os
+  destinatários inválidos: os outros saem e são marcados, e o mesmo grupo
+  não volta a falhar inteiro a cada execução do cron
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from services.email_service import enviar_lote_brevo
+
+settings = get_settings()
+
+# Quantas mensagens de erro guardar no relatório
+MAX_ERROS_REPORTADOS = 10
+
+
+class _BaldeDeTokens:
+    """
+    Rate limit clássico: o balde enche `taxa` tokens por segundo até `capacidade`.
+    Cada chamada ao Brevo consome um token; sem token, espera.
+    """
+
+    def __init__(self, taxa: float, capacidade: int):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def consumir(self) -> None:
+        async with self._lock:
+            while True:
+                agora = time.monotonic()
+                self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.taxa)
+
+
+async def _commit(db: Union[Session, AsyncSession]) -> None:
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
+
+
+async def despachar_emails(
+    db: Union[Session, AsyncSession],
+    itens: list[Any],
+    montar: Callable[[Any], dict],
+    marcar_enviado: Callable[[Any], None],
+) -> dict:
+    """
+    Envia um e-mail por item, em lotes paralelos com rate limit.
+
+    Args:
+        db: Sessão usada para commitar as marcações de cada lote
+        itens: Registros a notificar (SessaoAnalise, Analise, Usuario...)
+        montar: item → kwargs do e-mail (funções montar_email_* do email_service)
+        marcar_enviado: grava no item que o e-mail saiu (ex: email_30d_enviado_em)
+
+    Returns:
+        {"enviados", "falhas", "lotes", "lotes_com_falha", "lotes_divididos", "erros"}
+    """
+    resultado = {
+        "enviados": 0,
+        "falhas": 0,
+        "lotes": 0,
+        "lotes_com_falha": 0,
+        "lotes_divididos": 0,
+        "erros": [],
+    }
+    if not itens:
+        return resultado
+
+    # Monta tudo antes do primeiro commit: na Session síncrona os objetos
+    # expiram e cada atributo lido viraria uma query nova
+    emails = [montar(item) for item in itens]
+
+    tamanho = settings.EMAIL_LOTE_TAMANHO
+    lotes = [
+        (itens[i:i + tamanho], emails[i:i + tamanho])
+        for i in range(0, len(itens), tamanho)
+    ]
+    resultado["lotes"] = len(lotes)
+
+    semaforo = asyncio.Semaphore(settings.EMAIL_MAX_CONCORRENCIA)
+    # Sessão não aceita operações concorrentes: marcar + commit é serializado
+    trava_sessao = asyncio.Lock()
+    balde = _BaldeDeTokens(
+        taxa=settings.EMAIL_REQUISICOES_POR_SEGUNDO,
+        capacidade=settings.EMAIL_MAX_CONCORRENCIA,
+    )
+
+    async def _enviar(numero: int, lote: list[Any], emails_lote: list[dict]) -> bool:
+        """Envia (dividindo se recusado) e marca o que saiu; False se algum destinatário falhou."""
+        async with semaforo:
+            await balde.consumir()
+            falha = await enviar_lote_brevo(emails_lote)
+
+        if falha is None:
+            # Outro lote não intercala entre marcar e commitar
+            async with trava_sessao:
+                for item in lote:
+                    marcar_enviado(item)
+                await _commit(db)
+            resultado["enviados"] += len(lote)
+            return True
+
+        if falha.recusado and len(lote) > 1:
+            resultado["lotes_divididos"] += 1
+            meio = len(lote) // 2
+            metades = await asyncio.gather(
+                _enviar(numero, lote[:meio], emails_lote[:meio]),
+                _enviar(numero, lote[meio:], emails_lote[meio:]),
+            )
+            return all(metades)
+
+        resultado["falhas"] += len(lote)
+        if len(resultado["erros"]) < MAX_ERROS_REPORTADOS:
+            erro = {"lote": numero, "destinatarios": len(lote), "erro": falha.erro}
+            if len(lote) == 1:
+                erro["email"] = emails_lote[0]["para_email"]
+            resultado["erros"].append(erro)
+        return False
+
+    enviados = await asyncio.gather(*(
+        _enviar(numero, lote, emails_lote)
+        for numero, (lote, emails_lote) in enumerate(lotes, start=1)
+    ))
+    resultado["lotes_com_falha"] = enviados.count(False)
+    return resultado
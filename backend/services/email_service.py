@@ -1,17 +1,28 @@
 """
 Serviço de envio de e-mails via Brevo (ex-Sendinblue)
 Features: E-mail de abandono, E-mail pós-conclusão
+
+Conexão: um único httpx.AsyncClient por worker (HTTP/2 + keep-alive),
+aberto no primeiro envio e fechado no shutdown (lifespan do main.py).
+Envio em lote: enviar_lote_brevo manda até MAX_VERSOES_POR_LOTE
+destinatários numa única chamada (messageVersions do Brevo); os crons
+passam pelo services/email_dispatcher.py.
 """
 
+import logging
+import time
+
 import httpx
-from typing import Optional
+from typing import NamedTuple, Optional
 from urllib.parse import quote
 
 from config import get_settings
+from services.metricas import HISTOGRAMA_EMAIL, CONTADOR_EMAILS
 
 
 # Configurações
 settings = get_settings()
+logger = logging.getLogger(__name__)
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
 
 # Remetente padrão
@@ -24,6 +35,63 @@ LOGO_URL = "https://leme.app.br/images/logo-icon.png"
 # Tally
 TALLY_FORM_URL = "https://tally.so/r/44KEvd"
 
+# Limite de versões por chamada no envio em lote do Brevo
+MAX_VERSOES_POR_LOTE = 1000
+
+
+class FalhaLote(NamedTuple):
+    """Erro de enviar_lote_brevo."""
+    erro: str
+    # 4xx (menos 429): o Brevo recusou o conteúdo do lote — um destinatário
+    # inválido derruba todos; dividir o lote isola quem falha de verdade
+    recusado: bool = False
+
+
+# Cliente HTTP compartilhado (criado no primeiro envio)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+# ========== CLIENTE HTTP COMPARTILHADO ==========
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente do Brevo, criando no primeiro uso.
+    Reaproveita a conexão TLS entre envios — sem handshake novo por e-mail.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _http_client
+
+
+async def fechar_http_client() -> None:
+    """Fecha o pool HTTP. Chamado no shutdown da aplicação (lifespan)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _headers_brevo() -> dict:
+    return {
+        "accept": "application/json",
+        "content-type": "application/json",
+        "api-key": settings.BREVO_API_KEY,
+    }
+
+
+# ========== ENVIO ==========
+
+
+def _registrar_envio(template: str, status: str, inicio: float, quantidade: int = 1) -> None:
+    """Latência e contagem por template no /metrics (status: HTTP ou 'excecao')."""
+    HISTOGRAMA_EMAIL.observar(time.perf_counter() - inicio, template=template, status=status)
+    CONTADOR_EMAILS.incrementar(quantidade, template=template, status=status)
+
 
 async def enviar_email(
     para_email: str,
@@ -31,6 +99,7 @@ async def enviar_email(
     assunto: str,
     html_content: str,
     texto_content: Optional[str] = None,
+    template: str = "avulso",
 ) -> bool:
     """
     Envia um e-mail usando a API do Brevo.
@@ -41,13 +110,14 @@ async def enviar_email(
         assunto: Assunto do e-mail
         html_content: Conteúdo HTML do e-mail
         texto_content: Conteúdo texto puro (fallback)
+        template: Nome do modelo de e-mail (rótulo das métricas)
 
     Returns:
         True se enviou com sucesso, False caso contrário
     """
 
     if not settings.BREVO_API_KEY:
-        print("ERRO: BREVO_API_KEY não configurada")
+        logger.error("BREVO_API_KEY não configurada")
         return False
 
     payload = {
@@ -68,37 +138,125 @@ async def enviar_email(
     if texto_content:
         payload["textContent"] = texto_content
 
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "api-key": settings.BREVO_API_KEY,
-    }
-
+    inicio = time.perf_counter()
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                BREVO_API_URL,
-                json=payload,
-                headers=headers,
-                timeout=30.0,
+        response = await get_http_client().post(
+            BREVO_API_URL,
+            json=payload,
+            headers=_headers_brevo(),
+        )
+        _registrar_envio(template, str(response.status_code), inicio)
+
+        if response.status_code in [200, 201]:
+            logger.info("E-mail enviado com sucesso para %s", para_email, extra={"template": template})
+            return True
+        else:
+            logger.error(
+                "Erro ao enviar e-mail: %s - %s", response.status_code, response.text,
+                extra={"template": template},
             )
-
-            if response.status_code in [200, 201]:
-                print(f"E-mail enviado com sucesso para {para_email}")
-                return True
-            else:
-                print(f"Erro ao enviar e-mail: {response.status_code} - {response.text}")
-                return False
+            return False
 
     except Exception as e:
-        print(f"Exceção ao enviar e-mail: {e}")
+        _registrar_envio(template, "excecao", inicio)
+        logger.exception("Exceção ao enviar e-mail: %s", e, extra={"template": template})
         return False
 
 
-async def enviar_email_abandono_1(nome_empresa: str, email: str, sessao_id: str = None) -> bool:
+async def enviar_lote_brevo(emails: list[dict]) -> Optional[FalhaLote]:
     """
-    Envia o primeiro e-mail de abandono (3-6h após início).
+    Envia até MAX_VERSOES_POR_LOTE e-mails já montados (saída das funções
+    montar_email_*) numa única chamada, usando messageVersions do Brevo —
+    cada destinatário com assunto/HTML próprios.
+
+    O Brevo aceita ou recusa o lote inteiro.
+
+    Returns:
+        None se enviou, ou a FalhaLote (descrição do erro para o relatório
+        e se foi recusa do lote, que vale a pena dividir)
+    """
+
+    if not settings.BREVO_API_KEY:
+        logger.error("BREVO_API_KEY não configurada")
+        return FalhaLote("BREVO_API_KEY não configurada")
+
+    versoes = []
+    for email in emails:
+        versao = {
+            "to": [{"email": email["para_email"], "name": email["para_nome"]}],
+            "subject": email["assunto"],
+            "htmlContent": email["html_content"],
+        }
+        if email.get("texto_content"):
+            versao["textContent"] = email["texto_content"]
+        versoes.append(versao)
+
+    # Campos da raiz são obrigatórios — cada versão sobrescreve assunto e HTML
+    payload = {
+        "sender": {
+            "name": DEFAULT_SENDER_NAME,
+            "email": DEFAULT_SENDER_EMAIL,
+        },
+        "subject": emails[0]["assunto"],
+        "htmlContent": emails[0]["html_content"],
+        "messageVersions": versoes,
+    }
+
+    # Os lotes dos crons são de um template só (ver email_dispatcher)
+    template = emails[0].get("template", "avulso")
+    inicio = time.perf_counter()
+    try:
+        response = await get_http_client().post(
+            BREVO_API_URL,
+            json=payload,
+            headers=_headers_brevo(),
+        )
+        _registrar_envio(template, str(response.status_code), inicio, quantidade=len(emails))
+
+        if response.status_code in [200, 201]:
+            logger.info("Lote de %d e-mails enviado com sucesso", len(emails), extra={"template": template})
+            return None
+
+        logger.error(
+            "Erro ao enviar lote de e-mails: %s - %s", response.status_code, response.text,
+            extra={"template": template},
+        )
+        return FalhaLote(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            recusado=400 <= response.status_code < 500 and response.status_code != 429,
+        )
+
+    except Exception as e:
+        _registrar_envio(template, "excecao", inicio, quantidade=len(emails))
+        logger.exception("Exceção ao enviar lote de e-mails: %s", e, extra={"template": template})
+        return FalhaLote(f"{type(e).__name__}: {e}")
+
+
+async def enviar_emails_em_lote(emails: list[dict]) -> list[bool]:
+    """
+    Envia qualquer quantidade de e-mails montados, em lotes sequenciais de
+    MAX_VERSOES_POR_LOTE. Para os crons, prefira services/email_dispatcher.py
+    (lotes em paralelo, rate limit e marcação por lote).
+
+    Returns:
+        Lista de sucesso/falha na mesma ordem de `emails`.
+    """
+
+    resultados: list[bool] = []
+
+    for inicio in range(0, len(emails), MAX_VERSOES_POR_LOTE):
+        lote = emails[inicio:inicio + MAX_VERSOES_POR_LOTE]
+        erro = await enviar_lote_brevo(lote)
+        resultados.extend([erro is None] * len(lote))
+
+    return resultados
+
+
+def montar_email_abandono_1(nome_empresa: str, email: str, sessao_id: str = None) -> dict:
+    """
+    Monta o primeiro e-mail de abandono (3-6h após início).
     Tom: amigável, direto.
+    Retorna os kwargs de enviar_email (usado também no envio em lote).
     """
 
     if sessao_id:
@@ -153,18 +311,25 @@ async def enviar_email_abandono_1(nome_empresa: str, email: str, sessao_id: str
     </html>
     """
 
-    return await enviar_email(
-        para_email=email,
-        para_nome=nome_empresa,
-        assunto=assunto,
-        html_content=html_content,
-    )
+    return {
+        "para_email": email,
+        "para_nome": nome_empresa,
+        "assunto": assunto,
+        "html_content": html_content,
+        "template": "abandono_1",
+    }
 
 
-async def enviar_email_abandono_2(nome_empresa: str, email: str, sessao_id: str = None) -> bool:
+async def enviar_email_abandono_1(nome_empresa: str, email: str, sessao_id: str = None) -> bool:
+    """Envia o primeiro e-mail de abandono (3-6h após início)."""
+    return await enviar_email(**montar_email_abandono_1(nome_empresa, email, sessao_id))
+
+
+def montar_email_abandono_2(nome_empresa: str, email: str, sessao_id: str = None) -> dict:
     """
-    Envia o segundo e-mail de abandono (48h após início).
+    Monta o segundo e-mail de abandono (48h após início).
     Tom: último lembrete, sem pressão.
+    Retorna os kwargs de enviar_email (usado também no envio em lote).
     """
 
     if sessao_id:
@@ -225,17 +390,23 @@ async def enviar_email_abandono_2(nome_empresa: str, email: str, sessao_id: str
     </html>
     """
 
-    return await enviar_email(
-        para_email=email,
-        para_nome=nome_empresa,
-        assunto=assunto,
-        html_content=html_content,
-    )
+    return {
+        "para_email": email,
+        "para_nome": nome_empresa,
+        "assunto": assunto,
+        "html_content": html_content,
+        "template": "abandono_2",
+    }
 
 
-async def enviar_email_pos_conclusao(nome_empresa: str, email: str, analise_id: str) -> bool:
+async def enviar_email_abandono_2(nome_empresa: str, email: str, sessao_id: str = None) -> bool:
+    """Envia o segundo e-mail de abandono (48h após início)."""
+    return await enviar_email(**montar_email_abandono_2(nome_empresa, email, sessao_id))
+
+
+def montar_email_pos_conclusao(nome_empresa: str, email: str, analise_id: str) -> dict:
     """
-    Envia e-mail de feedback após conclusão da análise.
+    Monta o e-mail de feedback após conclusão da análise.
     """
 
     assunto = "Sua análise financeira em 1 nota"
@@ -294,18 +465,25 @@ async def enviar_email_pos_conclusao(nome_empresa: str, email: str, analise_id:
     </html>
     """
 
-    return await enviar_email(
-        para_email=email,
-        para_nome=nome_empresa,
-        assunto=assunto,
-        html_content=html_content,
-    )
+    return {
+        "para_email": email,
+        "para_nome": nome_empresa,
+        "assunto": assunto,
+        "html_content": html_content,
+        "template": "pos_conclusao",
+    }
 
 
-async def enviar_email_30_dias(nome_empresa: str, email: str) -> bool:
+async def enviar_email_pos_conclusao(nome_empresa: str, email: str, analise_id: str) -> bool:
+    """Envia e-mail de feedback após conclusão da análise."""
+    return await enviar_email(**montar_email_pos_conclusao(nome_empresa, email, analise_id))
+
+
+def montar_email_30_dias(nome_empresa: str, email: str) -> dict:
     """
-    Envia e-mail de reengajamento 30 dias após conclusão.
+    Monta o e-mail de reengajamento 30 dias após conclusão.
     Versão atualizada: mais direto, com menção ao Pro e cupom LEMEPRO1.
+    Retorna os kwargs de enviar_email (usado também no envio em lote).
     """
 
     assunto = f"Como está a saúde financeira da {nome_empresa} hoje?"
@@ -363,12 +541,18 @@ async def enviar_email_30_dias(nome_empresa: str, email: str) -> bool:
     </html>
     """
 
-    return await enviar_email(
-        para_email=email,
-        para_nome=nome_empresa,
-        assunto=assunto,
-        html_content=html_content,
-    )
+    return {
+        "para_email": email,
+        "para_nome": nome_empresa,
+        "assunto": assunto,
+        "html_content": html_content,
+        "template": "30_dias",
+    }
+
+
+async def enviar_email_30_dias(nome_empresa: str, email: str) -> bool:
+    """Envia e-mail de reengajamento 30 dias após conclusão."""
+    return await enviar_email(**montar_email_30_dias(nome_empresa, email))
 
 # =============================================================================
 # FASE 6 — NOVAS FUNÇÕES
@@ -467,6 +651,7 @@ async def enviar_email_pos_analise_pro(
         para_nome=nome_empresa,
         assunto=assunto,
         html_content=html_content,
+        template="pos_analise_pro",
     )
 
 
@@ -565,21 +750,23 @@ async def enviar_email_boas_vindas(
         para_nome=nome_empresa,
         assunto=assunto,
         html_content=html_content,
+        template="boas_vindas",
     )
 
 
-async def enviar_email_lembrete_mensal(
+def montar_email_lembrete_mensal(
     nome_empresa: str,
     email: str,
     score_anterior: int,
     folego_anterior: int,
     dias_desde_analise: int,
     mes_ultima_analise: str,
-) -> bool:
+) -> dict:
     """
     E3 — Lembrete mensal para usuários Pro no aniversário mensal da 1ª análise.
     Disparado pelo cron job diário em /api/v1/cron/lembrete-mensal.
     Paleta da ID Visual oficial: #112d4e, #f5793b, #f4f4f4.
+    Retorna os kwargs de enviar_email (usado também no envio em lote).
     """
 
     assunto = f"Como está {nome_empresa} este mês?"
@@ -639,12 +826,32 @@ async def enviar_email_lembrete_mensal(
     </html>
     """
 
-    return await enviar_email(
-        para_email=email,
-        para_nome=nome_empresa,
-        assunto=assunto,
-        html_content=html_content,
-    )
+    return {
+        "para_email": email,
+        "para_nome": nome_empresa,
+        "assunto": assunto,
+        "html_content": html_content,
+        "template": "lembrete_mensal",
+    }
+
+
+async def enviar_email_lembrete_mensal(
+    nome_empresa: str,
+    email: str,
+    score_anterior: int,
+    folego_anterior: int,
+    dias_desde_analise: int,
+    mes_ultima_analise: str,
+) -> bool:
+    """E3 — Lembrete mensal para usuários Pro (envio individual)."""
+    return await enviar_email(**montar_email_lembrete_mensal(
+        nome_empresa=nome_empresa,
+        email=email,
+        score_anterior=score_anterior,
+        folego_anterior=folego_anterior,
+        dias_desde_analise=dias_desde_analise,
+        mes_ultima_analise=mes_ultima_analise,
+    ))
 
 
 # =============================================================================
@@ -921,6 +1128,7 @@ async def enviar_email_boas_vindas_pro(
         para_nome=nome_empresa,
         assunto=assunto,
         html_content=html_content,
+        template="boas_vindas_pro",
     )
 
 # =============================================================================
@@ -1063,4 +1271,5 @@ async def enviar_email_reset_senha(
         para_nome=nome_empresa,
         assunto=assunto,
         html_content=html_content,
+        template="reset_senha",
     )
\ No newline at end of file
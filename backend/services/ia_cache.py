@@ -0,0 +1,139 @@
+"""
+Cache de textos gerados pela IA — Fase 5
+Evita pagar (e esperar) de novo por um prompt que já foi respondido.
+
+Duas camadas:
+1. Memória (CacheLRU por worker) — acerto em microssegundos
+2. Banco (tabela cache_ia) — sobrevive a restart e é compartilhada entre workers
+
+A chave é endereçada pelo conteúdo: SHA-256 do JSON canônico de
+(modelo, system, mensagens, max_tokens). Quem quer aumentar a taxa de acerto
+arredonda os números ANTES de montar o prompt (ver gerar_comparativo_setorial).
+
+Falhas do cache nunca derrubam a geração — no pior caso vira uma chamada à API.
+Entradas expiradas do banco são apagadas aos poucos, a cada gravação
+(LIMPEZA_POR_GRAVACAO por vez, pelo índice de expira_em).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from config import get_settings
+from database import SessionLocal
+from models.cache_ia import CacheIA
+from services.cache_lru import CacheLRU
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Validade por tipo de texto — benchmark setorial muda pouco, chat muda muito
+TTL_POR_FUNCAO = {
+    "comparativo_setorial": timedelta(days=30),
+    "resumo_executivo": timedelta(days=7),
+    "abertura_chat": timedelta(days=1),
+}
+TTL_PADRAO = timedelta(hours=1)
+
+# Expiradas apagadas por gravação: mais que o ritmo de entradas novas, então
+# a tabela não cresce, e pouco o bastante para não segurar a gravação
+LIMPEZA_POR_GRAVACAO = 100
+
+_memoria = CacheLRU(max_itens=settings.IA_CACHE_MAX_ITENS)
+
+
+# ========== CHAVE ==========
+
+def calcular_chave(model: str, system: str, messages: list[dict], max_tokens: int) -> str:
+    """Fingerprint canônico do prompt: mesma entrada → mesma chave, em qualquer worker."""
+    canonico = json.dumps(
+        {"model": model, "system": system, "messages": messages, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+# ========== CAMADA DE BANCO (roda em thread) ==========
+
+def _buscar_no_banco(chave: str) -> Optional[tuple[str, datetime]]:
+    db = SessionLocal()
+    try:
+        registro = db.query(CacheIA).filter(CacheIA.chave == chave).first()
+        if not registro or registro.expira_em <= datetime.utcnow():
+            return None
+        registro.hits = (registro.hits or 0) + 1
+        db.commit()
+        return registro.texto, registro.expira_em
+    finally:
+        db.close()
+
+
+def _gravar_no_banco(chave: str, funcao: str, texto: str, expira_em: datetime) -> None:
+    db = SessionLocal()
+    try:
+        # merge: sobrescreve entrada expirada com a mesma chave
+        db.merge(CacheIA(chave=chave, funcao=funcao, texto=texto, hits=0, expira_em=expira_em))
+        expiradas = (
+            select(CacheIA.chave)
+            .where(CacheIA.expira_em <= datetime.utcnow())
+            .limit(LIMPEZA_POR_GRAVACAO)
+        )
+        db.execute(delete(CacheIA).where(CacheIA.chave.in_(expiradas)))
+        db.commit()
+    finally:
+        db.close()
+
+
+# ========== API ==========
+
+async def buscar(chave: str) -> Optional[str]:
+    """Procura na memória e depois no banco. None = não tem (ou cache desligado)."""
+    if not settings.IA_CACHE_ATIVO:
+        return None
+
+    texto = _memoria.get(chave)
+    if texto is not None:
+        return texto
+
+    try:
+        encontrado = await asyncio.to_thread(_buscar_no_banco, chave)
+    except Exception as e:
+        logger.warning("Falha ao ler cache_ia: %s", e)
+        return None
+
+    if encontrado is None:
+        return None
+
+    # Promove para a memória com o tempo que ainda resta
+    texto, expira_em = encontrado
+    restante = (expira_em - datetime.utcnow()).total_seconds()
+    if restante > 0:
+        _memoria.set(chave, texto, ttl_segundos=restante)
+    return texto
+
+
+async def guardar(chave: str, funcao: str, texto: str) -> None:
+    """Grava nas duas camadas. Erro no banco só gera log."""
+    if not settings.IA_CACHE_ATIVO:
+        return
+
+    ttl = TTL_POR_FUNCAO.get(funcao, TTL_PADRAO)
+    _memoria.set(chave, texto, ttl_segundos=ttl.total_seconds())
+
+    try:
+        await asyncio.to_thread(_gravar_no_banco, chave, funcao, texto, datetime.utcnow() + ttl)
+    except Exception as e:
+        logger.warning("Falha ao gravar cache_ia: %s", e)
+
+
+def estatisticas() -> dict:
+    """Contadores da camada em memória deste worker (hits, misses, expulsões)."""
+    return _memoria.estatisticas()
@@ -0,0 +1,282 @@
+"""
+Cliente assíncrono da Claude API — Fase 5
+Camada única por onde passam todas as chamadas à Anthropic.
+
+Por que existe:
+- O SDK síncrono (anthropic.Anthropic) bloqueava o event loop do uvicorn
+  durante os 2-10s de cada geração — todas as outras requisições do worker
+  (inclusive as Free, que nunca chamam IA) ficavam esperando.
+- Aqui usamos o AsyncAnthropic com pool de conexões HTTP compartilhado,
+  limite de chamadas simultâneas por worker, timeout e retry com backoff.
+
+Uso:
+    texto = await gerar_texto(system=..., messages=[...], max_tokens=300)
+
+    # Com cache: prompt idêntico não chama a API de novo (ver ia_cache.py)
+    texto = await gerar_texto(..., cache="comparativo_setorial", validar=_json_valido)
+
+    async for pedaco in transmitir_texto(system=..., messages=[...], max_tokens=600):
+        ...  # streaming (ChatConsultor via SSE)
+
+Configuração (config.py / .env):
+- ANTHROPIC_BASE_URL: aponta para outro servidor (ex: fake local em testes de carga)
+- IA_MAX_CONCORRENCIA, IA_MAX_CONEXOES, IA_TIMEOUT_SEGUNDOS, IA_MAX_TENTATIVAS
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional
+
+import httpx
+
+from config import get_settings
+from services import ia_cache
+from services.metricas import HISTOGRAMA_IA, CONTADOR_TOKENS_IA, CONTADOR_CACHE_IA
+
+if TYPE_CHECKING:
+    # O SDK só é importado no primeiro uso (get_client): fora do cold start
+    import anthropic
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Modelo definido no handoff — custo/qualidade ideal para texto estruturado
+MODELO_IA = "claude-sonnet-4-5"
+
+
+# Backoff exponencial: 0.5s, 1s, 2s... com jitter, teto de 8s
+BACKOFF_BASE_SEGUNDOS = 0.5
+BACKOFF_MAX_SEGUNDOS = 8.0
+
+# Instâncias criadas no primeiro uso (um por worker)
+_client: Optional["anthropic.AsyncAnthropic"] = None
+_semaforo: Optional[asyncio.Semaphore] = None
+_erros_transitorios: Optional[tuple] = None
+
+
+# ========== INSTÂNCIAS COMPARTILHADAS ==========
+
+def get_client() -> "anthropic.AsyncAnthropic":
+    """
+    Retorna o cliente assíncrono compartilhado, criando no primeiro uso.
+    O pool HTTP é reaproveitado entre chamadas (keep-alive).
+    """
+    global _client
+    if _client is None:
+        import anthropic
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.IA_MAX_CONEXOES,
+                max_keepalive_connections=settings.IA_MAX_CONEXOES,
+            ),
+            timeout=httpx.Timeout(settings.IA_TIMEOUT_SEGUNDOS, connect=5.0),
+        )
+
+        kwargs = {
+            "http_client": http_client,
+            "timeout": settings.IA_TIMEOUT_SEGUNDOS,
+            # Retry fica por nossa conta (abaixo) para respeitar o semáforo
+            "max_retries": 0,
+        }
+        # Sem ANTHROPIC_API_KEY no settings, o SDK lê do ambiente
+        if settings.ANTHROPIC_API_KEY:
+            kwargs["api_key"] = settings.ANTHROPIC_API_KEY
+        if settings.ANTHROPIC_BASE_URL:
+            kwargs["base_url"] = settings.ANTHROPIC_BASE_URL
+
+        _client = anthropic.AsyncAnthropic(**kwargs)
+    return _client
+
+
+def _get_erros_transitorios() -> tuple:
+    """Erros que valem nova tentativa: rede/timeout, 429 e 5xx (inclui 529 overloaded)."""
+    global _erros_transitorios
+    if _erros_transitorios is None:
+        import anthropic
+        _erros_transitorios = (
+            anthropic.APIConnectionError,
+            anthropic.RateLimitError,
+            anthropic.InternalServerError,
+        )
+    return _erros_transitorios
+
+
+def _get_semaforo() -> asyncio.Semaphore:
+    """Limita quantas gerações rodam ao mesmo tempo neste worker."""
+    global _semaforo
+    if _semaforo is None:
+        _semaforo = asyncio.Semaphore(settings.IA_MAX_CONCORRENCIA)
+    return _semaforo
+
+
+async def fechar_cliente() -> None:
+    """Fecha o pool HTTP. Chamado no shutdown da aplicação (lifespan)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+# ========== RETRY ==========
+
+def _calcular_espera(tentativa: int, erro: Exception) -> float:
+    """
+    Tempo de espera antes da próxima tentativa.
+    Respeita o header retry-after do 429 quando presente.
+    """
+    resposta = getattr(erro, "response", None)
+    if resposta is not None:
+        retry_after = resposta.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SEGUNDOS)
+            except ValueError:
+                pass
+
+    espera = min(BACKOFF_BASE_SEGUNDOS * (2 ** (tentativa - 1)), BACKOFF_MAX_SEGUNDOS)
+    return random.uniform(espera / 2, espera)
+
+
+# ========== CHAMADA PRINCIPAL ==========
+
+async def gerar_texto(
+    system: str,
+    messages: list[dict],
+    max_tokens: int,
+    model: str = MODELO_IA,
+    cache: Optional[str] = None,
+    validar: Optional[Callable[[str], bool]] = None,
+) -> str:
+    """
+    Chama messages.create sem bloquear o event loop e retorna o texto gerado.
+
+    - No máximo IA_MAX_CONCORRENCIA chamadas simultâneas por worker
+    - Erros transitórios são tentados de novo até IA_MAX_TENTATIVAS vezes
+    - Erros definitivos (400, 401...) e a última falha sobem para o chamador,
+      que decide o fallback (cada função do ia_service já tem o seu)
+    - cache: nome da função (define o TTL). Quando informado, o texto é
+      buscado/guardado no cache pelo fingerprint do prompt
+    - validar: só textos aprovados vão para o cache (ex: JSON válido)
+    """
+    chave = None
+    if cache:
+        chave = ia_cache.calcular_chave(model, system, messages, max_tokens)
+        texto_cache = await ia_cache.buscar(chave)
+        CONTADOR_CACHE_IA.incrementar(funcao=cache, resultado="hit" if texto_cache is not None else "miss")
+        if texto_cache is not None:
+            return texto_cache
+
+    texto = await _chamar_api(system, messages, max_tokens, model, funcao=cache or "sem_cache")
+
+    if chave and (validar is None or validar(texto)):
+        await ia_cache.guardar(chave, cache, texto)
+    return texto
+
+
+def _registrar_uso(funcao: str, uso) -> None:
+    """Tokens de entrada/saída da resposta (resposta.usage) no /metrics."""
+    if uso is None:
+        return
+    CONTADOR_TOKENS_IA.incrementar(getattr(uso, "input_tokens", 0) or 0, funcao=funcao, tipo="entrada")
+    CONTADOR_TOKENS_IA.incrementar(getattr(uso, "output_tokens", 0) or 0, funcao=funcao, tipo="saida")
+
+
+async def _chamar_api(system: str, messages: list[dict], max_tokens: int, model: str, funcao: str) -> str:
+    """messages.create com semáforo e retry — sem cache."""
+    client = get_client()
+    tentativa = 0
+    inicio = time.perf_counter()
+
+    while True:
+        tentativa += 1
+        try:
+            async with _get_semaforo():
+                resposta = await client.messages.create(
+                    model=model,
+                    max_tokens=max_tokens,
+                    system=system,
+                    messages=messages,
+                )
+            HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="ok")
+            _registrar_uso(funcao, resposta.usage)
+            return resposta.content[0].text.strip()
+
+        except _get_erros_transitorios() as e:
+            if tentativa >= settings.IA_MAX_TENTATIVAS:
+                HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="erro")
+                raise
+            espera = _calcular_espera(tentativa, e)
+            logger.warning(
+                "Erro transitório na Claude API (tentativa %d/%d): %s. Nova tentativa em %.1fs.",
+                tentativa, settings.IA_MAX_TENTATIVAS, e, espera,
+            )
+            await asyncio.sleep(espera)
+
+        except Exception:
+            HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="erro")
+            raise
+
+
+async def transmitir_texto(
+    system: str,
+    messages: list[dict],
+    max_tokens: int,
+    model: str = MODELO_IA,
+) -> AsyncIterator[str]:
+    """
+    Versão em streaming do gerar_texto: entrega os pedaços de texto à medida
+    que a Claude gera, sem esperar a resposta completa.
+    Não passa pelo cache — cada conversa tem histórico próprio.
+
+    O slot do semáforo fica ocupado enquanto o stream estiver aberto.
+    Retry só acontece antes do primeiro pedaço — depois disso o erro sobe,
+    porque o cliente já recebeu parte da resposta.
+    """
+    client = get_client()
+    tentativa = 0
+    inicio = time.perf_counter()
+    funcao = "chat_stream"
+
+    while True:
+        tentativa += 1
+        recebeu_texto = False
+        try:
+            async with _get_semaforo():
+                async with client.messages.stream(
+                    model=model,
+                    max_tokens=max_tokens,
+                    system=system,
+                    messages=messages,
+                ) as stream:
+                    async for pedaco in stream.text_stream:
+                        if not recebeu_texto:
+                            # Mesmo comportamento do .strip() da versão sem streaming
+                            pedaco = pedaco.lstrip()
+                            if not pedaco:
+                                continue
+                        recebeu_texto = True
+                        yield pedaco
+                    # Stream já consumido: a mensagem final sai sem nova chamada
+                    mensagem_final = await stream.get_final_message()
+            HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="ok")
+            _registrar_uso(funcao, mensagem_final.usage)
+            return
+
+        except _get_erros_transitorios() as e:
+            if recebeu_texto or tentativa >= settings.IA_MAX_TENTATIVAS:
+                HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="erro")
+                raise
+            espera = _calcular_espera(tentativa, e)
+            logger.warning(
+                "Erro transitório no streaming da Claude API (tentativa %d/%d): %s. Nova tentativa em %.1fs.",
+                tentativa, settings.IA_MAX_TENTATIVAS, e, espera,
+            )
+            await asyncio.sleep(espera)
+
+        except Exception:
+            HISTOGRAMA_IA.observar(time.perf_counter() - inicio, funcao=funcao, resultado="erro")
+            raise
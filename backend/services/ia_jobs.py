@@ -0,0 +1,354 @@
+"""
+Fila de geração de IA — Fase 5
+Tira resumo_executivo e comparativo_setorial do caminho do POST /analise/nova.
+
+Fluxo:
+1. criar_analise grava a análise + um JobIA 'pendente' no MESMO commit
+2. Workers assíncronos (iniciados no lifespan do main.py) reservam jobs prontos,
+   chamam a Claude e salvam os textos na análise
+3. Falha → nova tentativa com backoff; esgotou → status 'falhou'
+4. O dashboard consulta GET /api/v1/analise/{id}/ia-status até sair de 'pendente'
+
+A reserva é otimista (UPDATE ... WHERE status = <lido>; job preso recuperado
+também exige updated_at ainda vencido), então vários processos uvicorn podem
+consumir a mesma tabela sem pegar o mesmo job.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import or_, and_, update
+from sqlalchemy.orm import Session
+
+from config import get_settings
+from database import SessionLocal
+from models.analise import Analise
+from models.job_ia import JobIA
+from services.ia_service import gerar_resumo_executivo, gerar_comparativo_setorial
+from services.email_service import enviar_email_pos_analise_pro
+from services.resumo_analises import buscar_score_anterior
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Job 'processando' sem atualização há mais que isso = worker morreu no meio
+TIMEOUT_PROCESSANDO = timedelta(minutes=10)
+
+# Espera entre tentativas: 30s, 2min, 8min...
+BACKOFF_BASE_SEGUNDOS = 30
+
+_workers: list[asyncio.Task] = []
+_novo_job: Optional[asyncio.Event] = None
+
+
+# ========== ENFILEIRAR (chamado dentro do request) ==========
+
+def enfileirar_geracao_ia(db: Session, analise_id: UUID) -> JobIA:
+    """
+    Adiciona o job da análise na sessão, sem commit — quem chama commita
+    junto com a análise (uma única transação).
+    Se já existir job para a análise, retorna o existente (deduplicação).
+    """
+    existente = db.query(JobIA).filter(JobIA.analise_id == analise_id).first()
+    if existente:
+        return existente
+
+    job = JobIA(
+        analise_id=analise_id,
+        status="pendente",
+        max_tentativas=settings.IA_JOBS_MAX_TENTATIVAS,
+    )
+    db.add(job)
+    return job
+
+
+def enfileirar_geracao_ia_lote(db: Session, analise_ids: list[UUID]) -> list[JobIA]:
+    """
+    enfileirar_geracao_ia para análises recém-criadas no mesmo lote (ainda
+    sem job, então sem a consulta de deduplicação): um add_all só.
+    """
+    jobs = [
+        JobIA(analise_id=analise_id, status="pendente", max_tentativas=settings.IA_JOBS_MAX_TENTATIVAS)
+        for analise_id in analise_ids
+    ]
+    db.add_all(jobs)
+    return jobs
+
+
+def notificar_novo_job() -> None:
+    """Acorda os workers deste processo sem esperar o próximo polling."""
+    if _novo_job is not None:
+        _novo_job.set()
+
+
+def buscar_status_job(db: Session, analise_id: UUID) -> Optional[JobIA]:
+    """Retorna o job da análise (None para Free e análises antigas)."""
+    return db.query(JobIA).filter(JobIA.analise_id == analise_id).first()
+
+
+# ========== OPERAÇÕES DE BANCO (rodam em thread) ==========
+
+def _reservar_proximo_job() -> Optional[tuple[UUID, UUID]]:
+    """
+    Reserva o próximo job pronto e retorna (job_id, analise_id).
+    Também recupera jobs presos em 'processando' por worker que caiu — se
+    ainda têm tentativa; senão viram 'falhou' (job que derruba o worker
+    não volta para a fila para sempre).
+    """
+    agora = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        candidatos = (
+            db.query(JobIA.id, JobIA.analise_id, JobIA.status, JobIA.tentativas, JobIA.max_tentativas)
+            .filter(
+                or_(
+                    and_(JobIA.status == "pendente", JobIA.proxima_tentativa_em <= agora),
+                    and_(JobIA.status == "processando", JobIA.updated_at < agora - TIMEOUT_PROCESSANDO),
+                )
+            )
+            .order_by(JobIA.proxima_tentativa_em)
+            .limit(5)
+            .all()
+        )
+
+        for job_id, analise_id, status_lido, tentativas, max_tentativas in candidatos:
+            # Só um worker consegue mudar o status que ele leu
+            condicoes = [JobIA.id == job_id, JobIA.status == status_lido]
+            if status_lido == "processando":
+                # 'processando' -> 'processando' não muda o status: sem isto, dois
+                # workers recuperariam o mesmo job preso. Quem chega primeiro
+                # renova o updated_at e o job deixa de estar vencido para o outro.
+                condicoes.append(JobIA.updated_at < agora - TIMEOUT_PROCESSANDO)
+                if tentativas >= max_tentativas:
+                    db.execute(
+                        update(JobIA)
+                        .where(*condicoes, JobIA.tentativas >= JobIA.max_tentativas)
+                        .values(
+                            status="falhou",
+                            erro="Worker interrompido em todas as tentativas",
+                            updated_at=agora,
+                        )
+                    )
+                    db.commit()
+                    logger.error("Job IA da análise %s → falhou (preso em processando, sem tentativas)", analise_id)
+                    continue
+                condicoes.append(JobIA.tentativas < JobIA.max_tentativas)
+            resultado = db.execute(
+                update(JobIA)
+                .where(*condicoes)
+                .values(
+                    status="processando",
+                    tentativas=JobIA.tentativas + 1,
+                    updated_at=agora,
+                )
+            )
+            db.commit()
+            if resultado.rowcount == 1:
+                return job_id, analise_id
+
+        return None
+    finally:
+        db.close()
+
+
+def _carregar_contexto(analise_id: UUID) -> Optional[dict]:
+    """Lê da análise tudo que os prompts precisam (inclusive o score anterior)."""
+    db = SessionLocal()
+    try:
+        analise = db.query(Analise).filter(Analise.id == analise_id).first()
+        if not analise:
+            return None
+
+        # Pelo resumo do usuário (chave primária) quando a análise é a última
+        score_anterior = buscar_score_anterior(db, analise)
+
+        # Prioridade do mês = primeiro item do plano de 30 dias
+        plano_prioridade = ""
+        if analise.plano_30_dias:
+            primeiro = analise.plano_30_dias[0]
+            if isinstance(primeiro, dict):
+                plano_prioridade = primeiro.get("titulo", "") or primeiro.get("acao", "")
+            else:
+                plano_prioridade = str(primeiro)
+
+        return {
+            "score": int(analise.score_saude or 0),
+            "setor": analise.setor,
+            "score_anterior": score_anterior,
+            "plano_prioridade": plano_prioridade,
+            "pontos_atencao": [
+                p.get("titulo", "") if isinstance(p, dict) else str(p)
+                for p in (analise.pontos_atencao or [])
+            ],
+            "indicadores": {
+                "margem_bruta": float(analise.margem_bruta) if analise.margem_bruta is not None else None,
+                "resultado_mes": float(analise.resultado_mes) if analise.resultado_mes is not None else None,
+                "folego_caixa": analise.folego_caixa,
+                "ciclo_financeiro": analise.ciclo_financeiro,
+                "peso_divida": float(analise.peso_divida) if analise.peso_divida is not None else None,
+                "receita_funcionario": float(analise.receita_funcionario) if analise.receita_funcionario is not None else None,
+            },
+            "ja_tem_resumo": analise.resumo_executivo is not None,
+            "ja_tem_comparativo": analise.comparativo_setorial is not None,
+            # Para o e-mail pós-análise Pro
+            "nome_empresa": analise.nome_empresa,
+            "email": analise.email,
+            "mes_referencia": analise.mes_referencia,
+            "ano_referencia": analise.ano_referencia,
+        }
+    finally:
+        db.close()
+
+
+def _salvar_resultado(
+    job_id: UUID,
+    analise_id: UUID,
+    resumo: Optional[str],
+    comparativo: Optional[str],
+    erro: Optional[str],
+) -> tuple[str, bool]:
+    """
+    Grava os textos gerados e atualiza o job.
+    Retorna (status_final, resumo_recem_salvo).
+    """
+    agora = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        analise = db.query(Analise).filter(Analise.id == analise_id).first()
+        job = db.query(JobIA).filter(JobIA.id == job_id).first()
+        if job is None:
+            # Análise (e o job, em cascata) apagada enquanto a IA gerava
+            logger.warning("Job IA %s da análise %s não existe mais; resultado descartado", job_id, analise_id)
+            return "removido", False
+
+        resumo_recem_salvo = False
+        if analise:
+            if resumo is not None and analise.resumo_executivo is None:
+                analise.resumo_executivo = resumo
+                resumo_recem_salvo = True
+            if comparativo is not None and analise.comparativo_setorial is None:
+                analise.comparativo_setorial = comparativo
+
+        if erro is None:
+            job.status = "concluido"
+            job.erro = None
+            job.concluido_em = agora
+        elif job.tentativas >= job.max_tentativas:
+            job.status = "falhou"
+            job.erro = erro
+        else:
+            job.status = "pendente"
+            job.erro = erro
+            espera = BACKOFF_BASE_SEGUNDOS * (4 ** (job.tentativas - 1))
+            job.proxima_tentativa_em = agora + timedelta(seconds=espera)
+
+        db.commit()
+        return job.status, resumo_recem_salvo
+    finally:
+        db.close()
+
+
+# ========== PROCESSAMENTO ==========
+
+async def _processar_job(job_id: UUID, analise_id: UUID) -> None:
+    """Gera só o que ainda falta (resumo e/ou comparativo) e salva."""
+    contexto = await asyncio.to_thread(_carregar_contexto, analise_id)
+    if contexto is None:
+        await asyncio.to_thread(_salvar_resultado, job_id, analise_id, None, None, "Análise não encontrada")
+        return
+
+    async def _resumo():
+        if contexto["ja_tem_resumo"]:
+            return None
+        return await gerar_resumo_executivo(
+            score=contexto["score"],
+            indicadores=contexto["indicadores"],
+            pontos_atencao=contexto["pontos_atencao"],
+            plano_prioridade=contexto["plano_prioridade"],
+            setor=contexto["setor"],
+            score_anterior=contexto["score_anterior"],
+        )
+
+    async def _comparativo():
+        if contexto["ja_tem_comparativo"]:
+            return None
+        return await gerar_comparativo_setorial(
+            indicadores=contexto["indicadores"],
+            setor=contexto["setor"],
+        )
+
+    # As duas gerações são independentes — rodam em paralelo
+    resumo, comparativo = await asyncio.gather(_resumo(), _comparativo())
+
+    # As funções do ia_service devolvem None em caso de falha
+    faltando = []
+    if not contexto["ja_tem_resumo"] and resumo is None:
+        faltando.append("resumo_executivo")
+    if not contexto["ja_tem_comparativo"] and comparativo is None:
+        faltando.append("comparativo_setorial")
+    erro = f"Falha ao gerar: {', '.join(faltando)}" if faltando else None
+
+    status_final, resumo_recem_salvo = await asyncio.to_thread(
+        _salvar_resultado, job_id, analise_id, resumo, comparativo, erro
+    )
+    logger.info("Job IA da análise %s → %s", analise_id, status_final)
+
+    # E-mail pós-análise Pro: só quando o resumo acabou de ser salvo
+    if resumo_recem_salvo:
+        await enviar_email_pos_analise_pro(
+            nome_empresa=contexto["nome_empresa"],
+            email=contexto["email"],
+            score=contexto["score"],
+            mes_referencia=contexto["mes_referencia"],
+            ano_referencia=contexto["ano_referencia"],
+            resumo_executivo=resumo,
+            analise_id=str(analise_id),
+        )
+
+
+async def _loop_worker(numero: int) -> None:
+    """Consome a fila até ser cancelado no shutdown."""
+    logger.info("Worker de IA %d iniciado", numero)
+    while True:
+        try:
+            reservado = await asyncio.to_thread(_reservar_proximo_job)
+            if reservado is None:
+                # Fila vazia: espera o polling ou um aviso de job novo
+                _novo_job.clear()
+                try:
+                    await asyncio.wait_for(_novo_job.wait(), timeout=settings.IA_JOBS_INTERVALO_SEGUNDOS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, analise_id = reservado
+            await _processar_job(job_id, analise_id)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Nunca deixar o worker morrer — o job volta pela recuperação de 'processando'
+            logger.error("Erro no worker de IA %d: %s", numero, e)
+            await asyncio.sleep(settings.IA_JOBS_INTERVALO_SEGUNDOS)
+
+
+# ========== CICLO DE VIDA (lifespan do main.py) ==========
+
+def iniciar_workers() -> None:
+    """Sobe o pool de workers deste processo."""
+    global _novo_job
+    _novo_job = asyncio.Event()
+    for numero in range(settings.IA_JOBS_WORKERS):
+        _workers.append(asyncio.create_task(_loop_worker(numero + 1)))
+
+
+async def parar_workers() -> None:
+    """Cancela os workers. Jobs interrompidos são retomados depois do TIMEOUT_PROCESSANDO."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
@@ -14,15 +14,11 @@ e salvas no banco. Não regerar a cada acesso.
 import json
 import logging
 from typing import Optional
-import anthropic
 
-logger = logging.getLogger(__name__)
-
-# Modelo definido no handoff — custo/qualidade ideal para texto estruturado
-MODELO_IA = "claude-sonnet-4-5"
+# Cliente assíncrono compartilhado — não bloqueia o event loop
+from services.ia_client import gerar_texto
 
-# Cliente Anthropic — lê ANTHROPIC_API_KEY do ambiente automaticamente
-_client = anthropic.Anthropic()
+logger = logging.getLogger(__name__)
 
 
 # ========== HELPERS INTERNOS ==========
@@ -37,6 +33,31 @@ def _status_por_score(score: int) -> str:
         return "crítico"
 
 
+def _arredondar_faixa(valor: float, passo: float) -> float:
+    """Arredonda para o múltiplo de `passo` mais próximo (faixas do cache)."""
+    return round(valor / passo) * passo
+
+
+def _arredondar_significativos(valor: float, digitos: int = 2) -> float:
+    """Mantém só `digitos` algarismos significativos (R$ 12.345 → 12.000)."""
+    if valor == 0:
+        return 0
+    return float(f"{valor:.{digitos}g}")
+
+
+def _resumo_valido(texto: str) -> bool:
+    """Resumo executivo tem no máximo 5 linhas não vazias."""
+    return len([l for l in texto.split("\n") if l.strip()]) <= 5
+
+
+def _json_valido(texto: str) -> bool:
+    try:
+        json.loads(texto)
+        return True
+    except ValueError:
+        return False
+
+
 # ========== FEATURE 1: RESUMO EXECUTIVO ==========
 
 async def gerar_resumo_executivo(
@@ -87,15 +108,14 @@ async def gerar_resumo_executivo(
     )
 
     try:
-        resposta = _client.messages.create(
-            model=MODELO_IA,
+        texto = await gerar_texto(
             max_tokens=300,
             messages=[{"role": "user", "content": user_prompt}],
             system=system_prompt,
+            cache="resumo_executivo",
+            validar=_resumo_valido,
         )
 
-        texto = resposta.content[0].text.strip()
-
         # Validação básica: rejeitar se veio mais de 5 linhas
         linhas = [l for l in texto.split("\n") if l.strip()]
         if len(linhas) > 5:
@@ -141,18 +161,20 @@ async def gerar_comparativo_setorial(
     resultado = indicadores.get("resultado_mes")
     receita = indicadores.get("receita_funcionario")
 
-    # Montar apenas os indicadores disponíveis
+    # Montar apenas os indicadores disponíveis, arredondados em faixas:
+    # o benchmark não muda entre 31,2% e 31,4% de margem, e assim empresas
+    # com perfil parecido caem na mesma chave do cache
     indicadores_txt_partes = []
     if margem is not None:
-        indicadores_txt_partes.append(f"margem_bruta: {margem}%")
+        indicadores_txt_partes.append(f"margem_bruta: {round(margem)}%")
     if folego is not None:
-        indicadores_txt_partes.append(f"folego_caixa: {folego} dias")
+        indicadores_txt_partes.append(f"folego_caixa: {int(_arredondar_faixa(folego, 5))} dias")
     if ciclo is not None:
-        indicadores_txt_partes.append(f"ciclo_financeiro: {ciclo} dias")
+        indicadores_txt_partes.append(f"ciclo_financeiro: {int(_arredondar_faixa(ciclo, 5))} dias")
     if peso_divida is not None:
-        indicadores_txt_partes.append(f"peso_divida: {peso_divida}%")
+        indicadores_txt_partes.append(f"peso_divida: {round(peso_divida)}%")
     if resultado is not None:
-        indicadores_txt_partes.append(f"margem_liquida: {resultado}")
+        indicadores_txt_partes.append(f"margem_liquida: {_arredondar_significativos(resultado):g}")
 
     indicadores_txt = ", ".join(indicadores_txt_partes)
 
@@ -172,15 +194,14 @@ async def gerar_comparativo_setorial(
     )
 
     try:
-        resposta = _client.messages.create(
-            model=MODELO_IA,
+        texto = await gerar_texto(
             max_tokens=600,
             messages=[{"role": "user", "content": user_prompt}],
             system=system_prompt,
+            cache="comparativo_setorial",
+            validar=_json_valido,
         )
 
-        texto = resposta.content[0].text.strip()
-
         # Validar que é JSON antes de salvar
         json.loads(texto)  # levanta ValueError se inválido
 
@@ -285,13 +306,12 @@ async def gerar_mensagem_abertura_chat(analise: dict) -> str:
         )
 
     try:
-        resposta = _client.messages.create(
-            model=MODELO_IA,
+        return await gerar_texto(
             max_tokens=150,
             system=system_prompt,
             messages=[{"role": "user", "content": abertura_hint}],
+            cache="abertura_chat",
         )
-        return resposta.content[0].text.strip()
 
     except Exception as e:
         logger.error("Erro ao gerar mensagem de abertura do chat: %s", e)
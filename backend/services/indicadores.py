@@ -9,6 +9,13 @@ from typing import Optional, TypedDict
 from schemas.analise import DadosAnaliseInput, IndicadoresCalculados, SetorEnum
 
 
+# Versão do motor (indicadores + score + diagnostico.py) gravada em cada análise.
+# SUBIR sempre que uma mudança alterar o resultado de calcular_indicadores,
+# _calcular_score ou gerar_diagnostico: análises de versão anterior são
+# recalculadas na leitura (services/recalculo_indicadores.py) ou pelo backfill.
+VERSAO_MOTOR = 3
+
+
 # ========== MÚLTIPLOS POR SETOR (para Valuation) ==========
 
 MULTIPLOS_SETOR = {
@@ -318,19 +325,8 @@ def calcular_indicadores(dados: DadosAnaliseInput) -> IndicadoresCalculados:
         payback_meses = int((retorno_investimento - payback_anos) * 12)
         
         payback_percentual_meta = min((5 / retorno_investimento) * 100, 100) if retorno_investimento > 0 else 0
-        
-        if retorno_investimento <= 2:
-            payback_frase = f"Excelente! Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
-        elif retorno_investimento <= 3.5:
-            payback_frase = f"Bom retorno! Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
-        elif retorno_investimento <= 5:
-            payback_frase = f"Retorno dentro da média. Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
-        else:
-            payback_frase = f"Retorno de longo prazo: {payback_anos} ano(s) e {payback_meses} mês(es) com o lucro atual."
-    elif lucro_anual is not None and lucro_anual <= 0:
-        payback_frase = "Com o resultado atual negativo, não é possível estimar tempo de retorno. Foque em equilibrar as contas primeiro."
-    elif resultado_mes is None:
-        payback_frase = "Não foi possível calcular o retorno — alguns dados financeiros precisam ser revisados."
+    
+    payback_frase = frase_payback(retorno_investimento, payback_anos, payback_meses, lucro_anual, resultado_mes)
     
     # ========== TENDÊNCIA ==========
     tendencia = calcular_tendencia(
@@ -387,6 +383,30 @@ def calcular_indicadores(dados: DadosAnaliseInput) -> IndicadoresCalculados:
     )
 
 
+def frase_payback(
+    retorno_investimento: Optional[float],
+    payback_anos: Optional[int],
+    payback_meses: Optional[int],
+    lucro_anual: Optional[float],
+    resultado_mes: Optional[float],
+) -> Optional[str]:
+    """Frase interpretativa do payback (também usada pelo indicadores_lote)."""
+    if retorno_investimento is not None:
+        if retorno_investimento <= 2:
+            return f"Excelente! Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
+        elif retorno_investimento <= 3.5:
+            return f"Bom retorno! Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
+        elif retorno_investimento <= 5:
+            return f"Retorno dentro da média. Com o lucro atual, o investimento se paga em {payback_anos} ano(s) e {payback_meses} mês(es)."
+        else:
+            return f"Retorno de longo prazo: {payback_anos} ano(s) e {payback_meses} mês(es) com o lucro atual."
+    elif lucro_anual is not None and lucro_anual <= 0:
+        return "Com o resultado atual negativo, não é possível estimar tempo de retorno. Foque em equilibrar as contas primeiro."
+    elif resultado_mes is None:
+        return "Não foi possível calcular o retorno — alguns dados financeiros precisam ser revisados."
+    return None
+
+
 def _calcular_score(
     margem_bruta: Optional[float],
     resultado_mes: Optional[float],
@@ -0,0 +1,507 @@
+"""
+Motor vetorizado (NumPy) dos indicadores — mesmas regras do indicadores.py
+para um lote inteiro de empresas de uma vez
+
+Usado em recálculo em massa, simulações e importação de muitas análises
+(contador com a carteira toda). Para uma análise só, calcular_indicadores
+continua sendo o caminho normal.
+
+Entrada colunar (LoteIndicadores): um array por campo do DadosAnaliseInput.
+Saída (ResultadoLote): um array por indicador; onde o escalar devolve None
+(dado placeholder, sem estoque, sem dívida...) o array tem NaN.
+
+Paridade com o escalar: as contas são feitas na mesma ordem, em float64,
+e o arredondamento final usa o round() do Python (linha()) — o resultado
+de linha(i) é igual a calcular_indicadores(dados[i]).
+Conferência: python -m scripts.verificar_indicadores_lote
+
+    lote = LoteIndicadores.de_dados(lista_de_dados)
+    resultado = calcular_indicadores_lote(lote)
+    resultado.score_saude          # ndarray
+    resultado.linha(0)             # IndicadoresCalculados
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from schemas.analise import DadosAnaliseInput, IndicadoresCalculados, SetorEnum
+from services.indicadores import (
+    LIMIAR_PLACEHOLDER,
+    MULTIPLOS_SETOR,
+    SETORES_COM_CUSTO,
+    frase_payback,
+)
+
+# Múltiplos de setor fora da tabela (mesmo default do escalar)
+MULTIPLO_PADRAO = (2.0, 5.0)
+
+
+# ========== ENTRADA ==========
+
+@dataclass
+class LoteIndicadores:
+    """Entrada colunar: arrays do mesmo tamanho, um por campo usado nos cálculos."""
+
+    setor: np.ndarray                 # valores do SetorEnum (str)
+    receita_3_meses_atras: np.ndarray
+    receita_2_meses_atras: np.ndarray
+    receita_mes_passado: np.ndarray
+    receita_atual: np.ndarray
+    custo_vendas: np.ndarray
+    despesas_fixas: np.ndarray
+    caixa_bancos: np.ndarray
+    contas_receber: np.ndarray
+    contas_pagar: np.ndarray
+    tem_estoque: np.ndarray           # bool
+    estoque: np.ndarray               # NaN = não informado
+    tem_dividas: np.ndarray           # bool
+    dividas_totais: np.ndarray        # NaN = não informado
+    num_funcionarios: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.receita_atual)
+
+    @classmethod
+    def de_dados(cls, dados: Sequence[DadosAnaliseInput]) -> "LoteIndicadores":
+        """Monta o lote a partir dos schemas já validados."""
+
+        def coluna(valores, tipo=np.float64) -> np.ndarray:
+            return np.array(list(valores), dtype=tipo)
+
+        def opcional(valores) -> np.ndarray:
+            return coluna(np.nan if v is None else v for v in valores)
+
+        return cls(
+            setor=np.array([d.setor.value for d in dados], dtype=object),
+            receita_3_meses_atras=coluna(d.receita_historico.tres_meses_atras for d in dados),
+            receita_2_meses_atras=coluna(d.receita_historico.dois_meses_atras for d in dados),
+            receita_mes_passado=coluna(d.receita_historico.mes_passado for d in dados),
+            receita_atual=coluna(d.receita_atual for d in dados),
+            custo_vendas=coluna(d.custo_vendas for d in dados),
+            despesas_fixas=coluna(d.despesas_fixas for d in dados),
+            caixa_bancos=coluna(d.caixa_bancos for d in dados),
+            contas_receber=coluna(d.contas_receber for d in dados),
+            contas_pagar=coluna(d.contas_pagar for d in dados),
+            tem_estoque=coluna((d.tem_estoque for d in dados), bool),
+            estoque=opcional(d.estoque for d in dados),
+            tem_dividas=coluna((d.tem_dividas for d in dados), bool),
+            dividas_totais=opcional(d.dividas_totais for d in dados),
+            num_funcionarios=coluna(d.num_funcionarios for d in dados),
+        )
+
+    @classmethod
+    def de_registros(cls, registros: Sequence[Any]) -> "LoteIndicadores":
+        """
+        Monta o lote a partir de linhas de analises (Analise ou Row com as
+        mesmas colunas): os campos do lote têm os nomes das colunas.
+        """
+        colunas = {}
+        for campo in fields(cls):
+            valores = [getattr(r, campo.name) for r in registros]
+            if campo.name == "setor":
+                colunas[campo.name] = np.array(valores, dtype=object)
+            elif campo.name in ("tem_estoque", "tem_dividas"):
+                colunas[campo.name] = np.array([bool(v) for v in valores], dtype=bool)
+            else:
+                # Numeric chega como Decimal; NULL vira NaN
+                colunas[campo.name] = np.array(
+                    [np.nan if v is None else float(v) for v in valores], dtype=np.float64
+                )
+        return cls(**colunas)
+
+
+# ========== SAÍDA ==========
+
+@dataclass
+class ResultadoLote:
+    """Um array por indicador (NaN onde o escalar devolve None), sem arredondar."""
+
+    margem_bruta: np.ndarray
+    resultado_mes: np.ndarray
+    folego_caixa: np.ndarray
+    ponto_equilibrio: np.ndarray
+    ciclo_financeiro: np.ndarray
+    capital_minimo: np.ndarray
+    receita_funcionario: np.ndarray
+    peso_divida: np.ndarray
+    valor_empresa_min: np.ndarray
+    valor_empresa_max: np.ndarray
+    multiplo_min: np.ndarray
+    multiplo_max: np.ndarray
+    lucro_anual: np.ndarray
+    retorno_investimento: np.ndarray
+    payback_anos: np.ndarray
+    payback_meses: np.ndarray
+    payback_percentual_meta: np.ndarray
+    tendencia_receita: np.ndarray     # já arredondada (2 casas), como no escalar
+    tendencia_status: np.ndarray      # "crescendo" / "estavel" / "caindo"
+    score_saude: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.score_saude)
+
+    def linha(self, i: int) -> IndicadoresCalculados:
+        """Mesmo retorno (e arredondamento) de calcular_indicadores para a empresa i."""
+
+        def valor(nome: str) -> Optional[float]:
+            v = float(getattr(self, nome)[i])
+            return None if np.isnan(v) else v
+
+        def arredondado(nome: str, casas: int = 2) -> Optional[float]:
+            v = valor(nome)
+            return round(v, casas) if v is not None else None
+
+        def inteiro(nome: str) -> Optional[int]:
+            v = valor(nome)
+            return int(v) if v is not None else None
+
+        retorno = valor("retorno_investimento")
+        payback_anos = inteiro("payback_anos")
+        payback_meses = inteiro("payback_meses")
+
+        return IndicadoresCalculados(
+            margem_bruta=arredondado("margem_bruta"),
+            resultado_mes=arredondado("resultado_mes"),
+            folego_caixa=inteiro("folego_caixa"),
+            ponto_equilibrio=arredondado("ponto_equilibrio"),
+            ciclo_financeiro=inteiro("ciclo_financeiro"),
+            capital_minimo=arredondado("capital_minimo"),
+            receita_funcionario=arredondado("receita_funcionario"),
+            peso_divida=arredondado("peso_divida"),
+            valor_empresa_min=arredondado("valor_empresa_min"),
+            valor_empresa_max=arredondado("valor_empresa_max"),
+            multiplo_setor=f"{float(self.multiplo_min[i])}x - {float(self.multiplo_max[i])}x",
+            retorno_investimento=arredondado("retorno_investimento"),
+            payback_anos=payback_anos,
+            payback_meses=payback_meses,
+            payback_frase=frase_payback(
+                retorno, payback_anos, payback_meses, valor("lucro_anual"), valor("resultado_mes")
+            ),
+            payback_percentual_meta=arredondado("payback_percentual_meta", 1),
+            tendencia_receita=float(self.tendencia_receita[i]),
+            tendencia_status=str(self.tendencia_status[i]),
+            score_saude=round(float(self.score_saude[i]), 2),
+        )
+
+    def linhas(self) -> list[IndicadoresCalculados]:
+        return [self.linha(i) for i in range(len(self))]
+
+
+# ========== HELPERS ==========
+
+def _por_setor(setor: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (tem_custo, multiplo_min, multiplo_max) por linha. O dicionário é
+    consultado uma vez por setor distinto, não por linha.
+    """
+    distintos, inverso = np.unique(setor.astype(str), return_inverse=True)
+    tem_custo = np.zeros(len(distintos), dtype=bool)
+    minimos = np.empty(len(distintos))
+    maximos = np.empty(len(distintos))
+    for k, valor in enumerate(distintos):
+        try:
+            enum = SetorEnum(valor)
+        except ValueError:
+            enum = None
+        tem_custo[k] = enum in SETORES_COM_CUSTO
+        minimos[k], maximos[k] = MULTIPLOS_SETOR.get(enum, MULTIPLO_PADRAO)
+    return tem_custo[inverso], minimos[inverso], maximos[inverso]
+
+
+def _dividir(numerador: np.ndarray, denominador: np.ndarray, onde: np.ndarray) -> np.ndarray:
+    """numerador / denominador só onde `onde`; NaN no resto (sem warning de divisão por zero)."""
+    resultado = np.full(np.broadcast(numerador, denominador).shape, np.nan)
+    np.divide(numerador, denominador, out=resultado, where=onde)
+    return resultado
+
+
+def _arredondar_como_python(valores: np.ndarray, casas: int) -> np.ndarray:
+    """
+    round() do Python elemento a elemento. np.round escala por 10**casas e
+    pode diferir do round() em empates — e a tendência arredondada entra
+    nas faixas do score.
+    """
+    return np.fromiter((round(v, casas) for v in valores.tolist()), dtype=np.float64, count=len(valores))
+
+
+# ========== TENDÊNCIA ==========
+
+def _calcular_tendencia_lote(lote: LoteIndicadores) -> tuple[np.ndarray, np.ndarray]:
+    """Média das variações mês a mês onde o mês anterior > 0 (calcular_tendencia)."""
+    receitas = [
+        lote.receita_3_meses_atras,
+        lote.receita_2_meses_atras,
+        lote.receita_mes_passado,
+        lote.receita_atual,
+    ]
+    soma = np.zeros(len(lote))
+    quantidade = np.zeros(len(lote))
+    for anterior, atual in zip(receitas, receitas[1:]):
+        valido = anterior > 0
+        variacao = _dividir(atual - anterior, anterior, valido) * 100
+        # Somar 0.0 onde não vale é exato: mesma soma do sum() do escalar
+        soma = soma + np.where(valido, variacao, 0.0)
+        quantidade += valido
+
+    tendencia = _dividir(soma, quantidade, quantidade > 0)
+    tendencia = np.where(quantidade > 0, tendencia, 0.0)
+
+    status = np.full(len(lote), "estavel", dtype=object)
+    status[tendencia > 5] = "crescendo"
+    status[tendencia < -5] = "caindo"
+    return _arredondar_como_python(tendencia, 2), status
+
+
+# ========== SCORE ==========
+
+def _calcular_score_lote(
+    margem_bruta: np.ndarray,
+    resultado_mes: np.ndarray,
+    folego_caixa: np.ndarray,
+    ponto_equilibrio: np.ndarray,
+    receita: np.ndarray,
+    peso_divida: np.ndarray,
+    tendencia_receita: np.ndarray,
+) -> np.ndarray:
+    """_calcular_score do indicadores.py, com NaN no lugar de None."""
+    tem_margem = ~np.isnan(margem_bruta)
+    tem_resultado = ~np.isnan(resultado_mes)
+    tem_folego = ~np.isnan(folego_caixa)
+    tem_pe = ~np.isnan(ponto_equilibrio)
+    tem_peso = ~np.isnan(peso_divida)
+
+    # Comparações com NaN dão False: as faixas só pegam quem tem dado
+    with np.errstate(invalid="ignore"):
+        # 1. Margem Bruta (20 pts)
+        pontos_margem = np.select(
+            [margem_bruta >= 40, margem_bruta >= 25, margem_bruta >= 15, margem_bruta >= 0],
+            [20, 14, 8, 3],
+            default=0,
+        )
+
+        # 2. Resultado do Mês (25 pts)
+        positivo = tem_resultado & (resultado_mes > 0) & (receita > 0)
+        resultado_pct = _dividir(resultado_mes, receita, positivo) * 100
+        pontos_resultado = np.select(
+            [
+                positivo & (resultado_pct >= 15),
+                positivo & (resultado_pct >= 10),
+                positivo & (resultado_pct >= 5),
+                positivo,
+                tem_resultado & (resultado_mes == 0),
+            ],
+            [25, 20, 14, 8, 3],
+            default=0,
+        )
+
+        # 3. Fôlego de Caixa (20 pts)
+        pontos_folego = np.select(
+            [folego_caixa >= 120, folego_caixa >= 90, folego_caixa >= 60, folego_caixa >= 30, tem_folego],
+            [20, 16, 11, 5, 2],
+            default=0,
+        )
+
+        # 4. Ponto de Equilíbrio (15 pts)
+        pe_valido = tem_pe & (receita > 0)
+        pe_pct = _dividir(ponto_equilibrio, receita, pe_valido) * 100
+        pontos_pe = np.select(
+            [pe_valido & (pe_pct < 50), pe_valido & (pe_pct < 70), pe_valido & (pe_pct < 85), pe_valido & (pe_pct < 100)],
+            [15, 10, 5, 2],
+            default=0,
+        )
+
+        # 5. Peso da Dívida (10 pts)
+        pontos_peso = np.select(
+            [~tem_peso | (peso_divida == 0), peso_divida < 15, peso_divida < 30, peso_divida < 50],
+            [10, 7, 4, 2],
+            default=0,
+        )
+
+        # 6. Tendência (10 pts)
+        pontos_tendencia = np.select(
+            [tendencia_receita >= 10, tendencia_receita > 5, tendencia_receita >= -5, tendencia_receita >= -15],
+            [10, 7, 4, 2],
+            default=0,
+        )
+
+        # Mesma ordem de soma do escalar
+        score = (
+            pontos_margem + pontos_resultado + pontos_folego
+            + pontos_pe + pontos_peso + pontos_tendencia
+        ).astype(np.float64)
+
+        # ========== REDISTRIBUIÇÃO PROPORCIONAL ==========
+        pontos_sem_dado = 20 * ~tem_margem + 25 * ~tem_resultado + 20 * ~tem_folego + 15 * ~tem_pe
+        pontos_com_dado = 100 - pontos_sem_dado
+        redistribuir = (pontos_sem_dado > 0) & (pontos_com_dado > 0)
+        score = np.where(redistribuir, _dividir(score, pontos_com_dado, redistribuir) * 100, score)
+
+        # ========== TETOS DE SEGURANÇA (CAPS) ==========
+        def teto(condicao: np.ndarray, limite: float) -> None:
+            nonlocal score
+            score = np.where(condicao, np.minimum(score, limite), score)
+
+        teto(tem_resultado & (resultado_mes < 0), 40)
+        sobra_valida = tem_resultado & (receita > 0) & (resultado_mes >= 0)
+        sobra_pct = _dividir(resultado_mes, receita, sobra_valida) * 100
+        teto(sobra_valida & (sobra_pct < 5), 65)
+        teto(tem_folego & (folego_caixa < 30), 50)
+        teto(tem_folego & (folego_caixa < 60), 65)
+        teto(tem_folego & (folego_caixa < 90), 72)
+        teto(tem_margem & (margem_bruta < 10), 60)
+        teto(tem_pe & (receita > 0) & (ponto_equilibrio >= receita), 45)
+        teto(tem_peso & (peso_divida > 50), 55)
+        teto(tendencia_receita < -10, 68)
+
+        # ========== PENALIZAÇÃO CRUZADA ==========
+        teto(tem_margem & tem_folego & (margem_bruta < 15) & (folego_caixa < 60), 42)
+        teto(tem_resultado & tem_folego & (resultado_mes < 0) & (folego_caixa < 60), 30)
+        teto(tem_resultado & tem_peso & (resultado_mes < 0) & (peso_divida > 30), 25)
+
+    return np.clip(score, 0, 100)
+
+
+# ========== FUNÇÃO PRINCIPAL ==========
+
+def calcular_indicadores_lote(lote: LoteIndicadores) -> ResultadoLote:
+    """calcular_indicadores para o lote inteiro. Não arredonda (ver ResultadoLote.linha)."""
+    n = len(lote)
+    receita = lote.receita_atual
+    custo = lote.custo_vendas
+    despesas = lote.despesas_fixas
+    caixa = lote.caixa_bancos
+    receber = lote.contas_receber
+    pagar = lote.contas_pagar
+    funcionarios = lote.num_funcionarios
+
+    estoque = np.where(lote.tem_estoque, np.nan_to_num(lote.estoque, nan=0.0), 0.0)
+    dividas = np.where(lote.tem_dividas, np.nan_to_num(lote.dividas_totais, nan=0.0), 0.0)
+
+    setor_tem_custo, multiplo_min, multiplo_max = _por_setor(lote.setor)
+
+    # ========== VALIDAR DADOS (_validar_dados) ==========
+    receita_relevante = receita > 500
+
+    def placeholder(valor: np.ndarray) -> np.ndarray:
+        return (0 < valor) & (valor < LIMIAR_PLACEHOLDER) & receita_relevante
+
+    custo_confiavel = ~((custo < LIMIAR_PLACEHOLDER) & receita_relevante & setor_tem_custo)
+    despesas_confiaveis = ~((despesas < LIMIAR_PLACEHOLDER) & receita_relevante)
+    caixa_confiavel = ~placeholder(caixa)
+    receber_confiavel = ~placeholder(receber)
+    pagar_confiavel = ~placeholder(pagar)
+    estoque_confiavel = ~(lote.tem_estoque & placeholder(estoque))
+
+    # ========== 1. MARGEM BRUTA ==========
+    margem_bruta = np.where(
+        custo_confiavel,
+        np.where(receita > 0, _dividir(receita - custo, receita, receita > 0) * 100, 0.0),
+        np.nan,
+    )
+
+    # ========== 2. RESULTADO DO MÊS ==========
+    resultado_mes = np.where(custo_confiavel & despesas_confiaveis, receita - custo - despesas, np.nan)
+
+    # ========== 3. FÔLEGO DE CAIXA ==========
+    despesa_diaria = np.select(
+        [despesas > 0, (custo > 0) & custo_confiavel],
+        [despesas / 30, custo / 30],
+        default=1.0,
+    )
+    folego_caixa = np.trunc(_dividir(caixa, despesa_diaria, despesa_diaria > 0))
+    folego_caixa = np.where(despesa_diaria > 0, folego_caixa, 0.0)
+    folego_caixa = np.minimum(np.maximum(folego_caixa, 0), 365)
+    folego_caixa = np.where(caixa_confiavel & despesas_confiaveis, folego_caixa, np.nan)
+
+    # ========== 4. PONTO DE EQUILÍBRIO ==========
+    with np.errstate(invalid="ignore"):
+        pe_valido = ~np.isnan(margem_bruta) & (margem_bruta > 0) & despesas_confiaveis
+    ponto_equilibrio = _dividir(despesas, margem_bruta / 100, pe_valido)
+
+    # ========== 5. CICLO FINANCEIRO ==========
+    ciclo_valido = (
+        lote.tem_estoque & (estoque > 0)
+        & receber_confiavel & pagar_confiavel & estoque_confiavel & custo_confiavel
+    )
+    receita_diaria = np.where(receita > 0, receita / 30, 1.0)
+    custo_diario = np.where(custo > 0, custo / 30, 1.0)
+    pmr = receber / receita_diaria
+    pme = estoque / custo_diario
+    pmp = pagar / custo_diario
+    ciclo_financeiro = np.trunc(pmr + pme - pmp)
+    ciclo_valido &= (ciclo_financeiro >= -365) & (ciclo_financeiro <= 365)
+    ciclo_financeiro = np.where(ciclo_valido, ciclo_financeiro, np.nan)
+
+    # ========== 6. CAPITAL MÍNIMO ==========
+    capital_minimo = np.where(receber_confiavel & pagar_confiavel, receber + estoque - pagar, np.nan)
+
+    # ========== 7. RECEITA POR FUNCIONÁRIO ==========
+    receita_funcionario = _dividir(receita, funcionarios, funcionarios >= 1)
+
+    # ========== 8. PESO DA DÍVIDA ==========
+    receita_anual = receita * 12
+    peso_divida = np.where(
+        receita_anual > 0,
+        _dividir(dividas, receita_anual, receita_anual > 0) * 100,
+        100.0,
+    )
+    peso_divida = np.where(lote.tem_dividas & (dividas > 0), peso_divida, np.nan)
+
+    # ========== VALUATION ==========
+    lucro_anual = resultado_mes * 12
+    with np.errstate(invalid="ignore"):
+        lucro_positivo = lucro_anual > 0
+    valor_empresa_min = np.where(lucro_positivo, lucro_anual * multiplo_min, np.nan)
+    valor_empresa_max = np.where(lucro_positivo, lucro_anual * multiplo_max, np.nan)
+
+    # ========== PAYBACK ==========
+    valor_medio = (valor_empresa_min + valor_empresa_max) / 2
+    retorno_investimento = _dividir(valor_medio, lucro_anual, lucro_positivo)
+    payback_anos = np.trunc(retorno_investimento)
+    payback_meses = np.trunc((retorno_investimento - payback_anos) * 12)
+    with np.errstate(invalid="ignore"):
+        retorno_positivo = retorno_investimento > 0
+    payback_percentual_meta = np.where(
+        retorno_positivo,
+        np.minimum(_dividir(np.full(n, 5.0), retorno_investimento, retorno_positivo) * 100, 100),
+        np.where(lucro_positivo, 0.0, np.nan),
+    )
+
+    # ========== TENDÊNCIA ==========
+    tendencia_receita, tendencia_status = _calcular_tendencia_lote(lote)
+
+    # ========== SCORE ==========
+    score_saude = _calcular_score_lote(
+        margem_bruta=margem_bruta,
+        resultado_mes=resultado_mes,
+        folego_caixa=folego_caixa,
+        ponto_equilibrio=ponto_equilibrio,
+        receita=receita,
+        peso_divida=peso_divida,
+        tendencia_receita=tendencia_receita,
+    )
+
+    return ResultadoLote(
+        margem_bruta=margem_bruta,
+        resultado_mes=resultado_mes,
+        folego_caixa=folego_caixa,
+        ponto_equilibrio=ponto_equilibrio,
+        ciclo_financeiro=ciclo_financeiro,
+        capital_minimo=capital_minimo,
+        receita_funcionario=receita_funcionario,
+        peso_divida=peso_divida,
+        valor_empresa_min=valor_empresa_min,
+        valor_empresa_max=valor_empresa_max,
+        multiplo_min=multiplo_min,
+        multiplo_max=multiplo_max,
+        lucro_anual=lucro_anual,
+        retorno_investimento=retorno_investimento,
+        payback_anos=payback_anos,
+        payback_meses=payback_meses,
+        payback_percentual_meta=payback_percentual_meta,
+        tendencia_receita=tendencia_receita,
+        tendencia_status=tendencia_status,
+        score_saude=score_saude,
+    )
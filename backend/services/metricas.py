@@ -0,0 +1,311 @@
+"""
+Métricas em memória do processo (por worker), expostas em GET /metrics
+no formato texto do Prometheus — sem serviço externo.
+
+Tipos:
+- Histograma: buckets fixos, contagem cumulativa + soma + total
+- Contador: só cresce (chamadas, tokens, e-mails)
+- Medidor: valor instantâneo (requisições em andamento, conexões em uso);
+  pode ser lido na hora da coleta por uma função
+
+Todos aceitam rótulos (ex: rota, funcao, template). Para não explodir a
+cardinalidade, rótulo é sempre um valor de conjunto pequeno — template da
+rota, nome da função, nunca ID ou e-mail.
+
+Uso:
+    HISTOGRAMA_QUERIES.observar(12, metodo="GET", rota="/api/v1/dashboard/{analise_id}")
+    with medir_duracao(HISTOGRAMA_CRON, job="lembrete_mensal"):
+        ...
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+
+class Histograma:
+    """Histograma thread-safe (endpoints síncronos rodam no threadpool)."""
+
+    def __init__(self, nome: str, descricao: str, buckets: list[float], rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.buckets = sorted(buckets)
+        self.rotulos = rotulos
+        # valores dos rótulos → [contagem por bucket (+Inf no fim), soma, total]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, **rotulos) -> None:
+        chave = tuple(str(rotulos.get(r, "")) for r in self.rotulos)
+        # Primeiro bucket com limite >= valor (le = "less or equal")
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[chave] = serie
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def snapshot(self) -> list[dict]:
+        """Cópia das séries com contagens cumulativas por bucket."""
+        with self._lock:
+            series = [(chave, list(s[0]), s[1], s[2]) for chave, s in self._series.items()]
+
+        resultado = []
+        for chave, contagens, soma, total in series:
+            acumulado = 0
+            por_bucket = []
+            for limite, contagem in zip(self.buckets + [float("inf")], contagens):
+                acumulado += contagem
+                por_bucket.append((limite, acumulado))
+            resultado.append({
+                "rotulos": dict(zip(self.rotulos, chave)),
+                "buckets": por_bucket,
+                "soma": soma,
+                "total": total,
+            })
+        return resultado
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Contador:
+    """Contador monotônico com rótulos."""
+
+    def __init__(self, nome: str, descricao: str, rotulos: tuple[str, ...] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self._series: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, valor: float = 1, **rotulos) -> None:
+        chave = tuple(str(rotulos.get(r, "")) for r in self.rotulos)
+        with self._lock:
+            self._series[chave] = self._series.get(chave, 0) + valor
+
+    def snapshot(self) -> list[tuple[dict, float]]:
+        with self._lock:
+            return [(dict(zip(self.rotulos, chave)), valor) for chave, valor in self._series.items()]
+
+
+class Medidor:
+    """Valor instantâneo. Com `ler`, o valor é calculado na hora da coleta."""
+
+    def __init__(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: tuple[str, ...] = (),
+        ler: Optional[Callable[[], list[tuple[dict, float]]]] = None,
+    ):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self._ler = ler
+        self._series: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def somar(self, valor: float, **rotulos) -> None:
+        chave = tuple(str(rotulos.get(r, "")) for r in self.rotulos)
+        with self._lock:
+            self._series[chave] = self._series.get(chave, 0) + valor
+
+    def snapshot(self) -> list[tuple[dict, float]]:
+        if self._ler is not None:
+            return self._ler()
+        with self._lock:
+            return [(dict(zip(self.rotulos, chave)), valor) for chave, valor in self._series.items()]
+
+
+Metrica = Union[Histograma, Contador, Medidor]
+
+_registro: dict[str, Metrica] = {}
+
+
+def _registrar(metrica: Metrica) -> Metrica:
+    """Registra a métrica (ou devolve a já registrada com o mesmo nome)."""
+    return _registro.setdefault(metrica.nome, metrica)
+
+
+def registrar_histograma(
+    nome: str,
+    descricao: str,
+    buckets: list[float],
+    rotulos: tuple[str, ...] = (),
+) -> Histograma:
+    return _registrar(Histograma(nome, descricao, buckets, rotulos))
+
+
+def registrar_contador(nome: str, descricao: str, rotulos: tuple[str, ...] = ()) -> Contador:
+    return _registrar(Contador(nome, descricao, rotulos))
+
+
+def registrar_medidor(
+    nome: str,
+    descricao: str,
+    rotulos: tuple[str, ...] = (),
+    ler: Optional[Callable[[], list[tuple[dict, float]]]] = None,
+) -> Medidor:
+    return _registrar(Medidor(nome, descricao, rotulos, ler))
+
+
+def histogramas() -> list[Histograma]:
+    return [m for m in _registro.values() if isinstance(m, Histograma)]
+
+
+@contextmanager
+def medir_duracao(histograma: Histograma, **rotulos) -> Iterator[None]:
+    """Observa no histograma quanto tempo o bloco levou (segundos), mesmo com exceção."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        histograma.observar(time.perf_counter() - inicio, **rotulos)
+
+
+# ========== EXPOSIÇÃO (formato texto do Prometheus) ==========
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_rotulos(rotulos: dict) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(f'{nome}="{_escapar(str(valor))}"' for nome, valor in rotulos.items())
+    return "{" + pares + "}"
+
+
+def _formatar_numero(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf"
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+def exportar_prometheus() -> str:
+    """Todas as métricas registradas no formato de exposição texto 0.0.4."""
+    linhas = []
+    for metrica in list(_registro.values()):
+        if isinstance(metrica, Histograma):
+            tipo = "histogram"
+        elif isinstance(metrica, Contador):
+            tipo = "counter"
+        else:
+            tipo = "gauge"
+        linhas.append(f"# HELP {metrica.nome} {metrica.descricao}")
+        linhas.append(f"# TYPE {metrica.nome} {tipo}")
+
+        if isinstance(metrica, Histograma):
+            for serie in metrica.snapshot():
+                for limite, acumulado in serie["buckets"]:
+                    rotulos = {**serie["rotulos"], "le": _formatar_numero(limite)}
+                    linhas.append(f"{metrica.nome}_bucket{_formatar_rotulos(rotulos)} {acumulado}")
+                sufixo = _formatar_rotulos(serie["rotulos"])
+                linhas.append(f"{metrica.nome}_sum{sufixo} {_formatar_numero(serie['soma'])}")
+                linhas.append(f"{metrica.nome}_count{sufixo} {serie['total']}")
+        else:
+            for rotulos, valor in metrica.snapshot():
+                linhas.append(f"{metrica.nome}{_formatar_rotulos(rotulos)} {_formatar_numero(valor)}")
+
+    return "\n".join(linhas) + "\n"
+
+
+# ========== SQL POR REQUISIÇÃO ==========
+
+HISTOGRAMA_QUERIES = registrar_histograma(
+    "leme_http_db_queries",
+    "Queries SQL por requisição",
+    buckets=[0, 1, 2, 5, 10, 20, 50, 100],
+    rotulos=("metodo", "rota"),
+)
+
+HISTOGRAMA_TEMPO_DB = registrar_histograma(
+    "leme_http_db_segundos",
+    "Tempo gasto no banco por requisição (segundos)",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+    rotulos=("metodo", "rota"),
+)
+
+# ========== HTTP ==========
+
+HISTOGRAMA_LATENCIA_HTTP = registrar_histograma(
+    "leme_http_requisicao_segundos",
+    "Latência das requisições HTTP por rota (segundos)",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    rotulos=("metodo", "rota", "status"),
+)
+
+MEDIDOR_EM_ANDAMENTO = registrar_medidor(
+    "leme_http_requisicoes_em_andamento",
+    "Requisições HTTP sendo atendidas agora",
+)
+
+# ========== POOL DE CONEXÕES ==========
+
+CONTADOR_CHECKOUTS = registrar_contador(
+    "leme_db_pool_checkouts_total",
+    "Conexões retiradas do pool",
+    rotulos=("engine",),
+)
+
+HISTOGRAMA_ESPERA_POOL = registrar_histograma(
+    "leme_db_pool_espera_segundos",
+    "Tempo para obter uma conexão do pool (segundos)",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0],
+    rotulos=("engine",),
+)
+
+# ========== CLAUDE API ==========
+
+HISTOGRAMA_IA = registrar_histograma(
+    "leme_ia_chamada_segundos",
+    "Latência das chamadas à Claude API, com retries (segundos)",
+    buckets=[0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0],
+    rotulos=("funcao", "resultado"),
+)
+
+CONTADOR_TOKENS_IA = registrar_contador(
+    "leme_ia_tokens_total",
+    "Tokens consumidos na Claude API",
+    rotulos=("funcao", "tipo"),
+)
+
+CONTADOR_CACHE_IA = registrar_contador(
+    "leme_ia_cache_total",
+    "Consultas ao cache de textos de IA",
+    rotulos=("funcao", "resultado"),
+)
+
+# ========== E-MAIL (Brevo) ==========
+
+HISTOGRAMA_EMAIL = registrar_histograma(
+    "leme_email_envio_segundos",
+    "Latência das chamadas ao Brevo (segundos)",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    rotulos=("template", "status"),
+)
+
+CONTADOR_EMAILS = registrar_contador(
+    "leme_emails_total",
+    "E-mails enviados ao Brevo",
+    rotulos=("template", "status"),
+)
+
+# ========== CRON ==========
+
+HISTOGRAMA_CRON = registrar_histograma(
+    "leme_cron_duracao_segundos",
+    "Duração das execuções dos jobs de cron (segundos)",
+    buckets=[0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+    rotulos=("job",),
+)
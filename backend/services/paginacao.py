@@ -0,0 +1,108 @@
+"""
+Paginação por cursor (keyset) das listagens: mais recentes primeiro
+
+OFFSET faz o banco ler e descartar todas as linhas das páginas anteriores;
+o cursor guarda (created_at, id) da última linha entregue e a próxima
+página começa logo depois dela, pelo índice (..., created_at DESC):
+
+    pagina: Pagina = Depends(parametros_paginacao)
+    ...
+    consulta = aplicar_keyset(select(...).where(...), Analise.created_at, Analise.id, pagina)
+    linhas = db.execute(consulta).all()
+    return [... for a in cortar_pagina(linhas, pagina, response)]
+
+O corpo continua sendo a lista; se há mais linhas, a resposta leva o
+cursor da próxima página no header X-Proximo-Cursor (ausente = acabou).
+Sem ?limite= e sem ?cursor= a resposta é a lista completa, como antes da
+paginação — clientes antigos, que não conhecem o header, não perdem linhas.
+O id desempata análises criadas no mesmo instante. Linhas com created_at
+NULL ficam de fora (não têm posição no keyset); a migração 007 preencheu
+as antigas e os models sempre gravam a data.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+
+from config import get_settings
+
+settings = get_settings()
+
+HEADER_PROXIMO_CURSOR = "X-Proximo-Cursor"
+
+
+@dataclass(frozen=True)
+class Pagina:
+    # None = sem limite (lista completa, sem cursor de próxima página)
+    limite: Optional[int]
+    # (created_at, id) da última linha da página anterior; None = primeira página
+    apos: Optional[tuple[datetime, UUID]] = None
+
+
+def codificar_cursor(created_at: datetime, id_: Any) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id_}".encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Levanta ValueError se o cursor não veio de codificar_cursor."""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        data, id_ = bruto.split("|")
+        return datetime.fromisoformat(data), UUID(id_)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Cursor inválido: {cursor!r}") from e
+
+
+def parametros_paginacao(
+    limite: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.LISTAGEM_LIMITE_MAXIMO,
+        description="Itens por página (sem limite e sem cursor: lista completa)",
+    ),
+    cursor: Optional[str] = Query(None, description="X-Proximo-Cursor da página anterior"),
+) -> Pagina:
+    """Dependência das listagens paginadas."""
+    if cursor is None:
+        return Pagina(limite=limite)
+    try:
+        return Pagina(limite=limite or settings.LISTAGEM_LIMITE_PADRAO, apos=decodificar_cursor(cursor))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def aplicar_keyset(consulta, coluna_data, coluna_id, pagina: Pagina):
+    """
+    Ordena por (data, id) decrescente, começa depois do cursor e pede uma
+    linha a mais que o limite (para saber se existe próxima página).
+    Serve para select() e para Query do ORM.
+    """
+    consulta = consulta.where(coluna_data.isnot(None))
+    if pagina.apos is not None:
+        consulta = consulta.where(tuple_(coluna_data, coluna_id) < pagina.apos)
+    consulta = consulta.order_by(coluna_data.desc(), coluna_id.desc())
+    if pagina.limite is None:
+        return consulta
+    return consulta.limit(pagina.limite + 1)
+
+
+def dividir_pagina(linhas: Sequence[Any], pagina: Pagina) -> tuple[Sequence[Any], Optional[str]]:
+    """(linhas da página, cursor da próxima ou None) a partir do resultado de aplicar_keyset."""
+    if pagina.limite is None or len(linhas) <= pagina.limite:
+        return linhas, None
+    linhas = linhas[:pagina.limite]
+    ultima = linhas[-1]
+    return linhas, codificar_cursor(ultima.created_at, ultima.id)
+
+
+def cortar_pagina(linhas: Sequence[Any], pagina: Pagina, response: Response) -> Sequence[Any]:
+    """dividir_pagina com o cursor da próxima página no header da resposta."""
+    linhas, proximo = dividir_pagina(linhas, pagina)
+    if proximo is not None:
+        response.headers[HEADER_PROXIMO_CURSOR] = proximo
+    return linhas
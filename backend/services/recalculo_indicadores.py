@@ -0,0 +1,245 @@
+"""
+Recálculo das análises gravadas com a versão atual do motor
+
+Cada análise guarda o score, os indicadores e o diagnóstico da versão de
+indicadores.py / diagnostico.py que existia quando foi criada, e desde a
+migração 005 também o número dessa versão (analises.versao_motor).
+Quando VERSAO_MOTOR sobe, as análises antigas são atualizadas aos poucos:
+
+- na leitura: dashboard e histórico chamam garantir_versao_atual, que
+  recalcula as desatualizadas, devolve os valores novos na própria
+  resposta e grava de volta uma vez (cache na frente para não recalcular
+  a mesma análise enquanto a gravação não aparece)
+- em massa: o backfill (python -m scripts.recalcular_indicadores) usa
+  recalcular_bloco + gravar_mudancas
+
+gravar_mudancas também ajusta os resumos que apontam para as análises
+alteradas (último/penúltimo score), na mesma transação — como o resto do
+resumo_analises.py.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from database import SessionLocal
+from models.analise import Analise
+from models.resumo_analises import ResumoAnalisesEmail, ResumoAnalisesUsuario
+from schemas.analise import DadosAnaliseInput, IndicadoresCalculados, ReceitaHistorico, SetorEnum
+from services.cache_lru import CacheLRU
+from services.diagnostico import gerar_diagnostico
+from services.indicadores import VERSAO_MOTOR, calcular_indicadores
+from services.indicadores_lote import LoteIndicadores, calcular_indicadores_lote
+
+logger = logging.getLogger(__name__)
+
+# Colunas de analises que vêm de IndicadoresCalculados
+CAMPOS_INDICADORES = (
+    "margem_bruta",
+    "resultado_mes",
+    "folego_caixa",
+    "ponto_equilibrio",
+    "ciclo_financeiro",
+    "capital_minimo",
+    "receita_funcionario",
+    "peso_divida",
+    "valor_empresa_min",
+    "valor_empresa_max",
+    "retorno_investimento",
+    "tendencia_receita",
+    "tendencia_status",
+    "score_saude",
+)
+
+# Colunas de analises que vêm de gerar_diagnostico
+CAMPOS_DIAGNOSTICO = (
+    "pontos_fortes",
+    "pontos_atencao",
+    "plano_30_dias",
+    "plano_60_dias",
+    "plano_90_dias",
+)
+
+# O que o select do backfill precisa trazer: chave, versão, entradas do
+# motor (que também bastam para o diagnóstico) e indicadores gravados
+COLUNAS_RECALCULO = (
+    Analise.id,
+    Analise.versao_motor,
+    *(getattr(Analise, nome) for nome in LoteIndicadores.__dataclass_fields__),
+    *(getattr(Analise, nome) for nome in CAMPOS_INDICADORES),
+)
+
+# (analise_id, versão, updated_at) → valores recalculados. Cobre a janela
+# entre recalcular na leitura e a gravação ficar visível (ou falhar).
+_recalculadas = CacheLRU(max_itens=5000, ttl_segundos=600)
+
+
+# ========== HELPERS ==========
+
+def dados_da_analise(analise: Any) -> DadosAnaliseInput:
+    """
+    Entradas gravadas → DadosAnaliseInput, sem revalidar (já passaram pelo
+    formulário). Aceita Analise ou Row com as colunas de entrada.
+    Levanta ValueError se o setor gravado não existir mais no SetorEnum.
+    """
+    return DadosAnaliseInput.model_construct(
+        setor=SetorEnum(analise.setor),
+        receita_historico=ReceitaHistorico.model_construct(
+            tres_meses_atras=float(analise.receita_3_meses_atras),
+            dois_meses_atras=float(analise.receita_2_meses_atras),
+            mes_passado=float(analise.receita_mes_passado),
+        ),
+        receita_atual=float(analise.receita_atual),
+        custo_vendas=float(analise.custo_vendas),
+        despesas_fixas=float(analise.despesas_fixas),
+        caixa_bancos=float(analise.caixa_bancos),
+        contas_receber=float(analise.contas_receber),
+        contas_pagar=float(analise.contas_pagar),
+        tem_estoque=bool(analise.tem_estoque),
+        estoque=float(analise.estoque) if analise.estoque is not None else None,
+        tem_dividas=bool(analise.tem_dividas),
+        dividas_totais=float(analise.dividas_totais) if analise.dividas_totais is not None else None,
+        num_funcionarios=analise.num_funcionarios,
+    )
+
+
+def valores_persistidos(indicadores: IndicadoresCalculados) -> dict:
+    """Indicadores → valores das colunas de analises."""
+    return {campo: getattr(indicadores, campo) for campo in CAMPOS_INDICADORES}
+
+
+def _valores_versao_atual(analise: Any, indicadores: IndicadoresCalculados) -> dict:
+    """Tudo que a versão atual grava: indicadores, diagnóstico e a própria versão."""
+    diagnostico = gerar_diagnostico(dados_da_analise(analise), indicadores)
+    return {
+        **valores_persistidos(indicadores),
+        **{campo: diagnostico[campo] for campo in CAMPOS_DIAGNOSTICO},
+        "versao_motor": VERSAO_MOTOR,
+        # Explícito (e não o onupdate do banco): a análise em memória e a
+        # linha gravada ficam com o mesmo valor
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _igual(gravado: Any, novo: Any) -> bool:
+    """Compara o gravado (Decimal/int/str) com o recalculado, sem falso positivo de Decimal x float."""
+    if gravado is None or novo is None:
+        return gravado is None and novo is None
+    if isinstance(novo, str):
+        return gravado == novo
+    return float(gravado) == float(novo)
+
+
+# ========== BACKFILL ==========
+
+def recalcular_bloco(registros: Sequence[Any]) -> list[dict]:
+    """
+    Recalcula as linhas (Row com COLUNAS_RECALCULO) e devolve
+    [{"id": ..., coluna: valor_novo, ...}] só das que mudaram ou são de
+    versão anterior do motor.
+    """
+    if not registros:
+        return []
+
+    resultado = calcular_indicadores_lote(LoteIndicadores.de_registros(registros))
+
+    mudancas = []
+    for i, registro in enumerate(registros):
+        indicadores = resultado.linha(i)
+        atual = registro.versao_motor == VERSAO_MOTOR
+        if atual and all(
+            _igual(getattr(registro, campo), valor)
+            for campo, valor in valores_persistidos(indicadores).items()
+        ):
+            continue
+        try:
+            mudancas.append({"id": registro.id, **_valores_versao_atual(registro, indicadores)})
+        except ValueError:
+            logger.warning("Análise %s com setor desconhecido (%s): não recalculada", registro.id, registro.setor)
+    return mudancas
+
+
+def gravar_mudancas(db: Session, mudancas: list[dict]) -> None:
+    """UPDATE em lote das análises alteradas e dos resumos que apontam para elas. Sem commit."""
+    if not mudancas:
+        return
+
+    # Bulk UPDATE por chave primária do ORM: um executemany
+    db.execute(update(Analise), mudancas)
+
+    parametros = [
+        {"b_id": m["id"], "b_score": m["score_saude"], "b_folego": m["folego_caixa"]}
+        for m in mudancas
+    ]
+    conexao = db.connection()
+    for modelo in (ResumoAnalisesUsuario, ResumoAnalisesEmail):
+        tabela = modelo.__table__
+        conexao.execute(
+            update(tabela)
+            .where(tabela.c.ultima_analise_id == bindparam("b_id"))
+            .values(ultimo_score=bindparam("b_score"), ultimo_folego_caixa=bindparam("b_folego")),
+            parametros,
+        )
+        conexao.execute(
+            update(tabela)
+            .where(tabela.c.penultima_analise_id == bindparam("b_id"))
+            .values(penultimo_score=bindparam("b_score")),
+            [{"b_id": p["b_id"], "b_score": p["b_score"]} for p in parametros],
+        )
+
+
+# ========== NA LEITURA ==========
+
+def _recalcular_analise(analise: Analise) -> Optional[dict]:
+    chave = (analise.id, VERSAO_MOTOR, analise.updated_at)
+    valores = _recalculadas.get(chave)
+    if valores is None:
+        try:
+            dados = dados_da_analise(analise)
+        except ValueError:
+            logger.warning("Análise %s com setor desconhecido (%s): não recalculada", analise.id, analise.setor)
+            return None
+        valores = _valores_versao_atual(analise, calcular_indicadores(dados))
+        _recalculadas.set(chave, valores)
+    return valores
+
+
+def garantir_versao_atual(analises: Iterable[Optional[Analise]]) -> int:
+    """
+    Recalcula as análises de versão anterior do motor e devolve quantas
+    foram atualizadas. Os objetos recebem os valores novos (sem ficarem
+    "sujos" na sessão do endpoint) e a gravação vai numa transação curta à
+    parte — a sessão de leitura não é commitada nem expirada. Se a gravação
+    falhar, a resposta sai recalculada mesmo assim e a próxima leitura tenta
+    de novo.
+    """
+    pendentes = []
+    for analise in analises:
+        if analise is None or analise.versao_motor == VERSAO_MOTOR:
+            continue
+        valores = _recalcular_analise(analise)
+        if valores is not None:
+            pendentes.append((analise, valores))
+
+    if not pendentes:
+        return 0
+
+    for analise, valores in pendentes:
+        for campo, valor in valores.items():
+            set_committed_value(analise, campo, valor)
+
+    try:
+        with SessionLocal() as escrita:
+            gravar_mudancas(escrita, [{"id": analise.id, **valores} for analise, valores in pendentes])
+            escrita.commit()
+    except SQLAlchemyError:
+        logger.exception("Falha ao gravar %d análise(s) recalculada(s)", len(pendentes))
+        return 0
+
+    logger.info("%d análise(s) atualizada(s) para o motor v%d na leitura", len(pendentes), VERSAO_MOTOR)
+    return len(pendentes)
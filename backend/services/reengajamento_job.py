@@ -18,7 +18,8 @@ from sqlalchemy import and_, or_, cast, String
 
 from models.analise import Analise
 from models.usuario import Usuario
-from services.email_service import enviar_email_30_dias
+from services.email_service import enviar_email_30_dias, montar_email_30_dias
+from services.email_dispatcher import despachar_emails
 
 
 async def processar_reengajamento_30_dias(db: Session) -> dict:
@@ -41,6 +42,8 @@ async def processar_reengajamento_30_dias(db: Session) -> dict:
         "email_30d_falhas": 0,
         "email_30d_ignorados": 0,
         "email_30d_pulados_pro": 0,
+        "lotes_com_falha": 0,
+        "erros": [],
     }
 
     # Busca análises criadas entre 29 e 31 dias atrás
@@ -73,8 +76,23 @@ async def processar_reengajamento_30_dias(db: Session) -> dict:
         .all()
     )
 
+    # Camada extra de segurança: dupla checagem se o usuário virou Pro
+    # entre a query e este momento (corrida improvável mas possível).
+    # Uma query só para todos os usuários do lote (antes era uma por análise).
+    usuario_ids = {analise.usuario_id for analise in analises if analise.usuario_id}
+    usuarios_pro = set()
+    if usuario_ids:
+        usuarios_pro = {
+            usuario_id
+            for (usuario_id,) in db.query(cast(Usuario.id, String)).filter(
+                cast(Usuario.id, String).in_(usuario_ids),
+                Usuario.pro_ativo == True,
+            )
+        }
+
     # Agrupa por e-mail para não enviar duplicado
     emails_processados = set()
+    a_enviar = []
 
     for analise in analises:
         # Pula se já enviou para este e-mail nesta execução
@@ -82,27 +100,30 @@ async def processar_reengajamento_30_dias(db: Session) -> dict:
             stats["email_30d_ignorados"] += 1
             continue
 
-        # Camada extra de segurança: dupla checagem se o usuário virou Pro
-        # entre a query e este momento (corrida improvável mas possível).
-        if analise.usuario_id:
-            usuario = db.query(Usuario).filter(
-                cast(Usuario.id, String) == analise.usuario_id
-            ).first()
-            if usuario and usuario.pro_ativo:
-                stats["email_30d_pulados_pro"] += 1
-                continue
-
-        sucesso = await enviar_email_30_dias(
+        if analise.usuario_id in usuarios_pro:
+            stats["email_30d_pulados_pro"] += 1
+            continue
+
+        a_enviar.append(analise)
+        emails_processados.add(analise.email)
+
+    def _marcar_enviado(analise: Analise) -> None:
+        analise.email_30d_enviado_em = agora
+
+    # Lotes em paralelo com rate limit; cada lote enviado é commitado na hora
+    resultado = await despachar_emails(
+        db,
+        a_enviar,
+        montar=lambda analise: montar_email_30_dias(
             nome_empresa=analise.nome_empresa,
             email=analise.email,
-        )
-
-        if sucesso:
-            analise.email_30d_enviado_em = agora
-            stats["email_30d_enviados"] += 1
-            emails_processados.add(analise.email)
-        else:
-            stats["email_30d_falhas"] += 1
+        ),
+        marcar_enviado=_marcar_enviado,
+    )
+    stats["email_30d_enviados"] = resultado["enviados"]
+    stats["email_30d_falhas"] = resultado["falhas"]
+    stats["lotes_com_falha"] = resultado["lotes_com_falha"]
+    stats["erros"] = resultado["erros"]
 
     # Commit das alterações
     db.commit()
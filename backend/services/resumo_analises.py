@@ -0,0 +1,281 @@
+"""
+Manutenção das tabelas de resumo de análises (por usuário e por e-mail)
+
+Quem altera análises chama estas funções ANTES do commit, na mesma sessão —
+o resumo nunca fica fora de sincronia com a tabela analises:
+- criar_analise     → registrar_nova_analise (incremental, O(1))
+- lote de análises  → registrar_novas_analises (cada resumo lido e gravado uma vez)
+- vincular_analise  → recalcular_resumo_usuario (raro: recalcula do zero)
+- arquivar_analise  → recalcular_resumo_usuario / recalcular_resumo_email
+
+Leitura: buscar_resumo_usuario / buscar_resumo_email (chave primária).
+Reconstrução completa: python -m scripts.reconstruir_resumos
+"""
+
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import func, case, desc, select
+from sqlalchemy.dialects.postgresql import insert as insert_postgresql
+from sqlalchemy.dialects.sqlite import insert as insert_sqlite
+from sqlalchemy.orm import Session
+
+from models.analise import Analise
+from models.resumo_analises import ResumoAnalisesUsuario, ResumoAnalisesEmail
+
+
+# INSERT com ON CONFLICT DO NOTHING dos dois bancos suportados
+_INSERT_POR_DIALETO = {
+    "postgresql": insert_postgresql,
+    "sqlite": insert_sqlite,
+}
+
+
+# ========== HELPERS ==========
+
+def _copiar_ultima(resumo, analise) -> None:
+    """Preenche os campos de 'última análise' do resumo (Analise ou linha com as mesmas colunas)."""
+    resumo.ultima_analise_id = analise.id
+    resumo.ultima_analise_em = analise.created_at
+    resumo.ultimo_score = analise.score_saude
+    resumo.ultimo_folego_caixa = analise.folego_caixa
+    resumo.ultimo_mes_referencia = analise.mes_referencia
+    resumo.ultimo_ano_referencia = analise.ano_referencia
+
+
+def _coluna_chave(modelo):
+    return modelo.usuario_id if modelo is ResumoAnalisesUsuario else modelo.email
+
+
+def _obter_para_atualizar_varios(db: Session, modelo, chaves: Iterable[str]) -> dict:
+    """
+    Garante que as linhas do resumo existem e as lê com lock de linha
+    (PostgreSQL): chave → resumo. Um INSERT e um SELECT para todas as chaves.
+
+    Criar com db.add() quando o SELECT não acha nada é uma corrida: duas
+    primeiras análises simultâneas do mesmo e-mail/usuário tentariam o mesmo
+    INSERT e a segunda levaria IntegrityError no commit. O INSERT ... ON
+    CONFLICT DO NOTHING deixa só uma criar; a outra espera o lock da linha
+    no SELECT ... FOR UPDATE e lê o resumo já criado. Chaves em ordem: dois
+    lotes com chaves em comum travam as linhas na mesma ordem (sem deadlock).
+    """
+    chaves = sorted(set(chaves))
+    coluna = _coluna_chave(modelo)
+    insert = _INSERT_POR_DIALETO[db.get_bind().dialect.name]
+    db.execute(
+        insert(modelo)
+        .values([{coluna.key: chave, "total_analises": 0, "total_arquivadas": 0} for chave in chaves])
+        .on_conflict_do_nothing(index_elements=[coluna.key])
+    )
+    resumos = db.scalars(
+        select(modelo)
+        .where(coluna.in_(chaves))
+        .order_by(coluna)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return {getattr(resumo, coluna.key): resumo for resumo in resumos}
+
+
+def _obter_para_atualizar(db: Session, modelo, chave: str):
+    """Um resumo só — ver _obter_para_atualizar_varios."""
+    return _obter_para_atualizar_varios(db, modelo, [chave])[chave]
+
+
+def _recalcular(db: Session, modelo, coluna, chave: str) -> None:
+    """Recalcula um resumo a partir da tabela analises."""
+    # Sessão sem autoflush: a alteração pendente da análise precisa ir pro banco antes
+    db.flush()
+
+    total, arquivadas = db.query(
+        func.count(Analise.id),
+        func.coalesce(func.sum(case((Analise.arquivada == True, 1), else_=0)), 0),
+    ).filter(coluna == chave).one()
+
+    resumo = db.get(modelo, chave, with_for_update=True)
+
+    if not total:
+        if resumo is not None:
+            db.delete(resumo)
+        return
+
+    if resumo is None:
+        resumo = _obter_para_atualizar(db, modelo, chave)
+
+    primeira = (
+        db.query(Analise.id, Analise.created_at)
+        .filter(coluna == chave)
+        .order_by(Analise.created_at.asc())
+        .first()
+    )
+    recentes = (
+        db.query(Analise)
+        .filter(coluna == chave)
+        .order_by(desc(Analise.created_at))
+        .limit(2)
+        .all()
+    )
+
+    resumo.primeira_analise_id, resumo.primeira_analise_em = primeira
+    _copiar_ultima(resumo, recentes[0])
+    if len(recentes) > 1:
+        resumo.penultima_analise_id = recentes[1].id
+        resumo.penultimo_score = recentes[1].score_saude
+    else:
+        resumo.penultima_analise_id = None
+        resumo.penultimo_score = None
+    resumo.total_analises = total
+    resumo.total_arquivadas = arquivadas
+
+
+# ========== ESCRITA (chamadas dentro da transação do endpoint) ==========
+
+def registrar_nova_analise(db: Session, analise: Analise) -> None:
+    """
+    Atualização incremental após criar uma análise (exige db.flush() antes,
+    para id e created_at já estarem preenchidos). A nova análise vira a
+    última e a última de antes vira a penúltima.
+    """
+    registrar_novas_analises(db, [analise])
+
+
+def registrar_novas_analises(db: Session, analises: list[Analise]) -> None:
+    """
+    registrar_nova_analise para um lote (mesma exigência de db.flush() antes):
+    as análises são agrupadas por e-mail e por usuário e cada resumo é lido
+    (com lock) e atualizado uma vez só, aplicando as análises do grupo na
+    ordem da lista.
+    """
+    grupos = {ResumoAnalisesEmail: defaultdict(list), ResumoAnalisesUsuario: defaultdict(list)}
+    for analise in analises:
+        grupos[ResumoAnalisesEmail][analise.email].append(analise)
+        if analise.usuario_id:
+            grupos[ResumoAnalisesUsuario][str(analise.usuario_id)].append(analise)
+
+    for modelo, por_chave in grupos.items():
+        if not por_chave:
+            continue
+        resumos = _obter_para_atualizar_varios(db, modelo, por_chave)
+        for chave, do_grupo in por_chave.items():
+            resumo = resumos[chave]
+            if resumo.primeira_analise_id is None:
+                resumo.primeira_analise_id = do_grupo[0].id
+                resumo.primeira_analise_em = do_grupo[0].created_at
+
+            for analise in do_grupo:
+                resumo.penultima_analise_id = resumo.ultima_analise_id
+                resumo.penultimo_score = resumo.ultimo_score
+                _copiar_ultima(resumo, analise)
+            resumo.total_analises = (resumo.total_analises or 0) + len(do_grupo)
+
+    # A sessão não tem autoflush: sem isso, outra análise do mesmo e-mail
+    # na mesma transação não enxergaria o resumo recém-criado
+    db.flush()
+
+
+def recalcular_resumo_usuario(db: Session, usuario_id: str) -> None:
+    _recalcular(db, ResumoAnalisesUsuario, Analise.usuario_id, str(usuario_id))
+
+
+def recalcular_resumo_email(db: Session, email: str) -> None:
+    _recalcular(db, ResumoAnalisesEmail, Analise.email, email)
+
+
+def reconstruir_resumos(db: Session) -> dict:
+    """
+    Apaga e reconstrói todos os resumos numa única passada ordenada pela
+    tabela analises (sem uma query por usuário). Não faz commit.
+    """
+    db.query(ResumoAnalisesUsuario).delete()
+    db.query(ResumoAnalisesEmail).delete()
+
+    resumos = {ResumoAnalisesUsuario: {}, ResumoAnalisesEmail: {}}
+
+    # Só as colunas usadas — não carrega os JSONs do diagnóstico
+    analises = (
+        db.query(
+            Analise.id,
+            Analise.created_at,
+            Analise.email,
+            Analise.usuario_id,
+            Analise.score_saude,
+            Analise.folego_caixa,
+            Analise.mes_referencia,
+            Analise.ano_referencia,
+            Analise.arquivada,
+        )
+        .order_by(Analise.created_at.asc())
+        .yield_per(1000)
+    )
+    for analise in analises:
+        chaves = [(ResumoAnalisesEmail, analise.email)]
+        if analise.usuario_id:
+            chaves.append((ResumoAnalisesUsuario, str(analise.usuario_id)))
+
+        for modelo, chave in chaves:
+            resumo = resumos[modelo].get(chave)
+            if resumo is None:
+                resumo = modelo(
+                    primeira_analise_id=analise.id,
+                    primeira_analise_em=analise.created_at,
+                    total_analises=0,
+                    total_arquivadas=0,
+                )
+                if modelo is ResumoAnalisesUsuario:
+                    resumo.usuario_id = chave
+                else:
+                    resumo.email = chave
+                resumos[modelo][chave] = resumo
+
+            resumo.penultima_analise_id = resumo.ultima_analise_id
+            resumo.penultimo_score = resumo.ultimo_score
+            _copiar_ultima(resumo, analise)
+            resumo.total_analises += 1
+            if analise.arquivada:
+                resumo.total_arquivadas += 1
+
+    for por_chave in resumos.values():
+        db.add_all(por_chave.values())
+
+    return {
+        "usuarios": len(resumos[ResumoAnalisesUsuario]),
+        "emails": len(resumos[ResumoAnalisesEmail]),
+    }
+
+
+# ========== LEITURA ==========
+
+def buscar_resumo_usuario(db: Session, usuario_id) -> Optional[ResumoAnalisesUsuario]:
+    return db.get(ResumoAnalisesUsuario, str(usuario_id))
+
+
+def buscar_resumo_email(db: Session, email: str) -> Optional[ResumoAnalisesEmail]:
+    return db.get(ResumoAnalisesEmail, email)
+
+
+def buscar_score_anterior(db: Session, analise: Analise) -> Optional[int]:
+    """
+    Score da análise imediatamente anterior à informada (mesmo usuário).
+    Caminho rápido pelo resumo quando a análise é a última do usuário —
+    o caso normal, já que o job de IA roda logo após a criação.
+    """
+    if not analise.usuario_id:
+        return None
+
+    resumo = buscar_resumo_usuario(db, analise.usuario_id)
+    if resumo is not None and resumo.ultima_analise_id == analise.id:
+        return int(resumo.penultimo_score) if resumo.penultimo_score is not None else None
+
+    analise_anterior = (
+        db.query(Analise.score_saude)
+        .filter(
+            Analise.usuario_id == analise.usuario_id,
+            Analise.id != analise.id,
+            Analise.created_at <= analise.created_at,
+        )
+        .order_by(desc(Analise.created_at))
+        .first()
+    )
+    if analise_anterior and analise_anterior.score_saude is not None:
+        return int(analise_anterior.score_saude)
+    return None
@@ -6,11 +6,10 @@ Responsabilidades:
 - Verificar status de uma sessão
 """
 
-import stripe
 import os
 
-# Chave secreta do Stripe — vem da variável de ambiente
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+# SDK e chave secreta (STRIPE_SECRET_KEY) configurados no primeiro uso
+from services.stripe_service import get_stripe
 
 # Price ID do plano Pro mensal (R$97/mês)
 STRIPE_PRO_PRICE_ID = os.getenv("STRIPE_PRO_PRICE_ID", "price_1T9nicFYVK9qebClXWvu8i7r")
@@ -35,7 +34,7 @@ async def criar_checkout_assinatura(usuario_id: str, email: str, plano: str = "m
     STRIPE_PRO_PRICE_MENSAL = os.getenv("STRIPE_PRO_PRICE_ID", "price_1T9nicFYVK9qebClXWvu8i7r")
     price_id = STRIPE_PRO_PRICE_ANUAL if plano == "anual" else STRIPE_PRO_PRICE_MENSAL
 
-    session = stripe.checkout.Session.create(
+    session = get_stripe().checkout.Session.create(
         mode="subscription",
         customer_email=email,
         line_items=[{"price": price_id, "quantity": 1}],
@@ -76,4 +75,4 @@ async def cancelar_assinatura(subscription_id: str) -> None:
     """
     Cancela a assinatura do usuário no Stripe imediatamente.
     """
-    stripe.Subscription.delete(subscription_id)
\ No newline at end of file
+    get_stripe().Subscription.delete(subscription_id)
\ No newline at end of file
@@ -3,14 +3,24 @@ Serviço de integração com Stripe para pagamentos
 Features: Checkout Session, Webhook, Verificação de Status
 """
 
-import stripe
 from typing import Optional
 from config import get_settings
 
 settings = get_settings()
 
-# Configura a chave do Stripe
-stripe.api_key = settings.STRIPE_SECRET_KEY
+# SDK importado e configurado no primeiro uso (get_stripe): o import do
+# stripe pesa no cold start e a maioria das requisições nunca cobra nada
+_stripe = None
+
+
+def get_stripe():
+    """Retorna o módulo stripe com a chave já configurada."""
+    global _stripe
+    if _stripe is None:
+        import stripe
+        stripe.api_key = settings.STRIPE_SECRET_KEY
+        _stripe = stripe
+    return _stripe
 
 
 class StripeService:
@@ -48,7 +58,7 @@ class StripeService:
         if not cancel_url:
             cancel_url = f"{frontend_url}/dashboard/{analise_id}"
         
-        session = stripe.checkout.Session.create(
+        session = get_stripe().checkout.Session.create(
             payment_method_types=["card"],
             line_items=[{
                 "price_data": {
@@ -83,7 +93,7 @@ class StripeService:
         Returns:
             dict com status e detalhes
         """
-        session = stripe.checkout.Session.retrieve(session_id)
+        session = get_stripe().checkout.Session.retrieve(session_id)
         
         return {
             "session_id": session.id,
@@ -0,0 +1,186 @@
+"""
+Fixtures dos testes da API
+
+    cd backend && python -m pytest -q
+
+Os testes rodam num SQLite descartável com as migrações aplicadas
+(scripts/banco_temporario.py) — DATABASE_URL é definido aqui, antes de
+qualquer import de config/database.
+
+Orçamento de queries por rota: com a fixture orcamento_queries, cada
+requisição feita no bloco é contada pelo contar_queries() do middleware
+(o mesmo que alimenta o /metrics) e o teste falha se passar do
+ORCAMENTO_QUERIES da rota ou repetir o mesmo SQL (suspeita de N+1):
+
+    def test_dashboard(cliente, orcamento_queries):
+        with orcamento_queries():
+            cliente.get("/api/v1/dashboard/a@b.com")
+"""
+
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.banco_temporario import preparar_banco
+
+preparar_banco()
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Máximo de queries por requisição, por template de rota (GET /api/v1/dashboard/{email}).
+# Subiu? Confira se não é um N+1 antes de aumentar o número.
+ORCAMENTO_QUERIES = {
+    # Independe do tamanho do lote: usuários, INSERT das análises, INSERT/SELECT/UPDATE
+    # de cada tabela de resumo (até 2 UPDATEs em lote: resumo novo x existente) e jobs
+    "POST /api/v1/analise/lote": 12,
+    "GET /api/v1/dashboard/{email}": 3,
+    "GET /api/v1/dashboard/id/{analise_id}": 2,
+    "GET /api/v1/historico/": 2,
+    "GET /api/v1/historico/comparativo": 3,
+    "GET /api/v1/historico/{analise_id}": 2,
+    "GET /api/v1/historico/{analise_id}/fatores-score": 2,
+}
+
+
+@pytest.fixture
+def app():
+    from main import app as aplicacao
+
+    return aplicacao
+
+
+@pytest.fixture
+def cliente(app):
+    """TestClient com startup/shutdown (lifespan) completo."""
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+# ========== DADOS ==========
+
+def dados_analise(email: str, usuario_id: str = None, mes: int = 9) -> dict:
+    """Corpo do POST /api/v1/analise/nova."""
+    return {
+        "nome_empresa": "Empresa Teste",
+        "email": email,
+        "setor": "servicos",
+        "estado": "SP",
+        "mes_referencia": mes,
+        "ano_referencia": 2026,
+        "receita_historico": {"tres_meses_atras": 50000, "dois_meses_atras": 52000, "mes_passado": 51000},
+        "receita_atual": 55000 + mes * 1000,
+        "custo_vendas": 20000,
+        "despesas_fixas": 15000,
+        "caixa_bancos": 30000,
+        "contas_receber": 10000,
+        "contas_pagar": 8000,
+        "num_funcionarios": 5,
+        "usuario_id": usuario_id,
+    }
+
+
+@pytest.fixture
+def usuario_pro(cliente):
+    """Usuário Pro ativo, já logado no cliente (cookie leme_token)."""
+    from database import SessionLocal
+    from models.usuario import Usuario
+    from services.auth_service import criar_token
+
+    email = f"pro-{uuid.uuid4().hex[:8]}@exemplo.com"
+    agora = datetime.utcnow()
+    with SessionLocal() as db:
+        usuario = Usuario(
+            id=uuid.uuid4(), nome="Empresa Teste", email=email, senha_hash="x",
+            plano="pro", pro_ativo=True, created_at=agora, updated_at=agora,
+        )
+        db.add(usuario)
+        db.commit()
+        db.refresh(usuario)
+        db.expunge(usuario)
+
+    cliente.cookies.set("leme_token", criar_token({"sub": email}))
+    return usuario
+
+
+@pytest.fixture
+def analises_pro(cliente, usuario_pro):
+    """Quatro análises mensais do usuário Pro, da mais antiga à mais recente."""
+    criadas = []
+    for mes in (6, 7, 8, 9):
+        resposta = cliente.post(
+            "/api/v1/analise/nova", json=dados_analise(usuario_pro.email, str(usuario_pro.id), mes),
+        )
+        assert resposta.status_code == 201, resposta.text
+        criadas.append(resposta.json())
+    return criadas
+
+
+# ========== ORÇAMENTO DE QUERIES ==========
+
+class _HistogramaQueriesGravado:
+    """Repassa ao HISTOGRAMA_QUERIES do main e anota "MÉTODO rota" de cada requisição."""
+
+    def __init__(self, original):
+        self.original = original
+        self.rotas: list[str] = []
+
+    def observar(self, valor, **rotulos):
+        self.rotas.append(f"{rotulos['metodo']} {rotulos['rota']}")
+        self.original.observar(valor, **rotulos)
+
+
+def _conferir(rotas: list[str], medidas: list) -> None:
+    from services.contador_queries import resumir_sql
+
+    estouros = []
+    for rota, estatisticas in zip(rotas, medidas):
+        orcamento = ORCAMENTO_QUERIES.get(rota)
+        if orcamento is None:
+            estouros.append(f"{rota}: sem orçamento em ORCAMENTO_QUERIES")
+            continue
+        if estatisticas.queries > orcamento:
+            estouros.append(f"{rota}: {estatisticas.queries} queries (orçamento: {orcamento})")
+        for sql, repeticoes in estatisticas.suspeitas_n_mais_1():
+            estouros.append(f"{rota}: possível N+1, {repeticoes}x {resumir_sql(sql)}")
+    if estouros:
+        pytest.fail("Orçamento de queries estourado:\n" + "\n".join(estouros))
+
+
+@pytest.fixture
+def orcamento_queries(monkeypatch):
+    """
+    Context manager: confere cada requisição feita dentro do bloco contra
+    ORCAMENTO_QUERIES (rota sem orçamento também falha). Devolve a lista de
+    (rota, EstatisticasSQL) das requisições do bloco.
+    """
+    import main
+
+    medidas = []
+    contar_original = main.contar_queries
+
+    @contextmanager
+    def _contar():
+        with contar_original() as estatisticas:
+            yield estatisticas
+        medidas.append(estatisticas)
+
+    histograma = _HistogramaQueriesGravado(main.HISTOGRAMA_QUERIES)
+    monkeypatch.setattr(main, "contar_queries", _contar)
+    monkeypatch.setattr(main, "HISTOGRAMA_QUERIES", histograma)
+
+    @contextmanager
+    def _orcamento():
+        medidas.clear()
+        histograma.rotas.clear()
+        requisicoes = []
+        yield requisicoes
+        requisicoes.extend(zip(histograma.rotas, medidas))
+        assert requisicoes, "nenhuma requisição feita dentro do orcamento_queries()"
+        _conferir(histograma.rotas, medidas)
+
+    return _orcamento
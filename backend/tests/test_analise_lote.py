@@ -0,0 +1,68 @@
+"""POST /api/v1/analise/lote: resumos e fila de IA atualizados em lote"""
+
+import uuid
+
+import pytest
+
+from conftest import dados_analise
+
+
+@pytest.fixture
+def banco():
+    from database import SessionLocal
+
+    with SessionLocal() as db:
+        yield db
+
+
+def test_lote_atualiza_cada_resumo_uma_vez(cliente, usuario_pro, banco, orcamento_queries):
+    from models.job_ia import JobIA
+    from models.resumo_analises import ResumoAnalisesEmail, ResumoAnalisesUsuario
+
+    outro_email = f"free-{uuid.uuid4().hex[:8]}@exemplo.com"
+    itens = [
+        dados_analise(usuario_pro.email, str(usuario_pro.id), mes=6),
+        dados_analise(outro_email, mes=6),
+        dados_analise(usuario_pro.email, str(usuario_pro.id), mes=7),
+        dados_analise(outro_email, mes=7),
+        dados_analise(usuario_pro.email, str(usuario_pro.id), mes=8),
+    ]
+    with orcamento_queries():
+        resposta = cliente.post("/api/v1/analise/lote", json={"itens": itens})
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert corpo["criadas"] == len(itens)
+    ids = [r["analise"]["id"] for r in corpo["resultados"]]
+
+    resumo_pro = banco.get(ResumoAnalisesEmail, usuario_pro.email)
+    assert resumo_pro.total_analises == 3
+    assert str(resumo_pro.primeira_analise_id) == ids[0]
+    assert str(resumo_pro.penultima_analise_id) == ids[2]
+    assert str(resumo_pro.ultima_analise_id) == ids[4]
+
+    resumo_usuario = banco.get(ResumoAnalisesUsuario, str(usuario_pro.id))
+    assert resumo_usuario.total_analises == 3
+    assert str(resumo_usuario.ultima_analise_id) == ids[4]
+
+    resumo_free = banco.get(ResumoAnalisesEmail, outro_email)
+    assert resumo_free.total_analises == 2
+    assert str(resumo_free.ultima_analise_id) == ids[3]
+
+    jobs = banco.query(JobIA).filter(JobIA.analise_id.in_([uuid.UUID(i) for i in ids])).all()
+    assert sorted(str(j.analise_id) for j in jobs) == sorted([ids[0], ids[2], ids[4]])
+
+
+def test_lote_continua_resumo_existente(cliente, analises_pro, usuario_pro, banco):
+    from models.resumo_analises import ResumoAnalisesUsuario
+
+    resposta = cliente.post("/api/v1/analise/lote", json={
+        "itens": [dados_analise(usuario_pro.email, str(usuario_pro.id), mes=10)],
+    })
+    assert resposta.status_code == 200
+    nova_id = resposta.json()["resultados"][0]["analise"]["id"]
+
+    resumo = banco.get(ResumoAnalisesUsuario, str(usuario_pro.id))
+    assert resumo.total_analises == len(analises_pro) + 1
+    assert str(resumo.primeira_analise_id) == analises_pro[0]["id"]
+    assert str(resumo.penultima_analise_id) == analises_pro[-1]["id"]
+    assert str(resumo.ultima_analise_id) == nova_id
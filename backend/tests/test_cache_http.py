@@ -0,0 +1,37 @@
+"""ETag / Last-Modified / Vary das leituras com cache condicional"""
+
+import uuid
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+
+
+def test_historico_detalhe_varia_por_cookie(cliente, analises_pro):
+    resposta = cliente.get(f"/api/v1/historico/{analises_pro[-1]['id']}")
+    assert resposta.status_code == 200
+    vary = [campo.strip() for campo in resposta.headers["Vary"].split(",")]
+    assert "Cookie" in vary
+    assert "Authorization" not in vary
+
+
+def test_dashboard_last_modified_acompanha_historico(cliente, analises_pro):
+    from database import SessionLocal
+    from models.analise import Analise
+
+    url = f"/api/v1/dashboard/id/{analises_pro[-1]['id']}"
+    primeira = cliente.get(url)
+    assert primeira.status_code == 200
+    last_modified = primeira.headers["Last-Modified"]
+    assert cliente.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # Score de uma análise antiga do histórico recalculado depois
+    recalculada_em = parsedate_to_datetime(last_modified).replace(tzinfo=None) + timedelta(hours=1)
+    with SessionLocal() as db:
+        antiga = db.get(Analise, uuid.UUID(analises_pro[0]["id"]))
+        antiga.score_saude = (antiga.score_saude or 0) + 1
+        antiga.updated_at = recalculada_em
+        db.commit()
+
+    segunda = cliente.get(url, headers={"If-Modified-Since": last_modified})
+    assert segunda.status_code == 200
+    assert parsedate_to_datetime(segunda.headers["Last-Modified"]).replace(tzinfo=None) == recalculada_em
+    assert segunda.headers["ETag"] != primeira.headers["ETag"]
@@ -0,0 +1,34 @@
+"""GET /api/v1/dashboard: histórico na versão atual do motor"""
+
+import uuid
+
+from conftest import dados_analise
+from services.indicadores import VERSAO_MOTOR
+
+
+def test_historico_recalculado_para_versao_atual(cliente):
+    from database import SessionLocal
+    from models.analise import Analise
+
+    email = f"dash-{uuid.uuid4().hex[:8]}@exemplo.com"
+    criadas = []
+    for mes in (7, 8, 9):
+        resposta = cliente.post("/api/v1/analise/nova", json=dados_analise(email, mes=mes))
+        assert resposta.status_code == 201, resposta.text
+        criadas.append(resposta.json())
+
+    # A de julho, gravada pelo motor anterior com outro score
+    antiga_id = uuid.UUID(criadas[0]["id"])
+    with SessionLocal() as db:
+        antiga = db.get(Analise, antiga_id)
+        score_atual = int(antiga.score_saude)
+        antiga.versao_motor = VERSAO_MOTOR - 1
+        antiga.score_saude = score_atual // 2
+        db.commit()
+
+    resposta = cliente.get(f"/api/v1/dashboard/id/{criadas[-1]['id']}")
+    assert resposta.status_code == 200
+    historico = {item["id"]: item for item in resposta.json()["historico"]}
+    assert int(historico[str(antiga_id)]["score"]) == score_atual
+    with SessionLocal() as db:
+        assert db.get(Analise, antiga_id).versao_motor == VERSAO_MOTOR
@@ -0,0 +1,66 @@
+"""Envio em lote dos crons (services/email_dispatcher.py)"""
+
+import asyncio
+
+from services import email_dispatcher
+from services.email_service import FalhaLote
+
+
+class _SessaoFalsa:
+    def commit(self) -> None:
+        pass
+
+
+def _despachar(monkeypatch, destinatarios: list[str], responder) -> tuple[dict, list[str], list[int]]:
+    """Roda despachar_emails com o Brevo trocado por `responder`; devolve (resultado, marcados, tamanhos das chamadas)."""
+    monkeypatch.setattr(email_dispatcher.settings, "EMAIL_LOTE_TAMANHO", 8)
+    monkeypatch.setattr(email_dispatcher.settings, "EMAIL_REQUISICOES_POR_SEGUNDO", 1000.0)
+    chamadas = []
+
+    async def _enviar_lote(emails):
+        chamadas.append(len(emails))
+        return responder([e["para_email"] for e in emails])
+
+    monkeypatch.setattr(email_dispatcher, "enviar_lote_brevo", _enviar_lote)
+    marcados = []
+    resultado = asyncio.run(email_dispatcher.despachar_emails(
+        _SessaoFalsa(),
+        destinatarios,
+        montar=lambda email: {"para_email": email},
+        marcar_enviado=marcados.append,
+    ))
+    return resultado, sorted(marcados), chamadas
+
+
+def test_lote_recusado_isola_o_destinatario_invalido(monkeypatch):
+    destinatarios = [f"cliente{i:02d}@exemplo.com" for i in range(16)]
+    invalido = "cliente05@exemplo.com"
+
+    def _brevo(para):
+        if invalido in para:
+            return FalhaLote("HTTP 400: invalid email", recusado=True)
+        return None
+
+    resultado, marcados, chamadas = _despachar(monkeypatch, destinatarios, _brevo)
+
+    assert marcados == sorted(set(destinatarios) - {invalido})
+    assert resultado["enviados"] == 15
+    assert resultado["falhas"] == 1
+    assert resultado["lotes_com_falha"] == 1
+    assert resultado["erros"] == [{"lote": 1, "destinatarios": 1, "erro": "HTTP 400: invalid email", "email": invalido}]
+    # 2 lotes + bisseção do primeiro (8 → 4 → 2 → 1): 2 + 2 + 2 + 2
+    assert len(chamadas) == 8
+
+
+def test_erro_do_brevo_nao_divide_o_lote(monkeypatch):
+    destinatarios = [f"cliente{i:02d}@exemplo.com" for i in range(16)]
+
+    resultado, marcados, chamadas = _despachar(
+        monkeypatch, destinatarios, lambda para: FalhaLote("HTTP 503: unavailable"),
+    )
+
+    assert marcados == []
+    assert resultado["falhas"] == 16
+    assert resultado["lotes_com_falha"] == 2
+    assert resultado["lotes_divididos"] == 0
+    assert chamadas == [8, 8]
@@ -0,0 +1,28 @@
+"""GZip das respostas: streams SSE ficam de fora em qualquer versão do Starlette"""
+
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from main import GZipExcetoStreams, ROTAS_SEM_GZIP
+
+CORPO = "x" * 5000
+
+
+async def _app_texto(scope, receive, send):
+    # text/plain: o Starlette comprime — o que deixa de fora é só a rota
+    await PlainTextResponse(CORPO)(scope, receive, send)
+
+
+def test_rota_de_stream_nao_comprime():
+    cliente = TestClient(GZipExcetoStreams(_app_texto, minimum_size=500))
+    for rota in ROTAS_SEM_GZIP:
+        resposta = cliente.post(rota, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resposta.headers
+        assert resposta.text == CORPO
+
+
+def test_demais_rotas_continuam_comprimidas():
+    cliente = TestClient(GZipExcetoStreams(_app_texto, minimum_size=500))
+    resposta = cliente.get("/api/v1/dashboard/a@b.com", headers={"Accept-Encoding": "gzip"})
+    assert resposta.headers["content-encoding"] == "gzip"
+    assert resposta.text == CORPO
@@ -0,0 +1,36 @@
+"""Camada de banco do cache de textos de IA (services/ia_cache.py)"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+
+def test_gravacao_apaga_entradas_expiradas():
+    from database import SessionLocal
+    from models.cache_ia import CacheIA
+    from services.ia_cache import _gravar_no_banco
+
+    agora = datetime.utcnow()
+    expiradas = [uuid.uuid4().hex for _ in range(3)]
+    valida = uuid.uuid4().hex
+    with SessionLocal() as db:
+        db.add_all(
+            [CacheIA(chave=c, funcao="teste", texto="velho", expira_em=agora - timedelta(hours=1)) for c in expiradas]
+            + [CacheIA(chave=valida, funcao="teste", texto="vale", expira_em=agora + timedelta(hours=1))]
+        )
+        db.commit()
+
+    nova = uuid.uuid4().hex
+    _gravar_no_banco(nova, "teste", "novo", agora + timedelta(hours=1))
+
+    with SessionLocal() as db:
+        restantes = {c for (c,) in db.query(CacheIA.chave).filter(CacheIA.chave.in_(expiradas + [valida, nova]))}
+    assert restantes == {valida, nova}
+
+
+def test_expira_em_indexado():
+    from database import engine
+
+    indices = {i["name"] for i in inspect(engine).get_indexes("cache_ia")}
+    assert "idx_cache_ia_expira_em" in indices
@@ -0,0 +1,68 @@
+"""Fila de geração de IA (services/ia_jobs.py): reserva e gravação do resultado"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from conftest import dados_analise
+
+
+@pytest.fixture
+def job_preso(cliente):
+    """Fábrica: análise Free + job 'processando' vencido há muito (o 1º da fila)."""
+    from database import SessionLocal
+    from models.job_ia import JobIA
+
+    def _criar(tentativas: int, max_tentativas: int = 3) -> uuid.UUID:
+        resposta = cliente.post("/api/v1/analise/nova", json=dados_analise(f"job-{uuid.uuid4().hex[:8]}@exemplo.com"))
+        assert resposta.status_code == 201, resposta.text
+        antigo = datetime(2020, 1, 1)
+        with SessionLocal() as db:
+            job = JobIA(
+                analise_id=uuid.UUID(resposta.json()["id"]), status="processando",
+                tentativas=tentativas, max_tentativas=max_tentativas,
+                proxima_tentativa_em=antigo, created_at=antigo, updated_at=antigo,
+            )
+            db.add(job)
+            db.commit()
+            return job.id
+
+    return _criar
+
+
+def _job(job_id):
+    from database import SessionLocal
+    from models.job_ia import JobIA
+
+    with SessionLocal() as db:
+        return db.get(JobIA, job_id)
+
+
+def test_job_preso_sem_tentativas_vira_falhou(job_preso):
+    from services.ia_jobs import _reservar_proximo_job
+
+    job_id = job_preso(tentativas=3)
+    reservado = _reservar_proximo_job()
+
+    assert reservado is None or reservado[0] != job_id
+    job = _job(job_id)
+    assert job.status == "falhou"
+    assert job.tentativas == 3
+
+
+def test_job_preso_com_tentativas_e_recuperado(job_preso):
+    from services.ia_jobs import _reservar_proximo_job
+
+    job_id = job_preso(tentativas=1)
+
+    assert _reservar_proximo_job()[0] == job_id
+    job = _job(job_id)
+    assert job.status == "processando"
+    assert job.tentativas == 2
+
+
+def test_salvar_resultado_de_job_apagado():
+    from services.ia_jobs import _salvar_resultado
+
+    assert _salvar_resultado(uuid.uuid4(), uuid.uuid4(), "resumo", None, None) == ("removido", False)
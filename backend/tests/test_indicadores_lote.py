@@ -0,0 +1,23 @@
+"""Motor de indicadores em lote (NumPy) x escalar: resultados idênticos"""
+
+import random
+
+import pytest
+
+from scripts.verificar_indicadores_lote import _empresa
+from services.indicadores import calcular_indicadores
+from services.indicadores_lote import LoteIndicadores, calcular_indicadores_lote
+
+
+# Amostra menor que a do script (20 mil), com as mesmas bordas sorteadas
+@pytest.mark.parametrize("semente", [1, 42])
+def test_lote_identico_ao_escalar(semente):
+    rng = random.Random(semente)
+    dados = [_empresa(rng) for _ in range(2000)]
+
+    esperados = [calcular_indicadores(d) for d in dados]
+    obtidos = calcular_indicadores_lote(LoteIndicadores.de_dados(dados)).linhas()
+
+    divergentes = [i for i, (esperado, obtido) in enumerate(zip(esperados, obtidos)) if esperado != obtido]
+    assert len(obtidos) == len(esperados)
+    assert divergentes == []
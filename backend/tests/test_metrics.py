@@ -0,0 +1,25 @@
+"""GET /metrics: token e exposição em produção"""
+
+import main
+
+
+def test_sem_token_em_producao_responde_404(cliente, monkeypatch):
+    monkeypatch.setattr(main.settings, "METRICS_TOKEN", None)
+    monkeypatch.setattr(main.settings, "DEBUG", False)
+    assert cliente.get("/metrics").status_code == 404
+
+
+def test_sem_token_com_debug_responde(cliente, monkeypatch):
+    monkeypatch.setattr(main.settings, "METRICS_TOKEN", None)
+    monkeypatch.setattr(main.settings, "DEBUG", True)
+    resposta = cliente.get("/metrics")
+    assert resposta.status_code == 200
+    assert "leme_http_" in resposta.text
+
+
+def test_com_token_exige_bearer(cliente, monkeypatch):
+    monkeypatch.setattr(main.settings, "METRICS_TOKEN", "segredo")
+    monkeypatch.setattr(main.settings, "DEBUG", False)
+    assert cliente.get("/metrics").status_code == 401
+    assert cliente.get("/metrics", headers={"Authorization": "Bearer errado"}).status_code == 401
+    assert cliente.get("/metrics", headers={"Authorization": "Bearer segredo"}).status_code == 200
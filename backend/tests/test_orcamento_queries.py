@@ -0,0 +1,45 @@
+"""Queries por requisição nas rotas quentes (dashboard e histórico) — ver ORCAMENTO_QUERIES"""
+
+import pytest
+
+import conftest
+
+
+def test_dashboard_por_email(cliente, analises_pro, usuario_pro, orcamento_queries):
+    with orcamento_queries():
+        resposta = cliente.get(f"/api/v1/dashboard/{usuario_pro.email}")
+    assert resposta.status_code == 200
+
+
+def test_dashboard_por_id(cliente, analises_pro, orcamento_queries):
+    with orcamento_queries():
+        resposta = cliente.get(f"/api/v1/dashboard/id/{analises_pro[-1]['id']}")
+    assert resposta.status_code == 200
+
+
+def test_historico_lista(cliente, analises_pro, orcamento_queries):
+    with orcamento_queries():
+        resposta = cliente.get("/api/v1/historico/")
+    assert resposta.status_code == 200
+    assert len(resposta.json()) == len(analises_pro)
+
+
+def test_historico_comparativo(cliente, analises_pro, orcamento_queries):
+    with orcamento_queries():
+        resposta = cliente.get("/api/v1/historico/comparativo")
+    assert resposta.status_code == 200
+
+
+def test_historico_detalhe_e_fatores(cliente, analises_pro, orcamento_queries):
+    analise_id = analises_pro[-1]["id"]
+    with orcamento_queries() as requisicoes:
+        assert cliente.get(f"/api/v1/historico/{analise_id}").status_code == 200
+        assert cliente.get(f"/api/v1/historico/{analise_id}/fatores-score").status_code == 200
+    assert len(requisicoes) == 2
+
+
+def test_orcamento_estourado_falha(cliente, analises_pro, orcamento_queries, monkeypatch):
+    monkeypatch.setitem(conftest.ORCAMENTO_QUERIES, "GET /api/v1/historico/", 1)
+    with pytest.raises(pytest.fail.Exception, match="orçamento: 1"):
+        with orcamento_queries():
+            cliente.get("/api/v1/historico/")
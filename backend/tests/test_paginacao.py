@@ -0,0 +1,67 @@
+"""Paginação por cursor das listagens (services/paginacao.py)"""
+
+import uuid
+
+from sqlalchemy import update
+
+from conftest import dados_analise
+
+
+def _todas_as_paginas(cliente, url: str, limite: int) -> list[dict]:
+    itens, cursor = [], None
+    while True:
+        params = {"limite": limite, **({"cursor": cursor} if cursor else {})}
+        resposta = cliente.get(url, params=params)
+        assert resposta.status_code == 200, resposta.text
+        itens += resposta.json()
+        cursor = resposta.headers.get("X-Proximo-Cursor")
+        if cursor is None:
+            return itens
+
+
+def test_analise_email_com_created_at_nulo(cliente):
+    from database import SessionLocal, engine
+    from migracoes import _m007_created_at_nulo
+    from models.analise import Analise
+
+    email = f"cursor-{uuid.uuid4().hex[:8]}@exemplo.com"
+    ids = []
+    for mes in (6, 7, 8):
+        resposta = cliente.post("/api/v1/analise/nova", json=dados_analise(email, mes=mes))
+        assert resposta.status_code == 201, resposta.text
+        ids.append(resposta.json()["id"])
+
+    # Linhas antigas, de antes do default do created_at (no SQLite os NULL
+    # vêm por último: com limite 2, a última da 1ª página seria uma delas)
+    with SessionLocal() as db:
+        antigas = [uuid.UUID(id_) for id_ in ids[1:]]
+        db.execute(update(Analise).where(Analise.id.in_(antigas)).values(created_at=None))
+        db.commit()
+
+    url = f"/api/v1/analise/email/{email}"
+    assert [a["id"] for a in _todas_as_paginas(cliente, url, limite=2)] == ids[:1]
+
+    with engine.begin() as conn:
+        _m007_created_at_nulo(conn)
+    assert sorted(a["id"] for a in _todas_as_paginas(cliente, url, limite=1)) == sorted(ids)
+
+
+def test_sem_limite_nem_cursor_devolve_lista_completa(cliente, monkeypatch):
+    from services import paginacao
+
+    # Padrão menor que a lista: o cliente antigo (sem ?limite=) não pode perder linhas
+    monkeypatch.setattr(paginacao.settings, "LISTAGEM_LIMITE_PADRAO", 1)
+    email = f"completa-{uuid.uuid4().hex[:8]}@exemplo.com"
+    for mes in (6, 7, 8):
+        assert cliente.post("/api/v1/analise/nova", json=dados_analise(email, mes=mes)).status_code == 201
+
+    url = f"/api/v1/analise/email/{email}"
+    resposta = cliente.get(url)
+    assert len(resposta.json()) == 3
+    assert "X-Proximo-Cursor" not in resposta.headers
+
+    primeira = cliente.get(url, params={"limite": 2})
+    assert len(primeira.json()) == 2
+    # Cursor sem limite: páginas de LISTAGEM_LIMITE_PADRAO
+    segunda = cliente.get(url, params={"cursor": primeira.headers["X-Proximo-Cursor"]})
+    assert len(segunda.json()) == 1
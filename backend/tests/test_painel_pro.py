@@ -0,0 +1,58 @@
+"""GET /api/v1/painel/{id}: bootstrap do painel Pro"""
+
+import uuid
+from datetime import datetime
+
+from services import recalculo_indicadores
+from services.auth_service import criar_token
+from services.indicadores import VERSAO_MOTOR
+
+
+def test_analise_desatualizada_recalculada_uma_vez(cliente, analises_pro, monkeypatch):
+    from database import SessionLocal
+    from models.analise import Analise
+
+    analise_id = uuid.UUID(analises_pro[-1]["id"])
+    with SessionLocal() as db:
+        db.get(Analise, analise_id).versao_motor = VERSAO_MOTOR - 1
+        db.commit()
+
+    recalculadas = []
+    recalcular_original = recalculo_indicadores._recalcular_analise
+
+    def _contar(analise):
+        recalculadas.append(analise.id)
+        return recalcular_original(analise)
+
+    monkeypatch.setattr(recalculo_indicadores, "_recalcular_analise", _contar)
+
+    resposta = cliente.get(f"/api/v1/painel/{analise_id}")
+    assert resposta.status_code == 200
+    assert recalculadas == [analise_id]
+    with SessionLocal() as db:
+        assert db.get(Analise, analise_id).versao_motor == VERSAO_MOTOR
+
+    corpo = resposta.json()
+    assert {item["id"] for item in corpo["historico"]} == {a["id"] for a in analises_pro}
+    assert corpo["fatores_score"] is not None
+
+
+def test_analise_de_outro_usuario(cliente, analises_pro, usuario_pro, monkeypatch):
+    from routers import painel_pro
+
+    blocos = []
+    monkeypatch.setattr(painel_pro, "_bloco_historico", lambda usuario_id: blocos.append(usuario_id))
+    from database import SessionLocal
+    from models.usuario import Usuario
+
+    intruso_email = f"intruso-{uuid.uuid4().hex[:8]}@exemplo.com"
+    with SessionLocal() as db:
+        db.add(Usuario(
+            id=uuid.uuid4(), nome="Intruso", email=intruso_email, senha_hash="x", plano="pro",
+            pro_ativo=True, created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        ))
+        db.commit()
+    cliente.cookies.set("leme_token", criar_token({"sub": intruso_email}))
+
+    assert cliente.get(f"/api/v1/painel/{analises_pro[-1]['id']}").status_code == 403
+    assert blocos == []
@@ -0,0 +1,34 @@
+"""
+Planos de execução das queries quentes (scripts/verificar_planos.py)
+
+Mesmos dados sintéticos, EXPLAIN e critérios do script, no banco dos
+testes (SQLite) e desfeitos no fim: índice que some ou query que deixa de
+casar com ele (varredura da tabela vigiada, sort) falha aqui. O script
+continua sendo o caminho para conferir no PostgreSQL.
+"""
+
+import pytest
+
+from scripts import verificar_planos
+
+QUERIES = verificar_planos._queries()
+
+
+@pytest.fixture(scope="module")
+def conexao_populada():
+    from database import engine
+
+    with engine.connect() as conn:
+        transacao = conn.begin()
+        try:
+            verificar_planos._popular(conn, 300)
+            yield conn
+        finally:
+            transacao.rollback()
+
+
+@pytest.mark.parametrize("nome", list(QUERIES))
+def test_plano_usa_indice(conexao_populada, nome):
+    stmt, tabela = QUERIES[nome]
+    plano = verificar_planos._explicar(conexao_populada, stmt)
+    assert verificar_planos._problemas(plano, tabela) == [], "\n".join(plano)
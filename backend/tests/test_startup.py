@@ -0,0 +1,78 @@
+"""Startup da API: conferência do schema no lifespan, tempo e DDL do boot"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from migracoes import MIGRACOES
+
+
+def test_sobe_com_schema_em_dia(cliente):
+    assert main.migracoes_pendentes() == []
+    assert cliente.get("/health").status_code == 200
+
+
+def test_recusa_subir_com_migracao_pendente(app, monkeypatch):
+    monkeypatch.setattr(main.settings, "MIGRAR_NO_STARTUP", False)
+    monkeypatch.setattr(main, "migracoes_pendentes", lambda: MIGRACOES[-1:])
+    iniciados = []
+    monkeypatch.setattr(main, "iniciar_workers_ia", lambda: iniciados.append(True))
+
+    with pytest.raises(RuntimeError, match=f"{MIGRACOES[-1].versao:03d}"):
+        with TestClient(app):
+            pass
+    assert iniciados == []
+
+
+def test_migrar_no_startup_aplica_antes_de_subir(app, monkeypatch):
+    aplicadas = []
+    monkeypatch.setattr(main.settings, "MIGRAR_NO_STARTUP", True)
+    monkeypatch.setattr(main, "aplicar_migracoes", lambda: aplicadas.append(True) or [])
+
+    with TestClient(app) as cliente:
+        assert cliente.get("/health").status_code == 200
+    assert aplicadas == [True]
+
+
+# Import do main + lifespan num processo novo, contra o banco já migrado do
+# conftest (DATABASE_URL herdado): tempo total e todo SQL emitido
+_SUBIR_WORKER = """
+import json, sys, time
+inicio = time.perf_counter()
+from sqlalchemy import event
+import database
+comandos = []
+for engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, sql, *args: comandos.append(sql))
+import main
+from fastapi.testclient import TestClient
+with TestClient(main.app):
+    segundos = time.perf_counter() - inicio
+print(json.dumps({"segundos": segundos, "comandos": comandos}))
+"""
+
+# Medido em ~1 s numa máquina de dev; o limite só pega regressão grosseira
+# (DDL/create_all de volta no boot, import pesado no caminho do startup)
+LIMITE_STARTUP_SEGUNDOS = 10.0
+
+
+def test_startup_do_worker_rapido_e_sem_ddl():
+    ambiente = {**os.environ, "MIGRAR_NO_STARTUP": "false"}
+    processo = subprocess.run(
+        [sys.executable, "-c", _SUBIR_WORKER],
+        cwd=Path(__file__).parent.parent, env=ambiente,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert processo.returncode == 0, processo.stderr
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+
+    ddl = [sql for sql in resultado["comandos"] if re.match(r"\s*(CREATE|ALTER|DROP)\b", sql, re.IGNORECASE)]
+    assert ddl == []
+    assert resultado["segundos"] < LIMITE_STARTUP_SEGUNDOS
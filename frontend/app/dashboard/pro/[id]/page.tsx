@@ -10,8 +10,8 @@ import { useParams, useRouter, useSearchParams } from "next/navigation";
 import Link from "next/link";
 
 import { useAuth } from "@/hooks/useAuth";
-import { buscarDashboardPorId, buscarComparativo, buscarHistorico } from "@/lib/api";
-import { DashboardData, AnaliseHistorico } from "@/types/dashboard";
+import { buscarPainelPro, buscarStatusIA } from "@/lib/api";
+import { DashboardData, ItemHistoricoPro, FatoresScore, ItemProgressoPlano } from "@/types/dashboard";
 
 import ProSidebar,   { ViewSlug } from "@/components/pro/ProSidebar";
 import ProBottomNav              from "@/components/pro/ProBottomNav";
@@ -73,7 +73,10 @@ export default function DashboardAnalise() {
 
   const [dashboard,   setDashboard]   = useState<DashboardData | null>(null);
   const [comparativo, setComparativo] = useState<Comparativo | null>(null);
-  const [historico,   setHistorico]   = useState<AnaliseHistorico[]>([]);
+  const [historico,   setHistorico]   = useState<ItemHistoricoPro[]>([]);
+  const [historicoCursor, setHistoricoCursor] = useState<string | null>(null);
+  const [fatoresScore, setFatoresScore] = useState<FatoresScore | null>(null);
+  const [progresso,   setProgresso]   = useState<ItemProgressoPlano[]>([]);
   const [carregando,  setCarregando]  = useState(true);
   const [erro,        setErro]        = useState<string | null>(null);
 
@@ -91,15 +94,23 @@ export default function DashboardAnalise() {
 
   useEffect(() => {
     if (!isPro || !id) return;
-    Promise.all([
-      buscarDashboardPorId(id),
-      buscarComparativo().catch(() => null),
-      buscarHistorico().catch(() => []),
-    ])
-      .then(([dash, comp, hist]) => {
+    // Uma chamada só (/api/v1/painel): dashboard + comparativo + histórico +
+    // fatores do score + progresso — repassados às views, que não buscam de novo
+    buscarPainelPro(id)
+      .then(({
+        dashboard: dash,
+        comparativo: comp,
+        historico: hist,
+        historico_proximo_cursor: cursor,
+        fatores_score: fatores,
+        progresso: prog,
+      }) => {
         setDashboard(dash);
         setComparativo(comp);
         setHistorico(hist ?? []);
+        setHistoricoCursor(cursor ?? null);
+        setFatoresScore(fatores ?? null);
+        setProgresso(prog ?? []);
 
         // Fase 5 — extrair campos de IA do comparativo (análise atual)
         // O endpoint /historico/comparativo já retorna os campos da análise atual
@@ -112,6 +123,39 @@ export default function DashboardAnalise() {
       .finally(() => setCarregando(false));
   }, [isPro, id]);
 
+  // ─── Fase 5 — IA gerada em background: consulta até o job terminar ──────────
+
+  useEffect(() => {
+    if (!isPro || !id || carregando || resumoIa) return;
+    // O comparativo só traz a análise mais recente — polling só faz sentido para ela
+    if (comparativo?.atual && comparativo.atual.analise_id !== id) return;
+
+    let tentativas = 0;
+    const intervalo = setInterval(async () => {
+      tentativas += 1;
+      try {
+        const statusIa = await buscarStatusIA(id);
+        if (statusIa.resumo_executivo) setResumoIa(statusIa.resumo_executivo);
+        if (statusIa.comparativo_setorial) setComparativoSetorial(statusIa.comparativo_setorial);
+        if (!["pendente", "processando"].includes(statusIa.status)) clearInterval(intervalo);
+      } catch {
+        clearInterval(intervalo);
+      }
+      if (tentativas >= 40) clearInterval(intervalo); // ~2 min
+    }, 3000);
+
+    return () => clearInterval(intervalo);
+  }, [isPro, id, carregando, resumoIa, comparativo]);
+
+  // ─── Progresso do plano: voltar à view não pode mostrar o estado do painel ──
+
+  const atualizarProgresso = (item: ItemProgressoPlano) => {
+    setProgresso((atual) => [
+      ...atual.filter((i) => !(i.periodo === item.periodo && i.indice_acao === item.indice_acao)),
+      item,
+    ]);
+  };
+
   // ─── Dados derivados (memoizados) ────────────────────────────────────────────
 
   const analiseAnterior = useMemo(() => {
@@ -191,6 +235,9 @@ export default function DashboardAnalise() {
             {...viewProps}
             analiseAnterior={analiseAnterior}
             resumoIa={resumoIa}
+            historico={historico}
+            historicoCursor={historicoCursor}
+            fatoresScore={fatoresScore}
           />
         );
       case "simuladores":
@@ -212,7 +259,13 @@ export default function DashboardAnalise() {
           />
         );
       case "plano-de-acao":
-        return <ViewPlanoAcao {...viewProps} />;
+        return (
+          <ViewPlanoAcao
+            {...viewProps}
+            progresso={progresso}
+            onProgressoAlterado={atualizarProgresso}
+          />
+        );
       case "financeiro":
         return <ViewFinanceiro {...viewProps} />;
       
@@ -222,6 +275,9 @@ export default function DashboardAnalise() {
             {...viewProps}
             analiseAnterior={analiseAnterior}
             resumoIa={resumoIa}
+            historico={historico}
+            historicoCursor={historicoCursor}
+            fatoresScore={fatoresScore}
           />
         );
     }
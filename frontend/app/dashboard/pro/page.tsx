@@ -19,7 +19,7 @@ import {
 } from "lucide-react";
 
 import { useAuth } from "@/hooks/useAuth";
-import { buscarHistorico } from "@/lib/api";
+import { buscarHistoricoPagina } from "@/lib/api";
 
 interface AnaliseResumo {
   id: string;
@@ -67,6 +67,8 @@ export default function DashboardProPage() {
   const router = useRouter();
 
   const [historico,      setHistorico]     = useState<AnaliseResumo[]>([]);
+  const [proximoCursor,  setProximoCursor] = useState<string | null>(null);
+  const [carregandoMais, setCarregandoMais] = useState(false);
   const [carregando,     setCarregando]    = useState(true);
   const [erro,           setErro]          = useState<string | null>(null);
   const [confirmandoId,  setConfirmandoId] = useState<string | null>(null);
@@ -81,12 +83,30 @@ export default function DashboardProPage() {
 
   useEffect(() => {
     if (!isPro) return;
-    buscarHistorico()
-      .then(setHistorico)
+    buscarHistoricoPagina()
+      .then(({ itens, proximoCursor }) => {
+        setHistorico(itens);
+        setProximoCursor(proximoCursor);
+      })
       .catch(() => setErro("Não foi possível carregar o histórico."))
       .finally(() => setCarregando(false));
   }, [isPro]);
 
+  // Histórico paginado por cursor: próximas análises sob demanda
+  const handleCarregarMais = async () => {
+    if (!proximoCursor) return;
+    setCarregandoMais(true);
+    try {
+      const { itens, proximoCursor: cursor } = await buscarHistoricoPagina(proximoCursor);
+      setHistorico((prev) => [...prev, ...itens]);
+      setProximoCursor(cursor);
+    } catch (err) {
+      console.error("Erro ao carregar mais análises:", err);
+    } finally {
+      setCarregandoMais(false);
+    }
+  };
+
   const dadosGrafico = [...historico].reverse().map((a) => ({
     label: `${MESES[a.mes_referencia - 1]}/${String(a.ano_referencia).slice(-2)}`,
     score: Math.round(a.score_saude ?? 0),
@@ -184,6 +204,9 @@ export default function DashboardProPage() {
         .card-icon { width:32px; height:32px; border-radius:8px; background:rgba(0,48,84,0.07); display:flex; align-items:center; justify-content:center; color:#003054; }
         .card-titulo { font-size:15px; font-weight:700; color:#003054; }
         .card-sub-count { margin-left:auto; font-size:13px; color:#9ca3af; }
+        .btn-carregar-mais { display:block; width:100%; padding:14px; background:#fafaf9; border:none; border-top:1px solid #f0eeea; font-family:'DM Sans',sans-serif; font-size:14px; font-weight:600; color:#003054; cursor:pointer; transition:background 0.15s; }
+        .btn-carregar-mais:hover { background:#f0eeea; }
+        .btn-carregar-mais:disabled { opacity:0.6; cursor:default; }
         .grafico-wrap { padding:8px 24px 24px; }
 
         /* CARD ÚLTIMA ANÁLISE */
@@ -399,7 +422,7 @@ export default function DashboardProPage() {
                 </div>
                 <div className="score-meta">
                   <span className="score-meta-label">Total de análises</span>
-                  <span className="score-meta-valor">{historico.length}</span>
+                  <span className="score-meta-valor">{historico.length}{proximoCursor ? "+" : ""}</span>
                 </div>
               </div>
             </div>
@@ -432,7 +455,7 @@ export default function DashboardProPage() {
               <div className="card-header-strip">
                 <div className="card-icon"><Calendar size={17} /></div>
                 <span className="card-titulo">Histórico de Análises</span>
-                <span className="card-sub-count">{historico.length} análise{historico.length !== 1 ? "s" : ""}</span>
+                <span className="card-sub-count">{historico.length}{proximoCursor ? "+" : ""} análise{historico.length !== 1 ? "s" : ""}</span>
               </div>
               <div className="tabela-outer">
                 <div className="tabela-wrap">
@@ -483,6 +506,11 @@ export default function DashboardProPage() {
                 })}
                 </div>
               </div>
+              {proximoCursor && (
+                <button className="btn-carregar-mais" onClick={handleCarregarMais} disabled={carregandoMais}>
+                  {carregandoMais ? "Carregando..." : "Carregar mais análises"}
+                </button>
+              )}
             </div>
           )}
 
@@ -7,7 +7,7 @@
 
 import { useState, useEffect, useRef } from 'react';
 import { Zap, Calendar, CalendarCheck, AlertCircle, Circle, Clock, User, Users } from 'lucide-react';
-import { PlanoAcao } from '@/types/dashboard';
+import { PlanoAcao, ItemProgressoPlano } from '@/types/dashboard';
 import { salvarProgresso, buscarProgresso } from '@/lib/api';
 
 interface PlanoAcaoSectionProps {
@@ -15,9 +15,18 @@ interface PlanoAcaoSectionProps {
   analiseId?: string;
   isPro?: boolean;
   isFree?: boolean; // NOVO — modo Free: oculta descrição, resultado e checkbox
+  progressoInicial?: ItemProgressoPlano[]; // Pro: progresso já carregado (painel) — não busca de novo
+  onProgressoAlterado?: (item: ItemProgressoPlano) => void; // mantém o progresso de quem passou progressoInicial em dia
 }
 
-export default function PlanoAcaoSection({ plano, analiseId, isPro = false, isFree = false }: PlanoAcaoSectionProps) {
+export default function PlanoAcaoSection({
+  plano,
+  analiseId,
+  isPro = false,
+  isFree = false,
+  progressoInicial,
+  onProgressoAlterado,
+}: PlanoAcaoSectionProps) {
   const [marcados, setMarcados] = useState<{
     '30': Set<number>;
     '60': Set<number>;
@@ -35,7 +44,8 @@ export default function PlanoAcaoSection({ plano, analiseId, isPro = false, isFr
 
     async function carregar() {
       if (isPro) {
-        const itens = await buscarProgresso(analiseId!).catch(() => []);
+        const itens: ItemProgressoPlano[] =
+          progressoInicial ?? await buscarProgresso(analiseId!).catch(() => []);
         const novo = { '30': new Set<number>(), '60': new Set<number>(), '90': new Set<number>() };
         for (const item of itens) {
           if (item.marcado && item.periodo in novo) {
@@ -62,7 +72,7 @@ export default function PlanoAcaoSection({ plano, analiseId, isPro = false, isFr
     }
 
     carregar();
-  }, [analiseId, isPro, isFree]);
+  }, [analiseId, isPro, isFree, progressoInicial]);
 
   // Salva no localStorage quando mudar (Free legado only — isFree novo não salva)
   useEffect(() => {
@@ -88,6 +98,7 @@ export default function PlanoAcaoSection({ plano, analiseId, isPro = false, isFr
     setMarcados((prev) => ({ ...prev, [periodo]: novoSet }));
 
     if (isPro && analiseId) {
+      onProgressoAlterado?.({ periodo, indice_acao: index, marcado: novoEstado });
       await salvarProgresso(analiseId, periodo, index, novoEstado).catch(() => null);
     }
   };
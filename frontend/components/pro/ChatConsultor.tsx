@@ -9,7 +9,7 @@
 import { useState, useRef, useEffect } from 'react';
 import { createPortal } from 'react-dom';
 import { MessageCircle, X, Send } from 'lucide-react';
-import { enviarMensagemChat, MensagemHistorico } from '@/lib/api';
+import { enviarMensagemChat, enviarMensagemChatStream, MensagemHistorico } from '@/lib/api';
 
 interface ChatConsultorProps {
   analiseId: string;
@@ -80,8 +80,14 @@ export default function ChatConsultor({ analiseId }: ChatConsultorProps) {
     setCarregando(true);
 
     try {
-      // Enviar histórico completo — backend não armazena estado
-      const resposta = await enviarMensagemChat(analiseId, texto, novasMensagens);
+      // Enviar histórico completo — backend não armazena estado.
+      // A resposta chega em streaming e vai aparecendo enquanto é gerada.
+      const resposta = await enviarMensagemChatStream(
+        analiseId,
+        texto,
+        novasMensagens,
+        (parcial) => setHistorico([...novasMensagens, { role: 'assistant', content: parcial }])
+      );
       setHistorico([...novasMensagens, { role: 'assistant', content: resposta }]);
     } catch {
       setHistorico([
@@ -346,8 +352,8 @@ export default function ChatConsultor({ analiseId }: ChatConsultorProps) {
             </div>
           ))}
 
-          {/* Indicador de digitação */}
-          {carregando && (
+          {/* Indicador de digitação — some quando o primeiro pedaço da resposta chega */}
+          {carregando && historico[historico.length - 1]?.role !== 'assistant' && (
             <div className="chat-digitando">
               <span /><span /><span />
             </div>
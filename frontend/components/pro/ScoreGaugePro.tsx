@@ -7,7 +7,7 @@
 import { useState, useEffect } from 'react';
 import { createPortal } from 'react-dom';
 import { Target, TrendingUp, TrendingDown, Minus, ChevronRight } from 'lucide-react';
-import { ScoreData } from '@/types/dashboard';
+import { ScoreData, ItemHistoricoPro, FatoresScore } from '@/types/dashboard';
 import ScoreModalPro from './ScoreModalPro';
 
 interface ScoreGaugeProProps {
@@ -19,11 +19,22 @@ interface ScoreGaugeProProps {
     mes_referencia: number;
     ano_referencia: number;
   } | null;
+  // Vindos do /api/v1/painel, repassados ao modal
+  historico?: ItemHistoricoPro[];
+  historicoCursor?: string | null;
+  fatoresScore?: FatoresScore | null;
 }
 
 const MESES = ['Jan','Fev','Mar','Abr','Mai','Jun','Jul','Ago','Set','Out','Nov','Dez'];
 
-export default function ScoreGaugePro({ score, analiseId, analiseAnterior }: ScoreGaugeProProps) {
+export default function ScoreGaugePro({
+  score,
+  analiseId,
+  analiseAnterior,
+  historico,
+  historicoCursor,
+  fatoresScore,
+}: ScoreGaugeProProps) {
   const [modalAberto, setModalAberto] = useState(false);
   const [mounted, setMounted] = useState(false);
 
@@ -181,6 +192,9 @@ export default function ScoreGaugePro({ score, analiseId, analiseAnterior }: Sco
           score={score}
           analiseId={analiseId}
           temHistorico={!!analiseAnterior}
+          historicoInicial={historico}
+          historicoCursor={historicoCursor}
+          fatoresIniciais={fatoresScore}
         />,
         document.body
       )}
@@ -1,6 +1,6 @@
 // components/pro/ScoreModalPro.tsx     
 // Modal Pro do Score — gráfico de linha (Recharts) + fatores positivos/negativos
-// Busca dados reais de dois endpoints ao abrir
+// Usa histórico e fatores vindos do /api/v1/painel; sem eles, busca ao abrir
 
 'use client';
 
@@ -10,18 +10,8 @@ import {
   LineChart, Line, XAxis, YAxis, Tooltip,
   ResponsiveContainer, CartesianGrid, Dot,
 } from 'recharts';
-import { ScoreData } from '@/types/dashboard';
-import { buscarHistorico, buscarFatoresScore } from '@/lib/api';
-
-interface FatorScore {
-  label: string;
-  impacto: number; // positivo = +N, negativo = -N
-}
-
-interface FatoresScore {
-  positivos: FatorScore[];
-  negativos: FatorScore[];
-}
+import { ScoreData, ItemHistoricoPro, FatoresScore } from '@/types/dashboard';
+import { buscarHistorico, buscarHistoricoPagina, buscarFatoresScore } from '@/lib/api';
 
 interface PontoGrafico {
   label: string;
@@ -34,6 +24,20 @@ interface ScoreModalProProps {
   score: ScoreData;
   analiseId: string;
   temHistorico: boolean; // false = só 1 análise, oculta seção de evolução
+  historicoInicial?: ItemHistoricoPro[]; // 1ª página do histórico (painel)
+  historicoCursor?: string | null;       // cursor da página seguinte (null = histórico completo)
+  fatoresIniciais?: FatoresScore | null; // fatores do score (painel)
+}
+
+/** Histórico completo: parte do que o painel já trouxe e busca só as páginas restantes. */
+async function completarHistorico(inicial: ItemHistoricoPro[], cursor: string | null) {
+  const itens = [...inicial];
+  while (cursor) {
+    const pagina = await buscarHistoricoPagina(cursor);
+    itens.push(...pagina.itens);
+    cursor = pagina.proximoCursor;
+  }
+  return itens;
 }
 
 function scoreColor(valor: number) {
@@ -50,6 +54,9 @@ export default function ScoreModalPro({
   score,
   analiseId,
   temHistorico,
+  historicoInicial,
+  historicoCursor = null,
+  fatoresIniciais,
 }: ScoreModalProProps) {
   const [fatores, setFatores]           = useState<FatoresScore | null>(null);
   const [dadosGrafico, setDadosGrafico] = useState<PontoGrafico[]>([]);
@@ -60,10 +67,11 @@ export default function ScoreModalPro({
 
     setCarregando(true);
 
-    // Busca paralela: histórico (para o gráfico) + fatores do score
+    // Busca paralela: histórico (para o gráfico) + fatores do score —
+    // só o que o painel não trouxe
     Promise.all([
-      buscarHistorico(),
-      buscarFatoresScore(analiseId),
+      historicoInicial ? completarHistorico(historicoInicial, historicoCursor) : buscarHistorico(),
+      fatoresIniciais ?? buscarFatoresScore(analiseId),
     ])
       .then(([historico, fat]) => {
         // Monta pontos do gráfico — mais antigo primeiro
@@ -80,7 +88,7 @@ export default function ScoreModalPro({
         // falha silenciosa — modal continua funcional sem dados
       })
       .finally(() => setCarregando(false));
-  }, [isOpen, analiseId]);
+  }, [isOpen, analiseId, historicoInicial, historicoCursor, fatoresIniciais]);
 
   if (!isOpen) return null;
 
@@ -4,19 +4,23 @@
 // View "Plano de Ação" — plano 30/60/90 dias completo.
 
 import PlanoAcaoSection from '@/components/dashboard/PlanoAcaoSection';
-import { DashboardData } from '@/types/dashboard';
+import { DashboardData, ItemProgressoPlano } from '@/types/dashboard';
 
 interface ViewPlanoAcaoProps {
   dashboard: DashboardData;
   analiseId: string;
+  progresso?: ItemProgressoPlano[]; // checkboxes salvos, vindos do /api/v1/painel
+  onProgressoAlterado?: (item: ItemProgressoPlano) => void;
 }
 
-export default function ViewPlanoAcao({ dashboard, analiseId }: ViewPlanoAcaoProps) {
+export default function ViewPlanoAcao({ dashboard, analiseId, progresso, onProgressoAlterado }: ViewPlanoAcaoProps) {
   return (
     <PlanoAcaoSection
       plano={dashboard.plano_acao}
       analiseId={analiseId}
       isPro={true}
+      progressoInicial={progresso}
+      onProgressoAlterado={onProgressoAlterado}
     />
   );
 }
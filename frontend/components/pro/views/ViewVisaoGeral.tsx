@@ -8,7 +8,7 @@
 import ScoreGaugePro from '@/components/pro/ScoreGaugePro';
 import ResumoExecutivo from '@/components/pro/ResumoExecutivo';
 import ProLaboreCard from '@/components/pro/ProLaboreCard';
-import { DashboardData } from '@/types/dashboard';
+import { DashboardData, ItemHistoricoPro, FatoresScore } from '@/types/dashboard';
 
 interface ViewVisaoGeralProps {
   dashboard: DashboardData;
@@ -19,6 +19,10 @@ interface ViewVisaoGeralProps {
     ano_referencia: number;
   } | null;
   resumoIa?: string | null; // Fase 5 — texto gerado por IA, null = fallback determinístico
+  // Vindos do /api/v1/painel — o modal do score não busca de novo
+  historico?: ItemHistoricoPro[];
+  historicoCursor?: string | null;
+  fatoresScore?: FatoresScore | null;
 }
 
 export default function ViewVisaoGeral({
@@ -26,6 +30,9 @@ export default function ViewVisaoGeral({
   analiseId,
   analiseAnterior,
   resumoIa,
+  historico,
+  historicoCursor,
+  fatoresScore,
 }: ViewVisaoGeralProps) {
   const analiseAnteriorResumo =
     analiseAnterior?.score != null
@@ -51,6 +58,9 @@ export default function ViewVisaoGeral({
         score={dashboard.score}
         analiseId={analiseId}
         analiseAnterior={analiseAnterior}
+        historico={historico}
+        historicoCursor={historicoCursor}
+        fatoresScore={fatoresScore}
       />
 
       {/* 3. Pró-labore */}
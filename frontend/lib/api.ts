@@ -3,6 +3,7 @@
  */
 
 import { DadosAnalise } from "@/types/analise";
+import { ItemHistoricoPro } from "@/types/dashboard";
 
 const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
@@ -104,6 +105,16 @@ export async function buscarDashboard(email: string) {
   return response.json();
 }
 
+/**
+ * Status da geração de IA (resumo executivo + comparativo setorial) de uma análise Pro.
+ * status: pendente | processando | concluido | falhou | indisponivel
+ */
+export async function buscarStatusIA(id: string) {
+  const response = await fetch(`${API_BASE}/api/v1/analise/${id}/ia-status`);
+  if (!response.ok) throw new Error("Erro ao buscar status da IA");
+  return response.json();
+}
+
 export async function buscarDashboardPorId(id: string) {
   const response = await fetch(`${API_BASE}/api/v1/dashboard/id/${id}`);
   if (!response.ok) {
@@ -116,14 +127,31 @@ export async function buscarDashboardPorId(id: string) {
 // ========== HISTÓRICO PRO ==========
 
 /**
- * Lista todas as análises vinculadas ao usuário logado
+ * Página seguinte do histórico do usuário logado (mais recentes primeiro),
+ * a partir do cursor de uma página anterior. Sem cursor vem a lista
+ * completa. proximoCursor = null quando não há mais páginas.
  */
-export async function buscarHistorico() {
-  const response = await fetch(`${API_BASE}/api/v1/historico/`, {
+export async function buscarHistoricoPagina(
+  cursor?: string | null,
+): Promise<{ itens: ItemHistoricoPro[]; proximoCursor: string | null }> {
+  const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const response = await fetch(`${API_BASE}/api/v1/historico/${params}`, {
     credentials: "include",
   });
   if (!response.ok) throw new Error("Erro ao buscar histórico");
-  return response.json();
+  return {
+    itens: await response.json(),
+    proximoCursor: response.headers.get("X-Proximo-Cursor"),
+  };
+}
+
+/**
+ * Histórico completo do usuário logado (sem limite nem cursor, a API
+ * devolve todas as análises)
+ */
+export async function buscarHistorico(): Promise<ItemHistoricoPro[]> {
+  const { itens } = await buscarHistoricoPagina();
+  return itens;
 }
 
 /**
@@ -176,6 +204,19 @@ export async function buscarFatoresScore(analiseId: string) {
   return response.json();
 }
 
+/**
+ * Estado completo do dashboard Pro de uma análise em uma chamada:
+ * { dashboard, historico, historico_proximo_cursor, comparativo, fatores_score, progresso }.
+ * Cada parte tem o mesmo formato do endpoint individual; comparativo pode ser null.
+ */
+export async function buscarPainelPro(analiseId: string) {
+  const response = await fetch(`${API_BASE}/api/v1/painel/${analiseId}`, {
+    credentials: "include",
+  });
+  if (!response.ok) throw new Error("Análise não encontrada ou sem permissão");
+  return response.json();
+}
+
 // ========== PROGRESSO DO PLANO DE AÇÃO ==========
 
 /**
@@ -248,4 +289,67 @@ export async function enviarMensagemChat(
 
   const data = await response.json();
   return data.resposta;
-}
\ No newline at end of file
+}
+/**
+ * Versão em streaming (Server-Sent Events) do ChatConsultor.
+ * Chama `aoReceberTexto` com o texto acumulado a cada pedaço que chega
+ * e resolve com a resposta completa.
+ */
+export async function enviarMensagemChatStream(
+  analiseId: string,
+  mensagem: string,
+  historico: MensagemHistorico[],
+  aoReceberTexto: (textoParcial: string) => void
+): Promise<string> {
+  const response = await fetch(`${API_BASE}/api/v1/chat/consultor/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+    credentials: "include",
+    body: JSON.stringify({
+      analise_id: analiseId,
+      mensagem,
+      historico,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    const erro = await response.json().catch(() => ({}));
+    throw new Error(erro.detail || "Erro ao enviar mensagem ao consultor");
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let texto = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Eventos SSE são separados por linha em branco
+    let separador = buffer.indexOf("\n\n");
+    while (separador !== -1) {
+      const bloco = buffer.slice(0, separador);
+      buffer = buffer.slice(separador + 2);
+      separador = buffer.indexOf("\n\n");
+
+      let evento = "message";
+      let dados = "";
+      for (const linha of bloco.split("\n")) {
+        if (linha.startsWith("event: ")) evento = linha.slice(7);
+        else if (linha.startsWith("data: ")) dados += linha.slice(6);
+      }
+      const payload = dados ? JSON.parse(dados) : {};
+
+      if (evento === "erro") throw new Error(payload.detail || "Erro no consultor");
+      if (evento === "fim") return texto;
+      if (payload.texto) {
+        texto += payload.texto;
+        aoReceberTexto(texto);
+      }
+    }
+  }
+
+  return texto;
+}
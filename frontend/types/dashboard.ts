@@ -110,6 +110,37 @@ export interface AnaliseHistorico {
   status: StatusType;
 }
 
+// ========== PRO (GET /api/v1/painel, mesmos formatos dos endpoints individuais) ==========
+// Linha de /api/v1/historico/
+export interface ItemHistoricoPro {
+  id: string;
+  nome_empresa: string;
+  setor: string;
+  mes_referencia: number;
+  ano_referencia: number;
+  score_saude: number | null;
+  tendencia_status: string | null;
+  created_at: string | null;
+}
+
+// /api/v1/historico/{id}/fatores-score
+export interface FatorScore {
+  label: string;
+  impacto: number; // positivo = +N, negativo = -N
+}
+
+export interface FatoresScore {
+  positivos: FatorScore[];
+  negativos: FatorScore[];
+}
+
+// /api/v1/progresso/{id}
+export interface ItemProgressoPlano {
+  periodo: '30' | '60' | '90';
+  indice_acao: number;
+  marcado: boolean;
+}
+
 // ========== SIMULADOR ==========
 export interface SimuladorData {
   caixa_disponivel: number;